@@ -0,0 +1,13 @@
+"""Local storage locations of the API (indexes, spill files).
+
+Paths are absolute so every process — uvicorn workers, Celery, the CLI
+scripts — finds the same files whatever its working directory.
+"""
+
+import os
+from pathlib import Path
+
+# Repository root (/app in the API image) unless LEXIBEL_DATA_DIR is set
+DATA_DIR = os.path.abspath(
+    os.getenv("LEXIBEL_DATA_DIR", str(Path(__file__).resolve().parents[3] / "data"))
+)
@@ -1,11 +1,13 @@
 """LexiBel API — FastAPI Application Factory"""
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.gzip import GZipMiddleware
 
 from apps.api.middleware.tenant import TenantMiddleware
@@ -32,7 +34,7 @@ from apps.api.routers.bootstrap import (
     ensure_admin_user,
     seed_demo_data,
 )
-from apps.api.routers.search import router as search_router
+from apps.api.routers.search import get_vector_service, router as search_router
 from apps.api.routers.ai import router as ai_router
 from apps.api.routers.migration import router as migration_router
 from apps.api.routers.dpa import router as dpa_router
@@ -66,6 +68,22 @@ except ImportError as e:
     sentinel_router = None
     SENTINEL_AVAILABLE = False
 
+from apps.api.services.brain.case_snapshots import register_snapshot_hooks
+from apps.api.services.brain.tenant_summary import (
+    register_summary_hooks,
+    relay_summary_events,
+)
+from apps.api.services.chunking_service import shutdown_page_pool
+from apps.api.services.compute_executor import (
+    ExecutorBusyError,
+    get_compute_executor,
+)
+from apps.api.services.embedding_service import get_embedding_engine
+from apps.api.services.http_client import close_http_clients
+from apps.api.services.keyword_index import get_keyword_index
+from apps.api.services.vector_service import InMemoryVectorService
+from apps.api.services.llm.audit_writer import close_audit_writer
+from apps.api.services.search_cache import get_search_cache
 from apps.api.services.metrics import metrics_endpoint
 
 logger = logging.getLogger(__name__)
@@ -100,6 +118,11 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown lifecycle."""
     _validate_env()
 
+    # Invalidate Brain case snapshots and tenant summaries when the rows
+    # they depend on change
+    register_snapshot_hooks()
+    register_summary_hooks()
+
     # Run Alembic migrations on startup
     try:
         from alembic.config import Config
@@ -123,8 +146,40 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Demo data seeding skipped: %s", e)
 
+    # Load the embedding model once per worker before serving traffic
+    try:
+        get_embedding_engine().warmup()
+    except Exception as e:
+        logger.warning("Embedding warmup skipped: %s", e)
+
+    # The BM25 keyword index is shared by every process and fed on ingest;
+    # build it from the vector store only if it is still empty. An in-memory
+    # vector store starts empty, so rows kept from the last run would point
+    # at chunks that no longer exist: rebuild it to match.
+    try:
+        vector_service = get_vector_service()
+        indexed = await asyncio.to_thread(
+            get_keyword_index().rebuild,
+            vector_service,
+            not isinstance(vector_service, InMemoryVectorService),
+        )
+        if indexed:
+            logger.info("Keyword index built: %d chunks", indexed)
+    except Exception as e:
+        logger.warning("Keyword index build skipped: %s", e)
+
+    # Relay summary updates published by the workers to SSE subscribers
+    summary_relay = asyncio.create_task(relay_summary_events())
+
     yield
 
+    summary_relay.cancel()
+    get_compute_executor().shutdown(wait=False)
+    shutdown_page_pool()
+    await get_search_cache().close()
+    await close_http_clients()
+    await close_audit_writer()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -169,6 +224,17 @@ def create_app() -> FastAPI:
     # Note: RBAC is enforced via @require_role() decorators (apps/api/middleware/rbac.py),
     # not as ASGI middleware, since it operates at the route level.
 
+    # ── Exception handlers ──
+
+    @app.exception_handler(ExecutorBusyError)
+    async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+        # Back-pressure from the RAG compute executor: ask the client to retry
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Search capacity exhausted, retry shortly"},
+            headers={"Retry-After": "1"},
+        )
+
     # ── Routers ──
     app.include_router(auth_router)
     app.include_router(mfa_router)
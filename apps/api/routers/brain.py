@@ -14,7 +14,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -27,8 +27,6 @@ from apps.api.schemas.brain import (
     BrainSummaryResponse,
     CaseAnalysisResponse,
     CaseHealthResponse,
-    CompletenessItem,
-    CompletenessResponse,
     ContactAssistRequest,
     ContactAssistResponse,
     DeadlineResponse,
@@ -37,517 +35,33 @@ from apps.api.schemas.brain import (
     InsightDismissRequest,
     InsightResponse,
     RiskAssessmentResponse,
-    RiskFactor,
     StrategySuggestionResponse,
     WorkloadWeek,
 )
+from apps.api.services.brain.case_scores import deadline_urgency
+from apps.api.services.brain.case_snapshots import get_case_intelligence
+from apps.api.services.brain.tenant_summary import (
+    BRAIN_SUMMARY_DAYS_AHEAD,
+    compute_brain_summary,
+    publish_summary_updated,
+    read_tenant_summary,
+)
 from packages.db.models.brain_action import BrainAction
 from packages.db.models.brain_insight import BrainInsight
 from packages.db.models.calendar_event import CalendarEvent
 from packages.db.models.case import Case
-from packages.db.models.evidence_link import EvidenceLink
-from packages.db.models.interaction_event import InteractionEvent
 from packages.db.models.invoice import Invoice
 from packages.db.models.time_entry import TimeEntry
-from packages.db.models.timeline_event import TimelineEvent
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/brain", tags=["brain"])
 
 
-# ── Helper: completeness checklist per matter type ───────────────────
-
-COMPLETENESS_CHECKLISTS: dict[str, list[dict]] = {
-    "civil": [
-        {"element": "client_contact", "label_fr": "Contact client", "critical": True},
-        {
-            "element": "adverse_contact",
-            "label_fr": "Partie adverse identifiee",
-            "critical": True,
-        },
-        {"element": "mandate_letter", "label_fr": "Lettre de mandat", "critical": True},
-        {
-            "element": "timeline_events",
-            "label_fr": "Chronologie des faits",
-            "critical": True,
-        },
-        {
-            "element": "key_documents",
-            "label_fr": "Pieces justificatives",
-            "critical": True,
-        },
-        {
-            "element": "court_reference",
-            "label_fr": "Reference du tribunal",
-            "critical": False,
-        },
-        {
-            "element": "billing_setup",
-            "label_fr": "Facturation configuree",
-            "critical": False,
-        },
-        {
-            "element": "jurisdiction",
-            "label_fr": "Juridiction determinee",
-            "critical": True,
-        },
-    ],
-    "penal": [
-        {"element": "client_contact", "label_fr": "Contact client", "critical": True},
-        {"element": "mandate_letter", "label_fr": "Lettre de mandat", "critical": True},
-        {
-            "element": "police_report",
-            "label_fr": "Proces-verbal de police",
-            "critical": True,
-        },
-        {
-            "element": "timeline_events",
-            "label_fr": "Chronologie des faits",
-            "critical": True,
-        },
-        {
-            "element": "court_reference",
-            "label_fr": "Reference du tribunal",
-            "critical": True,
-        },
-        {
-            "element": "key_documents",
-            "label_fr": "Pieces du dossier penal",
-            "critical": True,
-        },
-        {"element": "witness_list", "label_fr": "Liste des temoins", "critical": False},
-        {
-            "element": "billing_setup",
-            "label_fr": "Facturation configuree",
-            "critical": False,
-        },
-    ],
-    "family": [
-        {"element": "client_contact", "label_fr": "Contact client", "critical": True},
-        {
-            "element": "adverse_contact",
-            "label_fr": "Partie adverse identifiee",
-            "critical": True,
-        },
-        {"element": "mandate_letter", "label_fr": "Lettre de mandat", "critical": True},
-        {
-            "element": "marriage_certificate",
-            "label_fr": "Acte de mariage",
-            "critical": False,
-        },
-        {
-            "element": "timeline_events",
-            "label_fr": "Chronologie des faits",
-            "critical": True,
-        },
-        {
-            "element": "key_documents",
-            "label_fr": "Pieces justificatives",
-            "critical": True,
-        },
-        {
-            "element": "children_info",
-            "label_fr": "Informations sur les enfants",
-            "critical": False,
-        },
-        {
-            "element": "billing_setup",
-            "label_fr": "Facturation configuree",
-            "critical": False,
-        },
-    ],
-    "commercial": [
-        {"element": "client_contact", "label_fr": "Contact client", "critical": True},
-        {
-            "element": "adverse_contact",
-            "label_fr": "Partie adverse identifiee",
-            "critical": True,
-        },
-        {"element": "mandate_letter", "label_fr": "Lettre de mandat", "critical": True},
-        {"element": "contract", "label_fr": "Contrat litigieux", "critical": True},
-        {
-            "element": "timeline_events",
-            "label_fr": "Chronologie des faits",
-            "critical": True,
-        },
-        {
-            "element": "key_documents",
-            "label_fr": "Pieces justificatives",
-            "critical": True,
-        },
-        {
-            "element": "financial_docs",
-            "label_fr": "Documents financiers",
-            "critical": False,
-        },
-        {
-            "element": "billing_setup",
-            "label_fr": "Facturation configuree",
-            "critical": False,
-        },
-    ],
-}
-
-# Default checklist for unknown matter types
-DEFAULT_CHECKLIST = COMPLETENESS_CHECKLISTS["civil"]
-
-
-# ── Helper: risk level from score ────────────────────────────────────
-
-
-def _risk_level(score: int) -> str:
-    """Return risk level string from numeric score."""
-    if score >= 75:
-        return "critical"
-    if score >= 50:
-        return "high"
-    if score >= 25:
-        return "medium"
-    return "low"
-
-
-def _health_status(score: int) -> str:
-    """Return health status string from numeric score."""
-    if score >= 80:
-        return "healthy"
-    if score >= 60:
-        return "attention_needed"
-    if score >= 40:
-        return "at_risk"
-    return "critical"
-
-
-def _deadline_urgency(days: int) -> str:
-    """Return urgency level for a deadline based on days remaining."""
-    if days <= 2:
-        return "critical"
-    if days <= 7:
-        return "urgent"
-    if days <= 14:
-        return "attention"
-    return "normal"
-
-
-# ── Helper: compute case risk assessment ─────────────────────────────
-
-
-async def _compute_risk_assessment(
-    session: AsyncSession,
-    case: Case,
-    tenant_id: uuid.UUID,
-) -> RiskAssessmentResponse:
-    """Compute risk assessment for a case based on real data."""
-    now = datetime.now(timezone.utc)
-    factors: list[RiskFactor] = []
-
-    # Factor 1: Deadline proximity
-    upcoming_deadlines = await session.scalar(
-        select(func.count(CalendarEvent.id))
-        .where(CalendarEvent.tenant_id == tenant_id)
-        .where(CalendarEvent.case_id == case.id)
-        .where(CalendarEvent.start_time >= now)
-        .where(CalendarEvent.start_time <= now + timedelta(days=7))
-    )
-    deadline_score = min(100, (upcoming_deadlines or 0) * 25)
-    factors.append(
-        RiskFactor(
-            name="deadline_proximity",
-            score=deadline_score,
-            weight=0.3,
-            description="Echeances dans les 7 prochains jours",
-            severity=_risk_level(deadline_score),
-        )
-    )
-
-    # Factor 2: Communication gap (days since last interaction)
-    last_interaction = await session.scalar(
-        select(func.max(InteractionEvent.occurred_at))
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-    )
-    if last_interaction:
-        days_silent = (now - last_interaction).days
-    else:
-        days_silent = 90  # No interactions at all = high risk
-    comm_score = min(100, days_silent * 3)
-    factors.append(
-        RiskFactor(
-            name="communication_gap",
-            score=comm_score,
-            weight=0.25,
-            description=f"Aucune communication depuis {days_silent} jours",
-            severity=_risk_level(comm_score),
-        )
-    )
-
-    # Factor 3: Document completeness (evidence links count)
-    doc_count = await session.scalar(
-        select(func.count(EvidenceLink.id))
-        .join(
-            InteractionEvent, InteractionEvent.id == EvidenceLink.interaction_event_id
-        )
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-    )
-    doc_score = max(0, 100 - min(100, (doc_count or 0) * 10))
-    factors.append(
-        RiskFactor(
-            name="document_coverage",
-            score=doc_score,
-            weight=0.2,
-            description=f"{doc_count or 0} documents au dossier",
-            severity=_risk_level(doc_score),
-        )
-    )
-
-    # Factor 4: Case age without resolution
-    case_age_days = (now.date() - case.opened_at).days if case.opened_at else 0
-    age_score = min(100, max(0, case_age_days - 90))  # Risk grows after 90 days
-    factors.append(
-        RiskFactor(
-            name="case_age",
-            score=age_score,
-            weight=0.15,
-            description=f"Dossier ouvert depuis {case_age_days} jours",
-            severity=_risk_level(age_score),
-        )
-    )
-
-    # Factor 5: Billing health (unbilled time)
-    unbilled_entries = await session.scalar(
-        select(func.count(TimeEntry.id))
-        .where(TimeEntry.tenant_id == tenant_id)
-        .where(TimeEntry.case_id == case.id)
-        .where(TimeEntry.status == "draft")
-        .where(TimeEntry.billable.is_(True))
-    )
-    billing_score = min(100, (unbilled_entries or 0) * 15)
-    factors.append(
-        RiskFactor(
-            name="billing_health",
-            score=billing_score,
-            weight=0.1,
-            description=f"{unbilled_entries or 0} prestations non facturees",
-            severity=_risk_level(billing_score),
-        )
-    )
-
-    # Overall weighted score
-    overall = int(
-        sum(f.score * f.weight for f in factors)
-        / max(sum(f.weight for f in factors), 0.01)
-    )
-
-    # Recommendations
-    recommendations = []
-    if deadline_score >= 50:
-        recommendations.append(
-            "Verifier les echeances imminentes et preparer les documents necessaires"
-        )
-    if comm_score >= 50:
-        recommendations.append(
-            "Prendre contact avec le client pour un point de situation"
-        )
-    if doc_score >= 50:
-        recommendations.append("Completer le dossier avec les pieces manquantes")
-    if age_score >= 50:
-        recommendations.append(
-            "Evaluer l'avancement du dossier et definir les prochaines etapes"
-        )
-    if billing_score >= 50:
-        recommendations.append("Regulariser la facturation des prestations en attente")
-
-    return RiskAssessmentResponse(
-        overall_score=overall,
-        level=_risk_level(overall),
-        factors=factors,
-        recommendations=recommendations,
-    )
-
-
-# ── Helper: compute completeness ─────────────────────────────────────
-
-
-async def _compute_completeness(
-    session: AsyncSession,
-    case: Case,
-    tenant_id: uuid.UUID,
-) -> CompletenessResponse:
-    """Evaluate case completeness based on matter type checklist."""
-    from packages.db.models.case_contact import CaseContact
-
-    checklist = COMPLETENESS_CHECKLISTS.get(case.matter_type, DEFAULT_CHECKLIST)
-
-    # Gather case data for checking
-    contact_count = await session.scalar(
-        select(func.count(CaseContact.id)).where(CaseContact.case_id == case.id)
-    )
-    adverse_count = await session.scalar(
-        select(func.count(CaseContact.id))
-        .where(CaseContact.case_id == case.id)
-        .where(CaseContact.role == "adverse")
-    )
-    timeline_count = await session.scalar(
-        select(func.count(TimelineEvent.id))
-        .where(TimelineEvent.tenant_id == tenant_id)
-        .where(TimelineEvent.case_id == case.id)
-    )
-    doc_count = await session.scalar(
-        select(func.count(EvidenceLink.id))
-        .join(
-            InteractionEvent, InteractionEvent.id == EvidenceLink.interaction_event_id
-        )
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-    )
-    invoice_count = await session.scalar(
-        select(func.count(Invoice.id))
-        .where(Invoice.tenant_id == tenant_id)
-        .where(Invoice.case_id == case.id)
-    )
-
-    # Check each element
-    presence_map = {
-        "client_contact": (contact_count or 0) > 0,
-        "adverse_contact": (adverse_count or 0) > 0,
-        "mandate_letter": (doc_count or 0) > 0,  # Approximation
-        "timeline_events": (timeline_count or 0) >= 2,
-        "key_documents": (doc_count or 0) >= 3,
-        "court_reference": bool(case.court_reference),
-        "billing_setup": (invoice_count or 0) > 0
-        or bool(case.metadata_.get("billing_rate")),
-        "jurisdiction": bool(case.jurisdiction),
-        "police_report": (doc_count or 0) > 0,  # Approximation for penal
-        "witness_list": False,  # Would need specific check
-        "marriage_certificate": (doc_count or 0) > 0,  # Approximation for family
-        "children_info": bool(case.metadata_.get("children")),
-        "contract": (doc_count or 0) > 0,  # Approximation for commercial
-        "financial_docs": (doc_count or 0) >= 2,  # Approximation
-    }
-
-    present_items = []
-    missing_items = []
-
-    for item in checklist:
-        is_present = presence_map.get(item["element"], False)
-        completeness_item = CompletenessItem(
-            element=item["element"],
-            label_fr=item["label_fr"],
-            present=is_present,
-            critical=item["critical"],
-        )
-        if is_present:
-            present_items.append(completeness_item)
-        else:
-            missing_items.append(completeness_item)
-
-    total = len(checklist)
-    score = int((len(present_items) / max(total, 1)) * 100)
-
-    return CompletenessResponse(
-        score=score,
-        present=present_items,
-        missing=missing_items,
-        matter_type=case.matter_type,
-    )
-
-
-# ── Helper: compute case health ──────────────────────────────────────
-
-
-async def _compute_case_health(
-    session: AsyncSession,
-    case: Case,
-    tenant_id: uuid.UUID,
-) -> CaseHealthResponse:
-    """Compute overall health score for a case."""
-    now = datetime.now(timezone.utc)
-
-    # Completeness component
-    completeness = await _compute_completeness(session, case, tenant_id)
-    completeness_score = completeness.score
-
-    # Activity component (interactions in last 30 days)
-    recent_interactions = await session.scalar(
-        select(func.count(InteractionEvent.id))
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-        .where(InteractionEvent.occurred_at >= now - timedelta(days=30))
-    )
-    activity_score = min(100, (recent_interactions or 0) * 15)
-
-    # Billing component (ratio of invoiced vs total time)
-    total_entries = await session.scalar(
-        select(func.count(TimeEntry.id))
-        .where(TimeEntry.tenant_id == tenant_id)
-        .where(TimeEntry.case_id == case.id)
-    )
-    invoiced_entries = await session.scalar(
-        select(func.count(TimeEntry.id))
-        .where(TimeEntry.tenant_id == tenant_id)
-        .where(TimeEntry.case_id == case.id)
-        .where(TimeEntry.status == "invoiced")
-    )
-    billing_score = (
-        int((invoiced_entries or 0) / max(total_entries or 1, 1) * 100)
-        if (total_entries or 0) > 0
-        else 50  # Neutral if no time entries
-    )
-
-    # Communication component (recency of last interaction)
-    last_interaction = await session.scalar(
-        select(func.max(InteractionEvent.occurred_at))
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-    )
-    if last_interaction:
-        days_since = (now - last_interaction).days
-        communication_score = max(0, 100 - days_since * 5)
-    else:
-        communication_score = 0
-
-    # Deadline component (no overdue deadlines = good)
-    overdue = await session.scalar(
-        select(func.count(CalendarEvent.id))
-        .where(CalendarEvent.tenant_id == tenant_id)
-        .where(CalendarEvent.case_id == case.id)
-        .where(CalendarEvent.start_time < now)
-        .where(CalendarEvent.start_time >= now - timedelta(days=30))
-    )
-    deadline_score = max(0, 100 - (overdue or 0) * 20)
-
-    components = {
-        "completeness": completeness_score,
-        "activity": activity_score,
-        "billing": billing_score,
-        "communication": communication_score,
-        "deadlines": deadline_score,
-    }
-
-    overall = int(sum(components.values()) / max(len(components), 1))
-
-    # Trend: compare with 30 days ago data (simplified — based on activity)
-    older_interactions = await session.scalar(
-        select(func.count(InteractionEvent.id))
-        .where(InteractionEvent.tenant_id == tenant_id)
-        .where(InteractionEvent.case_id == case.id)
-        .where(InteractionEvent.occurred_at >= now - timedelta(days=60))
-        .where(InteractionEvent.occurred_at < now - timedelta(days=30))
-    )
-    if (recent_interactions or 0) > (older_interactions or 0):
-        trend = "improving"
-    elif (recent_interactions or 0) < (older_interactions or 0):
-        trend = "declining"
-    else:
-        trend = "stable"
-
-    return CaseHealthResponse(
-        overall_score=overall,
-        status=_health_status(overall),
-        components=components,
-        trend=trend,
-    )
+def _require_admin(user: dict) -> None:
+    """Require admin or super_admin role."""
+    if user.get("role") not in ("admin", "super_admin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
 
 
 # ── Helper: generate strategy suggestions ────────────────────────────
@@ -699,213 +213,37 @@ def _generate_action_suggestions(
 
 @router.get("/summary", response_model=BrainSummaryResponse)
 async def get_brain_summary(
+    background_tasks: BackgroundTasks,
     days_ahead: int = Query(14, ge=1, le=90),
+    refresh: bool = Query(False, description="Recompute now (admins only)"),
     session: AsyncSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user),
 ) -> BrainSummaryResponse:
-    """Dashboard-level intelligence summary across all cases."""
+    """Dashboard-level intelligence summary across all cases.
+
+    Served from the tenant's precomputed summary; horizons other than the
+    stored one are computed on request.
+    """
     tenant_id = current_user["tenant_id"]
-    now = datetime.now(timezone.utc)
+    if refresh:
+        _require_admin(current_user)
 
     try:
-        # Total active cases
-        total_active = await session.scalar(
-            select(func.count(Case.id))
-            .where(Case.tenant_id == tenant_id)
-            .where(Case.status.in_(["open", "in_progress", "pending"]))
-        )
-
-        # Pending brain actions
-        pending_actions_rows = (
-            (
-                await session.execute(
-                    select(BrainAction)
-                    .where(BrainAction.tenant_id == tenant_id)
-                    .where(BrainAction.status == "pending")
-                    .order_by(
-                        func.case(
-                            (BrainAction.priority == "critical", 1),
-                            (BrainAction.priority == "urgent", 2),
-                            else_=3,
-                        )
-                    )
-                    .limit(20)
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        pending_actions = [
-            ActionSuggestionResponse(
-                action_type=a.action_type,
-                title=a.action_data.get("title", a.action_type),
-                description=a.action_data.get("description", ""),
-                priority=a.priority,
-                confidence=a.confidence_score,
-                trigger_source=a.trigger_source,
-                generated_content=a.generated_content,
-            )
-            for a in pending_actions_rows
-        ]
-
-        # Recent insights (not dismissed)
-        recent_insights_rows = (
-            (
-                await session.execute(
-                    select(BrainInsight)
-                    .where(BrainInsight.tenant_id == tenant_id)
-                    .where(BrainInsight.dismissed.is_(False))
-                    .order_by(BrainInsight.created_at.desc())
-                    .limit(20)
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        recent_insights = [
-            InsightResponse(
-                id=str(i.id),
-                insight_type=i.insight_type,
-                severity=i.severity,
-                title=i.title,
-                description=i.description,
-                suggested_actions=list(i.suggested_actions)
-                if i.suggested_actions
-                else [],
-                case_id=str(i.case_id),
-                dismissed=i.dismissed,
-            )
-            for i in recent_insights_rows
-        ]
-
-        # Critical deadlines (calendar events in the next N days)
-        deadline_rows = (
-            await session.execute(
-                select(CalendarEvent, Case.title.label("case_title"))
-                .outerjoin(Case, Case.id == CalendarEvent.case_id)
-                .where(CalendarEvent.tenant_id == tenant_id)
-                .where(CalendarEvent.start_time >= now)
-                .where(CalendarEvent.start_time <= now + timedelta(days=days_ahead))
-                .order_by(CalendarEvent.start_time.asc())
-                .limit(30)
-            )
-        ).all()
-
-        critical_deadlines = [
-            DeadlineResponse(
-                title=event.title,
-                date=event.start_time.isoformat(),
-                days_remaining=max(0, (event.start_time - now).days),
-                urgency=_deadline_urgency((event.start_time - now).days),
-                case_id=str(event.case_id) if event.case_id else None,
-                case_title=case_title,
-            )
-            for event, case_title in deadline_rows
-        ]
-
-        # Risk distribution across active cases
-        active_cases = (
-            (
-                await session.execute(
-                    select(Case)
-                    .where(Case.tenant_id == tenant_id)
-                    .where(Case.status.in_(["open", "in_progress", "pending"]))
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        risk_dist = {"low": 0, "medium": 0, "high": 0, "critical": 0}
-        cases_needing_attention = []
-
-        for case in active_cases:
-            risk = await _compute_risk_assessment(session, case, tenant_id)
-            risk_dist[risk.level] = risk_dist.get(risk.level, 0) + 1
-
-            if risk.level in ("high", "critical"):
-                cases_needing_attention.append(
-                    {
-                        "case_id": str(case.id),
-                        "title": case.title,
-                        "reason": f"Risque {risk.level} ({risk.overall_score}/100)",
-                        "urgency": risk.level,
-                    }
-                )
-
-        # Workload next weeks
-        workload_weeks = []
-        for week_offset in range(4):
-            week_start = now + timedelta(weeks=week_offset)
-            week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-            # Adjust to Monday
-            week_start = week_start - timedelta(days=week_start.weekday())
-            week_end = week_start + timedelta(days=6)
-
-            week_deadlines = await session.scalar(
-                select(func.count(CalendarEvent.id))
-                .where(CalendarEvent.tenant_id == tenant_id)
-                .where(CalendarEvent.start_time >= week_start)
-                .where(CalendarEvent.start_time <= week_end)
-            )
-
-            week_cases = await session.scalar(
-                select(func.count(func.distinct(CalendarEvent.case_id)))
-                .where(CalendarEvent.tenant_id == tenant_id)
-                .where(CalendarEvent.case_id.isnot(None))
-                .where(CalendarEvent.start_time >= week_start)
-                .where(CalendarEvent.start_time <= week_end)
-            )
-
-            estimated_hours = (week_deadlines or 0) * 2.0  # Estimate 2h per event
-            workload_weeks.append(
-                WorkloadWeek(
-                    week_start=week_start.date().isoformat(),
-                    week_end=week_end.date().isoformat(),
-                    deadline_count=week_deadlines or 0,
-                    cases_count=week_cases or 0,
-                    estimated_hours=estimated_hours,
-                    overload=estimated_hours > 40,
-                )
-            )
-
-        # Aggregate stats
-        total_insights = await session.scalar(
-            select(func.count(BrainInsight.id))
-            .where(BrainInsight.tenant_id == tenant_id)
-            .where(BrainInsight.dismissed.is_(False))
-        )
-        total_pending_actions = await session.scalar(
-            select(func.count(BrainAction.id))
-            .where(BrainAction.tenant_id == tenant_id)
-            .where(BrainAction.status == "pending")
-        )
-
-        stats = {
-            "total_insights": total_insights or 0,
-            "total_pending_actions": total_pending_actions or 0,
-            "cases_at_risk": risk_dist.get("high", 0) + risk_dist.get("critical", 0),
-            "deadlines_this_period": len(critical_deadlines),
-        }
-
+        if days_ahead != BRAIN_SUMMARY_DAYS_AHEAD:
+            return await compute_brain_summary(session, tenant_id, days_ahead)
+        stored, refreshed = await read_tenant_summary(session, tenant_id, refresh)
     except Exception as e:
         logger.error("Failed to compute brain summary: %s", e)
         raise HTTPException(
             status_code=500, detail="Erreur lors du calcul du resume intelligence"
         )
 
-    return BrainSummaryResponse(
-        total_active_cases=total_active or 0,
-        risk_distribution=risk_dist,
-        critical_deadlines=critical_deadlines,
-        pending_actions=pending_actions,
-        recent_insights=recent_insights,
-        workload_next_weeks=workload_weeks,
-        cases_needing_attention=cases_needing_attention,
-        stats=stats,
-    )
+    if refreshed:
+        # Runs after the response, once the session is committed
+        background_tasks.add_task(
+            publish_summary_updated, tenant_id, stored.generated_at
+        )
+    return stored.summary
 
 
 # ── Endpoint 2: POST /analyze/{case_id} ──────────────────────────────
@@ -930,16 +268,11 @@ async def analyze_case(
         raise HTTPException(status_code=404, detail="Dossier introuvable")
 
     try:
-        # Risk assessment
-        risk = await _compute_risk_assessment(session, case, tenant_id)
-
-        # Completeness
-        completeness = None
-        if include_completeness:
-            completeness = await _compute_completeness(session, case, tenant_id)
-
-        # Health
-        health = await _compute_case_health(session, case, tenant_id)
+        # Risk, completeness and health from the case snapshot
+        intelligence = await get_case_intelligence(session, case)
+        risk = intelligence.risk
+        completeness = intelligence.completeness if include_completeness else None
+        health = intelligence.health
 
         # Strategy suggestions
         strategy_suggestions = []
@@ -1279,7 +612,7 @@ async def list_deadlines(
         deadlines = []
         for event, case_title in rows:
             days_remaining = max(0, (event.start_time - now).days)
-            urg = _deadline_urgency(days_remaining)
+            urg = deadline_urgency(days_remaining)
 
             if urgency and urg != urgency:
                 continue
@@ -1323,7 +656,7 @@ async def get_case_health(
         raise HTTPException(status_code=404, detail="Dossier introuvable")
 
     try:
-        return await _compute_case_health(session, case, tenant_id)
+        return (await get_case_intelligence(session, case)).health
     except Exception as e:
         logger.error("Failed to compute health for case %s: %s", case_id, e)
         raise HTTPException(
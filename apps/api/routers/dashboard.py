@@ -1,17 +1,18 @@
 """Dashboard router — aggregate statistics for the dashboard view."""
 
 import logging
-from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.dependencies import get_current_user, get_db_session
-from packages.db.models.brain_action import BrainAction
-from packages.db.models.brain_insight import BrainInsight
-from packages.db.models.calendar_event import CalendarEvent
+from apps.api.routers.brain import _require_admin
+from apps.api.services.brain.tenant_summary import (
+    publish_summary_updated,
+    read_tenant_summary,
+)
 from packages.db.models.case import Case
 from packages.db.models.contact import Contact
 from packages.db.models.evidence_link import EvidenceLink
@@ -107,9 +108,13 @@ async def get_dashboard_stats(
 async def get_dashboard_intelligence(
     session: Annotated[AsyncSession, Depends(get_db_session)],
     current_user: Annotated[dict, Depends(get_current_user)],
+    background_tasks: BackgroundTasks,
+    refresh: Annotated[bool, Query(description="Recompute now (admins only)")] = False,
 ) -> dict:
     """Quick brain intelligence data for the dashboard.
 
+    Served from the tenant's precomputed Brain summary.
+
     Returns:
         {
             "critical_insights_count": int,
@@ -117,95 +122,29 @@ async def get_dashboard_intelligence(
             "cases_at_risk_count": int,
             "upcoming_deadlines": [...],
             "recent_brain_actions": [...],
+            "generated_at": str,
+            "stale": bool,
         }
     """
     tenant_id = current_user["tenant_id"]
-    now = datetime.now(timezone.utc)
+    if refresh:
+        _require_admin(current_user)
 
     try:
-        # Critical insights count (high + critical, not dismissed)
-        critical_insights_count = await session.scalar(
-            select(func.count(BrainInsight.id))
-            .where(BrainInsight.tenant_id == tenant_id)
-            .where(BrainInsight.dismissed.is_(False))
-            .where(BrainInsight.severity.in_(["high", "critical"]))
-        )
-
-        # Pending actions count
-        pending_actions_count = await session.scalar(
-            select(func.count(BrainAction.id))
-            .where(BrainAction.tenant_id == tenant_id)
-            .where(BrainAction.status == "pending")
-        )
-
-        # Cases at risk (cases with high/critical insights)
-        cases_at_risk_count = await session.scalar(
-            select(func.count(func.distinct(BrainInsight.case_id)))
-            .where(BrainInsight.tenant_id == tenant_id)
-            .where(BrainInsight.dismissed.is_(False))
-            .where(BrainInsight.severity.in_(["high", "critical"]))
-        )
-
-        # Upcoming deadlines (next 7 days)
-        deadline_rows = (
-            await session.execute(
-                select(CalendarEvent, Case.title.label("case_title"))
-                .outerjoin(Case, Case.id == CalendarEvent.case_id)
-                .where(CalendarEvent.tenant_id == tenant_id)
-                .where(CalendarEvent.start_time >= now)
-                .where(CalendarEvent.start_time <= now + timedelta(days=7))
-                .order_by(CalendarEvent.start_time.asc())
-                .limit(10)
-            )
-        ).all()
-
-        upcoming_deadlines = [
-            {
-                "title": event.title,
-                "date": event.start_time.isoformat(),
-                "days_remaining": max(0, (event.start_time - now).days),
-                "case_id": str(event.case_id) if event.case_id else None,
-                "case_title": case_title,
-            }
-            for event, case_title in deadline_rows
-        ]
-
-        # Recent brain actions (last 5)
-        recent_actions_rows = (
-            (
-                await session.execute(
-                    select(BrainAction)
-                    .where(BrainAction.tenant_id == tenant_id)
-                    .order_by(BrainAction.created_at.desc())
-                    .limit(5)
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        recent_brain_actions = [
-            {
-                "id": str(a.id),
-                "case_id": str(a.case_id),
-                "action_type": a.action_type,
-                "priority": a.priority,
-                "status": a.status,
-                "created_at": a.created_at.isoformat(),
-            }
-            for a in recent_actions_rows
-        ]
-
+        stored, refreshed = await read_tenant_summary(session, tenant_id, refresh)
     except Exception as e:
         logger.error("Failed to fetch dashboard intelligence: %s", e)
         raise HTTPException(
             status_code=500, detail="Erreur lors du chargement de l'intelligence"
         )
 
+    if refreshed:
+        # Runs after the response, once the session is committed
+        background_tasks.add_task(
+            publish_summary_updated, tenant_id, stored.generated_at
+        )
     return {
-        "critical_insights_count": critical_insights_count or 0,
-        "pending_actions_count": pending_actions_count or 0,
-        "cases_at_risk_count": cases_at_risk_count or 0,
-        "upcoming_deadlines": upcoming_deadlines,
-        "recent_brain_actions": recent_brain_actions,
+        **stored.dashboard,
+        "generated_at": stored.generated_at.isoformat(),
+        "stale": stored.stale,
     }
@@ -127,6 +127,7 @@ async def legal_search(
         ],
         total=result.total,
         search_time_ms=result.search_time_ms,
+        rerank_time_ms=result.rerank_time_ms,
         suggested_queries=result.suggested_queries,
         detected_entities=[
             LegalEntityResponse(
@@ -49,6 +49,9 @@ class LLMCompleteRequest(BaseModel):
     require_human_validation: bool = Field(
         False, description="Require human validation (AI Act Art. 14)"
     )
+    use_cache: bool = Field(
+        True, description="Allow a cached response for an identical prompt"
+    )
 
 
 class LLMClassifyRequest(BaseModel):
@@ -104,6 +107,7 @@ async def llm_complete(
             temperature=body.temperature,
             max_tokens=body.max_tokens,
             require_human_validation=body.require_human_validation,
+            use_cache=body.use_cache,
         )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -124,6 +128,7 @@ async def llm_complete(
         "latency_ms": response.latency_ms,
         "audit_id": response.audit_id,
         "require_human_validation": response.require_human_validation,
+        "cached": response.cached,
     }
 
 
@@ -4,6 +4,8 @@ POST /api/v1/search — hybrid search (vector + keyword)
 POST /api/v1/ai/generate — AI generation with citations
 """
 
+import os
+
 from fastapi import APIRouter, Depends
 
 from apps.api.dependencies import get_current_user
@@ -20,8 +22,10 @@ from apps.api.services.llm_gateway import (
     LLMGateway,
     StubLLMGateway,
 )
+from apps.api.services.compute_executor import get_compute_executor
+from apps.api.services.keyword_index import get_keyword_index
 from apps.api.services.search_service import SearchService
-from apps.api.services.vector_service import InMemoryVectorService, VectorService
+from apps.api.services.vector_service import VectorService, create_vector_service
 
 router = APIRouter(prefix="/api/v1", tags=["search"])
 
@@ -35,14 +39,14 @@ _llm_gateway: LLMGateway | None = None
 def get_vector_service() -> VectorService:
     global _vector_service
     if _vector_service is None:
-        _vector_service = InMemoryVectorService()
+        _vector_service = create_vector_service(os.getenv("VECTOR_BACKEND", "memory"))
     return _vector_service
 
 
 def get_search_service() -> SearchService:
     global _search_service
     if _search_service is None:
-        _search_service = SearchService(get_vector_service())
+        _search_service = SearchService(get_vector_service(), get_keyword_index())
     return _search_service
 
 
@@ -60,7 +64,9 @@ async def search(
 ) -> SearchResponse:
     """Hybrid search: vector similarity + keyword scoring."""
     svc = get_search_service()
-    result = svc.search(
+    result = await get_compute_executor().run(
+        "search",
+        svc.search,
         query=body.query,
         tenant_id=str(current_user["tenant_id"]),
         case_id=str(body.case_id) if body.case_id else None,
@@ -97,7 +103,9 @@ async def ai_generate(
     context_chunks: list[ContextChunk] = []
     if body.case_id:
         svc = get_search_service()
-        results = svc.vector_search(
+        results = await get_compute_executor().run(
+            "search",
+            svc.vector_search,
             query=body.prompt,
             tenant_id=tenant_id,
             case_id=str(body.case_id),
@@ -85,6 +85,8 @@ class CaseHealthResponse(BaseModel):
         str, int
     ]  # completeness, activity, billing, communication, deadlines
     trend: str  # improving, stable, declining
+    generated_at: datetime | None = None  # when the scores were computed
+    stale: bool = False  # data changed or scores expired since generated_at
 
 
 class ActionSuggestionResponse(BaseModel):
@@ -146,6 +148,9 @@ class BrainSummaryResponse(BaseModel):
     workload_next_weeks: list[WorkloadWeek] = []
     cases_needing_attention: list[dict]  # [{case_id, title, reason, urgency}]
     stats: dict  # aggregate stats
+    generated_at: datetime | None = None  # oldest case score snapshot used
+    stale_cases: int = 0  # cases whose scores are being refreshed
+    stale: bool = False  # data changed or summary expired since it was stored
 
 
 class CommunicationHealthResponse(BaseModel):
@@ -107,6 +107,7 @@ class LegalSearchResponse(BaseModel):
     results: list[LegalSearchResultItem]
     total: int
     search_time_ms: float
+    rerank_time_ms: float = 0.0
     suggested_queries: list[str] = []
     detected_entities: list[LegalEntityResponse] = []
 
@@ -0,0 +1,198 @@
+"""Benchmark the Brain summary data loading: per-case queries vs bulk loader.
+
+Seeds the demo tenant with ``seed_demo_data`` (no-op if it already has
+cases), then clones its cases, with their contact links and time entries
+and a few timeline events, until the tenant has N active cases. Both
+loading strategies run against the same data:
+
+- per-case: the 4 fetchers called for every case (previous behaviour);
+- bulk:     ``load_case_datasets``, one query per dataset;
+
+followed by a full ``BrainOrchestrator.get_brain_summary``. The clones are
+created in a transaction that is rolled back at the end, so the database
+is left as seeded.
+
+Needs a PostgreSQL database with the migrations applied (DATABASE_URL).
+
+Usage:
+    python -m apps.api.scripts.benchmark_brain_summary
+    python -m apps.api.scripts.benchmark_brain_summary --cases 2000 --rounds 3
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import event, inspect, select, text
+
+from apps.api.routers.bootstrap import DEFAULT_TENANT_ID, seed_demo_data
+from apps.api.services.brain.case_data_loader import CaseDataset, load_case_datasets
+from apps.api.services.brain.orchestrator import BrainOrchestrator
+from packages.db.models.case import Case
+from packages.db.models.case_contact import CaseContact
+from packages.db.models.time_entry import TimeEntry
+from packages.db.models.timeline_event import TimelineEvent
+from packages.db.session import async_session_factory, engine
+
+_SKIP_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+def _clone(obj, **overrides):
+    """New ORM object with the column values of obj (fresh primary key)."""
+    values = {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(type(obj)).column_attrs
+        if attr.key not in _SKIP_COLUMNS
+    }
+    values.update(overrides)
+    return type(obj)(**values)
+
+
+async def seed_cases(session, tenant_id: uuid.UUID, target: int) -> None:
+    """Clone the demo cases until the tenant has ``target`` active cases."""
+    cases = (
+        (
+            await session.execute(
+                select(Case).where(
+                    Case.tenant_id == tenant_id,
+                    Case.status.in_(["open", "in_progress", "pending"]),
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if not cases:
+        raise SystemExit("No demo cases found: is the database migrated?")
+    links = (await session.execute(select(CaseContact))).scalars().all()
+    entries = (await session.execute(select(TimeEntry))).scalars().all()
+
+    today = date.today()
+    for i in range(target - len(cases)):
+        template = cases[i % len(cases)]
+        clone = _clone(template, id=uuid.uuid4(), reference=f"BENCH-{i:05d}")
+        session.add(clone)
+        session.add_all(
+            _clone(link, case_id=clone.id)
+            for link in links
+            if link.case_id == template.id
+        )
+        session.add_all(
+            _clone(entry, id=uuid.uuid4(), case_id=clone.id)
+            for entry in entries
+            if entry.case_id == template.id
+        )
+        session.add_all(
+            TimelineEvent(
+                tenant_id=tenant_id,
+                case_id=clone.id,
+                event_date=today + timedelta(days=days),
+                category=category,
+                title=title,
+                description=title,
+                actors=[],
+                source_type="manual",
+                source_excerpt="",
+                confidence_score=1.0,
+                created_by="benchmark",
+            )
+            for days, category, title in (
+                (-30, "meeting", "Consultation initiale"),
+                ((i % 20) + 1, "deadline", "Délai conclusions"),
+                ((i % 40) + 10, "hearing", "Audience"),
+            )
+        )
+        if i % 500 == 499:
+            await session.flush()
+    await session.flush()
+
+
+async def per_case_load(session, case_ids, tenant_id) -> dict[uuid.UUID, CaseDataset]:
+    """Previous loading: four queries for every case."""
+    datasets = {}
+    for case_id in case_ids:
+        datasets[case_id] = CaseDataset(
+            contacts=await BrainOrchestrator._fetch_contacts(
+                session, case_id, tenant_id
+            ),
+            timeline=await BrainOrchestrator._fetch_timeline(
+                session, case_id, tenant_id
+            ),
+            documents=await BrainOrchestrator._fetch_documents(
+                session, case_id, tenant_id
+            ),
+            time_entries=await BrainOrchestrator._fetch_time_entries(
+                session, case_id, tenant_id
+            ),
+        )
+    return datasets
+
+
+def _sorted(datasets: dict[uuid.UUID, CaseDataset]) -> dict:
+    """Datasets with rows in id order (unordered queries may differ)."""
+    return {
+        case_id: [
+            sorted(rows, key=lambda r: str(r["id"]))
+            for rows in (d.contacts, d.timeline, d.documents, d.time_entries)
+        ]
+        for case_id, d in datasets.items()
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Brain summary loading")
+    parser.add_argument("--cases", type=int, default=2000, help="Active cases")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds")
+    args = parser.parse_args()
+
+    await seed_demo_data()
+    tenant_id = DEFAULT_TENANT_ID
+
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+    async with async_session_factory() as session:
+        await session.execute(text(f"SET LOCAL app.current_tenant_id = '{tenant_id}'"))
+        await seed_cases(session, tenant_id, args.cases)
+        case_ids = [
+            c["id"]
+            for c in await BrainOrchestrator._fetch_active_cases(session, tenant_id)
+        ]
+        print(f"Active cases: {len(case_ids)}")
+
+        outputs = {}
+        for name, load in (
+            ("per-case", per_case_load),
+            ("bulk", load_case_datasets),
+        ):
+            best = float("inf")
+            for _ in range(args.rounds):
+                queries = 0
+                start = time.perf_counter()
+                outputs[name] = await load(session, case_ids, tenant_id)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {name:<9} {best * 1000:9.1f} ms  {queries:6d} queries")
+        assert _sorted(outputs["per-case"]) == _sorted(outputs["bulk"]), "differ"
+
+        queries = 0
+        start = time.perf_counter()
+        summary = await BrainOrchestrator().get_brain_summary(session, tenant_id)
+        print(
+            f"  summary   {(time.perf_counter() - start) * 1000:9.1f} ms  "
+            f"{queries:6d} queries  ({summary.total_active_cases} cases)"
+        )
+        await session.rollback()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Benchmark the chunker against the legacy encode/decode-per-window splitter.
+
+The corpus is built from the sample filings used by the legal indexer,
+concatenated into long documents so each run produces many windows.
+
+Usage:
+    python -m apps.api.scripts.benchmark_chunking
+    python -m apps.api.scripts.benchmark_chunking --filings 50 --repeat 40
+"""
+
+import argparse
+import time
+
+from apps.api.scripts.index_legal_documents import SAMPLE_DOCUMENTS
+from apps.api.services.chunking_service import (
+    MAX_TOKENS,
+    OVERLAP_TOKENS,
+    _get_encoder,
+    _split_text_into_chunks,
+)
+
+
+def legacy_split(
+    text: str,
+    max_tokens: int = MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+) -> list[str]:
+    """Previous implementation: tokenizer decode for every window."""
+    enc = _get_encoder()
+    tokens = enc.encode(text)
+
+    if len(tokens) <= max_tokens:
+        return [text]
+
+    chunks: list[str] = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + max_tokens, len(tokens))
+        chunks.append(enc.decode(tokens[start:end]))
+        if end >= len(tokens):
+            break
+        start += max_tokens - overlap_tokens
+    return chunks
+
+
+def build_corpus(filings: int, repeat: int) -> list[str]:
+    """Long filings made of the sample legal documents, rotated per filing."""
+    texts = [doc["content"] for doc in SAMPLE_DOCUMENTS]
+    corpus = []
+    for i in range(filings):
+        rotated = texts[i % len(texts) :] + texts[: i % len(texts)]
+        corpus.append("\n\n".join(rotated * repeat))
+    return corpus
+
+
+def run(split, corpus: list[str], rounds: int) -> tuple[float, int]:
+    """Best wall time over rounds, and number of chunks produced."""
+    best = float("inf")
+    n_chunks = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        n_chunks = sum(len(split(text)) for text in corpus)
+        best = min(best, time.perf_counter() - start)
+    return best, n_chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document chunking")
+    parser.add_argument("--filings", type=int, default=20, help="Documents")
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Sample documents per filing"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.filings, args.repeat)
+    size_mb = sum(len(t.encode("utf-8")) for t in corpus) / 1e6
+    _get_encoder()  # load outside the timed region
+
+    print(f"Corpus: {len(corpus)} filings, {size_mb:.1f} MB")
+    results = {}
+    for name, split in (
+        ("legacy", legacy_split),
+        ("single-pass", _split_text_into_chunks),
+    ):
+        seconds, n_chunks = run(split, corpus, args.rounds)
+        results[name] = seconds
+        print(
+            f"  {name:<12} {seconds * 1000:8.1f} ms  "
+            f"{size_mb / seconds:6.1f} MB/s  {n_chunks} chunks"
+        )
+    print(f"  speedup      {results['legacy'] / results['single-pass']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Benchmark the single-pass PII scanner against the legacy per-regex passes.
+
+For a non-EU provider, LLMGateway.complete classifies the prompt, anonymizes
+each message, classifies the prompt again and verifies the anonymized text.
+The legacy pipeline ran every pattern separately in each of those steps; the
+current one scans each text once per request (``RequestScans``) and shares
+the result.
+
+The classified text is the messages joined, while messages are anonymized
+one by one: a single user message shares one scan across every step, but
+with a system prompt the joined text and each message are scanned apart.
+Both cases are measured.
+
+Prompts are built from a Belgian case-file paragraph with PII, repeated up
+to the target size (100 KB by default).
+
+Usage:
+    python -m apps.api.scripts.benchmark_pii_scan
+    python -m apps.api.scripts.benchmark_pii_scan --size-kb 500 --rounds 10
+"""
+
+import argparse
+import time
+
+from apps.api.services.llm.anonymizer import DataAnonymizer
+from apps.api.services.llm.data_classifier import (
+    DataClassifier,
+    DetectedEntity,
+    _ADDRESS_KEYWORDS,
+    _BCE_PATTERN,
+    _CRIMINAL_KEYWORDS,
+    _DOB_PATTERN,
+    _EMAIL_PATTERN,
+    _HEALTH_KEYWORDS,
+    _IBAN_BE_PATTERN,
+    _INTERNAL_REF_PATTERN,
+    _JURISPRUDENCE_PATTERNS,
+    _LEGAL_CODE_PATTERNS,
+    _LEGAL_CONTEXT_NAME,
+    _MINOR_KEYWORDS,
+    _NISS_PATTERN,
+    _NOT_PERSON_NAMES,
+    _PHONE_BE_PATTERN,
+    _POSTAL_CODE_BE,
+    _PROPER_NAME_PATTERN,
+    RequestScans,
+)
+
+PARAGRAPH = (
+    "Dossier n° 2024/{i:04d} — Maître Jean Dupont représente Mme Marie Claes, "
+    "née le 12/03/1985, NISS 85.03.12-123.45, domiciliée rue de la Loi 16, "
+    "1000 Bruxelles. Contact : marie.claes{i}@example.be, +32 2 123 45 67. "
+    "La société Alpha SRL (BE0123.456.789) verse les loyers sur le compte "
+    "BE68 5390 0754 7034. Le certificat médical mentionne une incapacité de "
+    "travail ; le tribunal de la jeunesse est saisi pour l'enfant. Voir "
+    "Cass. 12 mars 2020 et l'art. 1382 Code civil ; selon le rapport remis "
+    "à Pierre Lambert, aucune condamnation n'est inscrite au casier "
+    "judiciaire.\n"
+)
+
+SYSTEM_PROMPT = (
+    "Tu es un assistant juridique pour un cabinet d'avocats belge. Réponds "
+    "en français, cite les articles de loi et la jurisprudence pertinents "
+    "et signale toute échéance de procédure."
+)
+
+_SIMPLE_DETECTORS = [
+    ("niss", _NISS_PATTERN),
+    ("bce", _BCE_PATTERN),
+    ("phone", _PHONE_BE_PATTERN),
+    ("iban", _IBAN_BE_PATTERN),
+    ("email", _EMAIL_PATTERN),
+]
+
+
+def _legacy_pii(text: str) -> list[DetectedEntity]:
+    """Previous per-pattern passes shared by classifier and anonymizer."""
+    entities = []
+    for entity_type, pattern in _SIMPLE_DETECTORS:
+        for m in pattern.finditer(text):
+            entities.append(DetectedEntity(entity_type, m.group(), m.start(), m.end()))
+    for m in _DOB_PATTERN.finditer(text):
+        entities.append(
+            DetectedEntity("date_of_birth", m.group(1), m.start(1), m.end(1))
+        )
+    for m in _LEGAL_CONTEXT_NAME.finditer(text):
+        entities.append(
+            DetectedEntity("person_name", m.group(), m.start(), m.end(), 0.9)
+        )
+    for m in _PROPER_NAME_PATTERN.finditer(text):
+        if m.group(1).lower() not in _NOT_PERSON_NAMES:
+            entities.append(
+                DetectedEntity("person_name", m.group(1), m.start(1), m.end(1), 0.6)
+            )
+    return entities
+
+
+def legacy_classify(text: str) -> list[DetectedEntity]:
+    """Previous DataClassifier.classify detection: one pass per pattern."""
+    entities = []
+    for entity_type, pattern in (
+        ("health_keyword", _HEALTH_KEYWORDS),
+        ("criminal_keyword", _CRIMINAL_KEYWORDS),
+        ("minor_keyword", _MINOR_KEYWORDS),
+        ("internal_ref", _INTERNAL_REF_PATTERN),
+    ):
+        for m in pattern.finditer(text):
+            entities.append(DetectedEntity(entity_type, m.group(), m.start(), m.end()))
+    entities.extend(_legacy_pii(text))
+    addr_matches = list(_ADDRESS_KEYWORDS.finditer(text))
+    postal_matches = list(_POSTAL_CODE_BE.finditer(text))
+    if addr_matches and postal_matches:
+        start, end = addr_matches[0].start(), postal_matches[0].end()
+        entities.append(DetectedEntity("address", text[start:end], start, end, 0.7))
+    _JURISPRUDENCE_PATTERNS.search(text)
+    _LEGAL_CODE_PATTERNS.search(text)
+    return entities
+
+
+class LegacyAnonymizer(DataAnonymizer):
+    """DataAnonymizer with the previous per-pattern entity detection."""
+
+    def _detect_entities(
+        self, text: str, scans: RequestScans | None = None
+    ) -> list[DetectedEntity]:
+        entities = _legacy_pii(text)
+        postal_matches = list(_POSTAL_CODE_BE.finditer(text))
+        for addr in _ADDRESS_KEYWORDS.finditer(text):
+            for postal in postal_matches:
+                if 0 < postal.start() - addr.start() < 100:
+                    entities.append(
+                        DetectedEntity(
+                            "address",
+                            text[addr.start() : postal.end()],
+                            addr.start(),
+                            postal.end(),
+                            0.7,
+                        )
+                    )
+                    break
+        return entities
+
+    def verify_anonymization(
+        self, anonymized_text: str, original_entities: list[DetectedEntity]
+    ) -> bool:
+        for entity in original_entities:
+            value = entity.value.strip()
+            if len(value) >= 3 and value in anonymized_text:
+                return False
+        return True
+
+
+def _joined(messages: list[dict]) -> str:
+    """Text classified by the gateway (LLMGateway._get_messages_text)."""
+    return "\n".join(m["content"] for m in messages)
+
+
+def legacy_pipeline(messages: list[dict]) -> tuple[list[str], bool]:
+    anonymizer = LegacyAnonymizer()
+    text = _joined(messages)
+    legacy_classify(text)
+    anonymized = []
+    for message in messages:
+        result = anonymizer.anonymize(message["content"])
+        anonymizer.verify_anonymization(result.anonymized_text, result.entities)
+        anonymized.append(result.anonymized_text)
+    entities = legacy_classify(text)
+    verified = anonymizer.verify_anonymization("\n".join(anonymized), entities)
+    return anonymized, verified
+
+
+def single_pass_pipeline(messages: list[dict]) -> tuple[list[str], bool]:
+    classifier, anonymizer = DataClassifier(), DataAnonymizer()
+    scans = RequestScans()  # one per request, as in LLMGateway.complete
+    text = _joined(messages)
+    classifier.classify(text, scans=scans)
+    anonymized, _ = anonymizer.anonymize_messages(messages, scans)
+    entities = classifier.classify(text, scans=scans).detected_entities
+    verified = anonymizer.verify_anonymization(_joined(anonymized), entities)
+    return [m["content"] for m in anonymized], verified
+
+
+def build_prompts(count: int, size_kb: int) -> list[str]:
+    """Prompts of about ``size_kb`` KB, each with distinct identifiers."""
+    prompts = []
+    for p in range(count):
+        parts, size = [], 0
+        i = p * 10_000
+        while size < size_kb * 1000:
+            parts.append(PARAGRAPH.format(i=i))
+            size += len(parts[-1].encode("utf-8"))
+            i += 1
+        prompts.append("".join(parts))
+    return prompts
+
+
+def run(pipeline, requests: list[list[dict]], rounds: int) -> tuple[float, list]:
+    """Best wall time over rounds, and the outputs."""
+    best = float("inf")
+    outputs: list = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        outputs = [pipeline(messages) for messages in requests]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PII scanning")
+    parser.add_argument("--prompts", type=int, default=5, help="Prompts per round")
+    parser.add_argument("--size-kb", type=int, default=100, help="Prompt size (KB)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds")
+    args = parser.parse_args()
+
+    prompts = build_prompts(args.prompts, args.size_kb)
+    size_mb = sum(len(t.encode("utf-8")) for t in prompts) / 1e6
+
+    print(f"Prompts: {len(prompts)} x {args.size_kb} KB")
+    cases = {
+        "user": [[{"role": "user", "content": p}] for p in prompts],
+        "system+user": [
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": p},
+            ]
+            for p in prompts
+        ],
+    }
+    for case, requests in cases.items():
+        print(f"Messages: {case}")
+        results, outputs = {}, {}
+        for name, pipeline in (
+            ("legacy", legacy_pipeline),
+            ("single-pass", single_pass_pipeline),
+        ):
+            seconds, outputs[name] = run(pipeline, requests, args.rounds)
+            results[name] = seconds
+            print(
+                f"  {name:<12} {seconds * 1000:8.1f} ms  "
+                f"{size_mb / seconds:6.1f} MB/s  "
+                f"{seconds * 1000 / len(prompts):6.1f} ms/prompt"
+            )
+        assert outputs["legacy"] == outputs["single-pass"], "outputs differ"
+        print(f"  speedup      {results['legacy'] / results['single-pass']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
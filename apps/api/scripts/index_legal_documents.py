@@ -19,6 +19,9 @@ import uuid
 from typing import Any
 
 from apps.api.services.chunking_service import chunk_text, generate_embeddings
+from apps.api.services.embedding_service import get_embedding_engine
+from apps.api.services.keyword_index import get_keyword_index
+from apps.api.services.search_cache import get_search_cache
 from apps.api.services.vector_service import VectorService, COLLECTION_NAME
 
 
@@ -194,7 +197,7 @@ async def index_document(
     vector_service: VectorService,
     document: dict[str, Any],
 ) -> int:
-    """Index a single legal document into Qdrant.
+    """Index a single legal document into Qdrant and the keyword index.
 
     Returns number of chunks indexed.
     """
@@ -202,16 +205,19 @@ async def index_document(
     metadata = extract_legal_metadata(document)
 
     # Chunk the document
-    chunks = chunk_text(
-        text=content,
-        chunk_size=500,
-        overlap=100,
-    )
+    chunks = [
+        c.content
+        for c in chunk_text(
+            text=content,
+            max_tokens=500,
+            overlap_tokens=100,
+        )
+    ]
 
     if not chunks:
         return 0
 
-    # Generate embeddings
+    # Generate embeddings (unchanged chunks are served from the embedding cache)
     embeddings = generate_embeddings(chunks)
 
     # Prepare payloads
@@ -232,6 +238,8 @@ async def index_document(
         embeddings=embeddings,
         payloads=payloads,
     )
+    # The keyword index is shared with the API (KEYWORD_INDEX_PATH)
+    get_keyword_index().add(chunk_ids, payloads)
 
     return len(chunks)
 
@@ -261,11 +269,24 @@ async def index_all_sources(
         total_chunks += chunks_count
         print(f"   ✓ {chunks_count} chunks indexed")
 
+    # Cached legal search results may predate the new documents
+    if total_chunks:
+        invalidated = await get_search_cache().invalidate("public")
+        print(f"\n✓ {invalidated} cached search results invalidated")
+
     print("\n✅ Indexing complete!")
     print(f"   Total documents: {len(SAMPLE_DOCUMENTS)}")
     print(f"   Total chunks: {total_chunks}")
     print(f"   Collection: {COLLECTION_NAME}")
 
+    cache = get_embedding_engine().cache
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"   Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
+
 
 # ── CLI ──
 
@@ -6,6 +6,7 @@ and proactive insights to Belgian lawyers managing their practice.
 
 from apps.api.services.brain.case_analyzer import (
     CaseAnalyzer,
+    CaseColumns,
     CaseHealth,
     CompletenessElement,
     CompletenessReport,
@@ -53,6 +54,7 @@ __all__ = [
     "DeadlineSummary",
     # Case Analyzer
     "CaseAnalyzer",
+    "CaseColumns",
     "RiskAssessment",
     "RiskFactor",
     "CompletenessReport",
@@ -2,13 +2,22 @@
 
 Provides risk assessment, strategy suggestions, completeness scoring,
 and intelligent recommendations based on Belgian legal practice.
+
+Risk and health can also be scored for a whole portfolio at once from
+CaseColumns (assess_risk_batch, calculate_case_health_batch), with the same
+results as the per-case methods.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from apps.api.services.brain.case_data_loader import CaseSnapshot
 
 
 # ---------------------------------------------------------------------------
@@ -314,6 +323,172 @@ STATUS_TIMELINE: dict[str, dict[str, int]] = {
 }
 
 
+# Timeline categories counted as communications with the client
+COMMUNICATION_CATEGORIES: set[str] = {"email", "call", "meeting"}
+
+# Timeline events treated as deadlines: by category or title keyword
+DEADLINE_CATEGORIES = ("deadline", "hearing", "audience")
+DEADLINE_KEYWORDS = ("délai", "audience", "deadline", "échéance", "conclusions")
+
+# Time entry statuses, in billing workflow order
+ENTRY_STATUSES = ("draft", "submitted", "approved", "invoiced")
+_ENTRY_STATUS_CODES = {status: code for code, status in enumerate(ENTRY_STATUSES)}
+
+
+def _to_date(value: Any) -> Any:
+    """Date of an event or entry field (None if missing or unparseable)."""
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except (ValueError, TypeError):
+            return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _is_deadline_event(event: Mapping[str, Any]) -> bool:
+    return event.get("category", "") in DEADLINE_CATEGORIES or any(
+        kw in event.get("title", "").lower() for kw in DEADLINE_KEYWORDS
+    )
+
+
+# ---------------------------------------------------------------------------
+# Columnar case data — batch scoring of a whole portfolio
+# ---------------------------------------------------------------------------
+
+# Day ordinals start at 1 (date.min), 0 marks a missing date
+_UNDATED = 0
+_NO_DAYS = np.iinfo(np.int64).max
+
+
+@dataclass
+class CaseColumns:
+    """Cases of a portfolio as columnar arrays, for batch scoring.
+
+    Per-case arrays have one row per case. Event arrays have one row per
+    dated timeline event and entry arrays one row per time entry, each with
+    the index of its case. Dates are day ordinals (``date.toordinal()``), so
+    day counts are integer subtractions; dates are parsed once, when the
+    columns are built.
+    """
+
+    cases: list[Mapping[str, Any]]  # case fields, enriched with billing metrics
+    has_client: np.ndarray  # bool
+    has_adverse: np.ndarray  # bool
+    documents: np.ndarray  # (n, 3): required, missing critical, missing important
+    opened_day: np.ndarray  # _UNDATED if unknown or invalid
+    opened_invalid: np.ndarray  # bool
+    invoice_day: np.ndarray  # last invoice, _UNDATED if none
+    event_case: np.ndarray
+    event_day: np.ndarray
+    event_communication: np.ndarray  # bool
+    event_deadline: np.ndarray  # bool
+    event_validated: np.ndarray  # bool
+    entry_case: np.ndarray
+    entry_day: np.ndarray  # _UNDATED if missing or invalid
+    entry_status: np.ndarray  # index in ENTRY_STATUSES, -1 if other
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    @classmethod
+    def from_cases(cls, cases: Sequence[CaseSnapshot]) -> CaseColumns:
+        """Columns of the given cases (case, contacts, documents, timeline
+        and time entries of each snapshot)."""
+        n = len(cases)
+        has_client = np.zeros(n, dtype=bool)
+        has_adverse = np.zeros(n, dtype=bool)
+        documents = np.zeros((n, 3), dtype=np.int64)
+        opened_day = np.full(n, _UNDATED, dtype=np.int64)
+        opened_invalid = np.zeros(n, dtype=bool)
+        invoice_day = np.full(n, _UNDATED, dtype=np.int64)
+        events: list[tuple[int, int, bool, bool, bool]] = []
+        entries: list[tuple[int, int, int]] = []
+
+        for i, snapshot in enumerate(cases):
+            case_data = snapshot.case
+            has_client[i] = any(c.get("role") == "client" for c in snapshot.contacts)
+            has_adverse[i] = any(c.get("role") == "adverse" for c in snapshot.contacts)
+            documents[i] = CaseAnalyzer._missing_documents(
+                case_data, snapshot.documents
+            )
+
+            opened_at = case_data.get("opened_at")
+            if opened_at is not None:
+                opened_at = _to_date(opened_at)
+                if opened_at is None:
+                    opened_invalid[i] = True
+                else:
+                    opened_day[i] = opened_at.toordinal()
+
+            last_invoice_date = case_data.get("last_invoice_date")
+            if last_invoice_date:
+                last_invoice_date = _to_date(last_invoice_date)
+                if last_invoice_date:
+                    invoice_day[i] = last_invoice_date.toordinal()
+
+            for event in snapshot.timeline:
+                event_date = _to_date(event.get("event_date"))
+                if event_date is None:
+                    continue
+                events.append(
+                    (
+                        i,
+                        event_date.toordinal(),
+                        event.get("category", "") in COMMUNICATION_CATEGORIES,
+                        _is_deadline_event(event),
+                        bool(event.get("is_validated", False)),
+                    )
+                )
+
+            for entry in snapshot.time_entries:
+                entry_date = _to_date(entry.get("date"))
+                entries.append(
+                    (
+                        i,
+                        _UNDATED if entry_date is None else entry_date.toordinal(),
+                        _ENTRY_STATUS_CODES.get(entry.get("status"), -1),
+                    )
+                )
+
+        event_columns = list(zip(*events)) or [()] * 5
+        entry_columns = list(zip(*entries)) or [()] * 3
+        return cls(
+            cases=[snapshot.case for snapshot in cases],
+            has_client=has_client,
+            has_adverse=has_adverse,
+            documents=documents,
+            opened_day=opened_day,
+            opened_invalid=opened_invalid,
+            invoice_day=invoice_day,
+            event_case=np.array(event_columns[0], dtype=np.int64),
+            event_day=np.array(event_columns[1], dtype=np.int64),
+            event_communication=np.array(event_columns[2], dtype=bool),
+            event_deadline=np.array(event_columns[3], dtype=bool),
+            event_validated=np.array(event_columns[4], dtype=bool),
+            entry_case=np.array(entry_columns[0], dtype=np.int64),
+            entry_day=np.array(entry_columns[1], dtype=np.int64),
+            entry_status=np.array(entry_columns[2], dtype=np.int64),
+        )
+
+
+def _latest(n: int, case: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Latest day per case (_UNDATED where the case has none)."""
+    latest = np.full(n, _UNDATED, dtype=np.int64)
+    np.maximum.at(latest, case, day)
+    return latest
+
+
+def _days_since(today: int, day: np.ndarray) -> list[int | None]:
+    return [None if d == _UNDATED else today - d for d in day.tolist()]
+
+
+def _count(n: int, case: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Rows selected by mask, per case."""
+    return np.bincount(case[mask], minlength=n)
+
+
 # ---------------------------------------------------------------------------
 # CaseAnalyzer
 # ---------------------------------------------------------------------------
@@ -362,6 +537,10 @@ class CaseAnalyzer:
         factors.append(self._assess_billing_risk(case_data))
         factors.append(self._assess_communication_risk(timeline, contacts))
 
+        return self._risk_assessment(factors)
+
+    def _risk_assessment(self, factors: list[RiskFactor]) -> RiskAssessment:
+        """Combine risk factors into the overall assessment."""
         # Weighted average — only include factors with weight > 0
         total_weight = sum(f.weight for f in factors if f.weight > 0)
         if total_weight > 0:
@@ -386,22 +565,20 @@ class CaseAnalyzer:
         closest_days = None
 
         for event in timeline:
-            event_date = event.get("event_date")
+            event_date = _to_date(event.get("event_date"))
             if event_date is None:
                 continue
-            if isinstance(event_date, str):
-                try:
-                    event_date = date.fromisoformat(event_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(event_date, datetime):
-                event_date = event_date.date()
 
             days_until = (event_date - today).days
             if days_until >= 0:
                 if closest_days is None or days_until < closest_days:
                     closest_days = days_until
 
+        return self._deadline_risk_factor(closest_days)
+
+    @staticmethod
+    def _deadline_risk_factor(closest_days: int | None) -> RiskFactor:
+        """Deadline risk from the days until the next timeline event."""
         if closest_days is None:
             # No upcoming deadlines — mild concern (no tracking)
             return RiskFactor(
@@ -442,10 +619,20 @@ class CaseAnalyzer:
 
     def _assess_document_risk(
         self,
-        case_data: dict[str, Any],
-        documents: list[dict[str, Any]],
+        case_data: Mapping[str, Any],
+        documents: Sequence[dict[str, Any]],
     ) -> RiskFactor:
         """Evaluate risk from missing critical documents."""
+        return self._document_risk_factor(
+            *self._missing_documents(case_data, documents)
+        )
+
+    @staticmethod
+    def _missing_documents(
+        case_data: Mapping[str, Any],
+        documents: Sequence[dict[str, Any]],
+    ) -> tuple[int, int, int]:
+        """Required, missing critical and missing important document counts."""
         matter_type = case_data.get("matter_type", "civil")
         required = REQUIRED_DOCUMENTS.get(matter_type, REQUIRED_DOCUMENTS["civil"])
 
@@ -465,8 +652,13 @@ class CaseAnalyzer:
                 elif req["importance"] == "important":
                     missing_important += 1
 
-        total_required = len(required)
+        return len(required), missing_critical, missing_important
 
+    @staticmethod
+    def _document_risk_factor(
+        total_required: int, missing_critical: int, missing_important: int
+    ) -> RiskFactor:
+        """Document risk from the missing required document counts."""
         if total_required == 0:
             score = 0.0
             explanation = "Aucun document requis pour ce type de dossier"
@@ -497,7 +689,11 @@ class CaseAnalyzer:
         """Evaluate risk from no adverse party or no adverse counsel identified."""
         has_adverse = any(c.get("role") == "adverse" for c in contacts)
         has_client = any(c.get("role") == "client" for c in contacts)
+        return self._adverse_counsel_factor(has_client, has_adverse)
 
+    @staticmethod
+    def _adverse_counsel_factor(has_client: bool, has_adverse: bool) -> RiskFactor:
+        """Procedural risk from the parties identified in the case."""
         if not has_client:
             return RiskFactor(
                 name="adverse_counsel",
@@ -531,29 +727,32 @@ class CaseAnalyzer:
         status = case_data.get("status", "open")
 
         if opened_at is None:
+            return self._case_age_factor(status, None)
+
+        opened_at = _to_date(opened_at)
+        if opened_at is None:
+            return self._case_age_factor(status, None, invalid=True)
+
+        return self._case_age_factor(status, (today - opened_at).days)
+
+    @staticmethod
+    def _case_age_factor(
+        status: str, age_days: int | None, invalid: bool = False
+    ) -> RiskFactor:
+        """Procedural risk from the case age (None: unknown or invalid date)."""
+        if age_days is None:
             return RiskFactor(
                 name="case_age",
                 score=20.0,
                 weight=0.15,
-                explanation="Date d'ouverture inconnue",
+                explanation=(
+                    "Date d'ouverture invalide"
+                    if invalid
+                    else "Date d'ouverture inconnue"
+                ),
                 category="procedural",
             )
 
-        if isinstance(opened_at, str):
-            try:
-                opened_at = date.fromisoformat(opened_at)
-            except (ValueError, TypeError):
-                return RiskFactor(
-                    name="case_age",
-                    score=20.0,
-                    weight=0.15,
-                    explanation="Date d'ouverture invalide",
-                    category="procedural",
-                )
-        elif isinstance(opened_at, datetime):
-            opened_at = opened_at.date()
-
-        age_days = (today - opened_at).days
         expected = STATUS_TIMELINE.get(status, {}).get("expected_max_days", 180)
 
         if status in ("closed", "archived"):
@@ -590,11 +789,26 @@ class CaseAnalyzer:
 
     def _assess_billing_risk(self, case_data: dict[str, Any]) -> RiskFactor:
         """Evaluate risk from billing gaps (time entries not invoiced)."""
-        total_time_minutes = case_data.get("total_time_minutes", 0)
-        unbilled_minutes = case_data.get("unbilled_minutes", 0)
         last_invoice_date = case_data.get("last_invoice_date")
-        today = date.today()
+        last_invoice_date = _to_date(last_invoice_date) if last_invoice_date else None
+
+        days_since_invoice = None
+        if last_invoice_date:
+            days_since_invoice = (date.today() - last_invoice_date).days
 
+        return self._billing_risk_factor(
+            case_data.get("total_time_minutes", 0),
+            case_data.get("unbilled_minutes", 0),
+            days_since_invoice,
+        )
+
+    @staticmethod
+    def _billing_risk_factor(
+        total_time_minutes: Any,
+        unbilled_minutes: Any,
+        days_since_invoice: int | None,
+    ) -> RiskFactor:
+        """Billing risk from the unbilled time and the last invoice age."""
         if total_time_minutes == 0:
             return RiskFactor(
                 name="billing_gap",
@@ -608,19 +822,6 @@ class CaseAnalyzer:
             unbilled_minutes / total_time_minutes if total_time_minutes > 0 else 0
         )
 
-        if last_invoice_date:
-            if isinstance(last_invoice_date, str):
-                try:
-                    last_invoice_date = date.fromisoformat(last_invoice_date)
-                except (ValueError, TypeError):
-                    last_invoice_date = None
-            elif isinstance(last_invoice_date, datetime):
-                last_invoice_date = last_invoice_date.date()
-
-        days_since_invoice = None
-        if last_invoice_date:
-            days_since_invoice = (today - last_invoice_date).days
-
         score = 0.0
 
         # Unbilled time component
@@ -671,41 +872,43 @@ class CaseAnalyzer:
         contacts: list[dict[str, Any]],
     ) -> RiskFactor:
         """Evaluate risk from communication gaps."""
-        today = date.today()
         has_client = any(c.get("role") == "client" for c in contacts)
-
         if not has_client:
-            return RiskFactor(
-                name="communication_gap",
-                score=40.0,
-                weight=0.15,
-                explanation="Pas de client identifié — communication impossible à évaluer",
-                category="communication",
-            )
+            return self._communication_risk_factor(False, None)
 
         # Find most recent communication event
-        comm_categories = {"email", "call", "meeting"}
         most_recent = None
 
         for event in timeline:
-            category = event.get("category", "")
-            if category not in comm_categories:
+            if event.get("category", "") not in COMMUNICATION_CATEGORIES:
                 continue
-            event_date = event.get("event_date")
+            event_date = _to_date(event.get("event_date"))
             if event_date is None:
                 continue
-            if isinstance(event_date, str):
-                try:
-                    event_date = date.fromisoformat(event_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(event_date, datetime):
-                event_date = event_date.date()
 
             if most_recent is None or event_date > most_recent:
                 most_recent = event_date
 
-        if most_recent is None:
+        days_since = None
+        if most_recent is not None:
+            days_since = (date.today() - most_recent).days
+        return self._communication_risk_factor(True, days_since)
+
+    @staticmethod
+    def _communication_risk_factor(
+        has_client: bool, days_since: int | None
+    ) -> RiskFactor:
+        """Communication risk from the days since the last client exchange."""
+        if not has_client:
+            return RiskFactor(
+                name="communication_gap",
+                score=40.0,
+                weight=0.15,
+                explanation="Pas de client identifié — communication impossible à évaluer",
+                category="communication",
+            )
+
+        if days_since is None:
             return RiskFactor(
                 name="communication_gap",
                 score=60.0,
@@ -714,8 +917,6 @@ class CaseAnalyzer:
                 category="communication",
             )
 
-        days_since = (today - most_recent).days
-
         if days_since > 30:
             score = 80.0
             explanation = (
@@ -1123,6 +1324,10 @@ class CaseAnalyzer:
         deadline = self._health_deadline_compliance(timeline)
         components.append(deadline)
 
+        return self._case_health(components)
+
+    def _case_health(self, components: list[HealthComponent]) -> CaseHealth:
+        """Combine health components into the overall case health."""
         # Weighted overall
         total_weight = sum(c.weight for c in components)
         if total_weight > 0:
@@ -1146,6 +1351,16 @@ class CaseAnalyzer:
         contacts: list[dict[str, Any]],
     ) -> HealthComponent:
         """Health component: case information completeness."""
+        return self._completeness_component(
+            case_data,
+            any(c.get("role") == "client" for c in contacts),
+            any(c.get("role") == "adverse" for c in contacts),
+        )
+
+    @staticmethod
+    def _completeness_component(
+        case_data: Mapping[str, Any], has_client: bool, has_adverse: bool
+    ) -> HealthComponent:
         score = 100.0
 
         if not case_data.get("title"):
@@ -1154,9 +1369,9 @@ class CaseAnalyzer:
             score -= 20.0
         if not case_data.get("jurisdiction"):
             score -= 10.0
-        if not any(c.get("role") == "client" for c in contacts):
+        if not has_client:
             score -= 30.0
-        if not any(c.get("role") == "adverse" for c in contacts):
+        if not has_adverse:
             score -= 10.0
         if (
             not case_data.get("court_reference")
@@ -1177,40 +1392,32 @@ class CaseAnalyzer:
         time_entries: list[dict[str, Any]],
     ) -> HealthComponent:
         """Health component: recent activity on the case."""
-        today = date.today()
         most_recent = None
 
         # Check timeline events
         for event in timeline:
-            event_date = event.get("event_date")
+            event_date = _to_date(event.get("event_date"))
             if event_date is None:
                 continue
-            if isinstance(event_date, str):
-                try:
-                    event_date = date.fromisoformat(event_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(event_date, datetime):
-                event_date = event_date.date()
             if most_recent is None or event_date > most_recent:
                 most_recent = event_date
 
         # Check time entries
         for entry in time_entries:
-            entry_date = entry.get("date")
+            entry_date = _to_date(entry.get("date"))
             if entry_date is None:
                 continue
-            if isinstance(entry_date, str):
-                try:
-                    entry_date = date.fromisoformat(entry_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(entry_date, datetime):
-                entry_date = entry_date.date()
             if most_recent is None or entry_date > most_recent:
                 most_recent = entry_date
 
-        if most_recent is None:
+        days_since = None
+        if most_recent is not None:
+            days_since = (date.today() - most_recent).days
+        return self._activity_component(days_since)
+
+    @staticmethod
+    def _activity_component(days_since: int | None) -> HealthComponent:
+        if days_since is None:
             return HealthComponent(
                 name="activity",
                 score=20.0,
@@ -1218,8 +1425,6 @@ class CaseAnalyzer:
                 details="Aucune activité enregistrée",
             )
 
-        days_since = (today - most_recent).days
-
         if days_since <= 3:
             score = 100.0
         elif days_since <= 7:
@@ -1242,20 +1447,18 @@ class CaseAnalyzer:
 
     def _health_billing(self, time_entries: list[dict[str, Any]]) -> HealthComponent:
         """Health component: billing status."""
-        if not time_entries:
-            return HealthComponent(
-                name="billing",
-                score=50.0,
-                weight=0.20,
-                details="Aucune prestation enregistrée",
-            )
-
-        total = len(time_entries)
-        draft = sum(1 for e in time_entries if e.get("status") == "draft")
-        submitted = sum(1 for e in time_entries if e.get("status") == "submitted")
-        approved = sum(1 for e in time_entries if e.get("status") == "approved")
-        invoiced = sum(1 for e in time_entries if e.get("status") == "invoiced")
+        return self._billing_component(
+            len(time_entries),
+            *(
+                sum(1 for e in time_entries if e.get("status") == status)
+                for status in ENTRY_STATUSES
+            ),
+        )
 
+    @staticmethod
+    def _billing_component(
+        total: int, draft: int, submitted: int, approved: int, invoiced: int
+    ) -> HealthComponent:
         if total == 0:
             return HealthComponent(
                 name="billing",
@@ -1295,6 +1498,21 @@ class CaseAnalyzer:
     ) -> HealthComponent:
         """Health component: communication quality."""
         has_client = any(c.get("role") == "client" for c in contacts)
+        if not has_client:
+            return self._communication_component(False, 0, 0)
+
+        recent_7d = self._count_recent_events(
+            timeline, categories=COMMUNICATION_CATEGORIES, days=7
+        )
+        recent_30d = self._count_recent_events(
+            timeline, categories=COMMUNICATION_CATEGORIES, days=30
+        )
+        return self._communication_component(True, recent_7d, recent_30d)
+
+    @staticmethod
+    def _communication_component(
+        has_client: bool, recent_7d: int, recent_30d: int
+    ) -> HealthComponent:
         if not has_client:
             return HealthComponent(
                 name="communication",
@@ -1303,13 +1521,6 @@ class CaseAnalyzer:
                 details="Pas de client identifié",
             )
 
-        recent_7d = self._count_recent_events(
-            timeline, categories={"email", "call", "meeting"}, days=7
-        )
-        recent_30d = self._count_recent_events(
-            timeline, categories={"email", "call", "meeting"}, days=30
-        )
-
         if recent_7d >= 2:
             score = 95.0
         elif recent_7d >= 1:
@@ -1339,24 +1550,12 @@ class CaseAnalyzer:
         upcoming = 0
 
         for event in timeline:
-            event_date = event.get("event_date")
+            event_date = _to_date(event.get("event_date"))
             if event_date is None:
                 continue
-            if isinstance(event_date, str):
-                try:
-                    event_date = date.fromisoformat(event_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(event_date, datetime):
-                event_date = event_date.date()
 
-            category = event.get("category", "")
             # Consider events that look like deadlines
-            is_deadline = category in ("deadline", "hearing", "audience") or any(
-                kw in event.get("title", "").lower()
-                for kw in ("délai", "audience", "deadline", "échéance", "conclusions")
-            )
-            if not is_deadline:
+            if not _is_deadline_event(event):
                 continue
 
             days_until = (event_date - today).days
@@ -1367,6 +1566,10 @@ class CaseAnalyzer:
             elif days_until <= 7:
                 upcoming += 1
 
+        return self._deadline_compliance_component(overdue, upcoming)
+
+    @staticmethod
+    def _deadline_compliance_component(overdue: int, upcoming: int) -> HealthComponent:
         if overdue > 0:
             score = max(0.0, 30.0 - overdue * 15.0)
             details = f"{overdue} délai(s) dépassé(s), {upcoming} à venir cette semaine"
@@ -1387,6 +1590,141 @@ class CaseAnalyzer:
             details=details,
         )
 
+    # ------------------------------------------------------------------
+    # Batch Scoring
+    # ------------------------------------------------------------------
+
+    def assess_risk_batch(
+        self, columns: CaseColumns, today: date | None = None
+    ) -> list[RiskAssessment]:
+        """Risk assessment of every case of a CaseColumns portfolio.
+
+        Gives the same result as assess_risk case by case: the measures
+        (days to the next event, days since the last communication and the
+        last invoice, case age) are computed for all cases with array
+        operations, then scored by the same factor rules.
+
+        Args:
+            columns: Columnar data of the cases to score.
+            today: Reference date (defaults to today).
+
+        Returns:
+            One RiskAssessment per case, in the order of columns.cases.
+        """
+        day = (today or date.today()).toordinal()
+        n = len(columns)
+
+        days_until = columns.event_day - day
+        ahead = days_until >= 0
+        closest = np.full(n, _NO_DAYS, dtype=np.int64)
+        np.minimum.at(closest, columns.event_case[ahead], days_until[ahead])
+
+        comm = columns.event_communication
+        last_comm = _latest(n, columns.event_case[comm], columns.event_day[comm])
+
+        closest_days = [None if d == _NO_DAYS else d for d in closest.tolist()]
+        comm_days = _days_since(day, last_comm)
+        invoice_days = _days_since(day, columns.invoice_day)
+        ages = _days_since(day, columns.opened_day)
+        documents = columns.documents.tolist()
+        has_client = columns.has_client.tolist()
+        has_adverse = columns.has_adverse.tolist()
+        opened_invalid = columns.opened_invalid.tolist()
+
+        assessments: list[RiskAssessment] = []
+        for i, case_data in enumerate(columns.cases):
+            factors = [
+                self._deadline_risk_factor(closest_days[i]),
+                self._document_risk_factor(*documents[i]),
+                self._adverse_counsel_factor(has_client[i], has_adverse[i]),
+                self._case_age_factor(
+                    case_data.get("status", "open"),
+                    ages[i],
+                    invalid=opened_invalid[i],
+                ),
+                self._billing_risk_factor(
+                    case_data.get("total_time_minutes", 0),
+                    case_data.get("unbilled_minutes", 0),
+                    invoice_days[i],
+                ),
+                self._communication_risk_factor(has_client[i], comm_days[i]),
+            ]
+            assessments.append(self._risk_assessment(factors))
+        return assessments
+
+    def calculate_case_health_batch(
+        self, columns: CaseColumns, today: date | None = None
+    ) -> list[CaseHealth]:
+        """Health of every case of a CaseColumns portfolio.
+
+        Gives the same result as calculate_case_health case by case: the
+        latest activity, time entry status counts, communications in the
+        last 7 and 30 days and overdue or upcoming deadlines are computed
+        for all cases with array operations, then scored by the same
+        component rules.
+
+        Args:
+            columns: Columnar data of the cases to score.
+            today: Reference date (defaults to today).
+
+        Returns:
+            One CaseHealth per case, in the order of columns.cases.
+        """
+        day = (today or date.today()).toordinal()
+        n = len(columns)
+
+        last_activity = _latest(
+            n,
+            np.concatenate([columns.event_case, columns.entry_case]),
+            np.concatenate([columns.event_day, columns.entry_day]),
+        )
+
+        # Entries per (case, status), unknown statuses in column 0
+        width = len(ENTRY_STATUSES) + 1
+        entries = np.bincount(
+            columns.entry_case * width + columns.entry_status + 1,
+            minlength=n * width,
+        ).reshape(n, width)
+
+        comm = columns.event_communication
+        recent_7d = _count(n, columns.event_case, comm & (columns.event_day >= day - 7))
+        recent_30d = _count(
+            n, columns.event_case, comm & (columns.event_day >= day - 30)
+        )
+
+        deadline = columns.event_deadline
+        days_until = columns.event_day - day
+        overdue = _count(
+            n,
+            columns.event_case,
+            deadline & (days_until < 0) & ~columns.event_validated,
+        )
+        upcoming = _count(
+            n, columns.event_case, deadline & (days_until >= 0) & (days_until <= 7)
+        )
+
+        activity_days = _days_since(day, last_activity)
+        totals = entries.sum(axis=1).tolist()
+        statuses = entries[:, 1:].tolist()
+        has_client = columns.has_client.tolist()
+        has_adverse = columns.has_adverse.tolist()
+        recent_7d, recent_30d = recent_7d.tolist(), recent_30d.tolist()
+        overdue, upcoming = overdue.tolist(), upcoming.tolist()
+
+        health: list[CaseHealth] = []
+        for i, case_data in enumerate(columns.cases):
+            components = [
+                self._completeness_component(case_data, has_client[i], has_adverse[i]),
+                self._activity_component(activity_days[i]),
+                self._billing_component(totals[i], *statuses[i]),
+                self._communication_component(
+                    has_client[i], recent_7d[i], recent_30d[i]
+                ),
+                self._deadline_compliance_component(overdue[i], upcoming[i]),
+            ]
+            health.append(self._case_health(components))
+        return health
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -1425,16 +1763,9 @@ class CaseAnalyzer:
         for event in timeline:
             if event.get("category", "") not in categories:
                 continue
-            event_date = event.get("event_date")
+            event_date = _to_date(event.get("event_date"))
             if event_date is None:
                 continue
-            if isinstance(event_date, str):
-                try:
-                    event_date = date.fromisoformat(event_date)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(event_date, datetime):
-                event_date = event_date.date()
             if event_date >= cutoff:
                 count += 1
         return count
@@ -0,0 +1,189 @@
+"""Case Data Loader — set-based loading of the datasets Brain analyzes per case.
+
+BrainOrchestrator.get_brain_summary used to fetch contacts, timeline,
+documents and time entries case by case: 4 queries per active case. The
+loader fetches each dataset for a whole list of cases in one query
+(``case_id = ANY(:case_ids)``, a single array parameter however many cases)
+and groups the rows in memory, so a summary costs 4 queries in total.
+
+Rows are mapped to the same dicts as the per-case fetchers of the
+orchestrator, which use the mappers below as well, so CaseAnalyzer and
+DeadlineIntelligence see identical input either way.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from packages.db.models.case_contact import CaseContact
+from packages.db.models.cloud_document import CloudDocument
+from packages.db.models.contact import Contact
+from packages.db.models.document_case_link import DocumentCaseLink
+from packages.db.models.time_entry import TimeEntry
+from packages.db.models.timeline_event import TimelineEvent
+
+
+@dataclass
+class CaseDataset:
+    """Rows Brain analyzes for one case."""
+
+    contacts: list[dict[str, Any]] = field(default_factory=list)
+    timeline: list[dict[str, Any]] = field(default_factory=list)
+    documents: list[dict[str, Any]] = field(default_factory=list)
+    time_entries: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CaseSnapshot:
+    """Read-only view of one case and its data, shared by every analyzer."""
+
+    case: Mapping[str, Any]  # case fields enriched with billing metrics
+    contacts: tuple[dict[str, Any], ...] = ()
+    documents: tuple[dict[str, Any], ...] = ()
+    timeline: tuple[dict[str, Any], ...] = ()
+    time_entries: tuple[dict[str, Any], ...] = ()
+    calendar_events: tuple[dict[str, Any], ...] = ()
+    emails: tuple[dict[str, Any], ...] = ()
+    calls: tuple[dict[str, Any], ...] = ()
+
+
+# ---------------------------------------------------------------------------
+# Row mappers (shared with the per-case fetchers)
+# ---------------------------------------------------------------------------
+
+
+def contact_to_dict(contact: Contact, role: str | None) -> dict[str, Any]:
+    return {
+        "id": contact.id,
+        "contact_id": contact.id,
+        "full_name": contact.full_name,
+        "email": contact.email,
+        "phone_e164": contact.phone_e164,
+        "type": contact.type,
+        "role": role,
+    }
+
+
+def document_to_dict(doc: CloudDocument, link_type: str | None) -> dict[str, Any]:
+    return {
+        "id": doc.id,
+        "name": doc.name,
+        "mime_type": doc.mime_type,
+        "provider": doc.provider,
+        "link_type": link_type,
+        "is_indexed": doc.is_indexed,
+        "size_bytes": doc.size_bytes,
+    }
+
+
+def timeline_event_to_dict(ev: TimelineEvent) -> dict[str, Any]:
+    return {
+        "id": ev.id,
+        "event_date": ev.event_date,
+        "event_time": ev.event_time,
+        "category": ev.category,
+        "title": ev.title,
+        "description": ev.description,
+        "actors": ev.actors,
+        "source_type": ev.source_type,
+        "confidence_score": ev.confidence_score,
+        "is_validated": ev.is_validated,
+        "is_key_event": ev.is_key_event,
+    }
+
+
+def time_entry_to_dict(entry: TimeEntry) -> dict[str, Any]:
+    return {
+        "id": entry.id,
+        "date": entry.date,
+        "duration_minutes": entry.duration_minutes,
+        "billable": entry.billable,
+        "status": entry.status,
+        "source": entry.source,
+        "hourly_rate_cents": entry.hourly_rate_cents,
+        "description": entry.description,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Bulk loading
+# ---------------------------------------------------------------------------
+
+
+def _in_cases(column: Any, case_ids: Sequence[uuid.UUID]) -> Any:
+    """``column = ANY(:case_ids)`` with the ids bound as one UUID array."""
+    return column == any_(literal(list(case_ids), ARRAY(UUID(as_uuid=True))))
+
+
+async def load_case_datasets(
+    session: AsyncSession,
+    case_ids: Sequence[uuid.UUID],
+    tenant_id: uuid.UUID,
+) -> dict[uuid.UUID, CaseDataset]:
+    """Contacts, timeline, documents and time entries of many cases.
+
+    Four queries whatever the number of cases. Every requested case gets a
+    dataset (empty lists when it has no rows); per-case ordering matches
+    the single-case fetchers (timeline by date ascending, time entries by
+    date descending).
+    """
+    datasets = {case_id: CaseDataset() for case_id in case_ids}
+    if not datasets:
+        return datasets
+
+    contacts = await session.execute(
+        select(CaseContact.case_id, Contact, CaseContact.role)
+        .select_from(Contact)
+        .join(CaseContact, CaseContact.contact_id == Contact.id)
+        .where(
+            _in_cases(CaseContact.case_id, case_ids),
+            CaseContact.tenant_id == tenant_id,
+        )
+    )
+    for case_id, contact, role in contacts.all():
+        datasets[case_id].contacts.append(contact_to_dict(contact, role))
+
+    timeline = await session.execute(
+        select(TimelineEvent)
+        .where(
+            _in_cases(TimelineEvent.case_id, case_ids),
+            TimelineEvent.tenant_id == tenant_id,
+        )
+        .order_by(TimelineEvent.event_date.asc())
+    )
+    for ev in timeline.scalars().all():
+        datasets[ev.case_id].timeline.append(timeline_event_to_dict(ev))
+
+    documents = await session.execute(
+        select(DocumentCaseLink.case_id, CloudDocument, DocumentCaseLink.link_type)
+        .select_from(CloudDocument)
+        .join(
+            DocumentCaseLink,
+            DocumentCaseLink.cloud_document_id == CloudDocument.id,
+        )
+        .where(
+            _in_cases(DocumentCaseLink.case_id, case_ids),
+            CloudDocument.tenant_id == tenant_id,
+        )
+    )
+    for case_id, doc, link_type in documents.all():
+        datasets[case_id].documents.append(document_to_dict(doc, link_type))
+
+    entries = await session.execute(
+        select(TimeEntry)
+        .where(
+            _in_cases(TimeEntry.case_id, case_ids),
+            TimeEntry.tenant_id == tenant_id,
+        )
+        .order_by(TimeEntry.date.desc())
+    )
+    for entry in entries.scalars().all():
+        datasets[entry.case_id].time_entries.append(time_entry_to_dict(entry))
+
+    return datasets
@@ -0,0 +1,373 @@
+"""Case intelligence snapshots — persisted risk, completeness and health.
+
+The /brain endpoints used to recompute every score from raw rows on each
+call: the summary ran the risk queries for every active case. Scores are
+now stored in case_intelligence_snapshots, one row per case:
+
+- reads serve the snapshot; a case without one is computed and stored
+  on read;
+- an ``after_flush`` hook marks the snapshot of a case dirty, in the same
+  transaction, whenever a row its scores depend on is written through the
+  ORM (timeline events, time entries, calendar events, interactions and
+  their evidence, emails, calls, document and contact links, invoices, the
+  case itself);
+- scores also depend on the clock (days since the last interaction,
+  deadlines within 7 days), so a snapshot expires after
+  BRAIN_SNAPSHOT_MAX_AGE seconds; this also bounds the staleness left by
+  writes that bypass the ORM;
+- the refresh_case_snapshots worker task recomputes dirty and expired
+  snapshots and creates the missing ones of active cases, one transaction
+  per case: the upsert locks a single snapshot row, briefly, so a write
+  whose flush hook marks that row dirty never queues behind a whole batch.
+
+Single-case reads refresh a stale snapshot before answering. The summary
+serves stale snapshots as they are and reports how many there are;
+responses carry ``generated_at`` and ``stale``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import event, func, inspect, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from apps.api.schemas.brain import (
+    CaseHealthResponse,
+    CompletenessResponse,
+    RiskAssessmentResponse,
+)
+from apps.api.services.brain.case_scores import (
+    compute_case_health,
+    compute_completeness,
+    compute_risk_assessment,
+)
+from apps.api.services.metrics import brain_snapshot_reads_total
+from packages.db.models.calendar_event import CalendarEvent
+from packages.db.models.call_record import CallRecord
+from packages.db.models.case import Case
+from packages.db.models.case_contact import CaseContact
+from packages.db.models.case_intelligence_snapshot import CaseIntelligenceSnapshot
+from packages.db.models.document_case_link import DocumentCaseLink
+from packages.db.models.email_message import EmailMessage
+from packages.db.models.email_thread import EmailThread
+from packages.db.models.evidence_link import EvidenceLink
+from packages.db.models.interaction_event import InteractionEvent
+from packages.db.models.invoice import Invoice
+from packages.db.models.time_entry import TimeEntry
+from packages.db.models.timeline_event import TimelineEvent
+from packages.db.session import get_superadmin_session, get_tenant_session
+
+logger = logging.getLogger(__name__)
+
+BRAIN_SNAPSHOT_MAX_AGE = int(os.getenv("BRAIN_SNAPSHOT_MAX_AGE", "21600"))
+BRAIN_SNAPSHOT_REFRESH_BATCH = int(os.getenv("BRAIN_SNAPSHOT_REFRESH_BATCH", "200"))
+
+ACTIVE_CASE_STATUSES = ("open", "in_progress", "pending")
+
+_snapshots = CaseIntelligenceSnapshot.__table__
+
+
+@dataclass
+class CaseIntelligence:
+    """Scores of one case and their freshness."""
+
+    risk: RiskAssessmentResponse
+    completeness: CompletenessResponse
+    health: CaseHealthResponse
+    generated_at: datetime
+    stale: bool = False
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+# Rows the scores depend on, by the attribute holding their case id
+_CASE_ATTRIBUTES: dict[type, str] = {
+    Case: "id",
+    CalendarEvent: "case_id",
+    CallRecord: "case_id",
+    CaseContact: "case_id",
+    DocumentCaseLink: "case_id",
+    EmailThread: "case_id",
+    InteractionEvent: "case_id",
+    Invoice: "case_id",
+    TimeEntry: "case_id",
+    TimelineEvent: "case_id",
+}
+
+# Rows linked to a case through a parent row: (attribute, parent model)
+_PARENT_ATTRIBUTES: dict[type, tuple[str, type]] = {
+    EmailMessage: ("thread_id", EmailThread),
+    EvidenceLink: ("interaction_event_id", InteractionEvent),
+}
+
+
+def _values(obj: Any, key: str) -> set:
+    """Current and, if changed in this flush, previous values of an attribute.
+
+    Reads the loaded state only: no SQL is emitted.
+    """
+    state = inspect(obj)
+    values = {state.dict.get(key)}
+    values.update(state.attrs[key].history.deleted or ())
+    values.discard(None)
+    return values
+
+
+def invalidation_statement(objects: Iterable[Any]) -> Optional[Any]:
+    """UPDATE marking dirty the snapshots of the cases objects belong to.
+
+    None if no object feeds the scores.
+    """
+    case_ids: set = set()
+    parent_ids: dict[type, set] = {}
+    for obj in objects:
+        model = type(obj)
+        if model in _CASE_ATTRIBUTES:
+            case_ids |= _values(obj, _CASE_ATTRIBUTES[model])
+        elif model in _PARENT_ATTRIBUTES:
+            key, parent = _PARENT_ATTRIBUTES[model]
+            parent_ids.setdefault(parent, set()).update(_values(obj, key))
+
+    conditions = []
+    if case_ids:
+        conditions.append(_snapshots.c.case_id.in_(sorted(case_ids, key=str)))
+    for parent, ids in parent_ids.items():
+        if ids:
+            conditions.append(
+                _snapshots.c.case_id.in_(
+                    select(parent.case_id).where(parent.id.in_(sorted(ids, key=str)))
+                )
+            )
+    if not conditions:
+        return None
+    return (
+        update(_snapshots)
+        .where(or_(*conditions))
+        .values(
+            dirty=True,
+            version=_snapshots.c.version + 1,
+            dirtied_at=func.now(),
+        )
+    )
+
+
+def _invalidate_after_flush(session: Session, flush_context: Any) -> None:
+    # new / dirty / deleted still hold the pre-flush state here
+    changed = chain(
+        session.new,
+        (obj for obj in session.dirty if session.is_modified(obj)),
+        session.deleted,
+    )
+    statement = invalidation_statement(changed)
+    if statement is not None:
+        session.connection().execute(statement)
+
+
+def register_snapshot_hooks() -> None:
+    """Mark snapshots dirty on ORM writes (idempotent; call at startup)."""
+    if not event.contains(Session, "after_flush", _invalidate_after_flush):
+        event.listen(Session, "after_flush", _invalidate_after_flush)
+
+
+# ---------------------------------------------------------------------------
+# Reading and refreshing
+# ---------------------------------------------------------------------------
+
+
+def is_stale(snapshot: CaseIntelligenceSnapshot, now: datetime | None = None) -> bool:
+    """True if the snapshot is dirty or older than BRAIN_SNAPSHOT_MAX_AGE."""
+    now = now or _utcnow()
+    return snapshot.dirty or snapshot.generated_at < now - timedelta(
+        seconds=BRAIN_SNAPSHOT_MAX_AGE
+    )
+
+
+def _from_snapshot(snapshot: CaseIntelligenceSnapshot, stale: bool) -> CaseIntelligence:
+    health = CaseHealthResponse.model_validate(
+        {**snapshot.health, "generated_at": snapshot.generated_at, "stale": stale}
+    )
+    return CaseIntelligence(
+        risk=RiskAssessmentResponse.model_validate(snapshot.risk),
+        completeness=CompletenessResponse.model_validate(snapshot.completeness),
+        health=health,
+        generated_at=snapshot.generated_at,
+        stale=stale,
+    )
+
+
+async def refresh_case_snapshot(
+    session: AsyncSession, case: Case, seen_version: int = 0
+) -> CaseIntelligence:
+    """Compute the scores of a case and upsert its snapshot.
+
+    seen_version is the snapshot version read before computing: if the
+    snapshot was invalidated meanwhile, it stays dirty.
+    """
+    risk = await compute_risk_assessment(session, case, case.tenant_id)
+    completeness = await compute_completeness(session, case, case.tenant_id)
+    health = await compute_case_health(
+        session, case, case.tenant_id, completeness=completeness
+    )
+    generated_at = _utcnow()
+
+    scores = {
+        "risk_score": risk.overall_score,
+        "risk_level": risk.level,
+        "completeness_score": completeness.score,
+        "health_score": health.overall_score,
+        "risk": risk.model_dump(mode="json"),
+        "completeness": completeness.model_dump(mode="json"),
+        "health": health.model_dump(mode="json", exclude={"generated_at", "stale"}),
+        "generated_at": generated_at,
+    }
+    await session.execute(
+        insert(CaseIntelligenceSnapshot)
+        .values(tenant_id=case.tenant_id, case_id=case.id, **scores)
+        .on_conflict_do_update(
+            index_elements=["case_id"],
+            set_={**scores, "dirty": _snapshots.c.version != seen_version},
+        )
+    )
+
+    health.generated_at = generated_at
+    return CaseIntelligence(risk, completeness, health, generated_at)
+
+
+async def get_case_intelligence(session: AsyncSession, case: Case) -> CaseIntelligence:
+    """Scores of one case: the snapshot, refreshed first if stale or missing."""
+    snapshot = await session.scalar(
+        select(CaseIntelligenceSnapshot)
+        .where(CaseIntelligenceSnapshot.tenant_id == case.tenant_id)
+        .where(CaseIntelligenceSnapshot.case_id == case.id)
+    )
+    if snapshot is not None and not is_stale(snapshot):
+        brain_snapshot_reads_total.labels(result="fresh").inc()
+        return _from_snapshot(snapshot, stale=False)
+    brain_snapshot_reads_total.labels(result="computed").inc()
+    return await refresh_case_snapshot(
+        session, case, snapshot.version if snapshot is not None else 0
+    )
+
+
+async def load_case_intelligence(
+    session: AsyncSession,
+    cases: Sequence[Case],
+    tenant_id: uuid.UUID,
+    refresh_stale: bool = False,
+) -> dict[uuid.UUID, CaseIntelligence]:
+    """Scores of many cases in one query, stale snapshots included as is.
+
+    Cases without a snapshot are computed and stored, and so are the stale
+    ones with refresh_stale.
+    """
+    if not cases:
+        return {}
+    rows = await session.execute(
+        select(CaseIntelligenceSnapshot)
+        .where(CaseIntelligenceSnapshot.tenant_id == tenant_id)
+        .where(CaseIntelligenceSnapshot.case_id.in_([c.id for c in cases]))
+    )
+    snapshots = {s.case_id: s for s in rows.scalars().all()}
+
+    now = _utcnow()
+    intelligence = {}
+    for case in cases:
+        snapshot = snapshots.get(case.id)
+        stale = snapshot is not None and is_stale(snapshot, now)
+        if snapshot is None or (stale and refresh_stale):
+            brain_snapshot_reads_total.labels(result="computed").inc()
+            intelligence[case.id] = await refresh_case_snapshot(
+                session, case, snapshot.version if snapshot is not None else 0
+            )
+            continue
+        brain_snapshot_reads_total.labels(result="stale" if stale else "fresh").inc()
+        intelligence[case.id] = _from_snapshot(snapshot, stale)
+    return intelligence
+
+
+async def refresh_due_snapshots(limit: int = BRAIN_SNAPSHOT_REFRESH_BATCH) -> int:
+    """Recompute up to limit dirty, expired or missing snapshots (all tenants).
+
+    Dirty snapshots go first, then the oldest, then active cases without a
+    snapshot. Each case is refreshed in its own RLS-scoped transaction, so
+    snapshot row locks are held for one case at a time. Returns the number
+    of snapshots refreshed.
+    """
+    cutoff = _utcnow() - timedelta(seconds=BRAIN_SNAPSHOT_MAX_AGE)
+    async with get_superadmin_session() as session:
+        due = (
+            await session.execute(
+                select(
+                    CaseIntelligenceSnapshot.tenant_id,
+                    CaseIntelligenceSnapshot.case_id,
+                    CaseIntelligenceSnapshot.version,
+                )
+                .where(
+                    or_(
+                        CaseIntelligenceSnapshot.dirty.is_(True),
+                        CaseIntelligenceSnapshot.generated_at < cutoff,
+                    )
+                )
+                .order_by(
+                    CaseIntelligenceSnapshot.dirty.desc(),
+                    CaseIntelligenceSnapshot.generated_at.asc(),
+                )
+                .limit(limit)
+            )
+        ).all()
+        missing = []
+        if len(due) < limit:
+            missing = (
+                await session.execute(
+                    select(Case.tenant_id, Case.id, literal(0))
+                    .outerjoin(
+                        CaseIntelligenceSnapshot,
+                        CaseIntelligenceSnapshot.case_id == Case.id,
+                    )
+                    .where(CaseIntelligenceSnapshot.id.is_(None))
+                    .where(Case.status.in_(ACTIVE_CASE_STATUSES))
+                    .limit(limit - len(due))
+                )
+            ).all()
+
+    by_tenant: dict[uuid.UUID, dict[uuid.UUID, int]] = {}
+    for tenant_id, case_id, version in chain(due, missing):
+        by_tenant.setdefault(tenant_id, {})[case_id] = version
+
+    refreshed = 0
+    for tenant_id, versions in by_tenant.items():
+        for case_id, version in versions.items():
+            try:
+                async with get_tenant_session(tenant_id) as session:
+                    case = await session.scalar(
+                        select(Case)
+                        .where(Case.tenant_id == tenant_id)
+                        .where(Case.id == case_id)
+                    )
+                    if case is None:
+                        continue
+                    await refresh_case_snapshot(session, case, version)
+                refreshed += 1
+            except Exception as e:
+                logger.error(
+                    "Snapshot refresh failed for case %s (tenant %s): %s",
+                    case_id,
+                    tenant_id,
+                    e,
+                )
+    return refreshed
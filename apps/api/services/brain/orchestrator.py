@@ -6,10 +6,16 @@ proactive intelligence to lawyers about their cases.
 
 from __future__ import annotations
 
+import asyncio
+import os
+import time
 import uuid
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterator
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,14 +33,24 @@ from packages.db.models.email_message import EmailMessage
 from packages.db.models.email_thread import EmailThread
 from packages.db.models.time_entry import TimeEntry
 from packages.db.models.timeline_event import TimelineEvent
+from packages.db.session import get_tenant_session
 
 from apps.api.services.brain.case_analyzer import (
     CaseAnalyzer,
+    CaseColumns,
     CaseHealth,
     CompletenessReport,
     RiskAssessment,
     StrategySuggestion,
 )
+from apps.api.services.brain.case_data_loader import (
+    CaseSnapshot,
+    contact_to_dict,
+    document_to_dict,
+    load_case_datasets,
+    time_entry_to_dict,
+    timeline_event_to_dict,
+)
 from apps.api.services.brain.communication_scorer import (
     CommunicationHealth,
     CommunicationScorer,
@@ -45,6 +61,35 @@ from apps.api.services.brain.deadline_intelligence import (
     WorkloadPrediction,
 )
 
+# Case datasets fetched at the same time by analyze_case / generate_insights,
+# each on its own pooled connection (1 = one after another on the session)
+BRAIN_FETCH_CONCURRENCY = int(os.getenv("BRAIN_FETCH_CONCURRENCY", "4"))
+# Pooled connections those fetches may hold at once across the whole process;
+# keep it well below the pool size (10 + 20 overflow) so requests that already
+# hold a connection can never starve the pool waiting for a second one
+BRAIN_FETCH_POOL_SLOTS = int(os.getenv("BRAIN_FETCH_POOL_SLOTS", "8"))
+
+# asyncio.Semaphore binds to the loop it first waits on; keep one per loop
+_pool_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_pool_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _pool_slots.get(loop)
+    if slots is None:
+        slots = _pool_slots[loop] = asyncio.Semaphore(max(1, BRAIN_FETCH_POOL_SLOTS))
+    return slots
+
+
+@contextmanager
+def _stage(timings: dict[str, float], name: str) -> Iterator[None]:
+    """Record the duration of the block in timings[name] (milliseconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
 
 # ---------------------------------------------------------------------------
 # Orchestrator Dataclasses
@@ -64,6 +109,7 @@ class CaseAnalysis:
     deadline_analysis: DeadlineAnalysis | None = None
     communication_health: CommunicationHealth | None = None
     generated_at: str = ""
+    stage_timings_ms: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -134,10 +180,16 @@ class BrainOrchestrator:
     DeadlineIntelligence, and CommunicationScorer services.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        session_factory: Any = get_tenant_session,
+        fetch_concurrency: int = BRAIN_FETCH_CONCURRENCY,
+    ) -> None:
         self.case_analyzer = CaseAnalyzer()
         self.deadline_intel = DeadlineIntelligence()
         self.comm_scorer = CommunicationScorer()
+        self._session_factory = session_factory
+        self._fetch_concurrency = fetch_concurrency
 
     # ------------------------------------------------------------------
     # Full Case Analysis
@@ -151,9 +203,11 @@ class BrainOrchestrator:
     ) -> CaseAnalysis:
         """Perform a full intelligence analysis of a single case.
 
-        Fetches all case data, contacts, documents, timeline, and time entries,
+        Fetches the case and its contacts, documents, timeline, time entries,
+        calendar events, emails and calls concurrently into one CaseSnapshot,
         then runs risk assessment, completeness analysis, health scoring,
         strategy suggestions, deadline analysis, and communication health.
+        Fetch and analysis durations are reported in ``stage_timings_ms``.
 
         Args:
             session: SQLAlchemy async session.
@@ -163,9 +217,9 @@ class BrainOrchestrator:
         Returns:
             CaseAnalysis with all intelligence components.
         """
-        # Fetch data
-        case_data = await self._fetch_case(session, case_id, tenant_id)
-        if case_data is None:
+        timings: dict[str, float] = {}
+        snapshot = await self._load_snapshot(session, case_id, tenant_id, timings)
+        if snapshot is None:
             return CaseAnalysis(
                 case_id=str(case_id),
                 case_reference="",
@@ -186,42 +240,39 @@ class BrainOrchestrator:
                     summary="Dossier introuvable",
                 ),
                 generated_at=datetime.utcnow().isoformat(),
+                stage_timings_ms=timings,
             )
 
-        contacts = await self._fetch_contacts(session, case_id, tenant_id)
-        documents = await self._fetch_documents(session, case_id, tenant_id)
-        timeline = await self._fetch_timeline(session, case_id, tenant_id)
-        time_entries = await self._fetch_time_entries(session, case_id, tenant_id)
-        calendar_events = await self._fetch_calendar_events(session, case_id, tenant_id)
-        emails = await self._fetch_emails(session, case_id, tenant_id)
-        calls = await self._fetch_calls(session, case_id, tenant_id)
-
-        # Enrich case_data with billing info
-        case_data_enriched = self._enrich_case_with_billing(case_data, time_entries)
-
         # Run analyses
-        risk = self.case_analyzer.assess_risk(
-            case_data_enriched, contacts, timeline, documents
-        )
-        completeness = self.case_analyzer.analyze_completeness(
-            case_data_enriched, contacts, documents
-        )
-        health = self.case_analyzer.calculate_case_health(
-            case_data_enriched, contacts, timeline, time_entries
-        )
-        strategies = self.case_analyzer.suggest_strategy(
-            case_data_enriched, contacts, timeline
-        )
-        deadlines = self.deadline_intel.analyze_deadlines(
-            case_data_enriched, timeline, calendar_events
-        )
-        comm_health = self.comm_scorer.score_communication_health(
-            str(case_id), emails, calls, contacts
-        )
+        case = snapshot.case
+        with _stage(timings, "risk"):
+            risk = self.case_analyzer.assess_risk(
+                case, snapshot.contacts, snapshot.timeline, snapshot.documents
+            )
+        with _stage(timings, "completeness"):
+            completeness = self.case_analyzer.analyze_completeness(
+                case, snapshot.contacts, snapshot.documents
+            )
+        with _stage(timings, "health"):
+            health = self.case_analyzer.calculate_case_health(
+                case, snapshot.contacts, snapshot.timeline, snapshot.time_entries
+            )
+        with _stage(timings, "strategy"):
+            strategies = self.case_analyzer.suggest_strategy(
+                case, snapshot.contacts, snapshot.timeline
+            )
+        with _stage(timings, "deadlines"):
+            deadlines = self.deadline_intel.analyze_deadlines(
+                case, snapshot.timeline, snapshot.calendar_events
+            )
+        with _stage(timings, "communication"):
+            comm_health = self.comm_scorer.score_communication_health(
+                str(case_id), snapshot.emails, snapshot.calls, snapshot.contacts
+            )
 
         return CaseAnalysis(
             case_id=str(case_id),
-            case_reference=case_data.get("reference", ""),
+            case_reference=case.get("reference", ""),
             risk_assessment=risk,
             completeness=completeness,
             health=health,
@@ -229,6 +280,75 @@ class BrainOrchestrator:
             deadline_analysis=deadlines,
             communication_health=comm_health,
             generated_at=datetime.utcnow().isoformat(),
+            stage_timings_ms=timings,
+        )
+
+    async def _load_snapshot(
+        self,
+        session: AsyncSession,
+        case_id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        timings: dict[str, float],
+    ) -> CaseSnapshot | None:
+        """Fetch a case and all its datasets; None if the case does not exist.
+
+        The case itself is read on the caller's session while the seven
+        datasets are fetched concurrently, each on a pooled tenant session,
+        at most BRAIN_FETCH_CONCURRENCY at a time per call and at most
+        BRAIN_FETCH_POOL_SLOTS at a time across the process. Each fetch's
+        duration is recorded in ``timings`` (``fetch`` is the wall time of
+        them all).
+
+        Concurrent fetches run in separate transactions, so the snapshot is
+        not transactionally consistent: a row committed mid-fetch can show up
+        in one dataset and not in another. That is acceptable for advisory
+        scoring; set BRAIN_FETCH_CONCURRENCY=1 to read everything on the
+        caller's session instead.
+        """
+        fetchers = {
+            "contacts": self._fetch_contacts,
+            "documents": self._fetch_documents,
+            "timeline": self._fetch_timeline,
+            "time_entries": self._fetch_time_entries,
+            "calendar_events": self._fetch_calendar_events,
+            "emails": self._fetch_emails,
+            "calls": self._fetch_calls,
+        }
+
+        async def timed(name: str, fetch: Any, db: AsyncSession) -> Any:
+            with _stage(timings, name):
+                return await fetch(db, case_id, tenant_id)
+
+        with _stage(timings, "fetch"):
+            if self._fetch_concurrency <= 1:
+                case_data = await timed("case", self._fetch_case, session)
+                if case_data is None:
+                    return None
+                data = {
+                    name: await timed(name, fetch, session)
+                    for name, fetch in fetchers.items()
+                }
+            else:
+                semaphore = asyncio.Semaphore(self._fetch_concurrency)
+                pool_slots = _get_pool_slots()
+
+                async def pooled(name: str, fetch: Any) -> Any:
+                    async with semaphore, pool_slots:
+                        async with self._session_factory(tenant_id) as db:
+                            return await timed(name, fetch, db)
+
+                case_data, *values = await asyncio.gather(
+                    timed("case", self._fetch_case, session),
+                    *(pooled(name, fetch) for name, fetch in fetchers.items()),
+                )
+                if case_data is None:
+                    return None
+                data = dict(zip(fetchers, values))
+
+        case_enriched = self._enrich_case_with_billing(case_data, data["time_entries"])
+        return CaseSnapshot(
+            case=MappingProxyType(case_enriched),
+            **{name: tuple(rows) for name, rows in data.items()},
         )
 
     # ------------------------------------------------------------------
@@ -254,20 +374,20 @@ class BrainOrchestrator:
         Returns:
             List of InsightResult sorted by severity.
         """
-        case_data = await self._fetch_case(session, case_id, tenant_id)
-        if case_data is None:
+        snapshot = await self._load_snapshot(session, case_id, tenant_id, {})
+        if snapshot is None:
             return []
 
-        contacts = await self._fetch_contacts(session, case_id, tenant_id)
-        documents = await self._fetch_documents(session, case_id, tenant_id)
-        timeline = await self._fetch_timeline(session, case_id, tenant_id)
-        time_entries = await self._fetch_time_entries(session, case_id, tenant_id)
-        emails = await self._fetch_emails(session, case_id, tenant_id)
-        calls = await self._fetch_calls(session, case_id, tenant_id)
+        case_data_enriched = snapshot.case
+        contacts = snapshot.contacts
+        documents = snapshot.documents
+        timeline = snapshot.timeline
+        time_entries = snapshot.time_entries
+        emails = snapshot.emails
+        calls = snapshot.calls
 
-        case_ref = case_data.get("reference", "")
+        case_ref = case_data_enriched.get("reference", "")
         case_id_str = str(case_id)
-        case_data_enriched = self._enrich_case_with_billing(case_data, time_entries)
 
         insights: list[InsightResult] = []
 
@@ -641,32 +761,46 @@ class BrainOrchestrator:
         """
         today = date.today()
 
-        # Fetch active cases
+        # Fetch active cases, then their datasets in one query each
         active_cases = await self._fetch_active_cases(session, tenant_id)
         total_active = len(active_cases)
+        case_uuids = [
+            c["id"] if isinstance(c["id"], uuid.UUID) else uuid.UUID(str(c["id"]))
+            for c in active_cases
+            if c.get("id") is not None
+        ]
+        datasets = await load_case_datasets(session, case_uuids, tenant_id)
 
-        # Risk distribution — analyze each case
-        risk_dist: dict[str, int] = {"low": 0, "medium": 0, "high": 0, "critical": 0}
-        all_deadlines: list[dict[str, Any]] = []
-        revenue_at_risk = 0
-
+        snapshots: dict[uuid.UUID, CaseSnapshot] = {}
         for case_data in active_cases:
             cid = case_data.get("id")
             if cid is None:
                 continue
             case_uuid = uuid.UUID(str(cid)) if not isinstance(cid, uuid.UUID) else cid
+            dataset = datasets[case_uuid]
+            snapshots[case_uuid] = CaseSnapshot(
+                case=self._enrich_case_with_billing(case_data, dataset.time_entries),
+                contacts=tuple(dataset.contacts),
+                documents=tuple(dataset.documents),
+                timeline=tuple(dataset.timeline),
+                time_entries=tuple(dataset.time_entries),
+            )
 
-            contacts = await self._fetch_contacts(session, case_uuid, tenant_id)
-            timeline = await self._fetch_timeline(session, case_uuid, tenant_id)
-            documents = await self._fetch_documents(session, case_uuid, tenant_id)
-            time_entries = await self._fetch_time_entries(session, case_uuid, tenant_id)
+        # Risk assessment of all cases at once
+        risks = self.case_analyzer.assess_risk_batch(
+            CaseColumns.from_cases(list(snapshots.values())), today
+        )
 
-            case_enriched = self._enrich_case_with_billing(case_data, time_entries)
+        # Risk distribution
+        risk_dist: dict[str, int] = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+        all_deadlines: list[dict[str, Any]] = []
+        revenue_at_risk = 0
+
+        for (case_uuid, snapshot), risk in zip(snapshots.items(), risks):
+            case_data = snapshot.case
+            timeline = snapshot.timeline
+            time_entries = snapshot.time_entries
 
-            # Risk assessment
-            risk = self.case_analyzer.assess_risk(
-                case_enriched, contacts, timeline, documents
-            )
             risk_dist[risk.level] = risk_dist.get(risk.level, 0) + 1
 
             # Collect deadlines for workload prediction
@@ -949,19 +1083,7 @@ class BrainOrchestrator:
                 CaseContact.tenant_id == tenant_id,
             )
         )
-        rows = result.all()
-        return [
-            {
-                "id": contact.id,
-                "contact_id": contact.id,
-                "full_name": contact.full_name,
-                "email": contact.email,
-                "phone_e164": contact.phone_e164,
-                "type": contact.type,
-                "role": role,
-            }
-            for contact, role in rows
-        ]
+        return [contact_to_dict(contact, role) for contact, role in result.all()]
 
     @staticmethod
     async def _fetch_documents(
@@ -981,19 +1103,7 @@ class BrainOrchestrator:
                 CloudDocument.tenant_id == tenant_id,
             )
         )
-        rows = result.all()
-        return [
-            {
-                "id": doc.id,
-                "name": doc.name,
-                "mime_type": doc.mime_type,
-                "provider": doc.provider,
-                "link_type": link_type,
-                "is_indexed": doc.is_indexed,
-                "size_bytes": doc.size_bytes,
-            }
-            for doc, link_type in rows
-        ]
+        return [document_to_dict(doc, link_type) for doc, link_type in result.all()]
 
     @staticmethod
     async def _fetch_timeline(
@@ -1010,23 +1120,7 @@ class BrainOrchestrator:
             )
             .order_by(TimelineEvent.event_date.asc())
         )
-        events = result.scalars().all()
-        return [
-            {
-                "id": ev.id,
-                "event_date": ev.event_date,
-                "event_time": ev.event_time,
-                "category": ev.category,
-                "title": ev.title,
-                "description": ev.description,
-                "actors": ev.actors,
-                "source_type": ev.source_type,
-                "confidence_score": ev.confidence_score,
-                "is_validated": ev.is_validated,
-                "is_key_event": ev.is_key_event,
-            }
-            for ev in events
-        ]
+        return [timeline_event_to_dict(ev) for ev in result.scalars().all()]
 
     @staticmethod
     async def _fetch_time_entries(
@@ -1043,20 +1137,7 @@ class BrainOrchestrator:
             )
             .order_by(TimeEntry.date.desc())
         )
-        entries = result.scalars().all()
-        return [
-            {
-                "id": entry.id,
-                "date": entry.date,
-                "duration_minutes": entry.duration_minutes,
-                "billable": entry.billable,
-                "status": entry.status,
-                "source": entry.source,
-                "hourly_rate_cents": entry.hourly_rate_cents,
-                "description": entry.description,
-            }
-            for entry in entries
-        ]
+        return [time_entry_to_dict(entry) for entry in result.scalars().all()]
 
     @staticmethod
     async def _fetch_calendar_events(
@@ -0,0 +1,659 @@
+"""Tenant Brain summaries — precomputed dashboard aggregates per tenant.
+
+GET /brain/summary and GET /dashboard/intelligence used to aggregate every
+case, deadline, insight and action of the tenant on the request path. Both
+payloads are now stored per tenant in brain_summary_snapshots:
+
+- an ``after_flush`` hook queues an invalidation of the tenant's summary
+  when a row it depends on is written through the ORM (the case score
+  inputs, brain insights and actions). It only inserts into
+  brain_summary_invalidations, once per tenant and transaction: writers
+  never update or lock the shared snapshot row;
+- a summary is stale while its tenant has queued invalidations or once
+  older than BRAIN_SUMMARY_MAX_AGE (deadlines and workload move with the
+  clock). A refresh deletes the invalidations it has seen in the
+  transaction that stores the new payloads; those committed meanwhile stay
+  queued, so the summary stays stale;
+- the endpoints read the stored payloads and recompute them on read when
+  missing or stale; admins can force a recomputation;
+- the precompute_brain_summaries worker task recomputes the stale
+  summaries, refreshing stale case snapshots first, and creates the missing
+  ones of tenants with active cases, so that reads rarely compute;
+- every recomputation pushes a ``brain_summary_updated`` event to the
+  tenant's SSE subscribers. Workers run in other processes than the SSE
+  connections, so events go through a Redis channel (REDIS_URL) that each
+  API process relays to its sse_manager; without Redis, events are
+  delivered in-process only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import delete, exists, func, inspect, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from apps.api.schemas.brain import (
+    ActionSuggestionResponse,
+    BrainSummaryResponse,
+    DeadlineResponse,
+    InsightResponse,
+    WorkloadWeek,
+)
+from apps.api.services.brain.case_scores import deadline_urgency
+from apps.api.services.brain.case_snapshots import (
+    ACTIVE_CASE_STATUSES,
+    load_case_intelligence,
+)
+from apps.api.services.sse_service import sse_manager
+from packages.db.models.brain_action import BrainAction
+from packages.db.models.brain_insight import BrainInsight
+from packages.db.models.brain_summary_invalidation import BrainSummaryInvalidation
+from packages.db.models.brain_summary_snapshot import BrainSummarySnapshot
+from packages.db.models.calendar_event import CalendarEvent
+from packages.db.models.call_record import CallRecord
+from packages.db.models.case import Case
+from packages.db.models.case_contact import CaseContact
+from packages.db.models.document_case_link import DocumentCaseLink
+from packages.db.models.email_message import EmailMessage
+from packages.db.models.email_thread import EmailThread
+from packages.db.models.evidence_link import EvidenceLink
+from packages.db.models.interaction_event import InteractionEvent
+from packages.db.models.invoice import Invoice
+from packages.db.models.time_entry import TimeEntry
+from packages.db.models.timeline_event import TimelineEvent
+from packages.db.session import get_superadmin_session, get_tenant_session
+
+logger = logging.getLogger(__name__)
+
+BRAIN_SUMMARY_MAX_AGE = int(os.getenv("BRAIN_SUMMARY_MAX_AGE", "900"))
+BRAIN_SUMMARY_DAYS_AHEAD = 14  # deadline horizon of the stored summary
+BRAIN_SUMMARY_REDIS_URL = os.getenv("REDIS_URL")
+BRAIN_SUMMARY_CHANNEL = "lexibel:brain_summary_updated"
+BRAIN_SUMMARY_EVENT = "brain_summary_updated"
+
+_invalidations = BrainSummaryInvalidation.__table__
+
+# session.info key: tenants already invalidated by the current transaction
+_QUEUED_TENANTS = "brain_summary_invalidated_tenants"
+
+
+@dataclass
+class StoredSummary:
+    """Stored payloads of a tenant and their freshness."""
+
+    summary: BrainSummaryResponse
+    dashboard: dict[str, Any]
+    generated_at: datetime
+    stale: bool = False
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Computation
+# ---------------------------------------------------------------------------
+
+
+async def compute_brain_summary(
+    session: AsyncSession,
+    tenant_id: uuid.UUID,
+    days_ahead: int = BRAIN_SUMMARY_DAYS_AHEAD,
+    refresh_stale: bool = False,
+) -> BrainSummaryResponse:
+    """Intelligence summary across all cases of a tenant.
+
+    Case risks come from the case snapshots; with refresh_stale, stale
+    snapshots are recomputed first instead of being served as they are.
+    """
+    now = datetime.now(timezone.utc)
+
+    # Total active cases
+    total_active = await session.scalar(
+        select(func.count(Case.id))
+        .where(Case.tenant_id == tenant_id)
+        .where(Case.status.in_(ACTIVE_CASE_STATUSES))
+    )
+
+    # Pending brain actions
+    pending_actions_rows = (
+        (
+            await session.execute(
+                select(BrainAction)
+                .where(BrainAction.tenant_id == tenant_id)
+                .where(BrainAction.status == "pending")
+                .order_by(
+                    func.case(
+                        (BrainAction.priority == "critical", 1),
+                        (BrainAction.priority == "urgent", 2),
+                        else_=3,
+                    )
+                )
+                .limit(20)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    pending_actions = [
+        ActionSuggestionResponse(
+            action_type=a.action_type,
+            title=a.action_data.get("title", a.action_type),
+            description=a.action_data.get("description", ""),
+            priority=a.priority,
+            confidence=a.confidence_score,
+            trigger_source=a.trigger_source,
+            generated_content=a.generated_content,
+        )
+        for a in pending_actions_rows
+    ]
+
+    # Recent insights (not dismissed)
+    recent_insights_rows = (
+        (
+            await session.execute(
+                select(BrainInsight)
+                .where(BrainInsight.tenant_id == tenant_id)
+                .where(BrainInsight.dismissed.is_(False))
+                .order_by(BrainInsight.created_at.desc())
+                .limit(20)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    recent_insights = [
+        InsightResponse(
+            id=str(i.id),
+            insight_type=i.insight_type,
+            severity=i.severity,
+            title=i.title,
+            description=i.description,
+            suggested_actions=list(i.suggested_actions) if i.suggested_actions else [],
+            case_id=str(i.case_id),
+            dismissed=i.dismissed,
+        )
+        for i in recent_insights_rows
+    ]
+
+    # Critical deadlines (calendar events in the next N days)
+    deadline_rows = (
+        await session.execute(
+            select(CalendarEvent, Case.title.label("case_title"))
+            .outerjoin(Case, Case.id == CalendarEvent.case_id)
+            .where(CalendarEvent.tenant_id == tenant_id)
+            .where(CalendarEvent.start_time >= now)
+            .where(CalendarEvent.start_time <= now + timedelta(days=days_ahead))
+            .order_by(CalendarEvent.start_time.asc())
+            .limit(30)
+        )
+    ).all()
+
+    critical_deadlines = [
+        DeadlineResponse(
+            title=event.title,
+            date=event.start_time.isoformat(),
+            days_remaining=max(0, (event.start_time - now).days),
+            urgency=deadline_urgency((event.start_time - now).days),
+            case_id=str(event.case_id) if event.case_id else None,
+            case_title=case_title,
+        )
+        for event, case_title in deadline_rows
+    ]
+
+    # Risk distribution across active cases
+    active_cases = (
+        (
+            await session.execute(
+                select(Case)
+                .where(Case.tenant_id == tenant_id)
+                .where(Case.status.in_(ACTIVE_CASE_STATUSES))
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    risk_dist = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+    cases_needing_attention = []
+
+    # Scores come from the case snapshots
+    intelligence = await load_case_intelligence(
+        session, active_cases, tenant_id, refresh_stale=refresh_stale
+    )
+    for case in active_cases:
+        risk = intelligence[case.id].risk
+        risk_dist[risk.level] = risk_dist.get(risk.level, 0) + 1
+
+        if risk.level in ("high", "critical"):
+            cases_needing_attention.append(
+                {
+                    "case_id": str(case.id),
+                    "title": case.title,
+                    "reason": f"Risque {risk.level} ({risk.overall_score}/100)",
+                    "urgency": risk.level,
+                }
+            )
+
+    # Workload next weeks
+    workload_weeks = []
+    for week_offset in range(4):
+        week_start = now + timedelta(weeks=week_offset)
+        week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Adjust to Monday
+        week_start = week_start - timedelta(days=week_start.weekday())
+        week_end = week_start + timedelta(days=6)
+
+        week_deadlines = await session.scalar(
+            select(func.count(CalendarEvent.id))
+            .where(CalendarEvent.tenant_id == tenant_id)
+            .where(CalendarEvent.start_time >= week_start)
+            .where(CalendarEvent.start_time <= week_end)
+        )
+
+        week_cases = await session.scalar(
+            select(func.count(func.distinct(CalendarEvent.case_id)))
+            .where(CalendarEvent.tenant_id == tenant_id)
+            .where(CalendarEvent.case_id.isnot(None))
+            .where(CalendarEvent.start_time >= week_start)
+            .where(CalendarEvent.start_time <= week_end)
+        )
+
+        estimated_hours = (week_deadlines or 0) * 2.0  # Estimate 2h per event
+        workload_weeks.append(
+            WorkloadWeek(
+                week_start=week_start.date().isoformat(),
+                week_end=week_end.date().isoformat(),
+                deadline_count=week_deadlines or 0,
+                cases_count=week_cases or 0,
+                estimated_hours=estimated_hours,
+                overload=estimated_hours > 40,
+            )
+        )
+
+    # Aggregate stats
+    total_insights = await session.scalar(
+        select(func.count(BrainInsight.id))
+        .where(BrainInsight.tenant_id == tenant_id)
+        .where(BrainInsight.dismissed.is_(False))
+    )
+    total_pending_actions = await session.scalar(
+        select(func.count(BrainAction.id))
+        .where(BrainAction.tenant_id == tenant_id)
+        .where(BrainAction.status == "pending")
+    )
+
+    stats = {
+        "total_insights": total_insights or 0,
+        "total_pending_actions": total_pending_actions or 0,
+        "cases_at_risk": risk_dist.get("high", 0) + risk_dist.get("critical", 0),
+        "deadlines_this_period": len(critical_deadlines),
+    }
+
+    return BrainSummaryResponse(
+        total_active_cases=total_active or 0,
+        risk_distribution=risk_dist,
+        critical_deadlines=critical_deadlines,
+        pending_actions=pending_actions,
+        recent_insights=recent_insights,
+        workload_next_weeks=workload_weeks,
+        cases_needing_attention=cases_needing_attention,
+        stats=stats,
+        generated_at=min((i.generated_at for i in intelligence.values()), default=None),
+        stale_cases=sum(i.stale for i in intelligence.values()),
+    )
+
+
+async def compute_dashboard_intelligence(
+    session: AsyncSession, tenant_id: uuid.UUID
+) -> dict[str, Any]:
+    """Quick brain intelligence data for the dashboard (JSON-ready)."""
+    now = datetime.now(timezone.utc)
+
+    # Critical insights count (high + critical, not dismissed)
+    critical_insights_count = await session.scalar(
+        select(func.count(BrainInsight.id))
+        .where(BrainInsight.tenant_id == tenant_id)
+        .where(BrainInsight.dismissed.is_(False))
+        .where(BrainInsight.severity.in_(["high", "critical"]))
+    )
+
+    # Pending actions count
+    pending_actions_count = await session.scalar(
+        select(func.count(BrainAction.id))
+        .where(BrainAction.tenant_id == tenant_id)
+        .where(BrainAction.status == "pending")
+    )
+
+    # Cases at risk (cases with high/critical insights)
+    cases_at_risk_count = await session.scalar(
+        select(func.count(func.distinct(BrainInsight.case_id)))
+        .where(BrainInsight.tenant_id == tenant_id)
+        .where(BrainInsight.dismissed.is_(False))
+        .where(BrainInsight.severity.in_(["high", "critical"]))
+    )
+
+    # Upcoming deadlines (next 7 days)
+    deadline_rows = (
+        await session.execute(
+            select(CalendarEvent, Case.title.label("case_title"))
+            .outerjoin(Case, Case.id == CalendarEvent.case_id)
+            .where(CalendarEvent.tenant_id == tenant_id)
+            .where(CalendarEvent.start_time >= now)
+            .where(CalendarEvent.start_time <= now + timedelta(days=7))
+            .order_by(CalendarEvent.start_time.asc())
+            .limit(10)
+        )
+    ).all()
+
+    upcoming_deadlines = [
+        {
+            "title": event.title,
+            "date": event.start_time.isoformat(),
+            "days_remaining": max(0, (event.start_time - now).days),
+            "case_id": str(event.case_id) if event.case_id else None,
+            "case_title": case_title,
+        }
+        for event, case_title in deadline_rows
+    ]
+
+    # Recent brain actions (last 5)
+    recent_actions_rows = (
+        (
+            await session.execute(
+                select(BrainAction)
+                .where(BrainAction.tenant_id == tenant_id)
+                .order_by(BrainAction.created_at.desc())
+                .limit(5)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    recent_brain_actions = [
+        {
+            "id": str(a.id),
+            "case_id": str(a.case_id),
+            "action_type": a.action_type,
+            "priority": a.priority,
+            "status": a.status,
+            "created_at": a.created_at.isoformat(),
+        }
+        for a in recent_actions_rows
+    ]
+
+    return {
+        "critical_insights_count": critical_insights_count or 0,
+        "pending_actions_count": pending_actions_count or 0,
+        "cases_at_risk_count": cases_at_risk_count or 0,
+        "upcoming_deadlines": upcoming_deadlines,
+        "recent_brain_actions": recent_brain_actions,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+# Rows the stored payloads depend on (the case score inputs, insights, actions)
+_SUMMARY_MODELS = (
+    BrainAction,
+    BrainInsight,
+    CalendarEvent,
+    CallRecord,
+    Case,
+    CaseContact,
+    DocumentCaseLink,
+    EmailMessage,
+    EmailThread,
+    EvidenceLink,
+    InteractionEvent,
+    Invoice,
+    TimeEntry,
+    TimelineEvent,
+)
+
+
+def summary_tenants(objects: Iterable[Any]) -> set[uuid.UUID]:
+    """Tenants whose summaries depend on some of objects."""
+    tenant_ids = {
+        inspect(obj).dict.get("tenant_id")
+        for obj in objects
+        if isinstance(obj, _SUMMARY_MODELS)
+    }
+    tenant_ids.discard(None)
+    return tenant_ids
+
+
+def invalidation_statement(tenant_ids: Iterable[uuid.UUID]) -> Any:
+    """INSERT queueing an invalidation of the tenants' summaries."""
+    return insert(_invalidations).values(
+        [{"tenant_id": tenant_id} for tenant_id in sorted(tenant_ids, key=str)]
+    )
+
+
+def _invalidate_after_flush(session: Session, flush_context: Any) -> None:
+    # new / dirty / deleted still hold the pre-flush state here
+    changed = chain(
+        session.new,
+        (obj for obj in session.dirty if session.is_modified(obj)),
+        session.deleted,
+    )
+    queued = session.info.setdefault(_QUEUED_TENANTS, set())
+    tenant_ids = summary_tenants(changed) - queued
+    if tenant_ids:
+        session.connection().execute(invalidation_statement(tenant_ids))
+        queued |= tenant_ids
+
+
+def _forget_queued(session: Session, transaction: Any) -> None:
+    # Also on savepoint ends: a rolled back savepoint drops its inserts
+    session.info.pop(_QUEUED_TENANTS, None)
+
+
+def register_summary_hooks() -> None:
+    """Queue summary invalidations on ORM writes (idempotent; call at startup)."""
+    if not sa_event.contains(Session, "after_flush", _invalidate_after_flush):
+        sa_event.listen(Session, "after_flush", _invalidate_after_flush)
+    if not sa_event.contains(Session, "after_transaction_end", _forget_queued):
+        sa_event.listen(Session, "after_transaction_end", _forget_queued)
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def is_stale(
+    snapshot: BrainSummarySnapshot, invalidated: bool, now: datetime | None = None
+) -> bool:
+    """True if the summary has queued invalidations or is older than
+    BRAIN_SUMMARY_MAX_AGE."""
+    now = now or _utcnow()
+    return invalidated or snapshot.generated_at < now - timedelta(
+        seconds=BRAIN_SUMMARY_MAX_AGE
+    )
+
+
+async def get_stored_summary(
+    session: AsyncSession, tenant_id: uuid.UUID
+) -> Optional[StoredSummary]:
+    """Stored payloads of a tenant, None if not computed yet."""
+    row = (
+        await session.execute(
+            select(
+                BrainSummarySnapshot,
+                exists().where(BrainSummaryInvalidation.tenant_id == tenant_id),
+            ).where(BrainSummarySnapshot.tenant_id == tenant_id)
+        )
+    ).first()
+    if row is None:
+        return None
+    snapshot, invalidated = row
+    stale = is_stale(snapshot, invalidated)
+    summary = BrainSummaryResponse.model_validate({**snapshot.summary, "stale": stale})
+    return StoredSummary(summary, snapshot.dashboard, snapshot.generated_at, stale)
+
+
+async def refresh_tenant_summary(
+    session: AsyncSession,
+    tenant_id: uuid.UUID,
+    refresh_stale: bool = False,
+) -> StoredSummary:
+    """Compute both payloads of a tenant and upsert them.
+
+    The invalidations visible when the refresh starts are deleted in the
+    same transaction; those committed meanwhile stay queued. The caller
+    publishes the update once its transaction is committed.
+    """
+    await session.execute(
+        delete(BrainSummaryInvalidation).where(
+            BrainSummaryInvalidation.tenant_id == tenant_id
+        )
+    )
+    summary = await compute_brain_summary(
+        session, tenant_id, refresh_stale=refresh_stale
+    )
+    dashboard = await compute_dashboard_intelligence(session, tenant_id)
+    generated_at = _utcnow()
+
+    payloads = {
+        "summary": summary.model_dump(mode="json", exclude={"stale"}),
+        "dashboard": dashboard,
+        "generated_at": generated_at,
+    }
+    await session.execute(
+        insert(BrainSummarySnapshot)
+        .values(tenant_id=tenant_id, **payloads)
+        .on_conflict_do_update(index_elements=["tenant_id"], set_=payloads)
+    )
+    return StoredSummary(summary, dashboard, generated_at)
+
+
+async def read_tenant_summary(
+    session: AsyncSession, tenant_id: uuid.UUID, refresh: bool = False
+) -> tuple[StoredSummary, bool]:
+    """Stored payloads of a tenant, computed inline only if missing.
+
+    Stale payloads are served as-is (flagged ``stale``); the precompute
+    task refreshes them. A forced refresh (admins) recomputes inline,
+    including the stale case snapshots. Returns the payloads and whether
+    they were recomputed (to be published once the transaction is
+    committed).
+    """
+    stored = await get_stored_summary(session, tenant_id)
+    if stored is not None and not refresh:
+        return stored, False
+    stored = await refresh_tenant_summary(session, tenant_id, refresh_stale=refresh)
+    return stored, True
+
+
+async def precompute_due_summaries() -> int:
+    """Recompute stale and missing summaries (all tenants).
+
+    Each tenant is refreshed in its own RLS-scoped transaction and notified
+    once it is committed. Returns the number of summaries refreshed.
+    """
+    cutoff = _utcnow() - timedelta(seconds=BRAIN_SUMMARY_MAX_AGE)
+    due_tenants = union(
+        select(BrainSummaryInvalidation.tenant_id),
+        select(BrainSummarySnapshot.tenant_id).where(
+            BrainSummarySnapshot.generated_at < cutoff
+        ),
+        select(Case.tenant_id)
+        .outerjoin(
+            BrainSummarySnapshot,
+            BrainSummarySnapshot.tenant_id == Case.tenant_id,
+        )
+        .where(BrainSummarySnapshot.id.is_(None))
+        .where(Case.status.in_(ACTIVE_CASE_STATUSES)),
+    )
+    async with get_superadmin_session() as session:
+        due = (await session.execute(due_tenants)).scalars().all()
+
+    refreshed = 0
+    for tenant_id in due:
+        try:
+            async with get_tenant_session(tenant_id) as session:
+                stored = await refresh_tenant_summary(
+                    session, tenant_id, refresh_stale=True
+                )
+        except Exception as e:
+            logger.error("Summary precompute failed for tenant %s: %s", tenant_id, e)
+            continue
+        await publish_summary_updated(tenant_id, stored.generated_at)
+        refreshed += 1
+    return refreshed
+
+
+# ---------------------------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------------------------
+
+
+def _redis_client() -> Optional[Any]:
+    if not BRAIN_SUMMARY_REDIS_URL:
+        return None
+    import redis.asyncio as aioredis
+
+    return aioredis.from_url(BRAIN_SUMMARY_REDIS_URL, decode_responses=True)
+
+
+async def publish_summary_updated(tenant_id: uuid.UUID, generated_at: datetime) -> None:
+    """Push brain_summary_updated to the tenant's SSE subscribers."""
+    data = {"tenant_id": str(tenant_id), "generated_at": generated_at.isoformat()}
+    redis = _redis_client()
+    if redis is not None:
+        try:
+            await redis.publish(BRAIN_SUMMARY_CHANNEL, json.dumps(data))
+            return
+        except Exception as e:
+            logger.warning("Brain summary event not published to Redis: %s", e)
+        finally:
+            await redis.aclose()
+    await sse_manager.publish(tenant_id, BRAIN_SUMMARY_EVENT, data)
+
+
+async def relay_summary_events() -> None:
+    """Forward Redis brain summary events to this process's SSE subscribers.
+
+    Runs for the lifetime of the API process (no-op without REDIS_URL);
+    reconnects after Redis errors.
+    """
+    while True:
+        redis = _redis_client()
+        if redis is None:
+            return
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(BRAIN_SUMMARY_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    await sse_manager.publish(
+                        uuid.UUID(data["tenant_id"]), BRAIN_SUMMARY_EVENT, data
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Brain summary relay interrupted: %s", e)
+            await asyncio.sleep(5)
+        finally:
+            await redis.aclose()
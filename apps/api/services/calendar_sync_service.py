@@ -6,15 +6,17 @@ Syncs calendar events to calendar_events table.
 from datetime import datetime
 from uuid import UUID, uuid4
 
-import httpx
 from googleapiclient.discovery import build
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.models.calendar_event import CalendarEvent
+from apps.api.services.http_client import pooled_client
 from apps.api.services.google_oauth_service import get_google_oauth_service
 from apps.api.services.microsoft_oauth_service import get_microsoft_oauth_service
 
+GRAPH_EVENTS_URL = "https://graph.microsoft.com/v1.0/me/events"
+
 
 class CalendarSyncService:
     """Calendar synchronization service for Google and Microsoft."""
@@ -149,9 +151,9 @@ class CalendarSyncService:
             "$filter": f"start/dateTime ge '{datetime.utcnow().isoformat()}Z'",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with pooled_client(GRAPH_EVENTS_URL, timeout=30.0) as client:
             response = await client.get(
-                "https://graph.microsoft.com/v1.0/me/events",
+                GRAPH_EVENTS_URL,
                 headers=headers,
                 params=params,
             )
@@ -2,15 +2,28 @@
 
 Supports PDF (pdfplumber), DOCX (python-docx), and plain text.
 Sliding window: max 512 tokens, 64 token overlap.
+
+Large documents are processed as a stream: pages -> chunks -> embedding
+batches. PDF pages are extracted in parallel on a process pool, so memory
+stays bounded by the prefetch window and the embedding batch size.
 """
 
+import bisect
 import io
+import itertools
+import multiprocessing
+import os
+import re
+import tempfile
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 
 import tiktoken
 
+from apps.api.services.embedding_service import get_embedding_engine
+
 
 @dataclass
 class Chunk:
@@ -24,6 +37,7 @@ class Chunk:
     document_id: Optional[str] = None
     evidence_link_id: Optional[str] = None
     tenant_id: Optional[str] = None
+    token_count: int = 0
     metadata: dict = field(default_factory=dict)
 
 
@@ -44,7 +58,97 @@ def _get_encoder() -> tiktoken.Encoding:
 
 def count_tokens(text: str) -> int:
     """Count tokens using tiktoken cl100k_base."""
-    return len(_get_encoder().encode(text))
+    return len(_get_encoder().encode_ordinary(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """First max_tokens tokens of text, cut on a character boundary."""
+    enc = _get_encoder()
+    tokens = enc.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode_bytes(tokens[: max(0, max_tokens)]).decode(
+        "utf-8", errors="ignore"
+    )
+
+
+# Preferred chunk ends, strongest first: paragraph breaks, then sentence
+# ends (punctuation followed by a capitalised word or a line break, so
+# "art. 1382" or "n. 5" do not count). Matched on UTF-8 bytes.
+_PARAGRAPH_RE = re.compile(rb"\n[ \t]*\n")
+_SENTENCE_RE = re.compile(
+    rb"[.!?][\"')\]]?(?=[ \t]*\n|\s+(?:[A-Z\"(]|\xc3[\x80-\x9e]))"
+)
+
+
+def _snap_end(data: bytes, lo: int, hi: int) -> int:
+    """Last paragraph or sentence boundary in data[lo:hi], or hi if none.
+
+    The boundary is placed before the whitespace that follows it, which
+    tokenizers usually attach to the next token.
+    """
+    last = None
+    for last in _PARAGRAPH_RE.finditer(data, lo, hi):
+        pass
+    if last is not None:
+        return last.start()
+    for last in _SENTENCE_RE.finditer(data, lo, hi):
+        pass
+    if last is not None:
+        return last.end()
+    return hi
+
+
+def _token_windows(
+    text: str,
+    max_tokens: int = MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+) -> list[tuple[str, int]]:
+    """Split text into overlapping windows of at most max_tokens tokens.
+
+    The text is encoded once. Window edges are tracked as byte offsets into
+    the UTF-8 text, from a prefix sum of the tokens' byte lengths built in
+    one pass, so chunk text is a plain slice and no token is decoded twice.
+    Each window ends on the last paragraph or sentence boundary in its
+    second half when there is one.
+
+    Returns [(chunk_text, token_count), ...].
+    """
+    enc = _get_encoder()
+    # Documents are data: "<|endoftext|>" in a filing is plain text, and
+    # skipping the special-token scan makes encoding markedly faster.
+    tokens = enc.encode_ordinary(text)
+    n_tokens = len(tokens)
+    if n_tokens <= max_tokens:
+        return [(text, n_tokens)]
+
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+    data = text.encode("utf-8")
+    # offsets[i] = byte offset of token i; offsets[n_tokens] = len(data)
+    offsets = [
+        0,
+        *itertools.accumulate(len(enc.decode_single_token_bytes(t)) for t in tokens),
+    ]
+
+    windows: list[tuple[str, int]] = []
+    start = 0
+    while start < n_tokens:
+        end = min(start + max_tokens, n_tokens)
+        if end < n_tokens:
+            floor = max(start + max_tokens // 2, start + 1)
+            boundary = _snap_end(data, offsets[floor], offsets[end])
+            # Drop trailing tokens that start at or after the boundary
+            end = bisect.bisect_left(offsets, boundary, floor, end)
+
+        chunk = data[offsets[start] : offsets[end]].decode("utf-8", errors="ignore")
+        chunk = chunk.strip()
+        if chunk:
+            windows.append((chunk, end - start))
+        if end >= n_tokens:
+            break
+        start = max(end - overlap_tokens, start + 1)
+
+    return windows
 
 
 def _split_text_into_chunks(
@@ -53,41 +157,116 @@ def _split_text_into_chunks(
     overlap_tokens: int = OVERLAP_TOKENS,
 ) -> list[str]:
     """Split text into overlapping token windows."""
-    enc = _get_encoder()
-    tokens = enc.encode(text)
+    return [chunk for chunk, _ in _token_windows(text, max_tokens, overlap_tokens)]
 
-    if len(tokens) <= max_tokens:
-        return [text]
 
-    chunks: list[str] = []
-    start = 0
-    while start < len(tokens):
-        end = min(start + max_tokens, len(tokens))
-        chunk_tokens = tokens[start:end]
-        chunks.append(enc.decode(chunk_tokens))
-        if end >= len(tokens):
-            break
-        start += max_tokens - overlap_tokens
+# PDF extraction: page ranges handed to each worker, and the page count
+# below which a document is extracted in-process.
+PDF_PAGES_PER_TASK = 16
+PDF_PARALLEL_MIN_PAGES = 32
+PDF_EXTRACT_WORKERS = int(
+    os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
 
-    return chunks
+# Chunks per embedding call / vector upsert when streaming
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        # The API process runs threads (embedding batcher, compute executor,
+        # torch): forking it could copy a held lock into the workers
+        _page_pool = ProcessPoolExecutor(
+            max_workers=PDF_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _page_pool
 
-def extract_text_from_pdf(content: bytes) -> list[tuple[str, int]]:
-    """Extract text per page from PDF bytes. Returns [(text, page_num), ...]."""
-    try:
-        import pdfplumber
-    except ImportError:
-        raise ImportError("pdfplumber is required for PDF processing")
+
+def shutdown_page_pool() -> None:
+    """Stop the PDF extraction workers (FastAPI lifespan shutdown)."""
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+def _extract_pdf_page_range(path: str, start: int, end: int) -> list[tuple[str, int]]:
+    """Extract pages [start, end) from a PDF file (runs in a worker process)."""
+    import pdfplumber
 
     pages: list[tuple[str, int]] = []
-    with pdfplumber.open(io.BytesIO(content)) as pdf:
-        for i, page in enumerate(pdf.pages):
+    with pdfplumber.open(path) as pdf:
+        for i in range(start, min(end, len(pdf.pages))):
+            page = pdf.pages[i]
             text = page.extract_text() or ""
             if text.strip():
                 pages.append((text, i + 1))
+            page.close()
     return pages
 
 
+def iter_pdf_pages(content: bytes) -> Iterator[tuple[str, int]]:
+    """Yield (text, page_num) for non-empty PDF pages, in page order.
+
+    Documents with PDF_PARALLEL_MIN_PAGES pages or more are split into page
+    ranges extracted concurrently on a process pool; at most two ranges per
+    worker are in flight, which bounds memory for 500+ page court files.
+    """
+    try:
+        import pdfplumber
+    except ImportError:
+        raise ImportError("pdfplumber is required for PDF processing")
+
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        page_count = len(pdf.pages)
+        if page_count < PDF_PARALLEL_MIN_PAGES or PDF_EXTRACT_WORKERS <= 1:
+            for i, page in enumerate(pdf.pages):
+                text = page.extract_text() or ""
+                page.close()
+                if text.strip():
+                    yield text, i + 1
+            return
+
+    # Workers read the PDF from a temp file instead of receiving the bytes
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+
+        pool = _get_page_pool()
+        ranges = iter(range(0, page_count, PDF_PAGES_PER_TASK))
+        window = [
+            pool.submit(
+                _extract_pdf_page_range, path, start, start + PDF_PAGES_PER_TASK
+            )
+            for start in itertools.islice(ranges, PDF_EXTRACT_WORKERS * 2)
+        ]
+        while window:
+            pages = window.pop(0).result()
+            start = next(ranges, None)
+            if start is not None:
+                window.append(
+                    pool.submit(
+                        _extract_pdf_page_range,
+                        path,
+                        start,
+                        start + PDF_PAGES_PER_TASK,
+                    )
+                )
+            yield from pages
+    finally:
+        os.unlink(path)
+
+
+def extract_text_from_pdf(content: bytes) -> list[tuple[str, int]]:
+    """Extract text per page from PDF bytes. Returns [(text, page_num), ...]."""
+    return list(iter_pdf_pages(content))
+
+
 def extract_text_from_docx(content: bytes) -> str:
     """Extract text from DOCX bytes."""
     try:
@@ -107,15 +286,18 @@ def chunk_text(
     tenant_id: Optional[str] = None,
     page_number: Optional[int] = None,
     extra_metadata: Optional[dict] = None,
+    max_tokens: int = MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
 ) -> list[Chunk]:
     """Chunk plain text into fragments with metadata."""
-    raw_chunks = _split_text_into_chunks(text)
+    windows = _token_windows(text, max_tokens, overlap_tokens)
     chunks: list[Chunk] = []
-    for idx, content in enumerate(raw_chunks):
+    for idx, (content, token_count) in enumerate(windows):
         chunks.append(
             Chunk(
                 content=content,
                 chunk_index=idx,
+                token_count=token_count,
                 page_number=page_number,
                 case_id=case_id,
                 document_id=document_id,
@@ -127,40 +309,36 @@ def chunk_text(
     return chunks
 
 
-def chunk_document(
+def iter_document_chunks(
     content: bytes,
     mime_type: str,
     case_id: Optional[str] = None,
     document_id: Optional[str] = None,
     evidence_link_id: Optional[str] = None,
     tenant_id: Optional[str] = None,
-) -> list[Chunk]:
-    """Chunk a document (PDF, DOCX, or text) into fragments."""
+) -> Iterator[Chunk]:
+    """Yield a document's chunks (PDF, DOCX, or text) as they are produced."""
     if mime_type == "application/pdf":
-        pages = extract_text_from_pdf(content)
-        all_chunks: list[Chunk] = []
         global_idx = 0
-        for text, page_num in pages:
-            page_chunks = chunk_text(
+        for text, page_num in iter_pdf_pages(content):
+            for c in chunk_text(
                 text,
                 case_id=case_id,
                 document_id=document_id,
                 evidence_link_id=evidence_link_id,
                 tenant_id=tenant_id,
                 page_number=page_num,
-            )
-            for c in page_chunks:
+            ):
                 c.chunk_index = global_idx
                 global_idx += 1
-            all_chunks.extend(page_chunks)
-        return all_chunks
+                yield c
 
     elif mime_type in (
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "application/msword",
     ):
         text = extract_text_from_docx(content)
-        return chunk_text(
+        yield from chunk_text(
             text,
             case_id=case_id,
             document_id=document_id,
@@ -171,7 +349,7 @@ def chunk_document(
     else:
         # Plain text fallback
         text = content.decode("utf-8", errors="replace")
-        return chunk_text(
+        yield from chunk_text(
             text,
             case_id=case_id,
             document_id=document_id,
@@ -180,30 +358,43 @@ def chunk_document(
         )
 
 
+def chunk_document(
+    content: bytes,
+    mime_type: str,
+    case_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    evidence_link_id: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> list[Chunk]:
+    """Chunk a document (PDF, DOCX, or text) into fragments."""
+    return list(
+        iter_document_chunks(
+            content,
+            mime_type,
+            case_id=case_id,
+            document_id=document_id,
+            evidence_link_id=evidence_link_id,
+            tenant_id=tenant_id,
+        )
+    )
+
+
 # ── Embedding generation ──
 
 
 def generate_embeddings(texts: list[str]) -> list[list[float]]:
     """Generate embeddings using sentence-transformers all-MiniLM-L6-v2.
 
-    Returns list of 384-dimensional vectors.
-    Falls back to random vectors if sentence-transformers not available.
+    Returns list of 384-dimensional vectors. Delegates to the process-wide
+    EmbeddingEngine, so the model is loaded once and concurrent calls are
+    micro-batched. Falls back to deterministic pseudo-embeddings if
+    sentence-transformers is not available.
     """
-    try:
-        from sentence_transformers import SentenceTransformer
+    return get_embedding_engine().encode(texts)
 
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        embeddings = model.encode(texts, show_progress_bar=False)
-        return [e.tolist() for e in embeddings]
-    except ImportError:
-        # Stub: deterministic pseudo-embeddings for testing
-        import hashlib
-
-        result: list[list[float]] = []
-        for text in texts:
-            h = hashlib.sha256(text.encode()).digest()
-            vec = [((b % 200) - 100) / 100.0 for b in h[:48]]
-            # Pad to 384 dims
-            vec = (vec * 8)[:384]
-            result.append(vec)
-        return result
+
+def take_batch(
+    chunks: Iterator[Chunk], batch_size: Optional[int] = None
+) -> list[Chunk]:
+    """Pull the next batch of chunks from a chunk stream ([] when exhausted)."""
+    return list(itertools.islice(chunks, batch_size or EMBEDDING_BATCH_SIZE))
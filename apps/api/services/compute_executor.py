@@ -0,0 +1,169 @@
+"""Compute executor — runs CPU-bound RAG stages off the event loop.
+
+PDF parsing, tokenization, embedding, cross-encoder scoring and the
+synchronous vector store clients all block. Async handlers hand these
+stages to a bounded thread pool instead of running them inline, so one
+large upload no longer stalls every other request on the worker.
+
+Back-pressure: at most ``max_pending`` stages may be queued or running.
+Further callers wait up to ``admit_timeout`` seconds for a slot, then get
+ExecutorBusyError (routers map it to 503). Ingests are additionally
+capped per tenant so one firm's bulk import cannot take every slot.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from apps.api.services.metrics import (
+    rag_executor_pending,
+    rag_ingests_rejected_total,
+    rag_stage_duration_seconds,
+)
+
+T = TypeVar("T")
+
+EXECUTOR_WORKERS = int(os.getenv("RAG_EXECUTOR_WORKERS", "4"))
+EXECUTOR_MAX_PENDING = int(
+    os.getenv("RAG_EXECUTOR_MAX_PENDING", str(EXECUTOR_WORKERS * 8))
+)
+EXECUTOR_ADMIT_TIMEOUT = float(os.getenv("RAG_EXECUTOR_ADMIT_TIMEOUT", "10"))
+MAX_INGESTS_PER_TENANT = int(os.getenv("RAG_MAX_INGESTS_PER_TENANT", "2"))
+
+
+class ExecutorBusyError(RuntimeError):
+    """No executor slot became free within the admission timeout."""
+
+
+class IngestLimitError(RuntimeError):
+    """The tenant already has the maximum number of ingests running."""
+
+
+class ComputeExecutor:
+    """Bounded thread pool for blocking RAG stages, with per-stage timing."""
+
+    def __init__(
+        self,
+        max_workers: int = EXECUTOR_WORKERS,
+        max_pending: int = EXECUTOR_MAX_PENDING,
+        admit_timeout: float = EXECUTOR_ADMIT_TIMEOUT,
+        max_ingests_per_tenant: int = MAX_INGESTS_PER_TENANT,
+    ) -> None:
+        self._max_workers = max(1, max_workers)
+        self._max_pending = max(self._max_workers, max_pending)
+        self._admit_timeout = admit_timeout
+        self._max_ingests = max(1, max_ingests_per_tenant)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # asyncio.Semaphore binds to the loop it first waits on; keep one per loop
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._pending = 0
+        self._ingests: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="rag-compute",
+                    )
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self._max_pending)
+        return slots
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._pending += delta
+            rag_executor_pending.set(self._pending)
+
+    async def run(
+        self,
+        stage: str,
+        fn: Callable[..., T],
+        *args: Any,
+        timings: Optional[dict[str, float]] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        The stage duration (excluding admission wait) is recorded in the
+        ``lexibel_rag_stage_duration_seconds`` histogram and, if given,
+        accumulated into ``timings[stage]`` in milliseconds.
+        """
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), self._admit_timeout)
+        except asyncio.TimeoutError:
+            raise ExecutorBusyError(
+                f"RAG executor saturated ({self._max_pending} stages pending)"
+            ) from None
+
+        self._track(1)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_pool(), functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            self._track(-1)
+            slots.release()
+            rag_stage_duration_seconds.labels(stage=stage).observe(elapsed)
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + elapsed * 1000
+
+    def pending(self) -> int:
+        """Stages currently queued or running on the pool."""
+        return self._pending
+
+    @asynccontextmanager
+    async def tenant_ingest(self, tenant_id: str) -> AsyncIterator[None]:
+        """Hold one of the tenant's ingest slots; raises IngestLimitError."""
+        with self._lock:
+            if self._ingests[tenant_id] >= self._max_ingests:
+                rag_ingests_rejected_total.inc()
+                raise IngestLimitError(
+                    f"Tenant already has {self._max_ingests} ingests in progress"
+                )
+            self._ingests[tenant_id] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._ingests[tenant_id] -= 1
+                if not self._ingests[tenant_id]:
+                    del self._ingests[tenant_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (called from the FastAPI lifespan)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+# Singleton instance
+_compute_executor: Optional[ComputeExecutor] = None
+
+
+def get_compute_executor() -> ComputeExecutor:
+    """Get or create the process-wide ComputeExecutor instance."""
+    global _compute_executor
+    if _compute_executor is None:
+        _compute_executor = ComputeExecutor()
+    return _compute_executor
@@ -0,0 +1,210 @@
+"""Context packer — fit retrieved chunks into the model's prompt budget.
+
+LLMGateway.generate used to paste every retrieved chunk into the prompt.
+Chunks are 512-token windows with a 64-token overlap, so neighbouring hits
+from one document repeat text, and long contexts overflowed the provider's
+context window. The packer:
+
+- counts tokens with the chunking encoder (tiktoken cl100k_base);
+- plans the budget: the model's context window minus the system prompt,
+  the question, the completion (max_tokens) and a margin, capped at
+  RAG_CONTEXT_MAX_TOKENS;
+- takes chunks greedily by score; a chunk that overlaps or follows one
+  already taken from the same document is merged into it, without the
+  repeated text, and costs only its new tokens; a chunk whose text is
+  already included costs nothing;
+- cuts the best chunk to the budget when even it does not fit (a whole
+  transcript passed as one chunk), rather than sending no context;
+- measures the assembled context exactly and drops the lowest-scored
+  sources if token boundaries pushed it over the budget.
+
+tokens_saved counts only what merging and deduplication removed from the
+selected sources; text left out for lack of budget is not a saving.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional
+
+from apps.api.services.chunking_service import count_tokens, truncate_tokens
+
+if TYPE_CHECKING:
+    from apps.api.services.llm_gateway import ContextChunk
+
+RAG_CONTEXT_MAX_TOKENS = int(os.getenv("RAG_CONTEXT_MAX_TOKENS", "6000"))
+LLM_CONTEXT_WINDOW = int(os.getenv("LLM_CONTEXT_WINDOW", "8192"))
+
+# Context window per model name prefix (the longest matching prefix wins)
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "mistral-large": 128_000,
+    "mistralai/Mistral-7B-Instruct-v0.2": 32_768,
+}
+
+# Chat formatting tokens and the CONTEXTE / DEMANDE wrapper
+_PROMPT_OVERHEAD = 32
+
+_SEPARATOR = "\n\n---\n\n"
+
+# Shortest shared text treated as a chunk overlap (shorter is coincidence)
+_MIN_OVERLAP_CHARS = 20
+
+
+def model_context_window(model: str) -> int:
+    """Context window of a model in tokens (LLM_CONTEXT_WINDOW if unknown)."""
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return LLM_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def context_budget(model: str, system_prompt: str, prompt: str, max_tokens: int) -> int:
+    """Tokens left for context chunks in one request."""
+    free = (
+        model_context_window(model)
+        - max_tokens
+        - count_tokens(system_prompt)
+        - count_tokens(prompt)
+        - _PROMPT_OVERHEAD
+    )
+    return max(0, min(RAG_CONTEXT_MAX_TOKENS, free))
+
+
+def source_header(index: int, chunk: ContextChunk) -> str:
+    ref = f"[Source {index}: doc={chunk.document_id or 'N/A'}"
+    if chunk.page_number:
+        ref += f", page {chunk.page_number}"
+    return ref + "]"
+
+
+def format_context(chunks: list[ContextChunk]) -> str:
+    """Context block of the user message, one numbered source per chunk."""
+    return _SEPARATOR.join(
+        f"{source_header(i + 1, chunk)}\n{chunk.content}"
+        for i, chunk in enumerate(chunks)
+    )
+
+
+def _overlap(head: str, tail: str) -> int:
+    """Length of the longest suffix of head that is a prefix of tail."""
+    probe = tail[:_MIN_OVERLAP_CHARS]
+    if len(probe) < _MIN_OVERLAP_CHARS:
+        return 0
+    pos = head.find(probe, max(0, len(head) - len(tail)))
+    while pos != -1:
+        if tail.startswith(head[pos:]):
+            return len(head) - pos
+        pos = head.find(probe, pos + 1)
+    return 0
+
+
+def _concat(head: str, tail: str, overlap: int) -> str:
+    return head + tail[overlap:] if overlap else f"{head}\n{tail}"
+
+
+@dataclass
+class _Span:
+    """Consecutive text of one document, built from one or more chunks."""
+
+    chunk: ContextChunk  # first chunk, carrying the merged content and best score
+    first_index: int
+    last_index: int
+    tokens: int  # of the content
+    sources: list[ContextChunk]  # chunks merged into the span, as retrieved
+
+    def join(self, other: ContextChunk) -> Optional[str]:
+        """Merged content if other continues or precedes this span."""
+        if other.document_id is None or other.document_id != self.chunk.document_id:
+            return None
+        content = self.chunk.content
+        if other.content in content:
+            return content
+        overlap = _overlap(content, other.content)
+        if overlap or other.chunk_index == self.last_index + 1:
+            return _concat(content, other.content, overlap)
+        overlap = _overlap(other.content, content)
+        if overlap or other.chunk_index == self.first_index - 1:
+            return _concat(other.content, content, overlap)
+        return None
+
+
+@dataclass
+class PackedContext:
+    """Chunks selected for a request and the token accounting."""
+
+    chunks: list[ContextChunk]
+    budget: int
+    context_tokens: int  # tokens of the packed context block
+    tokens_saved: int  # versus pasting the selected chunks one by one
+    dropped: int  # chunks left out for lack of budget
+
+
+def _header_cost(chunk: ContextChunk) -> int:
+    return count_tokens(f"{_SEPARATOR}{source_header(1, chunk)}\n")
+
+
+def pack_context(chunks: list[ContextChunk], budget: int) -> PackedContext:
+    """Merge, deduplicate and select chunks (best score first) within budget."""
+    if not chunks:
+        return PackedContext([], budget, 0, 0, 0)
+
+    spans: list[_Span] = []
+    used = 0
+    dropped = 0
+    # Best score first; retrieval order breaks ties
+    for chunk in sorted(chunks, key=lambda c: -c.score):
+        for span in spans:
+            merged = span.join(chunk)
+            if merged is None:
+                continue
+            if merged != span.chunk.content:
+                tokens = count_tokens(merged)
+                if used + tokens - span.tokens > budget:
+                    dropped += 1
+                    break
+                used += tokens - span.tokens
+                span.chunk = replace(span.chunk, content=merged)
+                span.tokens = tokens
+                span.first_index = min(span.first_index, chunk.chunk_index)
+                span.last_index = max(span.last_index, chunk.chunk_index)
+            span.sources.append(chunk)
+            break
+        else:
+            header = _header_cost(chunk)
+            tokens = count_tokens(chunk.content)
+            if not spans and header + tokens > budget > header:
+                # Too long on its own: better part of it than no context
+                chunk = replace(
+                    chunk, content=truncate_tokens(chunk.content, budget - header)
+                )
+                tokens = count_tokens(chunk.content)
+            if used + header + tokens > budget:
+                dropped += 1
+                continue
+            used += header + tokens
+            spans.append(
+                _Span(chunk, chunk.chunk_index, chunk.chunk_index, tokens, [chunk])
+            )
+
+    selected = [span.chunk for span in spans]
+    context_tokens = count_tokens(format_context(selected)) if selected else 0
+    # Token counts are not exactly additive across boundaries
+    while selected and context_tokens > budget:
+        selected.pop()
+        spans.pop()
+        dropped += 1
+        context_tokens = count_tokens(format_context(selected)) if selected else 0
+
+    pasted = [source for span in spans for source in span.sources]
+    return PackedContext(
+        chunks=selected,
+        budget=budget,
+        context_tokens=context_tokens,
+        tokens_saved=max(0, count_tokens(format_context(pasted)) - context_tokens),
+        dropped=dropped,
+    )
@@ -10,14 +10,17 @@ from datetime import datetime, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.services.http_client import pooled_client
 from apps.api.services.oauth_engine import get_oauth_engine
 from packages.db.models.email_message import EmailMessage
 from packages.db.models.email_thread import EmailThread
 
+GMAIL_API_URL = "https://gmail.googleapis.com/gmail/v1"
+GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+
 
 class EmailSyncService:
     """Synchronizes emails from Gmail and Outlook."""
@@ -77,7 +80,7 @@ class EmailSyncService:
         max_results: int,
     ) -> dict:
         """Sync emails from Gmail API."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with pooled_client(GMAIL_API_URL, timeout=30.0) as client:
             # Build query
             query_params = {"maxResults": max_results}
             if since:
@@ -232,7 +235,7 @@ class EmailSyncService:
         max_results: int,
     ) -> dict:
         """Sync emails from Microsoft Graph API."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with pooled_client(GRAPH_API_URL, timeout=30.0) as client:
             # Build query
             params = {"$top": max_results, "$orderby": "receivedDateTime desc"}
             if since:
@@ -430,7 +433,7 @@ class EmailSyncService:
         # Encode message
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
 
-        async with httpx.AsyncClient() as client:
+        async with pooled_client(GMAIL_API_URL) as client:
             response = await client.post(
                 "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -472,7 +475,7 @@ class EmailSyncService:
                 {"emailAddress": {"address": addr}} for addr in cc
             ]
 
-        async with httpx.AsyncClient() as client:
+        async with pooled_client(GRAPH_API_URL) as client:
             response = await client.post(
                 "https://graph.microsoft.com/v1.0/me/sendMail",
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -509,17 +512,16 @@ class EmailSyncService:
         )
         oauth_token = result.scalar_one()
 
-        async with httpx.AsyncClient() as client:
-            if oauth_token.provider == "google":
-                response = await client.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                )
-            else:  # microsoft
-                response = await client.get(
-                    "https://graph.microsoft.com/v1.0/me",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                )
+        if oauth_token.provider == "google":
+            profile_url = "https://www.googleapis.com/oauth2/v2/userinfo"
+        else:  # microsoft
+            profile_url = "https://graph.microsoft.com/v1.0/me"
+
+        async with pooled_client(profile_url) as client:
+            response = await client.get(
+                profile_url,
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
 
             if response.status_code != 200:
                 raise ValueError(f"Profile fetch failed: {response.status_code}")
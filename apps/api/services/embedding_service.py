@@ -0,0 +1,366 @@
+"""Embedding service — resident sentence-transformers engine with micro-batching.
+
+The model is loaded once per worker process (and warmed at startup from the
+FastAPI lifespan). Concurrent callers submit their texts to a shared queue;
+a background thread drains the queue into micro-batches so several search
+queries and ingests share a single ``model.encode`` call.
+
+Embeddings are cached by content: the key is the model identifier plus the
+SHA-256 of the text, so re-ingesting unchanged chunks (cloud sync passes,
+legal re-indexing) never re-encodes them. The cache is an in-memory LRU,
+optionally backed by a SQLite file shared across processes.
+
+Falls back to deterministic pseudo-embeddings if sentence-transformers is
+not installed (tests, lightweight installs).
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from apps.api.services.metrics import (
+    embedding_batch_duration_seconds,
+    embedding_batch_size,
+    embedding_cache_requests_total,
+    embedding_queue_depth,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+# Micro-batching limits: a batch is flushed when it holds MAX_BATCH_SIZE
+# texts or when MAX_WAIT_MS elapsed since its first request was dequeued.
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5"))
+
+# Embedding cache: in-memory LRU entries (0 disables), optional SQLite file
+CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+
+
+def _stub_embeddings(texts: list[str]) -> list[list[float]]:
+    """Deterministic pseudo-embeddings for testing (384 dims)."""
+    result: list[list[float]] = []
+    for text in texts:
+        h = hashlib.sha256(text.encode()).digest()
+        vec = [((b % 200) - 100) / 100.0 for b in h]
+        # Pad to 384 dims (32-byte digest repeated 12 times)
+        vec = (vec * 12)[:EMBEDDING_DIM]
+        result.append(vec)
+    return result
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache (LRU in memory, optional SQLite).
+
+    Vectors are stored as packed float32, which is what the model produces.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        path: Optional[str] = None,
+    ) -> None:
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> str:
+        """Cache key: model identifier + SHA-256 of the text."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_id}:{digest}"
+
+    @staticmethod
+    def _pack(vector: list[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> list[float]:
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)."""
+        if self._max_entries == 0:
+            return
+        self._entries[key] = blob
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Look up keys; returns only the ones found. Counts hits/misses."""
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                blob = self._entries.get(key)
+                if blob is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = blob
+
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            if self._db is not None:
+                # Stay well under SQLite's bound-parameter limit
+                for i in range(0, len(missing), 500):
+                    batch = missing[i : i + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._db.execute(
+                        "SELECT key, vector FROM embeddings "
+                        f"WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = blob
+                        self._remember(key, blob)
+
+            hits = sum(1 for k in keys if k in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        embedding_cache_requests_total.labels(result="hit").inc(hits)
+        embedding_cache_requests_total.labels(result="miss").inc(len(keys) - hits)
+        return {key: self._unpack(blob) for key, blob in found.items()}
+
+    def put_many(self, items: dict[str, list[float]]) -> dict[str, list[float]]:
+        """Store vectors; returns them as they will be served from cache."""
+        packed = {key: self._pack(vector) for key, vector in items.items()}
+        with self._lock:
+            for key, blob in packed.items():
+                self._remember(key, blob)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    packed.items(),
+                )
+                self._db.commit()
+        return {key: self._unpack(blob) for key, blob in packed.items()}
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "persistent": self._db is not None,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached vectors (memory and disk)."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+
+@dataclass
+class _EncodeRequest:
+    """Texts submitted by one caller, resolved by the batching thread."""
+
+    texts: list[str]
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingEngine:
+    """Process-wide embedding model with request coalescing."""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait_ms: float = MAX_WAIT_MS,
+        model: Any = None,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> None:
+        self.model_name = model_name or os.getenv("EMBEDDING_MODEL", DEFAULT_MODEL_NAME)
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._model: Any = model
+        self._model_loaded = model is not None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.cache = cache
+
+    # ── Model lifecycle ──
+
+    def _load_model(self) -> Any:
+        """Load the model once; returns None if sentence-transformers is missing."""
+        if self._model_loaded:
+            return self._model
+        with self._load_lock:
+            if not self._model_loaded:
+                try:
+                    from sentence_transformers import SentenceTransformer
+
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info("Embedding model %s loaded", self.model_name)
+                except ImportError:
+                    logger.warning(
+                        "sentence-transformers not installed — using stub embeddings"
+                    )
+                    self._model = None
+                self._model_loaded = True
+        return self._model
+
+    @property
+    def is_stub(self) -> bool:
+        """True when running on pseudo-embeddings (no model available)."""
+        return self._load_model() is None
+
+    @property
+    def model_id(self) -> str:
+        """Identifier used in cache keys (stub vectors never mix with real ones)."""
+        return "stub" if self.is_stub else self.model_name
+
+    def warmup(self) -> None:
+        """Load the model and run one encode so the first request is not cold."""
+        start = time.perf_counter()
+        self.encode(["warmup"])
+        logger.info(
+            "Embedding engine warmed up in %.0f ms",
+            (time.perf_counter() - start) * 1000,
+        )
+
+    # ── Encoding ──
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, serving unchanged content from the cache."""
+        if not texts:
+            return []
+        if self.cache is None:
+            return self._encode_uncached(texts)
+
+        model_id = self.model_id
+        keys = [EmbeddingCache.make_key(model_id, t) for t in texts]
+        found = self.cache.get_many(keys)
+
+        # Encode each missing text once, even if repeated in the request
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self._encode_uncached(list(missing.values()))
+            found.update(self.cache.put_many(dict(zip(missing, vectors))))
+
+        return [found[key] for key in keys]
+
+    def _encode_uncached(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, sharing one model call with concurrent callers."""
+        if self._load_model() is None:
+            return _stub_embeddings(texts)
+
+        request = _EncodeRequest(texts=list(texts))
+        self._ensure_worker()
+        self._queue.put(request)
+        embedding_queue_depth.set(self._queue.qsize())
+        return request.future.result()
+
+    def queue_depth(self) -> int:
+        """Number of encode requests waiting for a batch."""
+        return self._queue.qsize()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="embedding-batcher",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> list[_EncodeRequest]:
+        """Block for the first request, then coalesce until size/time limit."""
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self._max_wait
+
+        while size < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+
+        embedding_queue_depth.set(self._queue.qsize())
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            texts = [t for request in batch for t in request.texts]
+            embedding_batch_size.observe(len(texts))
+
+            start = time.perf_counter()
+            try:
+                embeddings = self._model.encode(texts, show_progress_bar=False)
+            except Exception as e:
+                logger.error("Embedding batch of %d texts failed: %s", len(texts), e)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            finally:
+                embedding_batch_duration_seconds.observe(time.perf_counter() - start)
+
+            offset = 0
+            for request in batch:
+                n = len(request.texts)
+                request.future.set_result(
+                    [e.tolist() for e in embeddings[offset : offset + n]]
+                )
+                offset += n
+
+
+# Singleton instance
+_embedding_engine: Optional[EmbeddingEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """Get or create the process-wide EmbeddingEngine instance."""
+    global _embedding_engine
+    if _embedding_engine is None:
+        with _engine_lock:
+            if _embedding_engine is None:
+                cache = None
+                if CACHE_MAX_ENTRIES > 0 or CACHE_PATH:
+                    cache = EmbeddingCache(CACHE_MAX_ENTRIES, CACHE_PATH)
+                _embedding_engine = EmbeddingEngine(cache=cache)
+    return _embedding_engine
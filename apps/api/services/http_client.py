@@ -0,0 +1,209 @@
+"""HTTP client registry — shared keep-alive connection pools per host.
+
+LLM providers, vLLM, Whisper and the mail/calendar sync services used to
+open a fresh ``httpx.AsyncClient`` per call (or per provider), paying a
+TCP + TLS handshake on almost every request. The registry keeps one
+client per origin (scheme://host:port) with tuned pool limits, keep-alive
+and HTTP/2 when the ``h2`` package is installed, so requests to the same
+host reuse warm connections.
+
+Usage:
+    client = get_http_client("https://api.mistral.ai/v1")
+    resp = await client.post(url, json=payload)
+
+    # Drop-in for ``async with httpx.AsyncClient(timeout=30.0) as client``;
+    # the pooled client is not closed on exit.
+    async with pooled_client("https://graph.microsoft.com", timeout=30.0) as client:
+        resp = await client.get(url)
+
+Clients are bound to the event loop that created them, so the registry
+keeps one set per loop. ``close_http_clients()`` runs in the FastAPI
+lifespan shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from apps.api.services.metrics import (
+    http_pool_connections,
+    http_pool_requests_total,
+)
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def origin(url: str) -> str:
+    """Pool key of a URL: scheme://host[:port]."""
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"Absolute URL required, got {url!r}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class _TimeoutClient:
+    """Pooled client view that applies a default per-request timeout."""
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Any) -> None:
+        self._client = client
+        self._timeout = timeout
+
+    def _with_timeout(self, kwargs: dict) -> dict:
+        kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.request(method, url, **self._with_timeout(kwargs))
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.get(url, **self._with_timeout(kwargs))
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.post(url, **self._with_timeout(kwargs))
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.put(url, **self._with_timeout(kwargs))
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.patch(url, **self._with_timeout(kwargs))
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client.delete(url, **self._with_timeout(kwargs))
+
+    def stream(self, method: str, url: str, **kwargs: Any):
+        return self._client.stream(method, url, **self._with_timeout(kwargs))
+
+
+class HTTPClientRegistry:
+    """One keep-alive ``httpx.AsyncClient`` per (event loop, origin)."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        http2: bool = HTTP2_ENABLED,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._http2 = http2 and _http2_available()
+        # loop -> {origin: (client, transport)}
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _create(self, host: str) -> tuple[httpx.AsyncClient, httpx.AsyncHTTPTransport]:
+        transport = httpx.AsyncHTTPTransport(limits=self._limits, http2=self._http2)
+
+        async def on_request(request: httpx.Request) -> None:
+            http_pool_requests_total.labels(host=host).inc()
+            self._observe(host, transport)
+
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=self._timeout,
+            event_hooks={"request": [on_request]},
+        )
+        return client, transport
+
+    @staticmethod
+    def _observe(host: str, transport: httpx.AsyncHTTPTransport) -> dict[str, int]:
+        connections = getattr(getattr(transport, "_pool", None), "connections", [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        counts = {"active": len(connections) - idle, "idle": idle}
+        for state, count in counts.items():
+            http_pool_connections.labels(host=host, state=state).set(count)
+        return counts
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Shared client for the URL's origin on the running event loop."""
+        host = origin(url)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.get(loop)
+            if clients is None:
+                clients = self._clients[loop] = {}
+            entry = clients.get(host)
+            if entry is None or entry[0].is_closed:
+                entry = clients[host] = self._create(host)
+        return entry[0]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Connection counts per origin on the running loop (refreshes gauges)."""
+        clients = self._clients.get(asyncio.get_running_loop(), {})
+        return {
+            host: self._observe(host, transport)
+            for host, (_, transport) in clients.items()
+        }
+
+    async def aclose(self) -> None:
+        """Close the clients of the running loop; forget those of other loops."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+            self._clients.clear()
+        for host, (client, _) in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Closing HTTP client for %s failed: %s", host, e)
+            for state in ("active", "idle"):
+                http_pool_connections.labels(host=host, state=state).set(0)
+
+
+# Singleton instance
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    """Get or create the process-wide HTTPClientRegistry instance."""
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Shared pooled client for the URL's origin."""
+    return get_http_registry().get(url)
+
+
+@asynccontextmanager
+async def pooled_client(
+    url: str, timeout: Any = httpx.USE_CLIENT_DEFAULT
+) -> AsyncIterator[_TimeoutClient]:
+    """Borrow the pooled client for ``url`` with a default request timeout."""
+    yield _TimeoutClient(get_http_client(url), timeout)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients (FastAPI lifespan shutdown)."""
+    if _registry is not None:
+        await _registry.aclose()
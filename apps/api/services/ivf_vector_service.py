@@ -0,0 +1,753 @@
+"""IVF vector service — embedded approximate nearest-neighbour backend.
+
+A third VectorService implementation for single-node installs that need
+Qdrant-like search latency without running Qdrant:
+
+- one partition per tenant, each with its own memory-mapped files:
+    vectors.f32   unit-normalized float32 vectors (row-major)
+    columns.i32   per-row [list_id, case_code, deleted]
+    centroids.npy IVF coarse quantizer (spherical k-means)
+- payloads and chunk/document lookups live in a SQLite catalog (index.db)
+- inserts are incremental: new rows are assigned to their nearest centroid
+  and the quantizer is retrained when a partition has grown 4x; k-means
+  runs on a copied sample after the write is committed and its locks are
+  released, only the reassignment of rows holds the partition lock
+- deletes are tombstones (delete_by_document flips the row flag); dead rows
+  are dropped from the inverted lists on the next rebuild
+
+Several processes (uvicorn workers, Celery, the CLI) may share one index
+directory. Writers take an exclusive flock on the partition and re-read its
+size and case codes from index.db before appending, so rows and case codes
+are never handed out twice; readers pick up other processes' appends and
+retraining from the committed partition row before each search.
+
+Until a partition holds IVF_MIN_TRAIN_SIZE vectors it is searched exactly.
+Case-scoped searches scan the case column and score the case's rows exactly;
+payload-filtered searches widen the probe until enough rows pass.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from apps.api.services.vector_service import (
+    SCROLL_BATCH_SIZE,
+    VectorSearchResult,
+    VectorService,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "./data/vector_index")
+IVF_MIN_TRAIN_SIZE = int(os.getenv("VECTOR_IVF_MIN_TRAIN_SIZE", "4096"))
+IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "8"))
+
+# Columns of the per-row int32 memmap
+_COL_LIST = 0
+_COL_CASE = 1
+_COL_DELETED = 2
+_N_COLS = 3
+
+_KMEANS_ITERATIONS = 10
+_KMEANS_MAX_SAMPLE = 100_000
+_ASSIGN_BATCH = 8192
+_DELETE_BATCH = 500  # SQLite bound-parameter limit
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid (max inner product) for each vector, in batches."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for i in range(0, len(vectors), _ASSIGN_BATCH):
+        out[i : i + _ASSIGN_BATCH] = np.argmax(
+            vectors[i : i + _ASSIGN_BATCH] @ centroids.T, axis=1
+        )
+    return out
+
+
+def train_centroids(sample: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means over unit vectors; returns (nlist, dim) centroids."""
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(_KMEANS_ITERATIONS):
+        assignment = _assign(sample, centroids)
+        order = np.argsort(assignment, kind="stable")
+        lists, starts = np.unique(assignment[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[lists] = np.add.reduceat(sample[order], starts, axis=0)
+        # Empty clusters keep their previous centroid
+        updated = _normalize(sums)
+        empty = ~updated.any(axis=1)
+        updated[empty] = centroids[empty]
+        centroids = updated
+
+    return centroids.astype(np.float32)
+
+
+class _Partition:
+    """Memory-mapped IVF index for one tenant."""
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, directory: str, dim: int, size: int, trained_size: int):
+        self.directory = directory
+        self.dim = dim
+        self.size = size
+        self.trained_size = trained_size
+        self.capacity = 0
+        self.vectors: Optional[np.memmap] = None
+        self.columns: Optional[np.memmap] = None
+        self.centroids: Optional[np.ndarray] = None
+
+        # Inverted lists: rows grouped by list (CSR), plus rows appended since
+        self._list_rows = np.empty(0, dtype=np.int64)
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+        self._pending: dict[int, list[int]] = {}
+        self._pending_count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._map(max(size, self._INITIAL_CAPACITY))
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(centroids_path):
+            self.centroids = np.load(centroids_path)
+        self.rebuild_lists()
+
+    # ── Storage ──
+
+    def _map(self, capacity: int) -> None:
+        """(Re)open the memmaps with at least ``capacity`` rows."""
+        if capacity <= self.capacity:
+            return
+        for name, width, dtype in (
+            ("vectors.f32", self.dim, np.float32),
+            ("columns.i32", _N_COLS, np.int32),
+        ):
+            path = os.path.join(self.directory, name)
+            nbytes = capacity * width * np.dtype(dtype).itemsize
+            if not os.path.exists(path) or os.path.getsize(path) < nbytes:
+                with open(path, "ab") as f:
+                    f.truncate(nbytes)
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.columns.flush()
+        self.vectors = np.memmap(
+            os.path.join(self.directory, "vectors.f32"),
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.dim),
+        )
+        self.columns = np.memmap(
+            os.path.join(self.directory, "columns.i32"),
+            dtype=np.int32,
+            mode="r+",
+            shape=(capacity, _N_COLS),
+        )
+        self.capacity = capacity
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        """Exclusive lock on the partition, shared across processes."""
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def sync(self, size: int, trained_size: int) -> bool:
+        """Pick up rows appended or a quantizer retrained by another process.
+
+        Returns True when anything changed.
+        """
+        if size == self.size and trained_size == self.trained_size:
+            return False
+        if size > self.capacity:
+            self._map(max(size, self.capacity * 2))
+
+        if trained_size != self.trained_size:
+            centroids_path = os.path.join(self.directory, "centroids.npy")
+            if os.path.exists(centroids_path):
+                self.centroids = np.load(centroids_path)
+            self.size = size
+            self.trained_size = trained_size
+            self.rebuild_lists()
+            return True
+
+        start, self.size = self.size, size
+        if self.centroids is not None and size > start:
+            list_ids = self.columns[start:size, _COL_LIST]
+            for row, list_id in zip(range(start, size), list_ids.tolist()):
+                self._pending.setdefault(list_id, []).append(row)
+            self._pending_count += size - start
+        return True
+
+    def append(self, vectors: np.ndarray, case_codes: list[int]) -> np.ndarray:
+        """Append normalized vectors; returns their row numbers."""
+        start = self.size
+        end = start + len(vectors)
+        if end > self.capacity:
+            self._map(max(end, self.capacity * 2))
+
+        self.vectors[start:end] = vectors
+        self.columns[start:end, _COL_CASE] = case_codes
+        self.columns[start:end, _COL_DELETED] = 0
+        self.columns[start:end, _COL_LIST] = -1
+        self.size = end
+
+        rows = np.arange(start, end)
+        if self.centroids is not None:
+            assignment = _assign(vectors, self.centroids)
+            self.columns[start:end, _COL_LIST] = assignment
+            for row, list_id in zip(rows.tolist(), assignment.tolist()):
+                self._pending.setdefault(list_id, []).append(row)
+            self._pending_count += len(rows)
+        return rows
+
+    def tombstone(self, rows: list[int]) -> None:
+        if rows:
+            self.columns[np.asarray(rows), _COL_DELETED] = 1
+
+    def flush(self) -> None:
+        self.vectors.flush()
+        self.columns.flush()
+
+    # ── IVF maintenance ──
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.columns[: self.size, _COL_DELETED] == 0)
+
+    def needs_training(self) -> bool:
+        live = int((self.columns[: self.size, _COL_DELETED] == 0).sum())
+        if live < IVF_MIN_TRAIN_SIZE:
+            return False
+        return self.centroids is None or live > 4 * self.trained_size
+
+    def training_sample(self) -> tuple[np.ndarray, int]:
+        """Copy of the vectors to train on, and the number of lists."""
+        live = self.live_rows()
+        nlist = int(np.clip(np.sqrt(len(live)), 16, 4096))
+        rng = np.random.default_rng(len(live))
+        sample_rows = np.sort(
+            rng.choice(live, min(len(live), _KMEANS_MAX_SAMPLE, 64 * nlist), False)
+        )
+        return np.array(self.vectors[sample_rows]), nlist
+
+    def install(self, centroids: np.ndarray) -> None:
+        """Adopt a trained quantizer and reassign every live row."""
+        live = self.live_rows()
+        self.centroids = centroids
+        # Readers in other processes load this file without the lock
+        centroids_path = os.path.join(self.directory, "centroids.npy")
+        with open(centroids_path + ".tmp", "wb") as f:
+            np.save(f, self.centroids)
+        os.replace(centroids_path + ".tmp", centroids_path)
+
+        for i in range(0, len(live), _ASSIGN_BATCH):
+            batch = live[i : i + _ASSIGN_BATCH]
+            self.columns[batch, _COL_LIST] = _assign(
+                np.asarray(self.vectors[batch]), self.centroids
+            )
+        self.trained_size = len(live)
+        self.rebuild_lists()
+        logger.info(
+            "IVF partition %s trained: %d lists over %d vectors",
+            self.directory,
+            len(self.centroids),
+            len(live),
+        )
+
+    def rebuild_lists(self) -> None:
+        """Group live rows by list id; drops tombstoned rows from the lists."""
+        self._pending = {}
+        self._pending_count = 0
+        if self.centroids is None:
+            return
+        live = self.live_rows()
+        list_ids = self.columns[live, _COL_LIST]
+        order = np.argsort(list_ids, kind="stable")
+        self._list_rows = live[order]
+        self._list_offsets = np.searchsorted(
+            list_ids[order], np.arange(len(self.centroids) + 1)
+        )
+
+    # ── Search ──
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows to score exactly: probed lists, or every row if untrained."""
+        if self.centroids is None:
+            rows = np.arange(self.size)
+        else:
+            if self._pending_count > max(1024, self.size // 10):
+                self.rebuild_lists()
+            nprobe = min(nprobe, len(self.centroids))
+            probed = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            parts = [
+                self._list_rows[self._list_offsets[p] : self._list_offsets[p + 1]]
+                for p in probed
+            ]
+            parts.extend(
+                np.asarray(self._pending[p]) for p in probed if p in self._pending
+            )
+            rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        return rows[self.columns[rows, _COL_DELETED] == 0]
+
+    def case_rows(self, case_code: int) -> np.ndarray:
+        """Every live row of one case (an exact scan of the columns)."""
+        columns = self.columns[: self.size]
+        return np.flatnonzero(
+            (columns[:, _COL_CASE] == case_code) & (columns[:, _COL_DELETED] == 0)
+        )
+
+    def probes_all(self, nprobe: int) -> bool:
+        return self.centroids is None or nprobe >= len(self.centroids)
+
+
+class IVFVectorService(VectorService):
+    """Embedded IVF vector store, partitioned by tenant, persisted on disk."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        nprobe: int = IVF_NPROBE,
+    ) -> None:
+        self._path = path or DEFAULT_INDEX_PATH
+        self._nprobe = max(1, nprobe)
+        self._partitions: dict[str, _Partition] = {}
+        self._case_codes: dict[str, dict[Any, int]] = {}
+        self._lock = threading.RLock()
+
+        os.makedirs(self._path, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(self._path, "index.db"), check_same_thread=False
+        )
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS partitions (
+                tenant_id TEXT PRIMARY KEY,
+                directory TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0,
+                trained_size INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                tenant_id TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                chunk_id TEXT NOT NULL,
+                document_id TEXT,
+                payload TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (tenant_id, row)
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunks_chunk
+                ON chunks (tenant_id, chunk_id) WHERE deleted = 0;
+            CREATE INDEX IF NOT EXISTS ix_chunks_document
+                ON chunks (document_id) WHERE deleted = 0;
+            CREATE TABLE IF NOT EXISTS cases (
+                tenant_id TEXT NOT NULL,
+                case_id TEXT NOT NULL,
+                code INTEGER NOT NULL,
+                PRIMARY KEY (tenant_id, case_id)
+            );
+            """
+        )
+        self._db.commit()
+
+    def _get_client(self) -> Any:
+        return None  # Not used
+
+    def ensure_collection(self) -> None:
+        os.makedirs(self._path, exist_ok=True)
+
+    # ── Partitions ──
+
+    def _partition(self, tenant_id: str, dim: Optional[int] = None):
+        """Open a tenant partition; creates it when ``dim`` is given."""
+        part = self._partitions.get(tenant_id)
+        if part is not None:
+            return part
+
+        row = self._db.execute(
+            "SELECT directory, dim, size, trained_size FROM partitions "
+            "WHERE tenant_id = ?",
+            (tenant_id,),
+        ).fetchone()
+        if row is None:
+            if dim is None:
+                return None
+            directory = hashlib.sha256(tenant_id.encode()).hexdigest()[:16]
+            # Another process may create the same partition concurrently
+            self._db.execute(
+                "INSERT OR IGNORE INTO partitions (tenant_id, directory, dim) "
+                "VALUES (?, ?, ?)",
+                (tenant_id, directory, dim),
+            )
+            self._db.commit()
+            row = self._db.execute(
+                "SELECT directory, dim, size, trained_size FROM partitions "
+                "WHERE tenant_id = ?",
+                (tenant_id,),
+            ).fetchone()
+
+        directory, part_dim, size, trained_size = row
+        part = _Partition(
+            os.path.join(self._path, directory), part_dim, size, trained_size
+        )
+        self._partitions[tenant_id] = part
+        self._load_case_codes(tenant_id)
+        return part
+
+    def _load_case_codes(self, tenant_id: str) -> None:
+        self._case_codes[tenant_id] = dict(
+            self._db.execute(
+                "SELECT case_id, code FROM cases WHERE tenant_id = ?", (tenant_id,)
+            ).fetchall()
+        )
+
+    def _refresh(self, tenant_id: str, part: _Partition, force: bool = False) -> None:
+        """Catch up with rows and case codes committed by other processes."""
+        size, trained_size = self._db.execute(
+            "SELECT size, trained_size FROM partitions WHERE tenant_id = ?",
+            (tenant_id,),
+        ).fetchone()
+        if part.sync(size, trained_size) or force:
+            self._load_case_codes(tenant_id)
+
+    def _case_code(self, tenant_id: str, case_id: Any) -> int:
+        """Small integer for a case id (0 = no case), created on first use.
+
+        The caller holds the partition lock and has refreshed the codes.
+        """
+        if case_id is None:
+            return 0
+        codes = self._case_codes[tenant_id]
+        key = str(case_id)
+        if key not in codes:
+            codes[key] = max(codes.values(), default=0) + 1
+            self._db.execute(
+                "INSERT INTO cases (tenant_id, case_id, code) VALUES (?, ?, ?)",
+                (tenant_id, key, codes[key]),
+            )
+        return codes[key]
+
+    def _save_partition(self, tenant_id: str, part: _Partition) -> None:
+        part.flush()
+        self._db.execute(
+            "UPDATE partitions SET size = ?, trained_size = ? WHERE tenant_id = ?",
+            (part.size, part.trained_size, tenant_id),
+        )
+
+    # ── VectorService interface ──
+
+    def upsert_chunks(
+        self,
+        chunk_ids: list[str],
+        embeddings: list[list[float]],
+        payloads: list[dict],
+    ) -> None:
+        if not chunk_ids:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+
+        by_tenant: dict[str, list[int]] = {}
+        for i, payload in enumerate(payloads):
+            by_tenant.setdefault(str(payload.get("tenant_id") or ""), []).append(i)
+
+        due = []
+        with self._lock:
+            for tenant_id, indices in by_tenant.items():
+                part = self._partition(tenant_id, dim=vectors.shape[1])
+                if part.dim != vectors.shape[1]:
+                    raise ValueError(
+                        f"Vector dimension {vectors.shape[1]} does not match "
+                        f"partition dimension {part.dim}"
+                    )
+                with part.locked():
+                    self._refresh(tenant_id, part, force=True)
+                    try:
+                        self._upsert_partition(
+                            tenant_id, part, indices, chunk_ids, vectors, payloads
+                        )
+                        self._db.commit()
+                    except Exception:
+                        # Nothing was committed: reopen from the catalog
+                        self._db.rollback()
+                        self._partitions.pop(tenant_id, None)
+                        raise
+                if part.needs_training():
+                    due.append(tenant_id)
+
+        for tenant_id in due:
+            self._retrain(tenant_id)
+
+    def _retrain(self, tenant_id: str) -> None:
+        """Retrain a partition's quantizer without blocking other writers.
+
+        k-means runs on a copied sample with no lock held; the result is
+        installed under both locks, unless another process retrained the
+        partition meanwhile.
+        """
+        with self._lock:
+            part = self._partitions.get(tenant_id)
+            if part is None:
+                return
+            self._refresh(tenant_id, part)
+            if not part.needs_training():
+                return
+            trained_size = part.trained_size
+            sample, nlist = part.training_sample()
+
+        centroids = train_centroids(sample, nlist)
+
+        with self._lock:
+            part = self._partitions.get(tenant_id)
+            if part is None:
+                return
+            with part.locked():
+                self._refresh(tenant_id, part, force=True)
+                if part.trained_size != trained_size:
+                    return
+                part.install(centroids)
+                self._save_partition(tenant_id, part)
+                self._db.commit()
+
+    def _upsert_partition(
+        self,
+        tenant_id: str,
+        part: _Partition,
+        indices: list[int],
+        chunk_ids: list[str],
+        vectors: np.ndarray,
+        payloads: list[dict],
+    ) -> None:
+        """Append one tenant's rows; the caller holds both locks and commits."""
+        # Re-upserted chunks: tombstone the previous row
+        ids = [chunk_ids[i] for i in indices]
+        placeholders = ",".join("?" * len(ids))
+        previous = [
+            r
+            for (r,) in self._db.execute(
+                "SELECT row FROM chunks WHERE tenant_id = ? AND deleted = 0 "
+                f"AND chunk_id IN ({placeholders})",
+                [tenant_id, *ids],
+            )
+        ]
+        self._tombstone(tenant_id, part, previous)
+
+        case_codes = [
+            self._case_code(tenant_id, payloads[i].get("case_id")) for i in indices
+        ]
+        rows = part.append(vectors[indices], case_codes)
+        self._db.executemany(
+            "INSERT INTO chunks "
+            "(tenant_id, row, chunk_id, document_id, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    tenant_id,
+                    int(row),
+                    chunk_ids[i],
+                    payloads[i].get("document_id"),
+                    json.dumps(payloads[i], default=str),
+                )
+                for row, i in zip(rows, indices)
+            ],
+        )
+        self._save_partition(tenant_id, part)
+
+    def _tombstone(self, tenant_id: str, part: _Partition, rows: list[int]) -> None:
+        if not rows:
+            return
+        part.tombstone(rows)
+        self._db.executemany(
+            "UPDATE chunks SET deleted = 1 WHERE tenant_id = ? AND row = ?",
+            [(tenant_id, r) for r in rows],
+        )
+
+    def search(
+        self,
+        query_embedding: list[float],
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[VectorSearchResult]:
+        """Approximate cosine search within the tenant's partition.
+
+        Case-scoped searches score every row of the case exactly. Otherwise
+        the probe is widened until ``top_k`` rows pass the payload filters
+        (or every list has been probed).
+        """
+        tenant_id = str(tenant_id)
+        with self._lock:
+            part = self._partition(tenant_id)
+            if part is None or top_k <= 0:
+                return []
+            self._refresh(tenant_id, part)
+
+            query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+            if case_id:
+                code = self._case_codes[tenant_id].get(str(case_id))
+                if code is None:
+                    return []
+                hits = self._top_hits(
+                    tenant_id, part, part.case_rows(code), query, top_k, filters
+                )
+            else:
+                nprobe = self._nprobe
+                while True:
+                    rows = part.candidates(query, nprobe)
+                    hits = self._top_hits(tenant_id, part, rows, query, top_k, filters)
+                    if len(hits) == top_k or part.probes_all(nprobe):
+                        break
+                    nprobe *= 2
+
+        return [
+            VectorSearchResult(
+                chunk_id=cid,
+                score=score,
+                content=payload.get("content", ""),
+                case_id=payload.get("case_id"),
+                document_id=payload.get("document_id"),
+                evidence_link_id=payload.get("evidence_link_id"),
+                page_number=payload.get("page_number"),
+                chunk_index=payload.get("chunk_index", 0),
+                metadata=payload.get("metadata"),
+            )
+            for cid, score, payload in hits
+        ]
+
+    def _top_hits(
+        self,
+        tenant_id: str,
+        part: _Partition,
+        rows: np.ndarray,
+        query: np.ndarray,
+        top_k: int,
+        filters: Optional[dict],
+    ) -> list[tuple[str, float, dict]]:
+        """Score ``rows`` exactly; best ``top_k`` passing ``filters``."""
+        if rows.size == 0:
+            return []
+
+        scores = np.asarray(part.vectors[rows]) @ query
+        if filters:
+            # Filters are checked on payloads, best-first, until top_k pass
+            order = np.argsort(-scores, kind="stable")
+        else:
+            k = min(top_k, rows.size)
+            order = np.argpartition(-scores, k - 1)[:k]
+            order = order[np.argsort(-scores[order], kind="stable")]
+
+        hits: list[tuple[str, float, dict]] = []
+        page = max(top_k * 4, 64)
+        for start in range(0, len(order), page):
+            window = order[start : start + page]
+            payloads = self._load_payloads(tenant_id, rows[window].tolist())
+            for i in window:
+                chunk_id, payload = payloads[int(rows[i])]
+                if filters and any(payload.get(k) != v for k, v in filters.items()):
+                    continue
+                hits.append((chunk_id, float(scores[i]), payload))
+                if len(hits) == top_k:
+                    return hits
+            if not filters:
+                break
+        return hits
+
+    def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Search several query vectors; each probes its own inverted lists."""
+        return [
+            self.search(embedding, tenant_id, top_k, case_id, filters)
+            for embedding in query_embeddings
+        ]
+
+    def _load_payloads(
+        self, tenant_id: str, rows: list[int]
+    ) -> dict[int, tuple[str, dict]]:
+        placeholders = ",".join("?" * len(rows))
+        return {
+            row: (chunk_id, json.loads(payload))
+            for row, chunk_id, payload in self._db.execute(
+                "SELECT row, chunk_id, payload FROM chunks "
+                f"WHERE tenant_id = ? AND row IN ({placeholders})",
+                [tenant_id, *rows],
+            )
+        }
+
+    def scroll_payloads(
+        self, batch_size: int = SCROLL_BATCH_SIZE
+    ) -> Iterator[tuple[list[str], list[dict]]]:
+        with self._lock:
+            stored = self._db.execute(
+                "SELECT chunk_id, payload FROM chunks WHERE deleted = 0"
+            ).fetchall()
+        for i in range(0, len(stored), batch_size):
+            batch = stored[i : i + batch_size]
+            yield (
+                [chunk_id for chunk_id, _ in batch],
+                [json.loads(payload) for _, payload in batch],
+            )
+
+    def delete_by_document(self, document_id: str) -> None:
+        """Tombstone all vectors for a given document."""
+        with self._lock:
+            self._tombstone_where("document_id = ?", [document_id])
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Tombstone the vectors of the given chunks."""
+        with self._lock:
+            for i in range(0, len(chunk_ids), _DELETE_BATCH):
+                ids = chunk_ids[i : i + _DELETE_BATCH]
+                placeholders = ",".join("?" * len(ids))
+                self._tombstone_where(f"chunk_id IN ({placeholders})", ids)
+
+    def _tombstone_where(self, condition: str, params: list) -> None:
+        """Tombstone the live rows matching ``condition`` (caller holds the lock)."""
+        by_tenant: dict[str, list[int]] = {}
+        for tenant_id, row in self._db.execute(
+            f"SELECT tenant_id, row FROM chunks WHERE {condition} AND deleted = 0",
+            params,
+        ):
+            by_tenant.setdefault(tenant_id, []).append(row)
+
+        for tenant_id, rows in by_tenant.items():
+            part = self._partition(tenant_id)
+            with part.locked():
+                self._refresh(tenant_id, part)
+                self._tombstone(tenant_id, part, rows)
+                part.flush()
+                self._db.commit()
+
+    def compact_lists(self) -> None:
+        """Drop tombstoned rows from every loaded partition's inverted lists."""
+        with self._lock:
+            for part in self._partitions.values():
+                part.rebuild_lists()
+
+    def close(self) -> None:
+        with self._lock:
+            for part in self._partitions.values():
+                part.flush()
+            self._partitions.clear()
+            self._db.close()
@@ -0,0 +1,301 @@
+"""Keyword index — per-tenant BM25 index for hybrid search.
+
+Built incrementally as chunks are ingested (RAGPipeline, legal indexer),
+queried by SearchService as a candidate generator alongside vector search.
+Catches exact article numbers, party names and references that embeddings
+miss.
+
+The index is a SQLite FTS5 database (KEYWORD_INDEX_PATH, in the app data
+directory), so every process — uvicorn workers, Celery, the CLI indexer —
+reads and writes the same postings: a chunk ingested anywhere is keyword
+searchable everywhere, and no worker holds a copy of the chunk text. Each
+tenant has its own FTS5 table so BM25 statistics stay per tenant; a side
+table maps chunk and document ids to FTS rows for deletes.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterator, Optional
+
+from apps.api.config.storage import DATA_DIR
+from apps.api.services.vector_service import VectorSearchResult, VectorService
+
+DEFAULT_KEYWORD_INDEX_PATH = os.getenv(
+    "KEYWORD_INDEX_PATH", os.path.join(DATA_DIR, "keywords.db")
+)
+
+# FTS5's bm25() uses the Robertson/Sparck Jones defaults k1=1.2, b=0.75
+_BUSY_TIMEOUT = 30.0
+_FILTER_PAGE = 256
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens (keeps digits, so "1382" is searchable)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _match_expression(query: str) -> str:
+    """FTS5 query matching any of the query's terms."""
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(tokenize(query)))
+
+
+class KeywordIndex:
+    """BM25 index partitioned by tenant, stored in SQLite FTS5.
+
+    ``path`` is the shared database file; without one the index is private
+    to this instance (an in-memory database, for stubs and tests).
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(
+            path or ":memory:",
+            timeout=_BUSY_TIMEOUT,
+            isolation_level=None,  # transactions are explicit (_transaction)
+            check_same_thread=False,
+        )
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS keyword_chunks (
+                tenant_id TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                document_id TEXT,
+                fts_row INTEGER NOT NULL,
+                PRIMARY KEY (tenant_id, chunk_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_keyword_chunks_chunk
+                ON keyword_chunks (chunk_id);
+            CREATE INDEX IF NOT EXISTS ix_keyword_chunks_document
+                ON keyword_chunks (document_id);
+            """
+        )
+        self._tables: set[str] = set()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Write transaction; takes the database write lock up front."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    @staticmethod
+    def _table(tenant_id: str) -> str:
+        return "kw_" + hashlib.sha256(tenant_id.encode()).hexdigest()[:16]
+
+    def _ensure_table(self, tenant_id: str) -> str:
+        """FTS5 table of a tenant, created on first use (caller holds the lock)."""
+        table = self._table(tenant_id)
+        if table not in self._tables:
+            self._db.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                "content, chunk_id UNINDEXED, case_id UNINDEXED, "
+                "payload UNINDEXED, tokenize='unicode61 remove_diacritics 0')"
+            )
+            self._tables.add(table)
+        return table
+
+    def _has_table(self, tenant_id: str) -> Optional[str]:
+        table = self._table(tenant_id)
+        if table in self._tables:
+            return table
+        found = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        ).fetchone()
+        if found is None:
+            return None
+        self._tables.add(table)
+        return table
+
+    def add(self, chunk_ids: list[str], payloads: list[dict]) -> None:
+        """Index chunks (same payloads as VectorService.upsert_chunks)."""
+        with self._transaction():
+            self._add(chunk_ids, payloads)
+
+    def _add(self, chunk_ids: list[str], payloads: list[dict]) -> None:
+        """Index chunks inside the caller's transaction."""
+        for chunk_id, payload in zip(chunk_ids, payloads):
+            tenant_id = str(payload.get("tenant_id") or "")
+            table = self._ensure_table(tenant_id)
+            self._remove(tenant_id, [chunk_id])
+
+            stored = {k: v for k, v in payload.items() if k != "content"}
+            case_id = payload.get("case_id")
+            cursor = self._db.execute(
+                f"INSERT INTO {table} (content, chunk_id, case_id, payload) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    payload.get("content") or "",
+                    chunk_id,
+                    str(case_id) if case_id is not None else None,
+                    json.dumps(stored, default=str),
+                ),
+            )
+            self._db.execute(
+                "INSERT INTO keyword_chunks "
+                "(tenant_id, chunk_id, document_id, fts_row) VALUES (?, ?, ?, ?)",
+                (tenant_id, chunk_id, payload.get("document_id"), cursor.lastrowid),
+            )
+
+    def _remove(self, tenant_id: str, chunk_ids: list[str]) -> None:
+        """Drop chunks of one tenant (inside the caller's transaction)."""
+        table = self._has_table(tenant_id)
+        if table is None:
+            return
+        for chunk_id in chunk_ids:
+            row = self._db.execute(
+                "DELETE FROM keyword_chunks WHERE tenant_id = ? AND chunk_id = ? "
+                "RETURNING fts_row",
+                (tenant_id, chunk_id),
+            ).fetchone()
+            if row is not None:
+                self._db.execute(f"DELETE FROM {table} WHERE rowid = ?", row)
+
+    def _remove_where(self, condition: str, params: list) -> None:
+        by_tenant: dict[str, list[str]] = {}
+        for tenant_id, chunk_id in self._db.execute(
+            f"SELECT tenant_id, chunk_id FROM keyword_chunks WHERE {condition}",
+            params,
+        ).fetchall():
+            by_tenant.setdefault(tenant_id, []).append(chunk_id)
+        for tenant_id, chunk_ids in by_tenant.items():
+            self._remove(tenant_id, chunk_ids)
+
+    def delete_by_document(self, document_id: str) -> None:
+        """Remove all chunks of a document."""
+        with self._transaction():
+            self._remove_where("document_id = ?", [document_id])
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Remove the given chunks, whatever their tenant."""
+        with self._transaction():
+            for chunk_id in chunk_ids:
+                self._remove_where("chunk_id = ?", [chunk_id])
+
+    def search(
+        self,
+        query: str,
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[VectorSearchResult]:
+        """BM25 search within a tenant; same result shape as vector search."""
+        expression = _match_expression(query)
+        if not expression or top_k <= 0:
+            return []
+
+        sql_filter, params = "", [expression]
+        if case_id:
+            sql_filter, params = "AND case_id = ? ", [expression, str(case_id)]
+
+        hits: list[tuple[str, float, dict]] = []
+        with self._lock:
+            table = self._has_table(str(tenant_id))
+            if table is None:
+                return []
+            # bm25() is lower-is-better; payload filters are checked in
+            # rank order until top_k pass
+            cursor = self._db.execute(
+                f"SELECT chunk_id, content, payload, -bm25({table}) FROM {table} "
+                f"WHERE {table} MATCH ? {sql_filter}ORDER BY bm25({table})"
+                + ("" if filters else f" LIMIT {int(top_k)}"),
+                params,
+            )
+            while len(hits) < top_k:
+                rows = cursor.fetchmany(_FILTER_PAGE)
+                if not rows:
+                    break
+                for chunk_id, content, stored, score in rows:
+                    payload = {**json.loads(stored), "content": content}
+                    if filters and any(payload.get(k) != v for k, v in filters.items()):
+                        continue
+                    hits.append((chunk_id, score, payload))
+                    if len(hits) == top_k:
+                        break
+            cursor.close()
+
+        return [
+            VectorSearchResult(
+                chunk_id=chunk_id,
+                score=score,
+                content=payload.get("content", ""),
+                case_id=payload.get("case_id"),
+                document_id=payload.get("document_id"),
+                evidence_link_id=payload.get("evidence_link_id"),
+                page_number=payload.get("page_number"),
+                chunk_index=payload.get("chunk_index", 0),
+                metadata=payload.get("metadata"),
+            )
+            for chunk_id, score, payload in hits
+        ]
+
+    def rebuild(self, vector_service: VectorService, if_empty: bool = False) -> int:
+        """Replace the index with every chunk held by ``vector_service``.
+
+        With ``if_empty`` the index is only built when it holds no chunk yet
+        (first start against an existing vector store); concurrent callers
+        wait on the write lock and find it built. Without it the index is
+        replaced even if populated, e.g. to match an in-memory vector store
+        that started empty. Returns the number of chunks indexed.
+        """
+        with self._transaction():
+            if (
+                if_empty
+                and self._db.execute("SELECT 1 FROM keyword_chunks LIMIT 1").fetchone()
+            ):
+                return 0
+            for (table,) in self._db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name GLOB 'kw_*' AND sql LIKE 'CREATE VIRTUAL TABLE%'"
+            ).fetchall():
+                self._db.execute(f"DROP TABLE {table}")
+            self._db.execute("DELETE FROM keyword_chunks")
+            self._tables.clear()
+
+            total = 0
+            for chunk_ids, payloads in vector_service.scroll_payloads():
+                self._add(chunk_ids, payloads)
+                total += len(chunk_ids)
+        return total
+
+    def document_count(self, tenant_id: str) -> int:
+        """Number of indexed chunks for a tenant."""
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM keyword_chunks WHERE tenant_id = ?",
+                (str(tenant_id),),
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Singleton instance
+_keyword_index: Optional[KeywordIndex] = None
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Get or create the process's handle on the shared KeywordIndex."""
+    global _keyword_index
+    if _keyword_index is None:
+        _keyword_index = KeywordIndex(DEFAULT_KEYWORD_INDEX_PATH)
+    return _keyword_index
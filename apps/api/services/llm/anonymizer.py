@@ -9,22 +9,24 @@ original values in the output.
 GDPR Art. 4(5): Truly anonymized data falls outside GDPR scope.
 However, pseudonymized data (reversible) still requires safeguards.
 Our approach: reversible replacement with ephemeral in-memory mapping.
+
+Substitution is linear in the text length: anonymize() finds the entity
+values in one regex pass over a trie of the values, deanonymize() restores
+in one pass of a placeholder regex, and StreamDeanonymizer restores streamed
+responses chunk by chunk, holding back only a placeholder split across
+chunks. Overlapping values (an address ending inside an IBAN) are replaced
+by one placeholder for their union, so no part of either reaches the
+provider.
 """
 
-from dataclasses import dataclass
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
 
 from apps.api.services.llm.data_classifier import (
     DetectedEntity,
-    _ADDRESS_KEYWORDS,
-    _BCE_PATTERN,
-    _DOB_PATTERN,
-    _EMAIL_PATTERN,
-    _IBAN_BE_PATTERN,
-    _LEGAL_CONTEXT_NAME,
-    _NISS_PATTERN,
-    _PHONE_BE_PATTERN,
-    _POSTAL_CODE_BE,
-    _PROPER_NAME_PATTERN,
+    RequestScans,
+    scan_text,
 )
 
 
@@ -36,6 +38,9 @@ class AnonymizationResult:
     mapping: dict[str, str]  # placeholder → original
     entity_count: int
     method: str = "regex_replacement"
+    entities: list[DetectedEntity] = field(default_factory=list)
+    # Replaced regions of the original text, sorted and disjoint
+    replaced_spans: list[tuple[int, int]] = field(default_factory=list)
 
 
 # Entity type → placeholder prefix
@@ -51,6 +56,67 @@ _PLACEHOLDER_MAP: dict[str, str] = {
     "company_name": "ENTREPRISE",
 }
 
+# Any placeholder produced by anonymize(): [PREFIX_N]
+_PLACEHOLDER_RE = re.compile(r"\[[A-Z_]+_\d+\]")
+
+
+def _trie_regex(node: dict) -> str:
+    branches = [
+        re.escape(char) + _trie_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A value ending here is only matched if no longer value continues
+    return f"(?:{body})?" if "" in node else body
+
+
+def _literal_pattern(values: list[str]) -> re.Pattern:
+    """Regex finding the longest of the values starting at every position.
+
+    The values are merged into a trie, so matching costs about one step per
+    character instead of one comparison per value per position. The trie is
+    wrapped in a lookahead: matches are reported at every position, even
+    inside another match, so overlapping values are all found.
+    """
+    trie: dict = {}
+    for value in values:
+        node = trie
+        for char in value:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return re.compile(f"(?=({_trie_regex(trie)}))")
+
+
+def _value_spans(text: str, values: list[str]) -> list[tuple[int, int, list[str]]]:
+    """Occurrences of the values, overlapping ones merged into one span.
+
+    Returns (start, end, values found in the span) in text order.
+    """
+    spans: list[tuple[int, int, list[str]]] = []
+    for match in _literal_pattern(values).finditer(text):
+        start, end = match.start(1), match.end(1)
+        if spans and start < spans[-1][1]:
+            spans[-1] = (
+                spans[-1][0],
+                max(end, spans[-1][1]),
+                [*spans[-1][2], match.group(1)],
+            )
+        else:
+            spans.append((start, end, [match.group(1)]))
+    return spans
+
+
+def _covered(entity: DetectedEntity, spans: list[tuple[int, int]]) -> bool:
+    i = bisect_right(spans, (entity.start, float("inf"))) - 1
+    return i >= 0 and spans[i][0] <= entity.start and entity.end <= spans[i][1]
+
+
+def _restore(text: str, mapping: dict[str, str]) -> str:
+    return _PLACEHOLDER_RE.sub(lambda m: mapping.get(m.group(), m.group()), text)
+
 
 class DataAnonymizer:
     """Anonymizes Belgian PII data for safe transmission to non-EU LLM providers.
@@ -60,47 +126,64 @@ class DataAnonymizer:
     sent to any external service.
     """
 
-    def anonymize(self, text: str) -> AnonymizationResult:
+    def anonymize(
+        self, text: str, scans: RequestScans | None = None
+    ) -> AnonymizationResult:
         """Anonymize text and return the result with mapping.
 
+        ``scans`` shares the scan of ``text`` with the request's other steps.
+
         Returns:
             AnonymizationResult with anonymized text and placeholder→original mapping.
             The mapping can be used with deanonymize() to restore the response.
         """
-        entities = self._detect_entities(text)
-
-        # Sort entities by position (end→start) to replace from end to beginning
-        # This preserves indices as we modify the text
-        entities.sort(key=lambda e: e.start, reverse=True)
+        entities = self._detect_entities(text, scans)
 
         # Deduplicate by value (same entity appearing multiple times)
         seen_values: dict[str, str] = {}  # original_value → placeholder
+        value_types: dict[str, str] = {}  # original_value → entity_type
         counters: dict[str, int] = {}  # entity_type → counter
         mapping: dict[str, str] = {}  # placeholder → original_value
 
+        def assign(value: str, entity_type: str) -> str:
+            prefix = _PLACEHOLDER_MAP.get(entity_type, "ENTITE")
+            counters[entity_type] = counters.get(entity_type, 0) + 1
+            placeholder = f"[{prefix}_{counters[entity_type]}]"
+            seen_values[value] = placeholder
+            value_types[value] = entity_type
+            mapping[placeholder] = value
+            return placeholder
+
         # First pass: assign placeholders to unique values
         for entity in sorted(entities, key=lambda e: e.start):
-            if entity.value in seen_values:
-                continue
-            prefix = _PLACEHOLDER_MAP.get(entity.entity_type, "ENTITE")
-            counters.setdefault(entity.entity_type, 0)
-            counters[entity.entity_type] += 1
-            placeholder = f"[{prefix}_{counters[entity.entity_type]}]"
-            seen_values[entity.value] = placeholder
-            mapping[placeholder] = entity.value
-
-        # Second pass: replace all occurrences in text
-        anonymized = text
-        for original, placeholder in sorted(
-            seen_values.items(), key=lambda x: len(x[0]), reverse=True
-        ):
-            anonymized = anonymized.replace(original, placeholder)
+            if entity.value not in seen_values:
+                assign(entity.value, entity.entity_type)
+
+        # Second pass: rebuild the text once, replacing every occurrence of
+        # every value (not only the detected spans). Overlapping occurrences
+        # are replaced as one span, under a placeholder of the type of the
+        # longest value, so no fragment of either value is left behind.
+        parts: list[str] = []
+        replaced_spans: list[tuple[int, int]] = []
+        last = 0
+        if seen_values:
+            for start, end, values in _value_spans(text, list(seen_values)):
+                union = text[start:end]
+                placeholder = seen_values.get(union) or assign(
+                    union, value_types[max(values, key=len)]
+                )
+                parts += [text[last:start], placeholder]
+                replaced_spans.append((start, end))
+                last = end
+        parts.append(text[last:])
 
         return AnonymizationResult(
-            anonymized_text=anonymized,
+            anonymized_text="".join(parts),
             mapping=mapping,
             entity_count=len(mapping),
             method="regex_replacement",
+            entities=entities,
+            replaced_spans=replaced_spans,
         )
 
     def deanonymize(self, text: str, mapping: dict[str, str]) -> str:
@@ -113,18 +196,14 @@ class DataAnonymizer:
         Returns:
             Text with placeholders replaced by original values.
         """
-        result = text
-        # Replace longest placeholders first to avoid partial matches
-        for placeholder, original in sorted(
-            mapping.items(), key=lambda x: len(x[0]), reverse=True
-        ):
-            result = result.replace(placeholder, original)
-        return result
+        if not mapping:
+            return text
+        return _restore(text, mapping)
 
     def anonymize_messages(
-        self, messages: list[dict]
+        self, messages: list[dict], scans: RequestScans | None = None
     ) -> tuple[list[dict], dict[str, str]]:
-        """Anonymize a list of chat messages.
+        """Anonymize a list of chat messages (each message is scanned apart).
 
         Returns:
             Tuple of (anonymized_messages, combined_mapping).
@@ -135,7 +214,14 @@ class DataAnonymizer:
         for msg in messages:
             content = msg.get("content", "")
             if isinstance(content, str) and content:
-                result = self.anonymize(content)
+                result = self.anonymize(content, scans)
+                if not self.verify_anonymization(
+                    result.anonymized_text, result.entities, result.replaced_spans
+                ):
+                    raise ValueError(
+                        "Anonymization verification failed: entity spans not "
+                        "fully replaced"
+                    )
                 combined_mapping.update(result.mapping)
                 anonymized_messages.append({**msg, "content": result.anonymized_text})
             else:
@@ -148,7 +234,10 @@ class DataAnonymizer:
         return self.deanonymize(text, mapping)
 
     def verify_anonymization(
-        self, anonymized_text: str, original_entities: list[DetectedEntity]
+        self,
+        anonymized_text: str,
+        original_entities: list[DetectedEntity],
+        replaced_spans: list[tuple[int, int]] | None = None,
     ) -> bool:
         """Verify that NO original entity values remain in the anonymized text.
 
@@ -158,21 +247,26 @@ class DataAnonymizer:
         Args:
             anonymized_text: The text after anonymization.
             original_entities: The entities that were detected before anonymization.
+            replaced_spans: Replaced regions of the original text
+                (AnonymizationResult.replaced_spans). When given, every
+                entity span must lie inside one of them, which also catches
+                a value only partly replaced.
 
         Returns:
             True if anonymization is verified (no leaks). False if any entity
             value is still present in the anonymized text.
         """
-        for entity in original_entities:
-            value = entity.value.strip()
-            if not value or len(value) < 3:
-                continue
-            if value in anonymized_text:
+        for value in {entity.value.strip() for entity in original_entities}:
+            if len(value) >= 3 and value in anonymized_text:
                 return False
+        if replaced_spans is not None:
+            return all(_covered(e, replaced_spans) for e in original_entities)
         return True
 
-    def _detect_entities(self, text: str) -> list[DetectedEntity]:
-        """Detect all PII entities in text using regex patterns.
+    def _detect_entities(
+        self, text: str, scans: RequestScans | None = None
+    ) -> list[DetectedEntity]:
+        """Detect all PII entities in text (one ``scan_text`` pass).
 
         Belgian-specific patterns:
         - NISS: XX.XX.XX-XXX.XX
@@ -184,81 +278,66 @@ class DataAnonymizer:
         - Date of birth: after "né(e)" or "date de naissance"
         - Person names: after titles or capitalized proper names
         """
-        entities: list[DetectedEntity] = []
-
-        # NISS
-        for m in _NISS_PATTERN.finditer(text):
-            entities.append(DetectedEntity("niss", m.group(), m.start(), m.end()))
-
-        # BCE
-        for m in _BCE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("bce", m.group(), m.start(), m.end()))
-
-        # Phone
-        for m in _PHONE_BE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("phone", m.group(), m.start(), m.end()))
-
-        # IBAN
-        for m in _IBAN_BE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("iban", m.group(), m.start(), m.end()))
-
-        # Email
-        for m in _EMAIL_PATTERN.finditer(text):
-            entities.append(DetectedEntity("email", m.group(), m.start(), m.end()))
-
-        # Date of birth
-        for m in _DOB_PATTERN.finditer(text):
-            entities.append(
-                DetectedEntity("date_of_birth", m.group(1), m.start(1), m.end(1))
-            )
-
-        # Person names (legal context — high confidence)
-        for m in _LEGAL_CONTEXT_NAME.finditer(text):
-            entities.append(
-                DetectedEntity(
-                    "person_name", m.group(), m.start(), m.end(), confidence=0.9
-                )
-            )
+        scan = scans.scan(text) if scans is not None else scan_text(text)
+        entities: list[DetectedEntity] = [
+            *scan.get("niss"),
+            *scan.get("bce"),
+            *scan.get("phone"),
+            *scan.get("iban"),
+            *scan.get("email"),
+            *scan.get("date_of_birth"),
+            # Person names: legal context (high confidence), then standalone
+            *scan.get("legal_name"),
+            *scan.get("proper_name"),
+        ]
 
-        # Person names (standalone proper names — medium confidence)
-        for m in _PROPER_NAME_PATTERN.finditer(text):
-            name = m.group(1)
-            # Skip common legal terms
-            if name.lower() not in {
-                "code civil",
-                "code pénal",
-                "cour appel",
-                "conseil état",
-                "moniteur belge",
-                "union européenne",
-            }:
+        # Addresses (street keyword + postal code)
+        postal_matches = scan.get("postal_code")
+        postal_starts = [p.start for p in postal_matches]
+        for addr in scan.get("address_keyword"):
+            # Pair with the next postal code after the keyword (within 100 chars)
+            i = bisect_right(postal_starts, addr.start)
+            if i < len(postal_starts) and postal_starts[i] - addr.start < 100:
+                postal = postal_matches[i]
                 entities.append(
                     DetectedEntity(
-                        "person_name", name, m.start(1), m.end(1), confidence=0.6
+                        "address",
+                        text[addr.start : postal.end],
+                        addr.start,
+                        postal.end,
+                        confidence=0.7,
                     )
                 )
 
-        # Addresses (street keyword + postal code)
-        addr_matches = list(_ADDRESS_KEYWORDS.finditer(text))
-        postal_matches = list(_POSTAL_CODE_BE.finditer(text))
-        if addr_matches and postal_matches:
-            # Pair each address keyword with the nearest following postal code
-            for addr in addr_matches:
-                # Find next postal code after this address keyword (within 100 chars)
-                for postal in postal_matches:
-                    if (
-                        postal.start() > addr.start()
-                        and (postal.start() - addr.start()) < 100
-                    ):
-                        entities.append(
-                            DetectedEntity(
-                                "address",
-                                text[addr.start() : postal.end()],
-                                addr.start(),
-                                postal.end(),
-                                confidence=0.7,
-                            )
-                        )
-                        break
-
         return entities
+
+
+class StreamDeanonymizer:
+    """Incremental deanonymize() for a streamed response.
+
+    feed() returns each chunk restored as soon as it is unambiguous. Only a
+    trailing fragment that is the start of a known placeholder (e.g.
+    "[PERS" while "[PERSONNE_1]" is mapped) is held back until the next
+    chunk or flush(); any other text, brackets included, passes through
+    immediately, so time-to-first-token matches a non-anonymized stream.
+    """
+
+    def __init__(self, mapping: dict[str, str]) -> None:
+        self._mapping = mapping
+        # Proper prefixes of the placeholders, e.g. "[", "[N", ..., "[NISS_1"
+        self._prefixes = {k[:i] for k in mapping for i in range(1, len(k))}
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk
+        self._pending = ""
+        # Placeholders contain a single "[", so only the last one can start
+        # a placeholder that is still incomplete
+        cut = text.rfind("[")
+        if cut != -1 and text[cut:] in self._prefixes:
+            text, self._pending = text[:cut], text[cut:]
+        return _restore(text, self._mapping)
+
+    def flush(self) -> str:
+        text, self._pending = self._pending, ""
+        return _restore(text, self._mapping)
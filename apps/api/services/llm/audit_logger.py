@@ -6,24 +6,49 @@ Art. 17: Quality management — usage stats and DPIA report export.
 
 GDPR Art. 35: Data Protection Impact Assessment (DPIA) is mandatory
 for high-risk processing. This logger provides data for DPIA reports.
+
+When AI_AUDIT_ASYNC is on, log_request / log_response / log_error are
+queued on the process-wide AuditWriter instead of round-tripping to the
+database in the request path; reads flush the queue first.
+
+Responses served from the gateway's response cache are logged under the
+CACHE_PROVIDER pseudo-provider: nothing left the platform for them, so they
+are kept out of the sub-processor and transfer sections of the reports.
 """
 
 import hashlib
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.services.llm.audit_writer import (
+    AI_AUDIT_ASYNC,
+    AuditWriter,
+    get_audit_writer,
+)
+from apps.api.services.llm.usage_rollup import usage_buckets
 from packages.db.models.ai_audit_log import AIAuditLog
 
+# Provider recorded for responses served from the response cache
+CACHE_PROVIDER = "cache"
+
 
 class AIAuditLogger:
     """Audit logger for AI Act EU compliance."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, writer: AuditWriter | None = None):
         self.session = session
+        if writer is None and AI_AUDIT_ASYNC:
+            writer = get_audit_writer()
+        self.writer = writer
+
+    async def _flush_writer(self) -> None:
+        """Make queued entries visible to this session's queries."""
+        if self.writer is not None:
+            await self.writer.flush()
 
     @staticmethod
     def hash_content(content: str) -> str:
@@ -47,6 +72,22 @@ class AIAuditLogger:
 
         Returns the audit log ID for later completion with log_response().
         """
+        if self.writer is not None:
+            return self.writer.add(
+                {
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "provider": provider,
+                    "model": model,
+                    "data_sensitivity": data_sensitivity,
+                    "was_anonymized": was_anonymized,
+                    "anonymization_method": anonymization_method,
+                    "prompt_hash": self.hash_content(prompt_content),
+                    "purpose": purpose,
+                    "metadata_": metadata or {},
+                }
+            )
+
         log = AIAuditLog(
             tenant_id=tenant_id,
             user_id=user_id,
@@ -75,6 +116,19 @@ class AIAuditLogger:
         error: str | None = None,
     ) -> None:
         """Complete an audit log entry with response data."""
+        fields = {
+            "response_hash": (
+                self.hash_content(response_content) if response_content else None
+            ),
+            "token_count_input": token_count_input,
+            "token_count_output": token_count_output,
+            "latency_ms": latency_ms,
+            "cost_estimate_eur": cost_estimate_eur,
+            "error": error,
+        }
+        if self.writer is not None and self.writer.update(request_id, fields):
+            return
+
         result = await self.session.execute(
             select(AIAuditLog).where(AIAuditLog.id == request_id)
         )
@@ -82,14 +136,8 @@ class AIAuditLogger:
         if log is None:
             return
 
-        log.response_hash = (
-            self.hash_content(response_content) if response_content else None
-        )
-        log.token_count_input = token_count_input
-        log.token_count_output = token_count_output
-        log.latency_ms = latency_ms
-        log.cost_estimate_eur = cost_estimate_eur
-        log.error = error
+        for name, value in fields.items():
+            setattr(log, name, value)
         await self.session.flush()
 
     async def log_error(
@@ -98,6 +146,9 @@ class AIAuditLogger:
         error: str,
     ) -> None:
         """Log an error for a failed request."""
+        if self.writer is not None and self.writer.update(request_id, {"error": error}):
+            return
+
         result = await self.session.execute(
             select(AIAuditLog).where(AIAuditLog.id == request_id)
         )
@@ -107,12 +158,40 @@ class AIAuditLogger:
         log.error = error
         await self.session.flush()
 
+    async def log_cancelled(
+        self,
+        request_id: uuid.UUID,
+        reason: str,
+        metadata: dict | None = None,
+    ) -> None:
+        """Mark a request abandoned by the gateway (e.g. lost a hedge race).
+
+        Not an error: the reason is recorded in the metadata, so error counts
+        (usage statistics, DPIA report) only reflect provider failures.
+        ``metadata`` is the one given to log_request, kept alongside.
+        """
+        merged = {**(metadata or {}), "cancelled": reason}
+        if self.writer is not None and self.writer.update(
+            request_id, {"metadata_": merged}
+        ):
+            return
+
+        result = await self.session.execute(
+            select(AIAuditLog).where(AIAuditLog.id == request_id)
+        )
+        log = result.scalar_one_or_none()
+        if log is None:
+            return
+        log.metadata_ = {**(log.metadata_ or {}), "cancelled": reason}
+        await self.session.flush()
+
     async def mark_human_validated(
         self,
         request_id: uuid.UUID,
         validator_id: uuid.UUID,
     ) -> None:
         """Mark an AI output as validated by a human (AI Act Art. 14)."""
+        await self._flush_writer()
         result = await self.session.execute(
             select(AIAuditLog).where(AIAuditLog.id == request_id)
         )
@@ -137,6 +216,7 @@ class AIAuditLogger:
         date_to: datetime | None = None,
     ) -> tuple[list[AIAuditLog], int]:
         """Get paginated audit logs with filters."""
+        await self._flush_writer()
         query = select(AIAuditLog).where(AIAuditLog.tenant_id == tenant_id)
 
         if provider:
@@ -172,86 +252,62 @@ class AIAuditLogger:
     ) -> dict:
         """Usage statistics for the last N days.
 
-        Returns breakdown by provider, sensitivity level, and cost.
+        Returns breakdown by provider, sensitivity level, and cost. Days
+        already rolled up are read from ai_usage_rollups; only the rest
+        (normally today) is aggregated from ai_audit_logs.
         """
+        await self._flush_writer()
+        # Naive UTC midnight, like ai_audit_logs.created_at
         cutoff = datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        from datetime import timedelta
-
-        cutoff = cutoff - timedelta(days=days)
-
-        base = select(AIAuditLog).where(
-            AIAuditLog.tenant_id == tenant_id,
-            AIAuditLog.created_at >= cutoff,
-        )
-
-        # Total requests
-        total_q = select(func.count()).select_from(base.subquery())
-        total = (await self.session.execute(total_q)).scalar_one()
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+        ) - timedelta(days=days)
+        buckets = await usage_buckets(self.session, tenant_id, since=cutoff)
 
         # By provider
-        by_provider_q = (
-            select(
-                AIAuditLog.provider,
-                func.count().label("count"),
-                func.sum(AIAuditLog.cost_estimate_eur).label("cost"),
-                func.sum(AIAuditLog.token_count_input).label("tokens_in"),
-                func.sum(AIAuditLog.token_count_output).label("tokens_out"),
-                func.avg(AIAuditLog.latency_ms).label("avg_latency"),
-            )
-            .where(
-                AIAuditLog.tenant_id == tenant_id,
-                AIAuditLog.created_at >= cutoff,
+        providers: dict[str, dict] = {}
+        for b in buckets:
+            p = providers.setdefault(
+                b["provider"],
+                {
+                    "count": 0,
+                    "cost": None,
+                    "tokens_in": 0,
+                    "tokens_out": 0,
+                    "latency_sum": 0,
+                    "latency_count": 0,
+                },
             )
-            .group_by(AIAuditLog.provider)
-        )
-        by_provider_rows = (await self.session.execute(by_provider_q)).all()
+            for key in ("count", "tokens_in", "tokens_out"):
+                p[key] += b[key]
+            p["latency_sum"] += b["latency_sum"]
+            p["latency_count"] += b["latency_count"]
+            if b["cost"] is not None:
+                p["cost"] = (p["cost"] or 0) + b["cost"]
         by_provider = [
             {
-                "provider": r.provider,
-                "count": r.count,
-                "cost_eur": float(r.cost) if r.cost else 0.0,
-                "tokens_in": r.tokens_in or 0,
-                "tokens_out": r.tokens_out or 0,
-                "avg_latency_ms": round(float(r.avg_latency)) if r.avg_latency else 0,
+                "provider": name,
+                "count": p["count"],
+                "cost_eur": float(p["cost"]) if p["cost"] else 0.0,
+                "tokens_in": p["tokens_in"],
+                "tokens_out": p["tokens_out"],
+                "avg_latency_ms": round(p["latency_sum"] / p["latency_count"])
+                if p["latency_count"] and p["latency_sum"]
+                else 0,
             }
-            for r in by_provider_rows
+            for name, p in providers.items()
         ]
 
         # By sensitivity
-        by_sens_q = (
-            select(
-                AIAuditLog.data_sensitivity,
-                func.count().label("count"),
-            )
-            .where(
-                AIAuditLog.tenant_id == tenant_id,
-                AIAuditLog.created_at >= cutoff,
-            )
-            .group_by(AIAuditLog.data_sensitivity)
-        )
-        by_sens_rows = (await self.session.execute(by_sens_q)).all()
-        by_sensitivity = {r.data_sensitivity: r.count for r in by_sens_rows}
-
-        # Human validation rate
-        validated_q = (
-            select(func.count())
-            .select_from(AIAuditLog)
-            .where(
-                AIAuditLog.tenant_id == tenant_id,
-                AIAuditLog.created_at >= cutoff,
-                AIAuditLog.human_validated.is_(True),
+        by_sensitivity: dict[str, int] = {}
+        for b in buckets:
+            by_sensitivity[b["data_sensitivity"]] = (
+                by_sensitivity.get(b["data_sensitivity"], 0) + b["count"]
             )
-        )
-        validated = (await self.session.execute(validated_q)).scalar_one()
 
-        # Total cost
-        total_cost_q = select(func.sum(AIAuditLog.cost_estimate_eur)).where(
-            AIAuditLog.tenant_id == tenant_id,
-            AIAuditLog.created_at >= cutoff,
-        )
-        total_cost = (await self.session.execute(total_cost_q)).scalar_one()
+        total = sum(b["count"] for b in buckets)
+        validated = sum(b["validated"] for b in buckets)
+        costs = [b["cost"] for b in buckets if b["cost"] is not None]
+        total_cost = sum(costs) if costs else None
 
         return {
             "period_days": days,
@@ -270,44 +326,19 @@ class AIAuditLogger:
 
         Required by GDPR Art. 35 for high-risk AI processing.
         """
+        await self._flush_writer()
         stats = await self.get_usage_stats(tenant_id, days=365)
 
-        # Get distinct providers used
-        providers_q = (
-            select(AIAuditLog.provider)
-            .where(AIAuditLog.tenant_id == tenant_id)
-            .distinct()
-        )
-        providers = [r[0] for r in (await self.session.execute(providers_q)).all()]
-
-        # Anonymization stats
-        total_q = (
-            select(func.count())
-            .select_from(AIAuditLog)
-            .where(AIAuditLog.tenant_id == tenant_id)
-        )
-        total_all = (await self.session.execute(total_q)).scalar_one()
-
-        anon_count_q = (
-            select(func.count())
-            .select_from(AIAuditLog)
-            .where(
-                AIAuditLog.tenant_id == tenant_id,
-                AIAuditLog.was_anonymized.is_(True),
-            )
-        )
-        anon_count = (await self.session.execute(anon_count_q)).scalar_one()
-
-        # Error rate
-        error_q = (
-            select(func.count())
-            .select_from(AIAuditLog)
-            .where(
-                AIAuditLog.tenant_id == tenant_id,
-                AIAuditLog.error.isnot(None),
+        # Providers, anonymization and errors over all time
+        all_time = await usage_buckets(self.session, tenant_id)
+        providers = list(
+            dict.fromkeys(
+                b["provider"] for b in all_time if b["provider"] != CACHE_PROVIDER
             )
         )
-        error_count = (await self.session.execute(error_q)).scalar_one()
+        total_all = sum(b["count"] for b in all_time)
+        anon_count = sum(b["anonymized"] for b in all_time)
+        error_count = sum(b["errors"] for b in all_time)
 
         provider_details = {
             "mistral": {
@@ -437,10 +468,14 @@ class AIAuditLogger:
         Required by GDPR Art. 30 for all processing activities.
         Must include: purposes, categories, recipients, transfers, retention.
         """
+        await self._flush_writer()
         # Get distinct providers used
         providers_q = (
             select(AIAuditLog.provider)
-            .where(AIAuditLog.tenant_id == tenant_id)
+            .where(
+                AIAuditLog.tenant_id == tenant_id,
+                AIAuditLog.provider != CACHE_PROVIDER,
+            )
             .distinct()
         )
         providers_used = [r[0] for r in (await self.session.execute(providers_q)).all()]
@@ -0,0 +1,550 @@
+"""Asynchronous, batched writer for AI audit log entries.
+
+AIAuditLogger used to flush every log_request / log_response / log_error
+to the database inside the request path: a single fallback chain in
+LLMGateway.complete cost 4-6 round-trips. With the writer, entries are
+queued in memory and written by a background task:
+
+- log_request generates the row id client-side (no round-trip) and queues
+  the row; a response or error for a still-queued row is merged into it,
+  so a successful attempt becomes one INSERT.
+- Every AI_AUDIT_FLUSH_INTERVAL seconds, or once AI_AUDIT_BATCH_SIZE
+  entries are queued, rows are bulk-inserted (one transaction per tenant,
+  under its RLS scope), followed by the updates of rows written earlier.
+- If the database is unavailable, the batch is appended to a local JSONL
+  spill file (AI_AUDIT_SPILL_PATH, by default in the app data directory
+  whatever the working directory) and replayed, before anything newer, on
+  the next flush. Inserts ignore ids already present, so a replay is idempotent.
+  Nothing is deleted: the table stays append-only.
+- An entry the database refuses (integrity or data error) is isolated by
+  retrying the tenant's entries one per transaction, so it never holds back
+  the rest; it is re-spilled with an attempt count and moved to a dead-letter
+  file ("<spill>.dead") after AI_AUDIT_MAX_ATTEMPTS. Spill lines that cannot
+  be decoded (torn by a crash or a full disk) go to "<spill>.corrupt".
+- The spill file is shared by every worker process: appends take an
+  exclusive lock on "<spill>.lock", and a replay renames the spill file to a
+  replay file of its own (locked until written), so entries appended by
+  another process are never lost. File I/O runs in a thread.
+- close() runs in the FastAPI lifespan shutdown and flushes what is left.
+
+Readers (AIAuditLogger queries and exports) call flush() first, so they
+see every entry logged before them.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import IO, Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from apps.api.config.storage import DATA_DIR
+from apps.api.services.metrics import llm_audit_entries_total, llm_audit_queue_depth
+from packages.db.models.ai_audit_log import AIAuditLog
+from packages.db.session import get_tenant_session
+
+logger = logging.getLogger(__name__)
+
+AI_AUDIT_ASYNC = os.getenv("AI_AUDIT_ASYNC", "true").lower() == "true"
+AI_AUDIT_BATCH_SIZE = int(os.getenv("AI_AUDIT_BATCH_SIZE", "200"))
+AI_AUDIT_FLUSH_INTERVAL = float(os.getenv("AI_AUDIT_FLUSH_INTERVAL", "0.5"))
+AI_AUDIT_SPILL_PATH = os.getenv(
+    "AI_AUDIT_SPILL_PATH", os.path.join(DATA_DIR, "ai_audit_spill.jsonl")
+)
+AI_AUDIT_MAX_ATTEMPTS = int(os.getenv("AI_AUDIT_MAX_ATTEMPTS", "5"))
+
+# Row ids -> tenant, to scope updates of rows already written
+_TENANT_MEMORY = 10_000
+
+_UUID_FIELDS = ("id", "tenant_id", "user_id", "human_validator_id")
+_DATETIME_FIELDS = ("created_at", "human_validated_at")
+
+
+def _encode(fields: dict) -> dict:
+    """JSON-safe copy of row fields (spill file)."""
+    encoded = {}
+    for key, value in fields.items():
+        if isinstance(value, (uuid.UUID, Decimal)):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        encoded[key] = value
+    return encoded
+
+
+def _decode(fields: dict) -> dict:
+    decoded = dict(fields)
+    for key in _UUID_FIELDS:
+        if decoded.get(key) is not None:
+            decoded[key] = uuid.UUID(decoded[key])
+    for key in _DATETIME_FIELDS:
+        if decoded.get(key) is not None:
+            decoded[key] = datetime.fromisoformat(decoded[key])
+    if decoded.get("cost_estimate_eur") is not None:
+        decoded["cost_estimate_eur"] = Decimal(decoded["cost_estimate_eur"])
+    return decoded
+
+
+# tenant -> (rows to insert by id, field updates by id)
+_Batch = dict[uuid.UUID, tuple[dict[uuid.UUID, dict], dict[uuid.UUID, dict]]]
+
+
+def _merge(target: _Batch, batch: _Batch) -> None:
+    for tenant_id, (rows, updates) in batch.items():
+        target_rows, target_updates = target.setdefault(tenant_id, ({}, {}))
+        target_rows.update(rows)
+        target_updates.update(updates)
+
+
+class AuditWriter:
+    """In-memory queue of audit entries with a background bulk writer."""
+
+    def __init__(
+        self,
+        batch_size: int = AI_AUDIT_BATCH_SIZE,
+        flush_interval: float = AI_AUDIT_FLUSH_INTERVAL,
+        spill_path: str = AI_AUDIT_SPILL_PATH,
+        session_factory: Any = get_tenant_session,
+        max_attempts: int = AI_AUDIT_MAX_ATTEMPTS,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.max_attempts = max(1, max_attempts)
+        self._session_factory = session_factory
+        self._rows: dict[uuid.UUID, dict] = {}
+        self._updates: dict[uuid.UUID, dict] = {}
+        self._tenants: OrderedDict[uuid.UUID, uuid.UUID] = OrderedDict()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    # ── Queueing ──
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows) + len(self._updates)
+
+    def add(self, row: dict) -> uuid.UUID:
+        """Queue a new row; returns its id."""
+        row.setdefault("id", uuid.uuid4())
+        row.setdefault("created_at", datetime.now(timezone.utc).replace(tzinfo=None))
+        row.setdefault("human_validated", False)
+        row_id = row["id"]
+        self._rows[row_id] = row
+        self._tenants[row_id] = row["tenant_id"]
+        while len(self._tenants) > _TENANT_MEMORY:
+            self._tenants.popitem(last=False)
+        self._queued()
+        return row_id
+
+    def update(self, row_id: uuid.UUID, fields: dict) -> bool:
+        """Queue field updates for a row; False if the row is unknown here."""
+        row = self._rows.get(row_id)
+        if row is not None:
+            row.update(fields)
+            return True
+        tenant_id = self._tenants.get(row_id)
+        if tenant_id is None:
+            return False
+        pending = self._updates.setdefault(row_id, {"tenant_id": tenant_id})
+        pending.update(fields)
+        self._queued()
+        return True
+
+    def _queued(self) -> None:
+        llm_audit_queue_depth.set(self.pending)
+        self._ensure_task()
+        if self.pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._flush_lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:  # never let the writer die
+                logger.error("AI audit flush failed: %s", e)
+
+    # ── Writing ──
+
+    def _take(self) -> _Batch:
+        """Swap out the queue, grouped by tenant."""
+        rows, self._rows = self._rows, {}
+        updates, self._updates = self._updates, {}
+        llm_audit_queue_depth.set(0)
+        return self._group(rows, updates)
+
+    def _requeue(self, batch: _Batch) -> None:
+        """Put back a taken batch that could be neither written nor spilled."""
+        for tenant_id, (rows, updates) in batch.items():
+            for row_id, row in rows.items():
+                newer = self._updates.pop(row_id, None)
+                if newer is not None:
+                    newer.pop("tenant_id")
+                    row.update(newer)
+                self._rows[row_id] = row
+            for row_id, fields in updates.items():
+                newer = self._updates.get(row_id, {})
+                self._updates[row_id] = {"tenant_id": tenant_id, **fields, **newer}
+        llm_audit_queue_depth.set(self.pending)
+
+    @staticmethod
+    def _group(rows: dict[uuid.UUID, dict], updates: dict[uuid.UUID, dict]) -> _Batch:
+        batch: _Batch = {}
+        for row_id, row in rows.items():
+            batch.setdefault(row["tenant_id"], ({}, {}))[0][row_id] = row
+        for row_id, fields in updates.items():
+            fields = dict(fields)
+            tenant_id = fields.pop("tenant_id")
+            batch.setdefault(tenant_id, ({}, {}))[1][row_id] = fields
+        return batch
+
+    async def _write_tenant(
+        self,
+        tenant_id: uuid.UUID,
+        rows: dict[uuid.UUID, dict],
+        updates: dict[uuid.UUID, dict],
+    ) -> None:
+        async with self._session_factory(tenant_id) as session:
+            if rows:
+                await session.execute(
+                    insert(AIAuditLog).on_conflict_do_nothing(index_elements=["id"]),
+                    list(rows.values()),
+                )
+            for row_id, fields in updates.items():
+                await session.execute(
+                    update(AIAuditLog).where(AIAuditLog.id == row_id).values(**fields)
+                )
+
+    async def _write(self, batch: _Batch) -> tuple[_Batch, _Batch]:
+        """Write each tenant's entries in one transaction.
+
+        Returns the entries that failed because the database is unavailable,
+        and those it rejected (to be retried, then dead-lettered).
+        """
+        failed: _Batch = {}
+        rejected: _Batch = {}
+        for tenant_id, (rows, updates) in batch.items():
+            try:
+                await self._write_tenant(tenant_id, rows, updates)
+            except (IntegrityError, DataError) as e:
+                if len(rows) + len(updates) == 1:
+                    logger.warning(
+                        "AI audit entry rejected for tenant %s: %s", tenant_id, e
+                    )
+                    rejected[tenant_id] = (rows, updates)
+                    continue
+                # One bad entry fails the transaction: write the others alone
+                singles = [
+                    {tenant_id: ({row_id: row}, {})} for row_id, row in rows.items()
+                ]
+                singles += [
+                    {tenant_id: ({}, {row_id: fields})}
+                    for row_id, fields in updates.items()
+                ]
+                for single in singles:
+                    single_failed, single_rejected = await self._write(single)
+                    _merge(failed, single_failed)
+                    _merge(rejected, single_rejected)
+                continue
+            except Exception as e:
+                logger.warning("AI audit write failed for tenant %s: %s", tenant_id, e)
+                failed[tenant_id] = (rows, updates)
+                continue
+            llm_audit_entries_total.labels(result="written").inc(
+                len(rows) + len(updates)
+            )
+        return failed, rejected
+
+    async def flush(self) -> None:
+        """Write everything queued so far (spilling on database errors)."""
+        if self._flush_lock is None:
+            if not self.pending:
+                return
+            self._ensure_task()
+        async with self._flush_lock:
+            # Spilled entries go first, so updates never precede their row.
+            # The queue is taken only once the replay went through: if it
+            # raises, the entries stay queued for the next flush.
+            replayed = await self._replay()
+            batch = self._take()
+            if not batch:
+                return
+            try:
+                if not replayed:
+                    await self._spill(batch)
+                    return
+                failed, rejected = await self._write(batch)
+                if failed:
+                    await self._spill(failed)
+                if rejected:
+                    await self._reject(rejected, {})
+            except Exception:
+                self._requeue(batch)
+                raise
+
+    # ── Spill file ──
+
+    @staticmethod
+    def _lines(batch: _Batch, attempts: dict[uuid.UUID, int]) -> list[str]:
+        lines = []
+        for tenant_id, (rows, updates) in batch.items():
+            lines.extend(
+                json.dumps(
+                    {
+                        "op": "insert",
+                        "fields": _encode(row),
+                        "attempts": attempts.get(row_id, 0),
+                    }
+                )
+                for row_id, row in rows.items()
+            )
+            lines.extend(
+                json.dumps(
+                    {
+                        "op": "update",
+                        "fields": _encode(
+                            {"id": row_id, "tenant_id": tenant_id, **fields}
+                        ),
+                        "attempts": attempts.get(row_id, 0),
+                    }
+                )
+                for row_id, fields in updates.items()
+            )
+        return lines
+
+    async def _spill(
+        self, batch: _Batch, attempts: Optional[dict[uuid.UUID, int]] = None
+    ) -> None:
+        lines = self._lines(batch, attempts or {})
+        await asyncio.to_thread(self._append_lines, self.spill_path, lines)
+        llm_audit_entries_total.labels(result="spilled").inc(len(lines))
+        logger.error(
+            "AI audit database unavailable: %d entries spilled to %s",
+            len(lines),
+            self.spill_path,
+        )
+
+    async def _reject(self, batch: _Batch, attempts: dict[uuid.UUID, int]) -> None:
+        """Re-spill rejected entries; dead-letter them after max_attempts."""
+        attempts = dict(attempts)
+        retry: _Batch = {}
+        dead: _Batch = {}
+        for tenant_id, (rows, updates) in batch.items():
+            for kind, entries in enumerate((rows, updates)):
+                for row_id, fields in entries.items():
+                    attempts[row_id] = attempts.get(row_id, 0) + 1
+                    target = dead if attempts[row_id] >= self.max_attempts else retry
+                    target.setdefault(tenant_id, ({}, {}))[kind][row_id] = fields
+        if retry:
+            lines = self._lines(retry, attempts)
+            await asyncio.to_thread(self._append_lines, self.spill_path, lines)
+            llm_audit_entries_total.labels(result="rejected").inc(len(lines))
+        if dead:
+            lines = self._lines(dead, attempts)
+            await asyncio.to_thread(
+                self._append_lines, f"{self.spill_path}.dead", lines
+            )
+            llm_audit_entries_total.labels(result="dead_lettered").inc(len(lines))
+            logger.error(
+                "AI audit: %d entries rejected %d times moved to %s.dead",
+                len(lines),
+                self.max_attempts,
+                self.spill_path,
+            )
+
+    @contextmanager
+    def _spill_lock(self) -> Iterator[None]:
+        """Exclusive lock on the spill file, across processes."""
+        directory = os.path.dirname(self.spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.spill_path}.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _append_lines(self, path: str, lines: list[str]) -> None:
+        """Append lines to the spill file or one of its siblings."""
+        with self._spill_lock(), open(path, "a+b") as f:
+            # A line torn by a crash must not swallow the first one appended
+            torn = False
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+            f.write((("\n" if torn else "") + "\n".join(lines) + "\n").encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _claim_spill(self) -> list[IO[str]]:
+        """Open and lock the replay files to write, oldest first.
+
+        The spill file becomes a replay file of its own; replay files left
+        by an interrupted replay are picked up unless another process is
+        replaying them (it holds their lock).
+        """
+        with self._spill_lock():
+            if os.path.exists(self.spill_path):
+                os.rename(
+                    self.spill_path, f"{self.spill_path}.replay-{uuid.uuid4().hex}"
+                )
+        paths = []
+        for path in glob.glob(f"{glob.escape(self.spill_path)}.replay*"):
+            try:
+                paths.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+
+        claimed = []
+        for _, path in sorted(paths):
+            try:
+                f = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    f.close()
+                    continue
+            if os.fstat(f.fileno()).st_nlink == 0:  # replayed meanwhile
+                f.close()
+                continue
+            claimed.append(f)
+        return claimed
+
+    @staticmethod
+    def _read_spill(
+        files: list[IO[str]],
+    ) -> tuple[dict[uuid.UUID, dict], dict[uuid.UUID, dict], dict, list[str]]:
+        """Entries of the replay files, their attempt counts and bad lines."""
+        rows: dict[uuid.UUID, dict] = {}
+        updates: dict[uuid.UUID, dict] = {}
+        attempts: dict[uuid.UUID, int] = {}
+        corrupt: list[str] = []
+        for f in files:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    fields = _decode(entry["fields"])
+                    row_id = fields["id"]
+                except (ValueError, KeyError, TypeError):
+                    corrupt.append(line.rstrip("\n"))
+                    continue
+                attempts[row_id] = max(
+                    attempts.get(row_id, 0), entry.get("attempts", 0)
+                )
+                if entry["op"] == "insert":
+                    rows[row_id] = fields
+                elif row_id in rows:
+                    fields.pop("tenant_id")
+                    rows[row_id].update(fields)
+                else:
+                    fields.pop("id")
+                    updates.setdefault(row_id, {}).update(fields)
+        return rows, updates, attempts, corrupt
+
+    @staticmethod
+    def _release_spill(files: list[IO[str]], written: bool) -> None:
+        """Unlock the replay files, removing them once written."""
+        for f in files:
+            if written:
+                os.remove(f.name)
+            f.close()
+
+    async def _replay(self) -> bool:
+        """Re-write spilled entries; False if the database was unavailable."""
+        files = await asyncio.to_thread(self._claim_spill)
+        if not files:
+            return True
+        written = False
+        try:
+            rows, updates, attempts, corrupt = await asyncio.to_thread(
+                self._read_spill, files
+            )
+            if corrupt:
+                await asyncio.to_thread(
+                    self._append_lines, f"{self.spill_path}.corrupt", corrupt
+                )
+                logger.error(
+                    "AI audit: %d undecodable spill lines moved to %s.corrupt",
+                    len(corrupt),
+                    self.spill_path,
+                )
+            failed, rejected = await self._write(self._group(rows, updates))
+            if failed:
+                await self._spill(failed, attempts)
+            if rejected:
+                await self._reject(rejected, attempts)
+            not_written = sum(
+                len(entry_rows) + len(entry_updates)
+                for unwritten in (failed, rejected)
+                for entry_rows, entry_updates in unwritten.values()
+            )
+            llm_audit_entries_total.labels(result="replayed").inc(
+                len(rows) + len(updates) - not_written
+            )
+            written = True
+        finally:
+            await asyncio.to_thread(self._release_spill, files, written)
+        return not failed
+
+    async def close(self) -> None:
+        """Stop the background task and flush what is left (shutdown)."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            # Let an in-flight flush finish rather than cancelling it
+            self._closing = True
+            self._wakeup.set()
+            await task
+            self._closing = False
+        if self.pending:
+            self._flush_lock = asyncio.Lock()
+            await self.flush()
+
+
+# Singleton instance
+_audit_writer: Optional[AuditWriter] = None
+
+
+def get_audit_writer() -> AuditWriter:
+    """Get or create the process-wide AuditWriter instance."""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = AuditWriter()
+    return _audit_writer
+
+
+async def close_audit_writer() -> None:
+    """Flush pending audit entries (FastAPI lifespan shutdown)."""
+    if _audit_writer is not None:
+        await _audit_writer.close()
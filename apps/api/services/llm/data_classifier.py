@@ -10,6 +10,12 @@ Belgian-specific patterns:
 - Belgian IBAN: BE## #### #### ####
 - Belgian postal addresses: rue/avenue + 4-digit postal code
 - Jurisprudence references: C.C., Cass., C.E., Trib., etc.
+
+All detection goes through ``scan_text``, which scans a text once. The
+gateway memoizes scans per request (``RequestScans``): classification,
+anonymization and post-anonymization verification of the same prompt share
+one scan instead of re-running every pattern three times, and no prompt text
+outlives its request in a module-level cache.
 """
 
 import re
@@ -175,6 +181,126 @@ _PROPER_NAME_PATTERN = re.compile(
 )
 
 
+# Legal terms that look like two-word proper names
+_NOT_PERSON_NAMES = {
+    "code civil",
+    "code pénal",
+    "cour appel",
+    "conseil état",
+    "moniteur belge",
+    "union européenne",
+}
+
+# ── Single-pass scanner ──
+
+# The keyword families (case-insensitive word lists that never overlap each
+# other) are combined into one alternation with a named group per family,
+# so one finditer replaces five. Everything else keeps its own pattern:
+# structured identifiers can overlap (a postal code inside an IBAN, a proper
+# name inside a "Me ..." name) and every overlapping match must be reported,
+# which a single alternation would not do; jurisprudence and legal-code
+# references span free text ("J.P. \w+") and only need a first match.
+_KEYWORD_FAMILIES: dict[str, re.Pattern] = {
+    "health_keyword": _HEALTH_KEYWORDS,
+    "criminal_keyword": _CRIMINAL_KEYWORDS,
+    "minor_keyword": _MINOR_KEYWORDS,
+    "internal_ref": _INTERNAL_REF_PATTERN,
+    "address_keyword": _ADDRESS_KEYWORDS,
+}
+_KEYWORD_SCANNER = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern.pattern})" for name, pattern in _KEYWORD_FAMILIES.items()
+    ),
+    re.IGNORECASE,
+)
+
+_DIGIT = re.compile(r"\d")
+
+
+@dataclass(frozen=True)
+class PIIScan:
+    """Every PII match in one text, grouped by family (document order)."""
+
+    matches: dict[str, tuple[DetectedEntity, ...]]
+    has_jurisprudence: bool = False
+    has_legal_codes: bool = False
+
+    def get(self, family: str) -> tuple[DetectedEntity, ...]:
+        return self.matches.get(family, ())
+
+
+def _entities(
+    entity_type: str, pattern: re.Pattern, text: str, group: int = 0
+) -> tuple[DetectedEntity, ...]:
+    return tuple(
+        DetectedEntity(entity_type, m.group(group), m.start(group), m.end(group))
+        for m in pattern.finditer(text)
+    )
+
+
+def scan_text(text: str) -> PIIScan:
+    """Scan text for all PII and legal-reference patterns."""
+    families: dict[str, list[DetectedEntity]] = {}
+    for m in _KEYWORD_SCANNER.finditer(text):
+        family = m.lastgroup
+        families.setdefault(family, []).append(
+            DetectedEntity(family, m.group(), m.start(), m.end())
+        )
+    matches: dict[str, tuple[DetectedEntity, ...]] = {
+        family: tuple(found) for family, found in families.items()
+    }
+
+    # Cheap prefilters: most identifiers need a digit, emails an "@"
+    if _DIGIT.search(text):
+        matches["niss"] = _entities("niss", _NISS_PATTERN, text)
+        matches["bce"] = _entities("bce", _BCE_PATTERN, text)
+        matches["phone"] = _entities("phone", _PHONE_BE_PATTERN, text)
+        matches["iban"] = _entities("iban", _IBAN_BE_PATTERN, text)
+        matches["date_of_birth"] = _entities(
+            "date_of_birth", _DOB_PATTERN, text, group=1
+        )
+        matches["postal_code"] = _entities("postal_code", _POSTAL_CODE_BE, text)
+    if "@" in text:
+        matches["email"] = _entities("email", _EMAIL_PATTERN, text)
+
+    matches["legal_name"] = tuple(
+        DetectedEntity("person_name", m.group(), m.start(), m.end(), confidence=0.9)
+        for m in _LEGAL_CONTEXT_NAME.finditer(text)
+    )
+    matches["proper_name"] = tuple(
+        DetectedEntity("person_name", m.group(1), m.start(1), m.end(1), confidence=0.6)
+        for m in _PROPER_NAME_PATTERN.finditer(text)
+        if m.group(1).lower() not in _NOT_PERSON_NAMES
+    )
+    return PIIScan(
+        matches=matches,
+        has_jurisprudence=bool(_JURISPRUDENCE_PATTERNS.search(text)),
+        has_legal_codes=bool(_LEGAL_CODE_PATTERNS.search(text)),
+    )
+
+
+class RequestScans:
+    """Scans of the texts of one request, each computed once.
+
+    Created per gateway request and passed to every classification and
+    anonymization step; dropped with the request, so raw prompts and the
+    PII found in them are not retained. Callers must not mutate the
+    returned entities.
+    """
+
+    def __init__(self) -> None:
+        self._scans: dict[str, PIIScan] = {}
+
+    def scan(self, text: str) -> PIIScan:
+        scan = self._scans.get(text)
+        if scan is None:
+            scan = self._scans[text] = scan_text(text)
+        return scan
+
+    def __len__(self) -> int:
+        return len(self._scans)
+
+
 # ── Provider routing rules ──
 
 _PROVIDER_RULES: dict[DataSensitivity, list[str]] = {
@@ -207,9 +333,15 @@ class DataClassifier:
     """
 
     def classify(
-        self, text: str, context: ClassificationContext | None = None
+        self,
+        text: str,
+        context: ClassificationContext | None = None,
+        scans: RequestScans | None = None,
     ) -> ClassificationResult:
-        """Analyze text and return sensitivity level with detected entities."""
+        """Analyze text and return sensitivity level with detected entities.
+
+        ``scans`` shares the scan of ``text`` with the request's other steps.
+        """
         entities: list[DetectedEntity] = []
         reasons: list[str] = []
 
@@ -227,109 +359,82 @@ class DataClassifier:
                 allowed_providers=_PROVIDER_RULES[DataSensitivity.PUBLIC],
             )
 
+        scan = scans.scan(text) if scans is not None else scan_text(text)
+
         # ── Detect CRITICAL patterns ──
 
         # Health data
-        for m in _HEALTH_KEYWORDS.finditer(text):
-            entities.append(
-                DetectedEntity("health_keyword", m.group(), m.start(), m.end())
-            )
-            reasons.append(f"Health-related keyword: '{m.group()}'")
+        for e in scan.get("health_keyword"):
+            entities.append(e)
+            reasons.append(f"Health-related keyword: '{e.value}'")
 
         # Criminal data
-        for m in _CRIMINAL_KEYWORDS.finditer(text):
-            entities.append(
-                DetectedEntity("criminal_keyword", m.group(), m.start(), m.end())
-            )
-            reasons.append(f"Criminal-related keyword: '{m.group()}'")
+        for e in scan.get("criminal_keyword"):
+            entities.append(e)
+            reasons.append(f"Criminal-related keyword: '{e.value}'")
 
         # Minors
-        for m in _MINOR_KEYWORDS.finditer(text):
-            entities.append(
-                DetectedEntity("minor_keyword", m.group(), m.start(), m.end())
-            )
-            reasons.append(f"Minor-related keyword: '{m.group()}'")
+        for e in scan.get("minor_keyword"):
+            entities.append(e)
+            reasons.append(f"Minor-related keyword: '{e.value}'")
 
         # NISS (always CRITICAL — this is the Belgian equivalent of SSN)
-        for m in _NISS_PATTERN.finditer(text):
-            entities.append(DetectedEntity("niss", m.group(), m.start(), m.end()))
-            reasons.append(f"Belgian NISS detected: {m.group()[:5]}***")
+        for e in scan.get("niss"):
+            entities.append(e)
+            reasons.append(f"Belgian NISS detected: {e.value[:5]}***")
 
         # ── Detect SENSITIVE patterns ──
 
         # Person names (legal context)
-        for m in _LEGAL_CONTEXT_NAME.finditer(text):
-            entities.append(
-                DetectedEntity(
-                    "person_name", m.group(), m.start(), m.end(), confidence=0.9
-                )
-            )
-            reasons.append(f"Person name in legal context: '{m.group()[:10]}...'")
-
-        # Standalone proper names
-        for m in _PROPER_NAME_PATTERN.finditer(text):
-            name = m.group(1)
-            # Filter out common legal terms that look like proper names
-            if name.lower() not in {
-                "code civil",
-                "code pénal",
-                "cour appel",
-                "conseil état",
-                "moniteur belge",
-                "union européenne",
-            }:
-                entities.append(
-                    DetectedEntity(
-                        "person_name", name, m.start(1), m.end(1), confidence=0.6
-                    )
-                )
+        for e in scan.get("legal_name"):
+            entities.append(e)
+            reasons.append(f"Person name in legal context: '{e.value[:10]}...'")
+
+        # Standalone proper names (common legal terms already filtered out)
+        entities.extend(scan.get("proper_name"))
 
         # Internal references
-        for m in _INTERNAL_REF_PATTERN.finditer(text):
-            entities.append(
-                DetectedEntity("internal_ref", m.group(), m.start(), m.end())
-            )
+        for e in scan.get("internal_ref"):
+            entities.append(e)
             reasons.append("Internal case/file reference detected")
 
         # Date of birth
-        for m in _DOB_PATTERN.finditer(text):
-            entities.append(
-                DetectedEntity("date_of_birth", m.group(1), m.start(1), m.end(1))
-            )
+        for e in scan.get("date_of_birth"):
+            entities.append(e)
             reasons.append("Date of birth detected")
 
         # ── Detect SEMI-SENSITIVE patterns ──
 
         # BCE/TVA numbers
-        for m in _BCE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("bce", m.group(), m.start(), m.end()))
-            reasons.append(f"BCE/TVA number: {m.group()}")
+        for e in scan.get("bce"):
+            entities.append(e)
+            reasons.append(f"BCE/TVA number: {e.value}")
 
         # Phone numbers
-        for m in _PHONE_BE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("phone", m.group(), m.start(), m.end()))
+        for e in scan.get("phone"):
+            entities.append(e)
             reasons.append("Belgian phone number detected")
 
         # IBAN
-        for m in _IBAN_BE_PATTERN.finditer(text):
-            entities.append(DetectedEntity("iban", m.group(), m.start(), m.end()))
+        for e in scan.get("iban"):
+            entities.append(e)
             reasons.append("Belgian IBAN detected")
 
         # Email
-        for m in _EMAIL_PATTERN.finditer(text):
-            entities.append(DetectedEntity("email", m.group(), m.start(), m.end()))
+        for e in scan.get("email"):
+            entities.append(e)
             reasons.append("Email address detected")
 
         # Addresses
-        addr_matches = list(_ADDRESS_KEYWORDS.finditer(text))
-        postal_matches = list(_POSTAL_CODE_BE.finditer(text))
+        addr_matches = scan.get("address_keyword")
+        postal_matches = scan.get("postal_code")
         if addr_matches and postal_matches:
             entities.append(
                 DetectedEntity(
                     "address",
-                    text[addr_matches[0].start() : postal_matches[0].end()],
-                    addr_matches[0].start(),
-                    postal_matches[0].end(),
+                    text[addr_matches[0].start : postal_matches[0].end],
+                    addr_matches[0].start,
+                    postal_matches[0].end,
                     confidence=0.7,
                 )
             )
@@ -337,8 +442,8 @@ class DataClassifier:
 
         # ── Detect PUBLIC patterns ──
 
-        has_jurisprudence = bool(_JURISPRUDENCE_PATTERNS.search(text))
-        has_legal_codes = bool(_LEGAL_CODE_PATTERNS.search(text))
+        has_jurisprudence = scan.has_jurisprudence
+        has_legal_codes = scan.has_legal_codes
         if has_jurisprudence:
             reasons.append("Published jurisprudence reference found")
         if has_legal_codes:
@@ -20,12 +20,13 @@ If anonymization fails, the request is BLOCKED.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import time
 import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
 from typing import TYPE_CHECKING, AsyncIterator
@@ -35,16 +36,35 @@ import httpx
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
-from apps.api.services.llm.anonymizer import DataAnonymizer
-from apps.api.services.llm.audit_logger import AIAuditLogger
+from apps.api.services.http_client import get_http_client
+from apps.api.services.llm.anonymizer import DataAnonymizer, StreamDeanonymizer
+from apps.api.services.llm.audit_logger import CACHE_PROVIDER, AIAuditLogger
 from apps.api.services.llm.data_classifier import (
     ClassificationContext,
     DataClassifier,
     DataSensitivity,
+    RequestScans,
+)
+from apps.api.services.llm.provider_health import BreakerState, ProviderHealth
+from apps.api.services.llm.response_cache import (
+    LLM_CACHE_ENABLED,
+    CachedResponse,
+    CacheLookup,
+    ResponseCache,
+)
+from apps.api.services.metrics import (
+    llm_hedged_requests_total,
+    llm_stream_first_chunk_seconds,
 )
 
 logger = logging.getLogger(__name__)
 
+# Hedging: race a slow provider against the next allowed one
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_DELAY_MS = float(os.getenv("LLM_HEDGE_DELAY_MS", "2000"))
+# Providers whose p95 exceeds this are tried after faster ones
+LLM_SLOW_P95_MS = float(os.getenv("LLM_SLOW_P95_MS", "30000"))
+
 
 class ProviderStatus(str, Enum):
     HEALTHY = "healthy"
@@ -68,6 +88,7 @@ class LLMResponse:
     cost_estimate_eur: float | None = None
     audit_id: str | None = None
     require_human_validation: bool = False
+    cached: bool = False
 
 
 @dataclass
@@ -173,6 +194,20 @@ PROVIDER_CONFIGS: dict[str, ProviderConfig] = {
 _NON_EU_PROVIDERS = {"deepseek", "glm", "kimi"}
 
 
+@dataclass
+class _Attempt:
+    """A provider attempt that passed the anonymization rules and was audited."""
+
+    provider_name: str
+    model: str
+    messages: list[dict]
+    anon_mapping: dict[str, str] | None
+    was_anonymized: bool
+    audit_id: uuid.UUID
+    metadata: dict = field(default_factory=dict)
+    hedged: bool = False
+
+
 class LLMProviderBase(ABC):
     """Abstract base for LLM provider implementations."""
 
@@ -182,7 +217,6 @@ class LLMProviderBase(ABC):
         self._status = (
             ProviderStatus.HEALTHY if self.api_key else ProviderStatus.DISABLED
         )
-        self._client: httpx.AsyncClient | None = None
 
     def set_api_key(self, key: str) -> None:
         """Set API key dynamically (from DB settings)."""
@@ -200,9 +234,8 @@ class LLMProviderBase(ABC):
         ) and bool(self.api_key)
 
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0))
-        return self._client
+        # Shared keep-alive pool per provider host (see services/http_client.py)
+        return get_http_client(self.config.base_url)
 
     @abstractmethod
     async def complete(
@@ -619,16 +652,30 @@ class LLMGateway:
     - Automatic PII anonymization for non-EU providers
     - AI Act audit logging
     - Fallback to alternative providers on failure
+    - Latency-aware routing, circuit breaking and optional hedged requests
+    - Response cache (exact, and near-duplicate for deterministic purposes)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        hedging: bool = LLM_HEDGE_ENABLED,
+        hedge_delay_ms: float = LLM_HEDGE_DELAY_MS,
+        response_cache: ResponseCache | None = None,
+    ):
         self.providers: dict[str, LLMProviderBase] = {}
+        self.health: dict[str, ProviderHealth] = {}
         self.classifier = DataClassifier()
         self.anonymizer = DataAnonymizer()
+        self.hedging = hedging
+        self.hedge_delay_ms = hedge_delay_ms
+        if response_cache is None and LLM_CACHE_ENABLED:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache
 
         # Initialize providers
         for name, config in PROVIDER_CONFIGS.items():
             self.providers[name] = _create_provider(config)
+            self.health[name] = ProviderHealth(name)
 
     async def load_tenant_keys(
         self,
@@ -683,7 +730,294 @@ class LLMGateway:
             if provider and provider.is_available:
                 ordered.append(name)
 
-        return ordered
+        # Open breakers go last (kept as a last resort), then slow providers;
+        # otherwise the tier/cost order above is preserved (stable sort)
+        def rank(name: str) -> tuple[bool, bool]:
+            health = self.health[name]
+            p95 = health.p95
+            slow = (
+                name != preferred_provider and p95 is not None and p95 > LLM_SLOW_P95_MS
+            )
+            return (not health.allows_request(), slow)
+
+        return sorted(ordered, key=rank)
+
+    def _hedge_delay(self, provider_name: str) -> float:
+        """Seconds to wait on a provider before hedging to the next one.
+
+        The configured delay, or the provider's own p95 if that is longer,
+        so only unusually slow calls are hedged.
+        """
+        p95 = self.health[provider_name].p95 or 0.0
+        return max(self.hedge_delay_ms, p95) / 1000
+
+    async def _prepare_attempt(
+        self,
+        provider_name: str,
+        messages: list[dict],
+        text: str,
+        data_sensitivity: DataSensitivity,
+        context: ClassificationContext | None,
+        model: str | None,
+        purpose: str,
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+        audit_logger: AIAuditLogger,
+        metadata: dict,
+        scans: RequestScans | None = None,
+    ) -> _Attempt:
+        """Anonymize (if required) and audit-log one provider attempt.
+
+        Raises ValueError if mandatory anonymization fails (request BLOCKED).
+        """
+        config = PROVIDER_CONFIGS[provider_name]
+        use_model = model or config.default_model
+
+        # Determine if anonymization is needed
+        needs_anonymization = (
+            provider_name in _NON_EU_PROVIDERS
+            and data_sensitivity != DataSensitivity.PUBLIC
+        )
+
+        work_messages = messages
+        anon_mapping: dict[str, str] | None = None
+        was_anonymized = False
+
+        if needs_anonymization:
+            try:
+                work_messages, anon_mapping = self.anonymizer.anonymize_messages(
+                    messages, scans
+                )
+                was_anonymized = True
+
+                # CRITICAL: verify that anonymization actually removed all entities
+                classification = self.classifier.classify(text, context, scans)
+                anon_text = self._get_messages_text(work_messages)
+                if not self.anonymizer.verify_anonymization(
+                    anon_text, classification.detected_entities
+                ):
+                    raise ValueError(
+                        "Anonymization verification failed: entities still present "
+                        "in anonymized text. Request BLOCKED for safety."
+                    )
+            except Exception as anon_err:
+                # CRITICAL: If anonymization fails, BLOCK the request
+                logger.error(
+                    "Anonymization failed for provider=%s sensitivity=%s: %s",
+                    provider_name,
+                    data_sensitivity.value,
+                    anon_err,
+                )
+                # Log the failure
+                audit_id = await audit_logger.log_request(
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    provider=provider_name,
+                    model=use_model,
+                    data_sensitivity=data_sensitivity.value,
+                    was_anonymized=False,
+                    anonymization_method=None,
+                    prompt_content=text,
+                    purpose=purpose,
+                    metadata={
+                        "error": "anonymization_failed",
+                        "anonymization_error": str(anon_err),
+                    },
+                )
+                await audit_logger.log_error(
+                    audit_id,
+                    f"Anonymization failed: {anon_err}. Request BLOCKED.",
+                )
+                raise ValueError(
+                    f"Anonymisation obligatoire échouée pour {provider_name}. "
+                    f"Les données de sensibilité '{data_sensitivity.value}' ne peuvent pas "
+                    f"être envoyées à un fournisseur non-EU sans anonymisation. "
+                    f"Erreur: {anon_err}"
+                ) from anon_err
+
+        # Log the request
+        audit_id = await audit_logger.log_request(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            provider=provider_name,
+            model=use_model,
+            data_sensitivity=data_sensitivity.value,
+            was_anonymized=was_anonymized,
+            anonymization_method="regex_replacement" if was_anonymized else None,
+            prompt_content=text,
+            purpose=purpose,
+            metadata=metadata,
+        )
+        return _Attempt(
+            provider_name=provider_name,
+            model=use_model,
+            messages=work_messages,
+            anon_mapping=anon_mapping,
+            was_anonymized=was_anonymized,
+            audit_id=audit_id,
+            metadata=metadata,
+        )
+
+    async def _call_provider(
+        self,
+        attempt: _Attempt,
+        temperature: float,
+        max_tokens: int,
+    ) -> tuple[dict, int]:
+        """Send one prepared attempt; returns (raw result, latency in ms).
+
+        Runs as its own task so attempts can race. It only talks to the
+        provider: audit writes stay in ``complete`` because the audit
+        logger's session must not be used concurrently.
+        """
+        health = self.health[attempt.provider_name]
+        start_time = time.monotonic()
+        try:
+            result = await self.providers[attempt.provider_name].complete(
+                messages=attempt.messages,
+                model=attempt.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except asyncio.CancelledError:
+            health.release()
+            raise
+        except Exception:
+            health.record_failure()
+            raise
+        latency_ms = int((time.monotonic() - start_time) * 1000)
+        health.record_success(latency_ms)
+        return result, latency_ms
+
+    async def _audit_failure(
+        self, audit_logger: AIAuditLogger, attempt: _Attempt, error: BaseException
+    ) -> None:
+        if isinstance(error, asyncio.CancelledError):
+            await audit_logger.log_cancelled(
+                attempt.audit_id, "another provider answered first", attempt.metadata
+            )
+        elif isinstance(error, httpx.HTTPStatusError):
+            logger.warning(
+                "Provider %s failed (HTTP %s), trying next: %s",
+                attempt.provider_name,
+                error.response.status_code,
+                error,
+            )
+            await audit_logger.log_error(
+                attempt.audit_id,
+                f"HTTP {error.response.status_code}: {str(error)[:500]}",
+            )
+        else:
+            logger.warning(
+                "Provider %s failed, trying next: %s", attempt.provider_name, error
+            )
+            await audit_logger.log_error(attempt.audit_id, str(error)[:500])
+
+    async def _finish_attempt(
+        self,
+        attempt: _Attempt,
+        result: dict,
+        latency_ms: int,
+        data_sensitivity: DataSensitivity,
+        audit_logger: AIAuditLogger,
+        require_human_validation: bool,
+    ) -> LLMResponse:
+        """De-anonymize and audit the winning response."""
+        provider = self.providers[attempt.provider_name]
+        content = result["content"]
+        usage = result.get("usage", {})
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+        cost = provider.estimate_cost(input_tokens, output_tokens)
+
+        # De-anonymize if needed
+        if attempt.was_anonymized and attempt.anon_mapping:
+            content = self.anonymizer.deanonymize(content, attempt.anon_mapping)
+
+        # Log response
+        await audit_logger.log_response(
+            request_id=attempt.audit_id,
+            response_content=content,
+            token_count_input=input_tokens,
+            token_count_output=output_tokens,
+            latency_ms=latency_ms,
+            cost_estimate_eur=Decimal(str(cost)),
+        )
+
+        return LLMResponse(
+            content=content,
+            provider=attempt.provider_name,
+            model=result.get("model", attempt.model),
+            sensitivity=data_sensitivity.value,
+            was_anonymized=attempt.was_anonymized,
+            token_count_input=input_tokens,
+            token_count_output=output_tokens,
+            latency_ms=latency_ms,
+            cost_estimate_eur=cost,
+            audit_id=str(attempt.audit_id),
+            require_human_validation=require_human_validation,
+        )
+
+    async def _serve_cached(
+        self,
+        lookup: CacheLookup,
+        text: str,
+        purpose: str,
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+        audit_logger: AIAuditLogger,
+        data_sensitivity: DataSensitivity,
+        require_human_validation: bool,
+    ) -> LLMResponse:
+        """Answer from the response cache, with its own audit entry.
+
+        The entry is logged under CACHE_PROVIDER (no provider was called)
+        and keeps the anonymization flags of the response it replays.
+        """
+        start_time = time.monotonic()
+        cached = lookup.hit
+        audit_id = await audit_logger.log_request(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            provider=CACHE_PROVIDER,
+            model=cached.model,
+            data_sensitivity=data_sensitivity.value,
+            was_anonymized=cached.was_anonymized,
+            anonymization_method="regex_replacement" if cached.was_anonymized else None,
+            prompt_content=text,
+            purpose=purpose,
+            metadata={
+                "cached": True,
+                "cache_match": lookup.match,
+                "cache_similarity": lookup.similarity,
+                "source_provider": cached.provider,
+                "source_audit_id": cached.audit_id,
+                "require_human_validation": require_human_validation,
+            },
+        )
+        latency_ms = int((time.monotonic() - start_time) * 1000)
+        await audit_logger.log_response(
+            request_id=audit_id,
+            response_content=cached.content,
+            token_count_input=cached.token_count_input,
+            token_count_output=cached.token_count_output,
+            latency_ms=latency_ms,
+            cost_estimate_eur=Decimal("0"),
+        )
+        return LLMResponse(
+            content=cached.content,
+            provider=cached.provider,
+            model=cached.model,
+            sensitivity=data_sensitivity.value,
+            was_anonymized=cached.was_anonymized,
+            token_count_input=cached.token_count_input,
+            token_count_output=cached.token_count_output,
+            latency_ms=latency_ms,
+            cost_estimate_eur=0.0,
+            audit_id=str(audit_id),
+            require_human_validation=require_human_validation,
+            cached=True,
+        )
 
     async def complete(
         self,
@@ -699,25 +1033,108 @@ class LLMGateway:
         max_tokens: int = 4096,
         require_human_validation: bool = False,
         context: ClassificationContext | None = None,
+        hedge: bool | None = None,
+        use_cache: bool = True,
     ) -> LLMResponse:
         """Execute an LLM completion with GDPR-compliant routing.
 
         Flow:
         1. Classify data sensitivity (if not provided)
-        2. Determine allowed providers
-        3. Anonymize if needed (non-EU providers + non-PUBLIC data)
-        4. Send request with fallback chain
-        5. De-anonymize response if needed
-        6. Log everything to audit trail
+        2. Serve from the response cache if possible (audited as cached)
+        3. Determine allowed providers
+        4. Anonymize if needed (non-EU providers + non-PUBLIC data)
+        5. Send request with fallback chain; with hedging, also send it to
+           the next allowed provider if the first one is slow
+        6. De-anonymize response if needed
+        7. Log everything to audit trail (every attempt, including hedges)
+
+        The first successful response wins; other in-flight attempts are
+        cancelled and audited as such.
         """
-        # Step 1: Classify
         text = self._get_messages_text(messages)
+        # PII scans shared by this request's classification and anonymization
+        scans = RequestScans()
         if data_sensitivity is None:
-            classification = self.classifier.classify(text, context)
+            classification = self.classifier.classify(text, context, scans)
             data_sensitivity = classification.sensitivity
+
+        lookup: CacheLookup | None = None
+        if use_cache and self.response_cache is not None:
+            lookup = await self.response_cache.lookup(
+                tenant_id,
+                purpose,
+                model,
+                temperature,
+                max_tokens,
+                data_sensitivity.value,
+                messages,
+            )
+            if lookup.hit is not None:
+                return await self._serve_cached(
+                    lookup,
+                    text,
+                    purpose,
+                    tenant_id,
+                    user_id,
+                    audit_logger,
+                    data_sensitivity,
+                    require_human_validation,
+                )
+
+        response = await self._complete_uncached(
+            messages,
+            purpose,
+            tenant_id,
+            user_id,
+            audit_logger,
+            data_sensitivity,
+            preferred_provider,
+            model,
+            temperature,
+            max_tokens,
+            require_human_validation,
+            context,
+            hedge,
+            scans,
+        )
+        if lookup is not None:
+            self.response_cache.store(
+                lookup,
+                CachedResponse(
+                    content=response.content,
+                    provider=response.provider,
+                    model=response.model,
+                    sensitivity=response.sensitivity,
+                    was_anonymized=response.was_anonymized,
+                    token_count_input=response.token_count_input,
+                    token_count_output=response.token_count_output,
+                    audit_id=response.audit_id,
+                ),
+            )
+        return response
+
+    async def _complete_uncached(
+        self,
+        messages: list[dict],
+        purpose: str,
+        tenant_id: uuid.UUID,
+        user_id: uuid.UUID,
+        audit_logger: AIAuditLogger,
+        data_sensitivity: DataSensitivity,
+        preferred_provider: str | None,
+        model: str | None,
+        temperature: float,
+        max_tokens: int,
+        require_human_validation: bool,
+        context: ClassificationContext | None,
+        hedge: bool | None,
+        scans: RequestScans | None = None,
+    ) -> LLMResponse:
+        """Route a completion to the providers (see ``complete``)."""
+        text = self._get_messages_text(messages)
         allowed = self.classifier.get_allowed_providers(data_sensitivity)
 
-        # Step 2: Select provider chain
+        # Select provider chain
         provider_chain = self._select_provider(allowed, preferred_provider)
         if not provider_chain:
             raise ValueError(
@@ -725,159 +1142,102 @@ class LLMGateway:
                 f"Allowed: {allowed}"
             )
 
-        # Step 3: Try each provider in the chain
+        # Try the chain; first success wins
+        hedge = self.hedging if hedge is None else hedge
+        remaining = iter(provider_chain)
+        pending: dict[asyncio.Task, _Attempt] = {}
+        hedged = False
         last_error: Exception | None = None
-        for provider_name in provider_chain:
-            provider = self.providers[provider_name]
-            config = PROVIDER_CONFIGS[provider_name]
-            use_model = model or config.default_model
-
-            # Determine if anonymization is needed
-            needs_anonymization = (
-                provider_name in _NON_EU_PROVIDERS
-                and data_sensitivity != DataSensitivity.PUBLIC
-            )
-
-            work_messages = messages
-            anon_mapping: dict[str, str] | None = None
-            was_anonymized = False
-
-            if needs_anonymization:
-                try:
-                    work_messages, anon_mapping = self.anonymizer.anonymize_messages(
-                        messages
-                    )
-                    was_anonymized = True
-
-                    # CRITICAL: verify that anonymization actually removed all entities
-                    classification = self.classifier.classify(text, context)
-                    anon_text = self._get_messages_text(work_messages)
-                    if not self.anonymizer.verify_anonymization(
-                        anon_text, classification.detected_entities
-                    ):
-                        raise ValueError(
-                            "Anonymization verification failed: entities still present "
-                            "in anonymized text. Request BLOCKED for safety."
-                        )
-                except Exception as anon_err:
-                    # CRITICAL: If anonymization fails, BLOCK the request
-                    logger.error(
-                        "Anonymization failed for provider=%s sensitivity=%s: %s",
-                        provider_name,
-                        data_sensitivity.value,
-                        anon_err,
-                    )
-                    # Log the failure
-                    audit_id = await audit_logger.log_request(
-                        tenant_id=tenant_id,
-                        user_id=user_id,
-                        provider=provider_name,
-                        model=use_model,
-                        data_sensitivity=data_sensitivity.value,
-                        was_anonymized=False,
-                        anonymization_method=None,
-                        prompt_content=text,
-                        purpose=purpose,
-                        metadata={
-                            "error": "anonymization_failed",
-                            "anonymization_error": str(anon_err),
-                        },
-                    )
-                    await audit_logger.log_error(
-                        audit_id,
-                        f"Anonymization failed: {anon_err}. Request BLOCKED.",
-                    )
-                    raise ValueError(
-                        f"Anonymisation obligatoire échouée pour {provider_name}. "
-                        f"Les données de sensibilité '{data_sensitivity.value}' ne peuvent pas "
-                        f"être envoyées à un fournisseur non-EU sans anonymisation. "
-                        f"Erreur: {anon_err}"
-                    ) from anon_err
 
-            # Log the request
-            audit_id = await audit_logger.log_request(
-                tenant_id=tenant_id,
-                user_id=user_id,
-                provider=provider_name,
-                model=use_model,
-                data_sensitivity=data_sensitivity.value,
-                was_anonymized=was_anonymized,
-                anonymization_method="regex_replacement" if was_anonymized else None,
-                prompt_content=text,
-                purpose=purpose,
+        async def launch(is_hedge: bool) -> None:
+            provider_name = next(remaining, None)
+            if provider_name is None:
+                return
+            attempt = await self._prepare_attempt(
+                provider_name,
+                messages,
+                text,
+                data_sensitivity,
+                context,
+                model,
+                purpose,
+                tenant_id,
+                user_id,
+                audit_logger,
                 metadata={
                     "preferred_provider": preferred_provider,
                     "fallback_chain": provider_chain,
                     "require_human_validation": require_human_validation,
+                    "hedged": is_hedge,
                 },
+                scans=scans,
             )
+            attempt.hedged = is_hedge
+            self.health[provider_name].begin_attempt()
+            task = asyncio.create_task(
+                self._call_provider(attempt, temperature, max_tokens)
+            )
+            pending[task] = attempt
+            if is_hedge:
+                llm_hedged_requests_total.labels(result="launched").inc()
 
-            # Execute request
-            start_time = time.monotonic()
-            try:
-                result = await provider.complete(
-                    messages=work_messages,
-                    model=use_model,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
-
-                latency_ms = int((time.monotonic() - start_time) * 1000)
-                content = result["content"]
-                usage = result.get("usage", {})
-                input_tokens = usage.get("prompt_tokens", 0)
-                output_tokens = usage.get("completion_tokens", 0)
-                cost = provider.estimate_cost(input_tokens, output_tokens)
-
-                # De-anonymize if needed
-                if was_anonymized and anon_mapping:
-                    content = self.anonymizer.deanonymize(content, anon_mapping)
-
-                # Log response
-                await audit_logger.log_response(
-                    request_id=audit_id,
-                    response_content=content,
-                    token_count_input=input_tokens,
-                    token_count_output=output_tokens,
-                    latency_ms=latency_ms,
-                    cost_estimate_eur=Decimal(str(cost)),
-                )
-
-                return LLMResponse(
-                    content=content,
-                    provider=provider_name,
-                    model=result.get("model", use_model),
-                    sensitivity=data_sensitivity.value,
-                    was_anonymized=was_anonymized,
-                    token_count_input=input_tokens,
-                    token_count_output=output_tokens,
-                    latency_ms=latency_ms,
-                    cost_estimate_eur=cost,
-                    audit_id=str(audit_id),
-                    require_human_validation=require_human_validation,
-                )
-
-            except httpx.HTTPStatusError as e:
-                latency_ms = int((time.monotonic() - start_time) * 1000)
-                last_error = e
-                logger.warning(
-                    "Provider %s failed (HTTP %s), trying next: %s",
-                    provider_name,
-                    e.response.status_code,
-                    e,
-                )
-                await audit_logger.log_error(
-                    audit_id,
-                    f"HTTP {e.response.status_code}: {str(e)[:500]}",
+        try:
+            await launch(is_hedge=False)
+            while pending:
+                timeout = None
+                if hedge and not hedged and len(pending) == 1:
+                    primary = next(iter(pending.values()))
+                    timeout = self._hedge_delay(primary.provider_name)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
                 )
-                continue
+                if not done:
+                    # Primary is slow: race it against the next allowed provider
+                    hedged = True
+                    try:
+                        await launch(is_hedge=True)
+                    except ValueError as blocked:
+                        # Anonymization for the hedge failed (audited and
+                        # blocked in _prepare_attempt): keep the primary
+                        last_error = blocked
+                        logger.warning("Hedge not launched: %s", blocked)
+                    continue
+
+                for task in done:
+                    attempt = pending.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        last_error = error
+                        await self._audit_failure(audit_logger, attempt, error)
+                        continue
+                    if attempt.hedged:
+                        llm_hedged_requests_total.labels(result="won").inc()
+                    result, latency_ms = task.result()
+                    return await self._finish_attempt(
+                        attempt,
+                        result,
+                        latency_ms,
+                        data_sensitivity,
+                        audit_logger,
+                        require_human_validation,
+                    )
 
-            except Exception as e:
-                latency_ms = int((time.monotonic() - start_time) * 1000)
-                last_error = e
-                logger.warning("Provider %s failed, trying next: %s", provider_name, e)
-                await audit_logger.log_error(audit_id, str(e)[:500])
-                continue
+                if not pending:
+                    await launch(is_hedge=False)
+        finally:
+            # Losers of a hedge race (or everything, if we are cancelled)
+            for task in pending:
+                task.cancel()
+            outcomes = await asyncio.gather(*pending, return_exceptions=True)
+            for attempt, outcome in zip(pending.values(), outcomes):
+                if isinstance(outcome, BaseException):
+                    await self._audit_failure(audit_logger, attempt, outcome)
+                else:
+                    await audit_logger.log_cancelled(
+                        attempt.audit_id,
+                        "discarded: another provider answered first",
+                        attempt.metadata,
+                    )
 
         # All providers failed
         raise RuntimeError(
@@ -901,14 +1261,14 @@ class LLMGateway:
     ) -> AsyncIterator[str]:
         """Stream an LLM completion with the same GDPR routing rules.
 
-        Note: De-anonymization happens at the end for streaming, since we
-        need the complete response to accurately replace placeholders.
-        For streaming, we accumulate and yield chunks, then the caller
-        must handle the final de-anonymization if needed.
+        Anonymized responses are de-anonymized incrementally: each chunk is
+        yielded with its placeholders restored, holding back only a
+        placeholder split across chunks until its remainder arrives.
         """
         text = self._get_messages_text(messages)
+        scans = RequestScans()
         if data_sensitivity is None:
-            classification = self.classifier.classify(text, context)
+            classification = self.classifier.classify(text, context, scans)
             data_sensitivity = classification.sensitivity
         allowed = self.classifier.get_allowed_providers(data_sensitivity)
 
@@ -934,7 +1294,7 @@ class LLMGateway:
             if needs_anonymization:
                 try:
                     work_messages, anon_mapping = self.anonymizer.anonymize_messages(
-                        messages
+                        messages, scans
                     )
                 except Exception as anon_err:
                     logger.error("Anonymization failed for streaming: %s", anon_err)
@@ -971,20 +1331,36 @@ class LLMGateway:
                 purpose=purpose,
             )
 
+            # Claims the half-open probe like a completion attempt; settled
+            # below, or released in ``finally`` if the stream is cancelled
+            health = self.health[provider_name]
+            health.begin_attempt()
+            settled = False
             start_time = time.monotonic()
             try:
                 full_content = []
-                async for chunk in provider.stream(
+                chunks = provider.stream(
                     messages=work_messages,
                     model=use_model,
                     temperature=temperature,
                     max_tokens=max_tokens,
-                ):
+                )
+                if anon_mapping:
+                    chunks = self._restore_stream(chunks, anon_mapping)
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if not full_content:
+                        llm_stream_first_chunk_seconds.labels(
+                            provider=provider_name,
+                            anonymized=str(bool(anon_mapping)).lower(),
+                        ).observe(time.monotonic() - start_time)
                     full_content.append(chunk)
-                    # For streaming, yield raw chunks (caller handles display)
                     yield chunk
 
                 latency_ms = int((time.monotonic() - start_time) * 1000)
+                health.record_success(latency_ms)
+                settled = True
                 complete_text = "".join(full_content)
 
                 # Log response
@@ -996,24 +1372,46 @@ class LLMGateway:
                 return  # Success
 
             except Exception as e:
+                if not settled:
+                    health.record_failure()
+                    settled = True
                 logger.warning("Provider %s stream failed: %s", provider_name, e)
                 await audit_logger.log_error(audit_id, str(e)[:500])
                 continue
+            finally:
+                if not settled:
+                    # Cancelled or closed early (client disconnect): not the
+                    # provider's fault, only give the probe back
+                    health.release()
 
         raise RuntimeError(
             f"All providers failed for streaming. Tried: {provider_chain}"
         )
 
+    @staticmethod
+    async def _restore_stream(
+        chunks: AsyncIterator[str], mapping: dict[str, str]
+    ) -> AsyncIterator[str]:
+        """De-anonymize a provider stream chunk by chunk."""
+        restorer = StreamDeanonymizer(mapping)
+        async for chunk in chunks:
+            yield restorer.feed(chunk)
+        yield restorer.flush()
+
     async def get_provider_status(self) -> dict[str, dict]:
         """Get health status of all providers."""
         statuses = {}
         for name, provider in self.providers.items():
             config = PROVIDER_CONFIGS[name]
             status = await provider.health_check()
+            health = self.health[name]
+            if status == ProviderStatus.HEALTHY and health.state != BreakerState.CLOSED:
+                status = ProviderStatus.DEGRADED
             statuses[name] = {
                 "name": name,
                 "tier": config.tier,
                 "status": status.value,
+                **health.snapshot(),
                 "default_model": config.default_model,
                 "max_context_tokens": config.max_context_tokens,
                 "cost_per_1k_input": config.cost_per_1k_input,
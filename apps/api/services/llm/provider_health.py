@@ -0,0 +1,133 @@
+"""Provider health — moving latency percentiles and a circuit breaker.
+
+The gateway records every provider attempt here. Latencies are kept in a
+sliding window (the last LLM_LATENCY_WINDOW successful calls) from which
+p50/p95 are read; the p95 drives the hedge delay and demotes slow
+providers in the routing order.
+
+Circuit breaker per provider:
+  CLOSED     normal routing
+  OPEN       after LLM_BREAKER_FAILURES consecutive failures; the provider
+             is skipped (unless nothing else is allowed) and reported as
+             DEGRADED for LLM_BREAKER_COOLDOWN seconds
+  HALF_OPEN  after the cooldown one probe request is let through; success
+             closes the breaker, failure re-opens it
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from apps.api.services.metrics import llm_circuit_open, llm_provider_latency_seconds
+
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "100"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ProviderHealth:
+    """Latency window and circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = LLM_LATENCY_WINDOW,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        cooldown: float = LLM_BREAKER_COOLDOWN,
+    ) -> None:
+        self.name = name
+        self._latencies: deque[float] = deque(maxlen=max(1, window))
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        if self._opened_at is None:
+            return BreakerState.CLOSED
+        if time.monotonic() - self._opened_at >= self._cooldown:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    def allows_request(self) -> bool:
+        """Whether routing may pick this provider now."""
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        return state == BreakerState.HALF_OPEN and not self._probing
+
+    def begin_attempt(self) -> None:
+        """Mark a request as started (claims the half-open probe)."""
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                self._probing = True
+
+    def record_success(self, latency_ms: float) -> None:
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+        llm_provider_latency_seconds.labels(provider=self.name).observe(
+            latency_ms / 1000
+        )
+        llm_circuit_open.labels(provider=self.name).set(0)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self._failure_threshold:
+                # Open, or re-open after a failed half-open probe
+                self._opened_at = time.monotonic()
+        if self._opened_at is not None:
+            llm_circuit_open.labels(provider=self.name).set(1)
+
+    def release(self) -> None:
+        """Attempt ended without an outcome (cancelled hedge)."""
+        with self._lock:
+            self._probing = False
+
+    def percentile(self, q: float) -> float | None:
+        """Latency percentile in ms over the window; None without samples."""
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return _percentile(ordered, q)
+
+    @property
+    def p50(self) -> float | None:
+        return self.percentile(0.50)
+
+    @property
+    def p95(self) -> float | None:
+        return self.percentile(0.95)
+
+    def snapshot(self) -> dict:
+        return {
+            "breaker": self.state.value,
+            "consecutive_failures": self._failures,
+            "latency_p50_ms": self.p50,
+            "latency_p95_ms": self.p95,
+            "samples": len(self._latencies),
+        }
@@ -0,0 +1,254 @@
+"""Response cache for LLMGateway completions.
+
+Exact matches are keyed by (tenant, purpose, model, temperature,
+max_tokens, sensitivity, SHA-256 of the normalized messages); messages are
+normalized with Unicode NFKC and collapsed whitespace. For deterministic
+purposes (LLM_CACHE_SEMANTIC_PURPOSES), a miss falls back to near-duplicate
+matching: the prompt embedding is compared with those cached under the
+same (tenant, purpose, model, temperature, max_tokens, sensitivity), and
+a cosine similarity of at least LLM_CACHE_SIMILARITY counts as a hit.
+Extraction is exact-match only by default: a near-duplicate document can
+differ in exactly the amount, date or name being extracted.
+
+Entries expire after LLM_CACHE_TTL seconds and the cache holds at most
+LLM_CACHE_MAX_ENTRIES responses (LRU eviction). Every key starts with the
+tenant id, so one tenant can never be served another tenant's response.
+
+The cache is in-process: cached responses contain de-anonymized text and
+are never written to a shared store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from apps.api.services.compute_executor import get_compute_executor
+from apps.api.services.embedding_service import get_embedding_engine
+from apps.api.services.metrics import llm_cache_requests_total
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.97"))
+LLM_CACHE_SEMANTIC_PURPOSES = frozenset(
+    p.strip()
+    for p in os.getenv(
+        "LLM_CACHE_SEMANTIC_PURPOSES", "classification,summarization"
+    ).split(",")
+    if p.strip()
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+Embedder = Callable[[list[str]], list[list[float]]]
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def normalize_messages(messages: list[dict]) -> str:
+    """Canonical JSON of (role, normalized content) pairs."""
+    return json.dumps(
+        [[m.get("role", ""), _normalize(str(m.get("content", "")))] for m in messages],
+        ensure_ascii=False,
+    )
+
+
+@dataclass
+class CachedResponse:
+    """A completed response, as stored in the cache."""
+
+    content: str
+    provider: str
+    model: str
+    sensitivity: str
+    was_anonymized: bool
+    token_count_input: int | None
+    token_count_output: int | None
+    audit_id: str | None
+
+
+@dataclass
+class CacheLookup:
+    """Outcome of a lookup; passed back to ``store`` on a miss."""
+
+    key: str
+    partition: str
+    text: str
+    vector: Optional[np.ndarray] = None
+    hit: Optional[CachedResponse] = None
+    match: str | None = None  # "exact" or "semantic"
+    similarity: float | None = None
+
+
+class ResponseCache:
+    """TTL + LRU cache of completions with optional semantic matching."""
+
+    def __init__(
+        self,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        similarity: float = LLM_CACHE_SIMILARITY,
+        semantic_purposes: frozenset[str] = LLM_CACHE_SEMANTIC_PURPOSES,
+        embed: Optional[Embedder] = None,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max(0, max_entries)
+        self._similarity = similarity
+        self._semantic_purposes = semantic_purposes
+        self._embed = embed
+        # key -> (expires_at, partition, response)
+        self._entries: OrderedDict[str, tuple[float, str, CachedResponse]] = (
+            OrderedDict()
+        )
+        # partition -> {key: unit vector}
+        self._vectors: dict[str, dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        tenant_id: uuid.UUID | str,
+        purpose: str,
+        model: str | None,
+        temperature: float,
+        max_tokens: int,
+        sensitivity: str,
+        messages: list[dict],
+    ) -> tuple[str, str]:
+        """(partition, key): the partition scopes semantic matching."""
+        partition = ":".join(
+            [
+                str(tenant_id),
+                purpose,
+                model or "default",
+                f"{temperature:g}",
+                str(max_tokens),
+                sensitivity,
+            ]
+        )
+        digest = hashlib.sha256(normalize_messages(messages).encode("utf-8"))
+        return partition, f"{partition}:{digest.hexdigest()}"
+
+    def _get_embedder(self) -> Optional[Embedder]:
+        if self._embed is None:
+            engine = get_embedding_engine()
+            # Pseudo-embeddings only match identical text: nothing to add
+            if engine.is_stub:
+                return None
+            self._embed = engine.encode
+        return self._embed
+
+    def _drop(self, key: str) -> None:
+        _, partition, _ = self._entries.pop(key)
+        vectors = self._vectors.get(partition)
+        if vectors is not None:
+            vectors.pop(key, None)
+            if not vectors:
+                del self._vectors[partition]
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def _nearest(
+        self, partition: str, vector: np.ndarray
+    ) -> tuple[Optional[str], float]:
+        with self._lock:
+            vectors = self._vectors.get(partition)
+            if not vectors:
+                return None, 0.0
+            keys = list(vectors)
+            matrix = np.stack([vectors[k] for k in keys])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        return keys[best], float(scores[best])
+
+    async def lookup(
+        self,
+        tenant_id: uuid.UUID | str,
+        purpose: str,
+        model: str | None,
+        temperature: float,
+        max_tokens: int,
+        sensitivity: str,
+        messages: list[dict],
+    ) -> CacheLookup:
+        """Exact lookup, then near-duplicate lookup for deterministic purposes."""
+        partition, key = self.make_key(
+            tenant_id, purpose, model, temperature, max_tokens, sensitivity, messages
+        )
+        text = "\n".join(_normalize(str(m.get("content", ""))) for m in messages)
+        lookup = CacheLookup(key=key, partition=partition, text=text)
+
+        lookup.hit = self._get(key)
+        if lookup.hit is not None:
+            lookup.match = "exact"
+        elif purpose in self._semantic_purposes:
+            embed = self._get_embedder()
+            if embed is not None:
+                [vector] = await get_compute_executor().run(
+                    "llm_cache_embed", embed, [text]
+                )
+                vector = np.asarray(vector, dtype=np.float32)
+                norm = float(np.linalg.norm(vector))
+                if norm:
+                    lookup.vector = vector / norm
+                    near_key, score = self._nearest(partition, lookup.vector)
+                    if near_key is not None and score >= self._similarity:
+                        lookup.hit = self._get(near_key)
+                        if lookup.hit is not None:
+                            lookup.match = "semantic"
+                            lookup.similarity = score
+
+        llm_cache_requests_total.labels(
+            result=f"{lookup.match}_hit" if lookup.hit else "miss"
+        ).inc()
+        return lookup
+
+    def store(self, lookup: CacheLookup, response: CachedResponse) -> None:
+        """Cache a fresh response under the looked-up key."""
+        if self._ttl <= 0 or self._max_entries == 0:
+            return
+        with self._lock:
+            if lookup.key in self._entries:
+                self._drop(lookup.key)
+            self._entries[lookup.key] = (
+                time.monotonic() + self._ttl,
+                lookup.partition,
+                response,
+            )
+            if lookup.vector is not None:
+                self._vectors.setdefault(lookup.partition, {})[lookup.key] = (
+                    lookup.vector
+                )
+            while len(self._entries) > self._max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tenant_id: uuid.UUID | str | None = None) -> int:
+        """Drop a tenant's responses (all tenants if None); returns the count."""
+        prefix = f"{tenant_id}:" if tenant_id else ""
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
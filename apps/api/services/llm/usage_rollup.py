@@ -0,0 +1,222 @@
+"""Daily AI usage rollups — pre-aggregated ai_audit_logs statistics.
+
+The rollup_ai_usage worker task aggregates ai_audit_logs into
+ai_usage_rollups (tenant × day × provider × sensitivity). Readers combine
+the rollups with a live aggregate of the days not rolled up yet, so the
+dashboard and DPIA statistics scan at most about a day of raw audit rows
+instead of the whole table.
+
+Rolled-up days can still change: a response or error can land just after
+midnight, a human validation can come days later, and audit entries
+spilled during a database outage are written on replay with their
+original created_at. Each run therefore re-aggregates the last rolled-up
+day and every day with a row validated or written (inserted_at) since the
+previous run (rollup rows are upserted, never deleted).
+"""
+
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import Date, cast, distinct, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from packages.db.models.ai_audit_log import AIAuditLog
+from packages.db.models.ai_usage_rollup import AIUsageRollup
+
+_ROLLUP_DAY = text(
+    """
+    INSERT INTO ai_usage_rollups (
+        tenant_id, day, provider, data_sensitivity,
+        request_count, anonymized_count, error_count, human_validated_count,
+        tokens_in, tokens_out, cost_eur, latency_ms_sum, latency_count,
+        updated_at
+    )
+    SELECT
+        tenant_id, CAST(created_at AS date), provider, data_sensitivity,
+        count(*),
+        count(*) FILTER (WHERE was_anonymized),
+        count(error),
+        count(*) FILTER (WHERE human_validated),
+        coalesce(sum(token_count_input), 0),
+        coalesce(sum(token_count_output), 0),
+        sum(cost_estimate_eur),
+        coalesce(sum(latency_ms), 0),
+        count(latency_ms),
+        now()
+    FROM ai_audit_logs
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY tenant_id, CAST(created_at AS date), provider, data_sensitivity
+    ON CONFLICT (tenant_id, day, provider, data_sensitivity) DO UPDATE SET
+        request_count = EXCLUDED.request_count,
+        anonymized_count = EXCLUDED.anonymized_count,
+        error_count = EXCLUDED.error_count,
+        human_validated_count = EXCLUDED.human_validated_count,
+        tokens_in = EXCLUDED.tokens_in,
+        tokens_out = EXCLUDED.tokens_out,
+        cost_eur = EXCLUDED.cost_eur,
+        latency_ms_sum = EXCLUDED.latency_ms_sum,
+        latency_count = EXCLUDED.latency_count,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+
+# Rows written by transactions still open when the previous run started
+# have an earlier inserted_at than that run
+_RUN_OVERLAP = timedelta(minutes=10)
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _day_start(day: date) -> datetime:
+    """UTC midnight, naive like ai_audit_logs.created_at."""
+    return datetime.combine(day, time())
+
+
+async def days_to_roll_up(
+    session: AsyncSession, today: date | None = None
+) -> list[date]:
+    """Days whose rollups are missing or stale (always before today)."""
+    today = today or _utc_today()
+    last_day, last_run = (
+        await session.execute(
+            select(func.max(AIUsageRollup.day), func.max(AIUsageRollup.updated_at))
+        )
+    ).one()
+
+    if last_day is None:
+        first = (
+            await session.execute(select(func.min(AIAuditLog.created_at)))
+        ).scalar_one()
+        if first is None:
+            return []
+        start = first.date()
+    else:
+        # Re-aggregate the last day: late responses may have landed since
+        start = last_day
+    days = {start + timedelta(days=i) for i in range((today - start).days)}
+
+    if last_run is not None:
+        since = last_run - _RUN_OVERLAP
+        changed = await session.execute(
+            select(distinct(cast(AIAuditLog.created_at, Date))).where(
+                or_(
+                    AIAuditLog.human_validated_at >= since,
+                    AIAuditLog.inserted_at >= since,
+                ),
+                AIAuditLog.created_at < _day_start(today),
+            )
+        )
+        days.update(day for (day,) in changed.all())
+    return sorted(days)
+
+
+async def rollup_ai_usage(session: AsyncSession, today: date | None = None) -> int:
+    """Refresh the rollups of every stale day (all tenants); returns the count.
+
+    Needs a session that sees every tenant (super-admin).
+    """
+    days = await days_to_roll_up(session, today)
+    for day in days:
+        await session.execute(
+            _ROLLUP_DAY,
+            {"start": _day_start(day), "end": _day_start(day + timedelta(days=1))},
+        )
+    return len(days)
+
+
+async def usage_buckets(
+    session: AsyncSession, tenant_id: uuid.UUID, since: datetime | None = None
+) -> list[dict]:
+    """Usage per (provider, sensitivity) since a naive UTC midnight (or ever).
+
+    Rolled-up days come from ai_usage_rollups; later days are aggregated
+    from ai_audit_logs.
+    """
+    rolled_through = (
+        await session.execute(
+            select(func.max(AIUsageRollup.day)).where(
+                AIUsageRollup.tenant_id == tenant_id
+            )
+        )
+    ).scalar_one()
+
+    queries = []
+    live_since = since
+    if rolled_through is not None and (since is None or rolled_through >= since.date()):
+        rollup_q = select(
+            AIUsageRollup.provider,
+            AIUsageRollup.data_sensitivity,
+            func.sum(AIUsageRollup.request_count).label("count"),
+            func.sum(AIUsageRollup.anonymized_count).label("anonymized"),
+            func.sum(AIUsageRollup.error_count).label("errors"),
+            func.sum(AIUsageRollup.human_validated_count).label("validated"),
+            func.sum(AIUsageRollup.tokens_in).label("tokens_in"),
+            func.sum(AIUsageRollup.tokens_out).label("tokens_out"),
+            func.sum(AIUsageRollup.cost_eur).label("cost"),
+            func.sum(AIUsageRollup.latency_ms_sum).label("latency_sum"),
+            func.sum(AIUsageRollup.latency_count).label("latency_count"),
+        ).where(
+            AIUsageRollup.tenant_id == tenant_id,
+            AIUsageRollup.day <= rolled_through,
+        )
+        if since is not None:
+            rollup_q = rollup_q.where(AIUsageRollup.day >= since.date())
+        queries.append(
+            rollup_q.group_by(AIUsageRollup.provider, AIUsageRollup.data_sensitivity)
+        )
+        live_since = _day_start(rolled_through + timedelta(days=1))
+
+    live_q = select(
+        AIAuditLog.provider,
+        AIAuditLog.data_sensitivity,
+        func.count().label("count"),
+        func.count().filter(AIAuditLog.was_anonymized.is_(True)).label("anonymized"),
+        func.count(AIAuditLog.error).label("errors"),
+        func.count().filter(AIAuditLog.human_validated.is_(True)).label("validated"),
+        func.sum(AIAuditLog.token_count_input).label("tokens_in"),
+        func.sum(AIAuditLog.token_count_output).label("tokens_out"),
+        func.sum(AIAuditLog.cost_estimate_eur).label("cost"),
+        func.sum(AIAuditLog.latency_ms).label("latency_sum"),
+        func.count(AIAuditLog.latency_ms).label("latency_count"),
+    ).where(AIAuditLog.tenant_id == tenant_id)
+    if live_since is not None:
+        live_q = live_q.where(AIAuditLog.created_at >= live_since)
+    queries.append(live_q.group_by(AIAuditLog.provider, AIAuditLog.data_sensitivity))
+
+    buckets: dict[tuple[str, str], dict] = {}
+    for query in queries:
+        for r in (await session.execute(query)).all():
+            bucket = buckets.setdefault(
+                (r.provider, r.data_sensitivity),
+                {
+                    "provider": r.provider,
+                    "data_sensitivity": r.data_sensitivity,
+                    "count": 0,
+                    "anonymized": 0,
+                    "errors": 0,
+                    "validated": 0,
+                    "tokens_in": 0,
+                    "tokens_out": 0,
+                    "cost": None,
+                    "latency_sum": 0,
+                    "latency_count": 0,
+                },
+            )
+            for key in (
+                "count",
+                "anonymized",
+                "errors",
+                "validated",
+                "tokens_in",
+                "tokens_out",
+                "latency_sum",
+                "latency_count",
+            ):
+                bucket[key] += int(getattr(r, key) or 0)
+            if r.cost is not None:
+                bucket["cost"] = (bucket["cost"] or Decimal(0)) + r.cost
+    return list(buckets.values())
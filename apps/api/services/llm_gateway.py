@@ -11,6 +11,14 @@ import time
 from dataclasses import dataclass, field
 from typing import Optional
 
+from apps.api.services.context_packer import (
+    PackedContext,
+    context_budget,
+    format_context,
+    pack_context,
+)
+from apps.api.services.metrics import rag_context_tokens_saved
+
 
 @dataclass
 class LLMSource:
@@ -33,6 +41,8 @@ class LLMResponse:
     tokens_used: int = 0
     has_uncited_claims: bool = False
     uncited_claims: list[str] = field(default_factory=list)
+    context_tokens: int = 0
+    context_tokens_saved: int = 0
 
 
 @dataclass
@@ -45,6 +55,7 @@ class ContextChunk:
     case_id: Optional[str] = None
     page_number: Optional[int] = None
     chunk_index: int = 0
+    score: float = 0.0
 
 
 # ── Rate limiter ──
@@ -192,15 +203,7 @@ class LLMGateway:
         system_prompt: str,
     ) -> list[dict]:
         """Build chat messages with context chunks."""
-        context_parts: list[str] = []
-        for i, chunk in enumerate(context_chunks):
-            source_ref = f"[Source {i + 1}: doc={chunk.document_id or 'N/A'}"
-            if chunk.page_number:
-                source_ref += f", page {chunk.page_number}"
-            source_ref += "]"
-            context_parts.append(f"{source_ref}\n{chunk.content}")
-
-        context_text = "\n\n---\n\n".join(context_parts) if context_parts else ""
+        context_text = format_context(context_chunks)
 
         user_message = prompt
         if context_text:
@@ -229,6 +232,19 @@ class LLMGateway:
 
         return self._vllm_base_url if self._vllm_available else self._base_url
 
+    def _pack_context(
+        self,
+        prompt: str,
+        context_chunks: list[ContextChunk],
+        system_prompt: str,
+        max_tokens: int,
+    ) -> PackedContext:
+        """Fit the context chunks into the model's prompt budget."""
+        budget = context_budget(self._model, system_prompt, prompt, max_tokens)
+        packed = pack_context(context_chunks, budget)
+        rag_context_tokens_saved.observe(packed.tokens_saved)
+        return packed
+
     async def generate(
         self,
         prompt: str,
@@ -249,6 +265,9 @@ class LLMGateway:
                 has_uncited_claims=False,
             )
 
+        # Deduplicated, merged and trimmed to the token budget
+        packed = self._pack_context(prompt, context_chunks, system_prompt, max_tokens)
+        context_chunks = packed.chunks
         messages = self._build_messages(prompt, context_chunks, system_prompt)
 
         # Try vLLM first, fallback to OpenAI
@@ -281,6 +300,8 @@ class LLMGateway:
                 text=f"Erreur LLM : {str(e)}",
                 model=self._model,
                 has_uncited_claims=False,
+                context_tokens=packed.context_tokens,
+                context_tokens_saved=packed.tokens_saved,
             )
 
         # Build sources from context chunks
@@ -305,6 +326,8 @@ class LLMGateway:
             tokens_used=tokens_used,
             has_uncited_claims=not is_valid,
             uncited_claims=uncited,
+            context_tokens=packed.context_tokens,
+            context_tokens_saved=packed.tokens_saved,
         )
 
 
@@ -65,6 +65,129 @@ timeline_extraction_duration_seconds = Histogram(
     "lexibel_timeline_extraction_duration_seconds", "Timeline extraction duration"
 )
 
+# EMBEDDING metrics
+embedding_queue_depth = Gauge(
+    "lexibel_embedding_queue_depth", "Encode requests waiting for a batch"
+)
+
+embedding_batch_size = Histogram(
+    "lexibel_embedding_batch_size",
+    "Texts per embedding model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+
+embedding_batch_duration_seconds = Histogram(
+    "lexibel_embedding_batch_duration_seconds", "Embedding model call duration"
+)
+
+embedding_cache_requests_total = Counter(
+    "lexibel_embedding_cache_requests_total",
+    "Embedding cache lookups",
+    ["result"],
+)
+
+# RAG executor metrics
+rag_stage_duration_seconds = Histogram(
+    "lexibel_rag_stage_duration_seconds",
+    "Duration of CPU-bound RAG stages run off the event loop",
+    ["stage"],
+)
+
+rag_executor_pending = Gauge(
+    "lexibel_rag_executor_pending", "RAG stages queued or running on the executor"
+)
+
+rag_ingests_rejected_total = Counter(
+    "lexibel_rag_ingests_rejected_total",
+    "Ingests rejected by the per-tenant concurrency cap",
+)
+
+search_cache_requests_total = Counter(
+    "lexibel_search_cache_requests_total",
+    "Legal search result cache lookups",
+    ["result"],
+)
+
+rerank_cache_requests_total = Counter(
+    "lexibel_rerank_cache_requests_total",
+    "Cross-encoder score cache lookups",
+    ["result"],
+)
+
+rerank_budget_exceeded_total = Counter(
+    "lexibel_rerank_budget_exceeded_total",
+    "Rerank requests that fell back to first-stage order",
+)
+
+rag_context_tokens_saved = Histogram(
+    "lexibel_rag_context_tokens_saved",
+    "Prompt tokens saved per generation by context packing",
+    buckets=(0, 64, 128, 256, 512, 1024, 2048, 4096, 8192),
+)
+
+# LLM gateway metrics
+llm_provider_latency_seconds = Histogram(
+    "lexibel_llm_provider_latency_seconds",
+    "Successful LLM provider call latency",
+    ["provider"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+
+llm_circuit_open = Gauge(
+    "lexibel_llm_circuit_open",
+    "1 while the provider's circuit breaker is open",
+    ["provider"],
+)
+
+llm_hedged_requests_total = Counter(
+    "lexibel_llm_hedged_requests_total",
+    "Hedged LLM requests launched and won",
+    ["result"],
+)
+
+llm_cache_requests_total = Counter(
+    "lexibel_llm_cache_requests_total",
+    "LLM response cache lookups (exact_hit, semantic_hit, miss)",
+    ["result"],
+)
+
+llm_stream_first_chunk_seconds = Histogram(
+    "lexibel_llm_stream_first_chunk_seconds",
+    "Time to the first streamed chunk sent to the client",
+    ["provider", "anonymized"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30),
+)
+
+llm_audit_queue_depth = Gauge(
+    "lexibel_llm_audit_queue_depth",
+    "AI audit entries queued in memory, not yet written",
+)
+
+llm_audit_entries_total = Counter(
+    "lexibel_llm_audit_entries_total",
+    "AI audit entries written, spilled to the local file, or replayed",
+    ["result"],
+)
+
+http_pool_connections = Gauge(
+    "lexibel_http_pool_connections",
+    "Pooled outbound HTTP connections per origin",
+    ["host", "state"],
+)
+
+http_pool_requests_total = Counter(
+    "lexibel_http_pool_requests_total",
+    "Outbound HTTP requests sent through the shared client pools",
+    ["host"],
+)
+
+brain_snapshot_reads_total = Counter(
+    "lexibel_brain_snapshot_reads_total",
+    "Case intelligence snapshot reads: fresh, stale (served, refresh pending) "
+    "or computed on read",
+    ["result"],
+)
+
 # Database metrics
 db_connections_active = Gauge(
     "lexibel_db_connections_active", "Active database connections", ["database"]
@@ -7,11 +7,11 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.models.calendar_event import CalendarEvent
+from apps.api.services.http_client import pooled_client
 from apps.api.services.microsoft_oauth_service import get_microsoft_oauth_service
 
 
@@ -63,7 +63,7 @@ class MicrosoftCalendarService:
         if filters:
             params["$filter"] = " and ".join(filters)
 
-        async with httpx.AsyncClient(timeout=GRAPH_TIMEOUT) as client:
+        async with pooled_client(GRAPH_BASE_URL, timeout=GRAPH_TIMEOUT) as client:
             response = await client.get(
                 f"{GRAPH_BASE_URL}/me/events",
                 headers=headers,
@@ -7,12 +7,12 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.models.email_message import EmailMessage
 from packages.db.models.email_thread import EmailThread
+from apps.api.services.http_client import pooled_client
 from apps.api.services.microsoft_oauth_service import get_microsoft_oauth_service
 
 
@@ -54,7 +54,7 @@ class MicrosoftOutlookSyncService:
             since_iso = since_date.isoformat()
             params["$filter"] = f"receivedDateTime ge {since_iso}Z"
 
-        async with httpx.AsyncClient(timeout=GRAPH_TIMEOUT) as client:
+        async with pooled_client(GRAPH_BASE_URL, timeout=GRAPH_TIMEOUT) as client:
             response = await client.get(
                 f"{GRAPH_BASE_URL}/me/messages",
                 headers=headers,
@@ -8,15 +8,26 @@ Orchestrates the full RAG flow:
 Implements P3 (No Source No Claim) at every step.
 """
 
+import asyncio
 import os
 from dataclasses import dataclass, field
 from typing import Optional
 
 from apps.api.services.chunking_service import (
-    chunk_document,
+    Chunk,
     chunk_text,
     generate_embeddings,
+    iter_document_chunks,
+    take_batch,
 )
+from apps.api.services.compute_executor import (
+    ComputeExecutor,
+    ExecutorBusyError,
+    get_compute_executor,
+)
+from apps.api.services.keyword_index import KeywordIndex, get_keyword_index
+from apps.api.services.rerank_service import RerankService, get_rerank_service
+from apps.api.services.search_service import SearchService
 from apps.api.services.vector_service import (
     InMemoryVectorService,
     VectorService,
@@ -30,6 +41,23 @@ from apps.api.services.llm_gateway import (
 )
 
 
+def _chunk_payloads(chunks: list[Chunk]) -> list[dict]:
+    """Vector-store payloads for chunks (also fed to the keyword index)."""
+    return [
+        {
+            "content": c.content,
+            "document_id": c.document_id,
+            "case_id": c.case_id,
+            "evidence_link_id": c.evidence_link_id,
+            "tenant_id": c.tenant_id,
+            "page_number": c.page_number,
+            "chunk_index": c.chunk_index,
+            "metadata": c.metadata,
+        }
+        for c in chunks
+    ]
+
+
 @dataclass
 class IngestResult:
     """Result of document ingestion."""
@@ -40,6 +68,7 @@ class IngestResult:
     vectors_upserted: int
     success: bool = True
     error: Optional[str] = None
+    stage_timings_ms: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -51,6 +80,8 @@ class QueryResult:
     total_results: int = 0
     search_time_ms: float = 0.0
     reranked: bool = False
+    rerank_time_ms: float = 0.0
+    stage_timings_ms: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -65,6 +96,7 @@ class GenerateResult:
     has_uncited_claims: bool = False
     uncited_claims: list[str] = field(default_factory=list)
     context_chunks_used: int = 0
+    context_tokens_saved: int = 0
 
 
 class RAGPipeline:
@@ -79,6 +111,9 @@ class RAGPipeline:
         vector_service: Optional[VectorService] = None,
         llm_gateway: Optional[LLMGateway] = None,
         use_stub: bool = False,
+        keyword_index: Optional[KeywordIndex] = None,
+        executor: Optional[ComputeExecutor] = None,
+        rerank_service: Optional[RerankService] = None,
     ):
         """Initialize RAG pipeline.
 
@@ -86,6 +121,9 @@ class RAGPipeline:
             vector_service: Vector store service (defaults to InMemoryVectorService)
             llm_gateway: LLM gateway (defaults to StubLLMGateway if use_stub=True)
             use_stub: Use stub services for testing without dependencies
+            keyword_index: BM25 index fed on ingest (defaults to a private one)
+            executor: Pool for blocking stages (defaults to the shared one)
+            rerank_service: Cross-encoder reranker (defaults to the shared one)
         """
         if use_stub or vector_service is None:
             self.vector_service = InMemoryVectorService()
@@ -99,6 +137,11 @@ class RAGPipeline:
         else:
             self.llm_gateway = llm_gateway
 
+        self.keyword_index = keyword_index or KeywordIndex()
+        self.search_service = SearchService(self.vector_service, self.keyword_index)
+        self.executor = executor or get_compute_executor()
+        self.rerank_service = rerank_service or get_rerank_service()
+
         self._ensure_collection()
 
     def _ensure_collection(self) -> None:
@@ -120,10 +163,16 @@ class RAGPipeline:
     ) -> IngestResult:
         """Ingest a document into the RAG system.
 
-        Steps:
-        1. Chunk the document (512 tokens, 64 overlap)
-        2. Generate embeddings for each chunk
-        3. Upsert vectors into vector store with metadata
+        Steps (streamed, so large PDFs never sit fully in memory):
+        1. Chunk the document page by page (512 tokens, 64 overlap)
+        2. Generate embeddings per batch of EMBEDDING_BATCH_SIZE chunks
+        3. Upsert each batch into the vector store with metadata
+
+        Chunking, embedding and upserts run on the compute executor, never
+        on the event loop. At most RAG_MAX_INGESTS_PER_TENANT ingests run
+        per tenant; a failure or cancellation part-way through removes the
+        chunks this attempt upserted (chunks of an earlier ingest of the
+        document stay).
 
         Args:
             document_id: Unique document identifier
@@ -136,18 +185,28 @@ class RAGPipeline:
         Returns:
             IngestResult with statistics
         """
+        timings: dict[str, float] = {}
+        chunks_created = 0
+        written: list[str] = []
         try:
-            # 1. Chunk the document
-            chunks = chunk_document(
-                content=content,
-                mime_type=mime_type,
-                case_id=case_id,
-                document_id=document_id,
-                evidence_link_id=evidence_link_id,
-                tenant_id=tenant_id,
-            )
-
-            if not chunks:
+            async with self.executor.tenant_ingest(tenant_id):
+                chunks = iter_document_chunks(
+                    content=content,
+                    mime_type=mime_type,
+                    case_id=case_id,
+                    document_id=document_id,
+                    evidence_link_id=evidence_link_id,
+                    tenant_id=tenant_id,
+                )
+                while batch := await self.executor.run(
+                    "chunk", take_batch, chunks, timings=timings
+                ):
+                    # Recorded before the upsert, which may fail part-way
+                    written.extend(c.chunk_id for c in batch)
+                    await self._index_batch(batch, timings)
+                    chunks_created += len(batch)
+
+            if not chunks_created:
                 return IngestResult(
                     document_id=document_id,
                     chunks_created=0,
@@ -155,43 +214,20 @@ class RAGPipeline:
                     vectors_upserted=0,
                     success=False,
                     error="No chunks extracted from document",
+                    stage_timings_ms=timings,
                 )
 
-            # 2. Generate embeddings
-            chunk_texts = [c.content for c in chunks]
-            embeddings = generate_embeddings(chunk_texts)
-
-            # 3. Upsert into vector store
-            chunk_ids = [c.chunk_id for c in chunks]
-            payloads = [
-                {
-                    "content": c.content,
-                    "document_id": c.document_id,
-                    "case_id": c.case_id,
-                    "evidence_link_id": c.evidence_link_id,
-                    "tenant_id": c.tenant_id,
-                    "page_number": c.page_number,
-                    "chunk_index": c.chunk_index,
-                    "metadata": c.metadata,
-                }
-                for c in chunks
-            ]
-
-            self.vector_service.upsert_chunks(
-                chunk_ids=chunk_ids,
-                embeddings=embeddings,
-                payloads=payloads,
-            )
-
             return IngestResult(
                 document_id=document_id,
-                chunks_created=len(chunks),
-                embeddings_generated=len(embeddings),
-                vectors_upserted=len(chunk_ids),
+                chunks_created=chunks_created,
+                embeddings_generated=chunks_created,
+                vectors_upserted=chunks_created,
                 success=True,
+                stage_timings_ms=timings,
             )
 
         except Exception as e:
+            await self._rollback(written)
             return IngestResult(
                 document_id=document_id,
                 chunks_created=0,
@@ -199,7 +235,52 @@ class RAGPipeline:
                 vectors_upserted=0,
                 success=False,
                 error=str(e),
+                stage_timings_ms=timings,
             )
+        except BaseException:
+            # Cancelled (client gone, shutdown): roll back, then propagate
+            await self._rollback(written)
+            raise
+
+    async def _rollback(self, chunk_ids: list[str]) -> None:
+        """Remove the chunks a failed or cancelled ingest wrote.
+
+        Runs on a plain thread, not the compute executor: admission to the
+        executor can be refused when it is saturated, and a started thread
+        finishes even if the caller is cancelled again.
+        """
+        if chunk_ids:
+            await asyncio.to_thread(self.delete_chunks, chunk_ids)
+
+    async def _index_batch(
+        self, chunks: list[Chunk], timings: dict[str, float]
+    ) -> None:
+        """Embed one batch of chunks and write it to the vector and keyword indexes."""
+        embeddings = await self.executor.run(
+            "embed", generate_embeddings, [c.content for c in chunks], timings=timings
+        )
+        upsert = asyncio.ensure_future(
+            self.executor.run(
+                "upsert", self._upsert, chunks, embeddings, timings=timings
+            )
+        )
+        try:
+            await asyncio.shield(upsert)
+        except asyncio.CancelledError:
+            # The write keeps running on the pool: let it land so the
+            # caller's rollback removes it rather than racing it
+            await asyncio.wait([upsert])
+            raise
+
+    def _upsert(self, chunks: list[Chunk], embeddings: list[list[float]]) -> None:
+        chunk_ids = [c.chunk_id for c in chunks]
+        payloads = _chunk_payloads(chunks)
+        self.vector_service.upsert_chunks(
+            chunk_ids=chunk_ids,
+            embeddings=embeddings,
+            payloads=payloads,
+        )
+        self.keyword_index.add(chunk_ids, payloads)
 
     async def ingest_text(
         self,
@@ -225,62 +306,49 @@ class RAGPipeline:
         Returns:
             IngestResult with statistics
         """
+        timings: dict[str, float] = {}
+        written: list[str] = []
         try:
-            # Chunk the text
-            chunks = chunk_text(
-                text=text,
-                case_id=case_id,
-                document_id=document_id,
-                evidence_link_id=evidence_link_id,
-                tenant_id=tenant_id,
-                extra_metadata=extra_metadata,
-            )
-
-            if not chunks:
-                return IngestResult(
+            async with self.executor.tenant_ingest(tenant_id):
+                # Chunk the text
+                chunks = await self.executor.run(
+                    "chunk",
+                    chunk_text,
+                    text=text,
+                    case_id=case_id,
                     document_id=document_id,
-                    chunks_created=0,
-                    embeddings_generated=0,
-                    vectors_upserted=0,
-                    success=False,
-                    error="No chunks created from text",
+                    evidence_link_id=evidence_link_id,
+                    tenant_id=tenant_id,
+                    extra_metadata=extra_metadata,
+                    timings=timings,
                 )
 
-            # Generate embeddings
-            chunk_texts = [c.content for c in chunks]
-            embeddings = generate_embeddings(chunk_texts)
-
-            # Upsert into vector store
-            chunk_ids = [c.chunk_id for c in chunks]
-            payloads = [
-                {
-                    "content": c.content,
-                    "document_id": c.document_id,
-                    "case_id": c.case_id,
-                    "evidence_link_id": c.evidence_link_id,
-                    "tenant_id": c.tenant_id,
-                    "page_number": c.page_number,
-                    "chunk_index": c.chunk_index,
-                    "metadata": c.metadata,
-                }
-                for c in chunks
-            ]
-
-            self.vector_service.upsert_chunks(
-                chunk_ids=chunk_ids,
-                embeddings=embeddings,
-                payloads=payloads,
-            )
+                if not chunks:
+                    return IngestResult(
+                        document_id=document_id,
+                        chunks_created=0,
+                        embeddings_generated=0,
+                        vectors_upserted=0,
+                        success=False,
+                        error="No chunks created from text",
+                        stage_timings_ms=timings,
+                    )
+
+                # Embed and upsert into the vector store
+                written = [c.chunk_id for c in chunks]
+                await self._index_batch(chunks, timings)
 
             return IngestResult(
                 document_id=document_id,
                 chunks_created=len(chunks),
-                embeddings_generated=len(embeddings),
-                vectors_upserted=len(chunk_ids),
+                embeddings_generated=len(chunks),
+                vectors_upserted=len(chunks),
                 success=True,
+                stage_timings_ms=timings,
             )
 
         except Exception as e:
+            await self._rollback(written)
             return IngestResult(
                 document_id=document_id,
                 chunks_created=0,
@@ -288,7 +356,11 @@ class RAGPipeline:
                 vectors_upserted=0,
                 success=False,
                 error=str(e),
+                stage_timings_ms=timings,
             )
+        except BaseException:
+            await self._rollback(written)
+            raise
 
     async def query(
         self,
@@ -321,24 +393,40 @@ class RAGPipeline:
         import time
 
         start = time.time()
+        timings: dict[str, float] = {}
 
         try:
             # 1. Embed the question
-            query_embedding = generate_embeddings([question])[0]
+            query_embedding = (
+                await self.executor.run(
+                    "embed", generate_embeddings, [question], timings=timings
+                )
+            )[0]
 
             # 2. Vector search
-            results = self.vector_service.search(
+            results = await self.executor.run(
+                "search",
+                self.vector_service.search,
                 query_embedding=query_embedding,
                 tenant_id=tenant_id,
                 top_k=top_k * 2 if enable_rerank else top_k,
                 case_id=case_id,
                 filters=filters,
+                timings=timings,
             )
 
-            # 3. Re-ranking (simple score-based for now, upgrade to cross-encoder)
-            if enable_rerank and len(results) > top_k:
-                # Simple re-ranking: sort by score, take top_k
-                results = sorted(results, key=lambda r: r.score, reverse=True)[:top_k]
+            # 3. Cross-encoder re-ranking (first-stage order if unavailable)
+            reranked = False
+            if enable_rerank and len(results) > 1:
+                results, reranked = await self.executor.run(
+                    "rerank",
+                    self.rerank_service.rerank,
+                    question,
+                    results,
+                    top_k,
+                    timings=timings,
+                )
+            results = results[:top_k]
 
             # 4. Convert to ContextChunk format
             context_chunks = [
@@ -348,7 +436,8 @@ class RAGPipeline:
                     evidence_link_id=r.evidence_link_id,
                     case_id=r.case_id,
                     page_number=r.page_number,
-                    chunk_index=0,
+                    chunk_index=r.chunk_index,
+                    score=r.score,
                 )
                 for r in results
             ]
@@ -360,9 +449,14 @@ class RAGPipeline:
                 context_chunks=context_chunks,
                 total_results=len(results),
                 search_time_ms=search_time_ms,
-                reranked=enable_rerank,
+                reranked=reranked,
+                rerank_time_ms=timings.get("rerank", 0.0),
+                stage_timings_ms=timings,
             )
 
+        except ExecutorBusyError:
+            # Back-pressure: let the caller answer 503 instead of "no results"
+            raise
         except Exception:
             return QueryResult(
                 query=question,
@@ -415,7 +509,8 @@ class RAGPipeline:
                 tokens_used=response.tokens_used,
                 has_uncited_claims=response.has_uncited_claims,
                 uncited_claims=response.uncited_claims,
-                context_chunks_used=len(context_chunks),
+                context_chunks_used=len(response.sources),
+                context_tokens_saved=response.context_tokens_saved,
             )
 
         except Exception as e:
@@ -474,6 +569,22 @@ class RAGPipeline:
 
         return generate_result
 
+    def delete_chunks(self, chunk_ids: list[str]) -> bool:
+        """Delete the vectors of specific chunks.
+
+        Args:
+            chunk_ids: Chunk IDs to delete
+
+        Returns:
+            True if successful
+        """
+        try:
+            self.vector_service.delete_chunks(chunk_ids)
+            self.keyword_index.delete_chunks(chunk_ids)
+            return True
+        except Exception:
+            return False
+
     def delete_document(self, document_id: str) -> bool:
         """Delete all vectors for a document.
 
@@ -485,6 +596,7 @@ class RAGPipeline:
         """
         try:
             self.vector_service.delete_by_document(document_id)
+            self.keyword_index.delete_by_document(document_id)
             return True
         except Exception:
             return False
@@ -514,9 +626,9 @@ def create_rag_pipeline(
     if not use_stub:
         # Try to use real services
         try:
-            from apps.api.services.vector_service import VectorService
+            from apps.api.services.vector_service import create_vector_service
 
-            vector_service = VectorService(url=qdrant_url)
+            vector_service = create_vector_service(url=qdrant_url)
         except Exception:
             # Fall back to in-memory
             vector_service = InMemoryVectorService()
@@ -532,4 +644,5 @@ def create_rag_pipeline(
         vector_service=vector_service,
         llm_gateway=llm_gateway,
         use_stub=use_stub,
+        keyword_index=None if use_stub else get_keyword_index(),
     )
@@ -9,14 +9,22 @@ Features:
 - Jurisprudence prediction
 """
 
-import os
+import itertools
+import json
 import re
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 from datetime import datetime
 
 from apps.api.services.vector_service import VectorService
 from apps.api.services.chunking_service import generate_embeddings
+from apps.api.services.compute_executor import get_compute_executor
+from apps.api.services.rerank_service import RerankService, get_rerank_service
+from apps.api.services.search_cache import (
+    SearchResultCache,
+    get_search_cache,
+    make_cache_key,
+)
 
 
 # ── Legal Document Types ──
@@ -72,6 +80,7 @@ class LegalSearchResult:
     related_articles: list[str] = field(default_factory=list)
     entities: list[LegalEntity] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
+    chunk_id: Optional[str] = None
 
 
 @dataclass
@@ -85,6 +94,27 @@ class LegalSearchResponse:
     search_time_ms: float = 0.0
     suggested_queries: list[str] = field(default_factory=list)
     detected_entities: list[LegalEntity] = field(default_factory=list)
+    rerank_time_ms: float = 0.0
+
+    def to_json(self) -> str:
+        """Serialize for the search result cache."""
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, data: str) -> "LegalSearchResponse":
+        """Rebuild a response serialized with to_json."""
+        raw = json.loads(data)
+        raw["results"] = [
+            LegalSearchResult(
+                **{
+                    **r,
+                    "entities": [LegalEntity(**e) for e in r["entities"]],
+                }
+            )
+            for r in raw["results"]
+        ]
+        raw["detected_entities"] = [LegalEntity(**e) for e in raw["detected_entities"]]
+        return cls(**raw)
 
 
 # ── Legal Entity Recognition ──
@@ -192,24 +222,10 @@ class LegalQueryExpander:
 
 
 class CrossEncoderReranker:
-    """Re-rank search results using cross-encoder model."""
-
-    def __init__(self) -> None:
-        self._model = None
-        self._model_name = os.getenv(
-            "CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"
-        )
-
-    def _load_model(self) -> None:
-        """Lazy load cross-encoder model."""
-        if self._model is None:
-            try:
-                from sentence_transformers import CrossEncoder
+    """Re-rank search results using the shared cross-encoder service."""
 
-                self._model = CrossEncoder(self._model_name)
-            except ImportError:
-                # Fallback: no re-ranking
-                pass
+    def __init__(self, service: Optional[RerankService] = None) -> None:
+        self._service = service or get_rerank_service()
 
     def rerank(
         self,
@@ -217,27 +233,14 @@ class CrossEncoderReranker:
         results: list[LegalSearchResult],
         top_k: int = 10,
     ) -> list[LegalSearchResult]:
-        """Re-rank results using cross-encoder."""
-        self._load_model()
-
-        if not self._model or not results:
-            return results[:top_k]
-
-        # Prepare query-document pairs
-        pairs = [(query, r.chunk_text) for r in results]
-
-        # Get cross-encoder scores
-        scores = self._model.predict(pairs)
-
-        # Re-rank results
-        ranked = sorted(zip(results, scores), key=lambda x: x[1], reverse=True)
-
-        # Update scores
-        reranked = []
-        for result, score in ranked[:top_k]:
-            result.score = float(score)
-            reranked.append(result)
+        """Re-rank results using cross-encoder.
 
+        Keeps the first-stage order if no model is available or the
+        latency budget is exceeded.
+        """
+        reranked, _ = self._service.rerank(
+            query, results, top_k, text_attr="chunk_text"
+        )
         return reranked
 
 
@@ -291,13 +294,18 @@ class LegalRAGService:
     CHUNK_SIZE = 500
     CHUNK_OVERLAP = 100
 
-    def __init__(self, vector_service: VectorService) -> None:
+    def __init__(
+        self,
+        vector_service: VectorService,
+        cache: Optional[SearchResultCache] = None,
+    ) -> None:
         self._vector = vector_service
         self._entity_extractor = LegalEntityExtractor()
         self._query_expander = LegalQueryExpander()
         self._reranker = CrossEncoderReranker()
         self._translator = MultilingualTranslator()
-        self._cache: dict[str, LegalSearchResponse] = {}
+        self._cache = cache or get_search_cache()
+        self._executor = get_compute_executor()
 
     def _highlight_passages(
         self,
@@ -359,13 +367,24 @@ class LegalRAGService:
         import time
 
         start_time = time.time()
-
-        # Cache check
-        cache_key = f"{query}:{tenant_id}:{str(filters)}"
-        if cache_key in self._cache:
-            cached = self._cache[cache_key]
-            cached.search_time_ms = (time.time() - start_time) * 1000
-            return cached
+        timings: dict[str, float] = {}
+
+        # Cache check (each hit is a fresh copy, safe to annotate)
+        cache_key = make_cache_key(
+            query,
+            tenant_id,
+            filters,
+            limit=limit,
+            enable_reranking=enable_reranking,
+            enable_multilingual=enable_multilingual,
+        )
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            response = LegalSearchResponse.from_json(cached)
+            response.query = query
+            response.search_time_ms = (time.time() - start_time) * 1000
+            response.rerank_time_ms = 0.0
+            return response
 
         # 1. Entity extraction
         entities = self._entity_extractor.extract(query)
@@ -380,23 +399,31 @@ class LegalRAGService:
             if nl_query != expanded_query:
                 queries_to_search.append(nl_query)
 
-        # 4. Semantic search with Qdrant
-        all_results = []
-        for search_query in queries_to_search:
-            query_embedding = generate_embeddings([search_query])[0]
-
-            vector_results = self._vector.search(
-                query_embedding=query_embedding,
-                tenant_id=tenant_id,
-                top_k=limit * 2,  # Fetch more for re-ranking
-                filters=filters,
-            )
-
-            # Convert to LegalSearchResult
-            for vr in vector_results:
-                metadata = vr.metadata or {}
+        # 4. Semantic search: all query variants in one embedding call and
+        # one multi-vector search request
+        query_embeddings = await self._executor.run(
+            "embed", generate_embeddings, queries_to_search
+        )
+        result_lists = await self._executor.run(
+            "search",
+            self._vector.search_batch,
+            query_embeddings=query_embeddings,
+            tenant_id=tenant_id,
+            top_k=limit * 2,  # Fetch more for re-ranking
+            filters=filters,
+        )
 
-                result = LegalSearchResult(
+        # 5. Convert to LegalSearchResult, removing duplicates (by chunk_text)
+        seen = set()
+        unique_results = []
+        for vr in itertools.chain.from_iterable(result_lists):
+            if vr.content in seen:
+                continue
+            seen.add(vr.content)
+            metadata = vr.metadata or {}
+            unique_results.append(
+                LegalSearchResult(
+                    chunk_id=vr.chunk_id,
                     chunk_text=vr.content,
                     score=vr.score,
                     source=metadata.get("source", "Unknown"),
@@ -408,37 +435,32 @@ class LegalRAGService:
                     page_number=vr.page_number,
                     metadata=metadata,
                 )
-
-                # Add highlighted passages
-                result.highlighted_passages = self._highlight_passages(
-                    vr.content, query
-                )
-
-                # Add related articles
-                result.related_articles = self._detect_related_articles(
-                    result.article_number,
-                    result.document_type,
-                )
-
-                # Extract entities from result
-                result.entities = self._entity_extractor.extract(vr.content)
-
-                all_results.append(result)
-
-        # 5. Remove duplicates (by chunk_text)
-        seen = set()
-        unique_results = []
-        for result in all_results:
-            if result.chunk_text not in seen:
-                seen.add(result.chunk_text)
-                unique_results.append(result)
+            )
 
         # 6. Cross-encoder re-ranking (if enabled)
         if enable_reranking and len(unique_results) > 1:
-            unique_results = self._reranker.rerank(query, unique_results, limit)
+            unique_results = await self._executor.run(
+                "rerank",
+                self._reranker.rerank,
+                query,
+                unique_results,
+                limit,
+                timings=timings,
+            )
         else:
             unique_results = unique_results[:limit]
 
+        # Highlights, related articles and entities for the returned results only
+        for result in unique_results:
+            result.highlighted_passages = self._highlight_passages(
+                result.chunk_text, query
+            )
+            result.related_articles = self._detect_related_articles(
+                result.article_number,
+                result.document_type,
+            )
+            result.entities = self._entity_extractor.extract(result.chunk_text)
+
         # 7. Generate suggested queries
         suggested_queries = []
         if entities:
@@ -453,13 +475,12 @@ class LegalRAGService:
             results=unique_results,
             total=len(unique_results),
             search_time_ms=(time.time() - start_time) * 1000,
+            rerank_time_ms=timings.get("rerank", 0.0),
             suggested_queries=suggested_queries,
             detected_entities=entities,
         )
 
-        # Cache response (simple in-memory cache)
-        if len(self._cache) < 100:  # Limit cache size
-            self._cache[cache_key] = response
+        await self._cache.set(cache_key, response.to_json())
 
         return response
 
@@ -0,0 +1,204 @@
+"""Rerank service — shared cross-encoder scoring for search results.
+
+One CrossEncoder per process (instead of one per LegalRAGService), scoring
+(query, passage) pairs in batches of RERANK_BATCH_SIZE. Scores are cached
+by (query hash, chunk key), so repeated or paginated queries only score new
+candidates. At most RERANK_MAX_CANDIDATES pairs are scored per request.
+
+Each request has a latency budget (RERANK_BUDGET_MS): once it is spent,
+scoring stops and the caller keeps the first-stage (vector) order. Batches
+already scored stay in the cache, so a retry of the same query is cheaper.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from apps.api.services.metrics import (
+    rerank_budget_exceeded_total,
+    rerank_cache_requests_total,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+RERANK_MAX_CANDIDATES = int(os.getenv("RERANK_MAX_CANDIDATES", "50"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "300"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
+
+
+def chunk_key(text: str, chunk_id: Optional[str] = None) -> str:
+    """Cache identity of a passage: its chunk id, else a hash of its text."""
+    return chunk_id or hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RerankService:
+    """Process-wide cross-encoder with batching, score cache and budget."""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: int = RERANK_BATCH_SIZE,
+        max_candidates: int = RERANK_MAX_CANDIDATES,
+        budget_ms: float = RERANK_BUDGET_MS,
+        cache_size: int = RERANK_CACHE_SIZE,
+        model: Any = None,
+    ) -> None:
+        self.model_name = model_name or os.getenv(
+            "CROSS_ENCODER_MODEL", DEFAULT_MODEL_NAME
+        )
+        self.batch_size = max(1, batch_size)
+        self.max_candidates = max(1, max_candidates)
+        self.budget_ms = budget_ms
+        self._model: Any = model
+        self._model_loaded = model is not None
+        self._load_lock = threading.Lock()
+        # The model is not guaranteed thread-safe; one predict at a time
+        self._predict_lock = threading.Lock()
+        self._cache_size = max(0, cache_size)
+        self._scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _load_model(self) -> Any:
+        """Load the model once; returns None if sentence-transformers is missing."""
+        if self._model_loaded:
+            return self._model
+        with self._load_lock:
+            if not self._model_loaded:
+                try:
+                    from sentence_transformers import CrossEncoder
+
+                    self._model = CrossEncoder(self.model_name)
+                    logger.info("Cross-encoder %s loaded", self.model_name)
+                except ImportError:
+                    logger.warning("sentence-transformers not installed — no reranking")
+                    self._model = None
+                self._model_loaded = True
+        return self._model
+
+    def _cached(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], float]:
+        with self._cache_lock:
+            found = {}
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                    found[key] = score
+        rerank_cache_requests_total.labels(result="hit").inc(len(found))
+        rerank_cache_requests_total.labels(result="miss").inc(len(keys) - len(found))
+        return found
+
+    def _remember(self, items: dict[tuple[str, str], float]) -> None:
+        if self._cache_size == 0:
+            return
+        with self._cache_lock:
+            self._scores.update(items)
+            for key in items:
+                self._scores.move_to_end(key)
+            while len(self._scores) > self._cache_size:
+                self._scores.popitem(last=False)
+
+    def score(
+        self,
+        query: str,
+        passages: list[tuple[str, str]],
+        budget_ms: Optional[float] = None,
+    ) -> Optional[list[float]]:
+        """Cross-encoder scores for (chunk key, text) passages, in order.
+
+        Only the first ``max_candidates`` passages are scored. Returns None
+        when no model is available or the latency budget ran out.
+        """
+        model = self._load_model()
+        if model is None or not passages:
+            return None
+        budget = self.budget_ms if budget_ms is None else budget_ms
+        start = time.perf_counter()
+
+        passages = passages[: self.max_candidates]
+        query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()[:32]
+        keys = [(query_hash, key) for key, _ in passages]
+        scores = self._cached(keys)
+
+        missing = [
+            (key, text) for key, (_, text) in zip(keys, passages) if key not in scores
+        ]
+        for i in range(0, len(missing), self.batch_size):
+            if budget > 0 and (time.perf_counter() - start) * 1000 > budget:
+                rerank_budget_exceeded_total.inc()
+                return None
+            batch = missing[i : i + self.batch_size]
+            with self._predict_lock:
+                batch_scores = model.predict(
+                    [(query, text) for _, text in batch],
+                    batch_size=self.batch_size,
+                    show_progress_bar=False,
+                )
+            scored = {key: float(s) for (key, _), s in zip(batch, batch_scores)}
+            self._remember(scored)
+            scores.update(scored)
+
+        return [scores[key] for key in keys]
+
+    def rerank(
+        self,
+        query: str,
+        results: list[Any],
+        top_k: int,
+        text_attr: str = "content",
+        id_attr: str = "chunk_id",
+        budget_ms: Optional[float] = None,
+    ) -> tuple[list[Any], bool]:
+        """Reorder search results (objects with a ``score``) by cross-encoder score.
+
+        Scored results get their cross-encoder score; candidates beyond
+        ``max_candidates`` follow in first-stage order. Returns the top_k
+        results and whether reranking was applied; without a model or past
+        the budget the first-stage order is returned unchanged.
+        """
+        passages = [
+            (
+                chunk_key(getattr(r, text_attr), getattr(r, id_attr, None)),
+                getattr(r, text_attr),
+            )
+            for r in results
+        ]
+        scores = self.score(query, passages, budget_ms)
+        if scores is None:
+            return results[:top_k], False
+
+        ranked = sorted(
+            zip(results[: len(scores)], scores), key=lambda x: x[1], reverse=True
+        )
+        reranked = []
+        for result, score in ranked:
+            result.score = score
+            reranked.append(result)
+        reranked.extend(results[len(scores) :])
+        return reranked[:top_k], True
+
+    def clear(self) -> None:
+        """Drop all cached scores."""
+        with self._cache_lock:
+            self._scores.clear()
+
+
+# Singleton instance
+_rerank_service: Optional[RerankService] = None
+_service_lock = threading.Lock()
+
+
+def get_rerank_service() -> RerankService:
+    """Get or create the process-wide RerankService instance."""
+    global _rerank_service
+    if _rerank_service is None:
+        with _service_lock:
+            if _rerank_service is None:
+                _rerank_service = RerankService()
+    return _rerank_service
@@ -0,0 +1,173 @@
+"""Search result cache — TTL/LRU cache for legal search responses.
+
+Keys are normalized (Unicode NFKC, case-folded, collapsed whitespace) and
+include every parameter that changes the result: tenant, filters, limit,
+re-ranking and multilingual flags. Values are JSON strings, so a hit is
+always a fresh object that the caller may modify.
+
+Backends:
+- in-process (default): OrderedDict LRU with per-entry expiry;
+- Redis (when SEARCH_CACHE_REDIS_URL or REDIS_URL is set): shared by all
+  API workers, expiry via SETEX. Redis errors degrade to cache misses.
+
+The legal indexer calls ``invalidate(tenant_id)`` after upserting, which
+drops the tenant's entries in the shared backend; in-process caches of
+other processes catch up within the TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+from apps.api.services.metrics import search_cache_requests_total
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512"))
+SEARCH_CACHE_REDIS_URL = os.getenv("SEARCH_CACHE_REDIS_URL") or os.getenv("REDIS_URL")
+
+KEY_PREFIX = "lexibel:legal_search"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query for cache keys."""
+    return (
+        _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip().casefold()
+    )
+
+
+def make_cache_key(
+    query: str,
+    tenant_id: str,
+    filters: Optional[dict] = None,
+    **params: Any,
+) -> str:
+    """Cache key: tenant prefix + SHA-256 of the normalized request."""
+    canonical = json.dumps(
+        {"q": normalize_query(query), "filters": filters or {}, **params},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{tenant_id}:{digest}"
+
+
+class SearchResultCache:
+    """TTL + LRU cache of serialized search responses."""
+
+    def __init__(
+        self,
+        ttl: float = SEARCH_CACHE_TTL,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        redis_url: Optional[str] = None,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_url = redis_url
+        self._redis: Optional[Any] = None
+
+    async def _get_redis(self) -> Optional[Any]:
+        if self._redis is None and self._redis_url:
+            try:
+                import redis.asyncio as aioredis
+
+                self._redis = aioredis.from_url(self._redis_url, decode_responses=True)
+            except Exception as e:
+                logger.warning("Search cache Redis disabled: %s", e)
+                self._redis_url = None
+        return self._redis
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        value = None
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                value = await redis.get(key)
+            except Exception as e:
+                logger.warning("Search cache read failed: %s", e)
+        else:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    expires_at, value = entry
+                    if expires_at <= time.monotonic():
+                        del self._entries[key]
+                        value = None
+                    else:
+                        self._entries.move_to_end(key)
+
+        search_cache_requests_total.labels(result="hit" if value else "miss").inc()
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a value for the configured TTL."""
+        if self._ttl <= 0:
+            return
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                await redis.setex(key, int(max(1, self._ttl)), value)
+            except Exception as e:
+                logger.warning("Search cache write failed: %s", e)
+            return
+
+        if self._max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    async def invalidate(self, tenant_id: Optional[str] = None) -> int:
+        """Drop cached results for a tenant (all tenants if None).
+
+        Returns the number of entries removed.
+        """
+        prefix = f"{KEY_PREFIX}:{tenant_id}:" if tenant_id else f"{KEY_PREFIX}:"
+        removed = 0
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                keys = [k async for k in redis.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    removed = await redis.unlink(*keys)
+            except Exception as e:
+                logger.warning("Search cache invalidation failed: %s", e)
+
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+                removed += 1
+        return removed
+
+    async def close(self) -> None:
+        """Close the Redis connection, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+# Singleton instance
+_search_cache: Optional[SearchResultCache] = None
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get or create the process-wide SearchResultCache instance."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchResultCache(redis_url=SEARCH_CACHE_REDIS_URL)
+    return _search_cache
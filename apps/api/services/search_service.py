@@ -1,5 +1,10 @@
 """Search service — hybrid search combining vector similarity + keyword.
 
+With a KeywordIndex, BM25 retrieval runs as its own candidate generator and
+is fused with vector hits by weighted reciprocal rank fusion (RRF).
+Without one (or while it holds nothing for the tenant), vector hits are
+rescored with a lightweight keyword score.
+
 Implements P3 (No Source No Claim): every result must have a traceable source.
 """
 
@@ -8,7 +13,11 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from apps.api.services.chunking_service import generate_embeddings
-from apps.api.services.vector_service import VectorService
+from apps.api.services.keyword_index import KeywordIndex
+from apps.api.services.vector_service import VectorSearchResult, VectorService
+
+# RRF damping constant (Cormack et al.); higher flattens rank differences
+RRF_K = 60
 
 
 @dataclass
@@ -65,11 +74,52 @@ def _keyword_score(text: str, query: str) -> float:
     return total_score / len(terms)
 
 
+def _to_search_result(
+    hit: VectorSearchResult, score: float, source_type: str
+) -> SearchResult:
+    return SearchResult(
+        chunk_text=hit.content,
+        document_id=hit.document_id,
+        case_id=hit.case_id,
+        evidence_link_id=hit.evidence_link_id,
+        score=score,
+        page_number=hit.page_number,
+        source_type=source_type,
+        metadata=hit.metadata or {},
+    )
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: list[tuple[list[VectorSearchResult], float]],
+    k: int = RRF_K,
+) -> list[tuple[VectorSearchResult, float, int]]:
+    """Fuse ranked hit lists by weighted RRF.
+
+    Returns (hit, fused_score, number_of_lists_containing_hit), best first.
+    """
+    fused: dict[str, list] = {}
+    for hits, weight in ranked_lists:
+        for rank, hit in enumerate(hits, start=1):
+            entry = fused.setdefault(hit.chunk_id, [hit, 0.0, 0])
+            entry[1] += weight / (k + rank)
+            entry[2] += 1
+    return sorted(
+        (tuple(entry) for entry in fused.values()),
+        key=lambda x: x[1],
+        reverse=True,
+    )
+
+
 class SearchService:
     """Hybrid search service combining vector + keyword scoring."""
 
-    def __init__(self, vector_service: VectorService) -> None:
+    def __init__(
+        self,
+        vector_service: VectorService,
+        keyword_index: Optional[KeywordIndex] = None,
+    ) -> None:
         self._vector = vector_service
+        self._keywords = keyword_index
 
     def search(
         self,
@@ -90,6 +140,18 @@ class SearchService:
             top_k=top_k * 2,  # Fetch more for reranking
         )
 
+        # Fusing with an empty BM25 side would only flatten vector scores
+        if self._keywords is not None and self._keywords.document_count(tenant_id):
+            return self._fused_search(
+                query,
+                tenant_id,
+                case_id,
+                top_k,
+                vector_results,
+                vector_weight,
+                keyword_weight,
+            )
+
         # 2. Score and rerank with keyword component
         scored: list[tuple[SearchResult, float]] = []
         for vr in vector_results:
@@ -122,6 +184,63 @@ class SearchService:
             keyword_count=0,  # Pure keyword search not yet implemented
         )
 
+    def _fused_search(
+        self,
+        query: str,
+        tenant_id: str,
+        case_id: Optional[str],
+        top_k: int,
+        vector_results: list[VectorSearchResult],
+        vector_weight: float,
+        keyword_weight: float,
+    ) -> SearchResponse:
+        """Independent BM25 candidates fused with vector hits by RRF."""
+        keyword_results = self._keywords.search(
+            query, tenant_id, top_k=top_k * 2, case_id=case_id
+        )
+        keyword_ids = {hit.chunk_id for hit in keyword_results}
+
+        results: list[SearchResult] = []
+        for hit, score, sources in reciprocal_rank_fusion(
+            [(vector_results, vector_weight), (keyword_results, keyword_weight)]
+        ):
+            if sources > 1:
+                source_type = "hybrid"
+            elif hit.chunk_id in keyword_ids:
+                source_type = "keyword"
+            else:
+                source_type = "vector"
+            result = _to_search_result(hit, score, source_type)
+            # P3 (No Source No Claim)
+            if result.has_source:
+                results.append(result)
+            if len(results) == top_k:
+                break
+
+        return SearchResponse(
+            query=query,
+            results=results,
+            total=len(results),
+            vector_count=len(vector_results),
+            keyword_count=len(keyword_results),
+        )
+
+    def keyword_search(
+        self,
+        query: str,
+        tenant_id: str,
+        case_id: Optional[str] = None,
+        top_k: int = 10,
+    ) -> list[SearchResult]:
+        """Pure BM25 keyword search (requires a KeywordIndex)."""
+        if self._keywords is None:
+            return []
+        return [
+            _to_search_result(hit, hit.score, "keyword")
+            for hit in self._keywords.search(query, tenant_id, top_k, case_id=case_id)
+            if hit.content
+        ]
+
     def vector_search(
         self,
         query: str,
@@ -15,7 +15,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import AsyncIterator, BinaryIO, Optional
 
-import httpx
+from apps.api.services.http_client import pooled_client
 
 
 @dataclass
@@ -181,7 +181,7 @@ class TranscriptionService:
         enable_timestamps: bool = False,
     ) -> dict:
         """Call Whisper API with audio data."""
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with pooled_client(self.base_url, timeout=300.0) as client:
             # Prepare multipart form data
             files = {
                 "file": (filename, io.BytesIO(audio_data), "audio/mpeg"),
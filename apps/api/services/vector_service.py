@@ -2,14 +2,22 @@
 
 Collection: lexibel_documents (384 dims for all-MiniLM-L6-v2).
 Tenant isolation via payload filter on tenant_id.
+
+Backends (VECTOR_BACKEND): qdrant, ivf (embedded ANN index, see
+ivf_vector_service), memory.
 """
 
 import os
+import threading
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+import numpy as np
 
 COLLECTION_NAME = "lexibel_documents"
 VECTOR_DIM = 384  # all-MiniLM-L6-v2
+SCROLL_BATCH_SIZE = 256
 
 
 @dataclass
@@ -23,9 +31,25 @@ class VectorSearchResult:
     document_id: Optional[str] = None
     evidence_link_id: Optional[str] = None
     page_number: Optional[int] = None
+    chunk_index: int = 0
     metadata: dict | None = None
 
 
+def _to_result(chunk_id: str, score: float, payload: dict) -> VectorSearchResult:
+    """Build a search result from a stored chunk payload."""
+    return VectorSearchResult(
+        chunk_id=chunk_id,
+        score=score,
+        content=payload.get("content", ""),
+        case_id=payload.get("case_id"),
+        document_id=payload.get("document_id"),
+        evidence_link_id=payload.get("evidence_link_id"),
+        page_number=payload.get("page_number"),
+        chunk_index=payload.get("chunk_index", 0),
+        metadata=payload.get("metadata"),
+    )
+
+
 class VectorService:
     """Qdrant vector database service with tenant-isolated search."""
 
@@ -86,15 +110,13 @@ class VectorService:
         ]
         client.upsert(collection_name=COLLECTION_NAME, points=points)
 
-    def search(
+    def _build_filter(
         self,
-        query_embedding: list[float],
         tenant_id: str,
-        top_k: int = 10,
-        case_id: Optional[str] = None,
-        filters: Optional[dict] = None,
-    ) -> list[VectorSearchResult]:
-        """Search vectors with tenant isolation via payload filter."""
+        case_id: Optional[str],
+        filters: Optional[dict],
+    ) -> Any:
+        """Qdrant payload filter enforcing tenant isolation."""
         from qdrant_client.models import FieldCondition, Filter, MatchValue
 
         must_conditions = [
@@ -109,30 +131,91 @@ class VectorService:
                 must_conditions.append(
                     FieldCondition(key=key, match=MatchValue(value=value))
                 )
+        return Filter(must=must_conditions)
 
+    def search(
+        self,
+        query_embedding: list[float],
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[VectorSearchResult]:
+        """Search vectors with tenant isolation via payload filter."""
         client = self._get_client()
         results = client.search(
             collection_name=COLLECTION_NAME,
             query_vector=query_embedding,
-            query_filter=Filter(must=must_conditions),
+            query_filter=self._build_filter(tenant_id, case_id, filters),
             limit=top_k,
             with_payload=True,
         )
+        return [_to_result(str(r.id), r.score, r.payload) for r in results]
+
+    def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Search several query vectors in one request (same filters).
+
+        Returns one result list per query embedding, in order.
+        """
+        from qdrant_client.models import SearchRequest
 
+        query_filter = self._build_filter(tenant_id, case_id, filters)
+        client = self._get_client()
+        batches = client.search_batch(
+            collection_name=COLLECTION_NAME,
+            requests=[
+                SearchRequest(
+                    vector=embedding,
+                    filter=query_filter,
+                    limit=top_k,
+                    with_payload=True,
+                )
+                for embedding in query_embeddings
+            ],
+        )
         return [
-            VectorSearchResult(
-                chunk_id=str(r.id),
-                score=r.score,
-                content=r.payload.get("content", ""),
-                case_id=r.payload.get("case_id"),
-                document_id=r.payload.get("document_id"),
-                evidence_link_id=r.payload.get("evidence_link_id"),
-                page_number=r.payload.get("page_number"),
-                metadata=r.payload.get("metadata"),
-            )
-            for r in results
+            [_to_result(str(r.id), r.score, r.payload) for r in results]
+            for results in batches
         ]
 
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Delete the vectors of the given chunks."""
+        from qdrant_client.models import PointIdsList
+
+        if not chunk_ids:
+            return
+        client = self._get_client()
+        client.delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=PointIdsList(points=chunk_ids),
+        )
+
+    def scroll_payloads(
+        self, batch_size: int = SCROLL_BATCH_SIZE
+    ) -> Iterator[tuple[list[str], list[dict]]]:
+        """Yield every stored chunk as (chunk_ids, payloads) batches."""
+        client = self._get_client()
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=COLLECTION_NAME,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            if records:
+                yield [str(r.id) for r in records], [r.payload for r in records]
+            if offset is None:
+                break
+
     def delete_by_document(self, document_id: str) -> None:
         """Delete all vectors for a given document."""
         from qdrant_client.models import FieldCondition, Filter, MatchValue
@@ -151,14 +234,30 @@ class VectorService:
         )
 
 
-# ── In-memory stub for testing ──
+# ── In-memory store (tests, single-node installs) ──
 
 
 class InMemoryVectorService(VectorService):
-    """In-memory vector service for testing (no Qdrant needed)."""
+    """In-memory vector service (no Qdrant needed).
+
+    Columnar layout: unit-normalized float32 vectors live in one contiguous
+    matrix, payloads in a parallel list, and rows are indexed per tenant,
+    per (tenant, case) and per document. Search is a single matrix-vector
+    product over the candidate rows followed by an argpartition top-k.
+    """
+
+    _INITIAL_CAPACITY = 1024
 
     def __init__(self) -> None:
-        self._store: dict[str, dict] = {}  # chunk_id -> {vector, payload}
+        self._store: dict[str, int] = {}  # chunk_id -> row
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim) float32
+        self._row_ids: list[Optional[str]] = []
+        self._payloads: list[Optional[dict]] = []
+        self._free_rows: list[int] = []
+        self._tenant_rows: dict[Any, set[int]] = defaultdict(set)
+        self._case_rows: dict[tuple[Any, Any], set[int]] = defaultdict(set)
+        self._document_rows: dict[Any, set[int]] = defaultdict(set)
+        self._lock = threading.RLock()
 
     def _get_client(self) -> Any:
         return None  # Not used
@@ -166,14 +265,104 @@ class InMemoryVectorService(VectorService):
     def ensure_collection(self) -> None:
         pass
 
+    # ── Row management ──
+
+    def _allocate_row(self, dim: int) -> int:
+        if self._matrix is None:
+            self._matrix = np.zeros((self._INITIAL_CAPACITY, dim), dtype=np.float32)
+        elif self._matrix.shape[1] != dim:
+            raise ValueError(
+                f"Vector dimension {dim} does not match store dimension "
+                f"{self._matrix.shape[1]}"
+            )
+
+        if self._free_rows:
+            return self._free_rows.pop()
+
+        row = len(self._row_ids)
+        if row >= self._matrix.shape[0]:
+            grown = np.zeros((self._matrix.shape[0] * 2, dim), dtype=np.float32)
+            grown[:row] = self._matrix[:row]
+            self._matrix = grown
+        self._row_ids.append(None)
+        self._payloads.append(None)
+        return row
+
+    def _index_row(self, row: int, payload: dict) -> None:
+        tenant_id = payload.get("tenant_id")
+        self._tenant_rows[tenant_id].add(row)
+        self._case_rows[(tenant_id, payload.get("case_id"))].add(row)
+        self._document_rows[payload.get("document_id")].add(row)
+
+    def _unindex_row(self, row: int) -> None:
+        payload = self._payloads[row] or {}
+        tenant_id = payload.get("tenant_id")
+        for index, key in (
+            (self._tenant_rows, tenant_id),
+            (self._case_rows, (tenant_id, payload.get("case_id"))),
+            (self._document_rows, payload.get("document_id")),
+        ):
+            rows = index.get(key)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del index[key]
+
+    def _free_row(self, row: int) -> None:
+        self._unindex_row(row)
+        self._matrix[row] = 0.0
+        self._row_ids[row] = None
+        self._payloads[row] = None
+        self._free_rows.append(row)
+
+    # ── VectorService interface ──
+
     def upsert_chunks(
         self,
         chunk_ids: list[str],
         embeddings: list[list[float]],
         payloads: list[dict],
     ) -> None:
-        for cid, emb, payload in zip(chunk_ids, embeddings, payloads):
-            self._store[cid] = {"vector": emb, "payload": payload}
+        if not chunk_ids:
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a list of equal-length vectors")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+        with self._lock:
+            for cid, vector, payload in zip(chunk_ids, vectors, payloads):
+                row = self._store.get(cid)
+                if row is None:
+                    row = self._allocate_row(vectors.shape[1])
+                    self._store[cid] = row
+                else:
+                    self._unindex_row(row)
+                self._matrix[row] = vector
+                self._row_ids[row] = cid
+                self._payloads[row] = payload
+                self._index_row(row, payload)
+
+    def _candidate_rows(
+        self,
+        tenant_id: str,
+        case_id: Optional[str],
+        filters: Optional[dict],
+    ) -> np.ndarray:
+        if case_id:
+            rows = self._case_rows.get((tenant_id, case_id), ())
+        else:
+            rows = self._tenant_rows.get(tenant_id, ())
+
+        if filters:
+            rows = [
+                row
+                for row in rows
+                if all(self._payloads[row].get(k) == v for k, v in filters.items())
+            ]
+        return np.fromiter(rows, dtype=np.intp, count=len(rows))
 
     def search(
         self,
@@ -184,54 +373,97 @@ class InMemoryVectorService(VectorService):
         filters: Optional[dict] = None,
     ) -> list[VectorSearchResult]:
         """Cosine similarity search in memory with tenant filter."""
-        import math
-
-        def cosine_sim(a: list[float], b: list[float]) -> float:
-            dot = sum(x * y for x, y in zip(a, b))
-            mag_a = math.sqrt(sum(x * x for x in a))
-            mag_b = math.sqrt(sum(x * x for x in b))
-            if mag_a == 0 or mag_b == 0:
-                return 0.0
-            return dot / (mag_a * mag_b)
-
-        scored: list[tuple[str, float, dict]] = []
-        for cid, data in self._store.items():
-            payload = data["payload"]
-            if payload.get("tenant_id") != tenant_id:
-                continue
-            if case_id and payload.get("case_id") != case_id:
-                continue
-            if filters:
-                skip = False
-                for k, v in filters.items():
-                    if payload.get(k) != v:
-                        skip = True
-                        break
-                if skip:
-                    continue
-            score = cosine_sim(query_embedding, data["vector"])
-            scored.append((cid, score, payload))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
+        return self.search_batch([query_embedding], tenant_id, top_k, case_id, filters)[
+            0
+        ]
+
+    def search_batch(
+        self,
+        query_embeddings: list[list[float]],
+        tenant_id: str,
+        top_k: int = 10,
+        case_id: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> list[list[VectorSearchResult]]:
+        """Score all query vectors with one matrix product over the candidates."""
+        if not query_embeddings:
+            return []
+        with self._lock:
+            if self._matrix is None or top_k <= 0:
+                return [[] for _ in query_embeddings]
+            rows = self._candidate_rows(tenant_id, case_id, filters)
+            if rows.size == 0:
+                return [[] for _ in query_embeddings]
+
+            queries = np.asarray(query_embeddings, dtype=np.float32)
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms > 0, norms, 1)
+
+            # Gathering a small candidate set is cheaper than scoring every
+            # row; for large tenants score the dense prefix and gather scores.
+            used = len(self._row_ids)
+            if rows.size * 4 < used:
+                scores = self._matrix[rows] @ queries.T
+            else:
+                scores = (self._matrix[:used] @ queries.T)[rows]
+
+            k = min(top_k, rows.size)
+            batches = []
+            for column in scores.T:
+                if k < rows.size:
+                    top = np.argpartition(-column, k - 1)[:k]
+                else:
+                    top = np.arange(rows.size)
+                top = top[np.argsort(-column[top], kind="stable")]
+                batches.append(
+                    [
+                        (
+                            self._row_ids[rows[i]],
+                            float(column[i]),
+                            self._payloads[rows[i]],
+                        )
+                        for i in top
+                    ]
+                )
+
         return [
-            VectorSearchResult(
-                chunk_id=cid,
-                score=score,
-                content=payload.get("content", ""),
-                case_id=payload.get("case_id"),
-                document_id=payload.get("document_id"),
-                evidence_link_id=payload.get("evidence_link_id"),
-                page_number=payload.get("page_number"),
-                metadata=payload.get("metadata"),
-            )
-            for cid, score, payload in scored[:top_k]
+            [_to_result(cid, score, payload) for cid, score, payload in hits]
+            for hits in batches
         ]
 
+    def scroll_payloads(
+        self, batch_size: int = SCROLL_BATCH_SIZE
+    ) -> Iterator[tuple[list[str], list[dict]]]:
+        with self._lock:
+            stored = [(cid, self._payloads[row]) for cid, row in self._store.items()]
+        for i in range(0, len(stored), batch_size):
+            batch = stored[i : i + batch_size]
+            yield [cid for cid, _ in batch], [payload for _, payload in batch]
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        with self._lock:
+            for cid in chunk_ids:
+                row = self._store.pop(cid, None)
+                if row is not None:
+                    self._free_row(row)
+
     def delete_by_document(self, document_id: str) -> None:
-        to_delete = [
-            cid
-            for cid, data in self._store.items()
-            if data["payload"].get("document_id") == document_id
-        ]
-        for cid in to_delete:
-            del self._store[cid]
+        with self._lock:
+            for row in list(self._document_rows.get(document_id, ())):
+                del self._store[self._row_ids[row]]
+                self._free_row(row)
+
+
+def create_vector_service(
+    backend: Optional[str] = None,
+    url: Optional[str] = None,
+) -> VectorService:
+    """Create the vector backend named by ``backend`` or $VECTOR_BACKEND."""
+    backend = (backend or os.getenv("VECTOR_BACKEND", "qdrant")).lower()
+    if backend == "ivf":
+        from apps.api.services.ivf_vector_service import IVFVectorService
+
+        return IVFVectorService()
+    if backend == "memory":
+        return InMemoryVectorService()
+    return VectorService(url=url)
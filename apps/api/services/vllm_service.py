@@ -12,6 +12,8 @@ from typing import AsyncGenerator, Optional
 
 import httpx
 
+from apps.api.services.http_client import pooled_client
+
 
 # ── Constants ──
 
@@ -68,7 +70,7 @@ class VLLMService:
             return self._vllm_available
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with pooled_client(self._vllm_url, timeout=5.0) as client:
                 resp = await client.get(f"{self._vllm_url}/models")
                 self._vllm_available = resp.status_code == 200
         except (httpx.HTTPError, Exception):
@@ -142,7 +144,7 @@ class VLLMService:
             payload["model"] = f"{model}:{lora_adapter}"
 
         try:
-            async with httpx.AsyncClient(timeout=VLLM_TIMEOUT) as client:
+            async with pooled_client(self._vllm_url, timeout=VLLM_TIMEOUT) as client:
                 resp = await client.post(
                     f"{self._vllm_url}/chat/completions",
                     json=payload,
@@ -178,7 +180,7 @@ class VLLMService:
             )
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with pooled_client(self._openai_url, timeout=60.0) as client:
                 resp = await client.post(
                     f"{self._openai_url}/chat/completions",
                     headers={
@@ -247,7 +249,7 @@ class VLLMService:
             headers["Authorization"] = f"Bearer {self._openai_key}"
 
         try:
-            async with httpx.AsyncClient(timeout=VLLM_TIMEOUT) as client:
+            async with pooled_client(base_url, timeout=VLLM_TIMEOUT) as client:
                 async with client.stream(
                     "POST",
                     f"{base_url}/chat/completions",
@@ -279,7 +281,7 @@ class VLLMService:
             return [ModelInfo(id="gpt-4o-mini", owned_by="openai")]
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with pooled_client(self._vllm_url, timeout=10.0) as client:
                 resp = await client.get(f"{self._vllm_url}/models")
                 resp.raise_for_status()
                 data = resp.json()
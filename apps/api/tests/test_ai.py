@@ -16,12 +16,25 @@ from apps.api.services.llm_gateway import (
     RATE_LIMIT_MAX,
 )
 from apps.api.main import app
+from apps.api.routers import search as search_router
+from apps.api.services import keyword_index
 
 
 TENANT_ID = str(uuid.uuid4())
 USER_ID = str(uuid.uuid4())
 
 
+@pytest.fixture(autouse=True)
+def _keyword_index(tmp_path, monkeypatch):
+    """Keep the shared keyword index out of the working tree."""
+    monkeypatch.setattr(
+        keyword_index,
+        "_keyword_index",
+        keyword_index.KeywordIndex(str(tmp_path / "keywords.db")),
+    )
+    monkeypatch.setattr(search_router, "_search_service", None)
+
+
 def _auth_headers() -> dict:
     return {
         "X-Tenant-ID": TENANT_ID,
@@ -10,6 +10,8 @@ Tests the complete Case Brain implementation:
 - Graph Knowledge (in-memory fallback)
 """
 
+import time
+
 import pytest
 from datetime import date
 
@@ -39,11 +41,15 @@ from apps.api.services.vector_service import (
 
 # Legal RAG
 from apps.api.services.rag_service import (
+    CrossEncoderReranker,
     LegalRAGService,
+    LegalSearchResult,
     LegalEntityExtractor,
     LegalQueryExpander,
     MultilingualTranslator,
 )
+from apps.api.services.rerank_service import RerankService
+from apps.api.services.search_cache import SearchResultCache, make_cache_key
 
 # ML Services
 from apps.api.services.ml.linkage_ranker import LinkageRanker
@@ -370,6 +376,188 @@ async def test_legal_rag_search():
     assert result.query == "responsabilité civile"
 
 
+def test_search_cache_key_normalization():
+    """Cache keys ignore case/spacing but not result-shaping parameters."""
+    base = make_cache_key("Article 1382  Code civil", "public", None, limit=10)
+    assert base == make_cache_key("  article 1382 code CIVIL", "public", {}, limit=10)
+    assert base != make_cache_key("article 1382 code civil", "public", None, limit=5)
+    assert base != make_cache_key("article 1382 code civil", "tenant-2", None, limit=10)
+    assert base != make_cache_key(
+        "article 1382 code civil", "public", {"jurisdiction": "federal"}, limit=10
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_cache_ttl_and_lru():
+    """Entries expire after the TTL and the least recently used is evicted."""
+    cache = SearchResultCache(ttl=60, max_entries=2)
+    await cache.set("k1", "v1")
+    await cache.set("k2", "v2")
+    assert await cache.get("k1") == "v1"  # k1 is now most recently used
+    await cache.set("k3", "v3")
+    assert await cache.get("k2") is None
+    assert await cache.get("k1") == "v1"
+
+    short = SearchResultCache(ttl=0.01)
+    await short.set("k", "v")
+    time.sleep(0.02)
+    assert await short.get("k") is None
+
+
+def _upsert_legal_chunk(vector_service, chunk_id, content, article):
+    vector_service.upsert_chunks(
+        chunk_ids=[chunk_id],
+        embeddings=generate_embeddings([content]),
+        payloads=[
+            {
+                "content": content,
+                "tenant_id": "public",
+                "metadata": {
+                    "source": "Code Civil",
+                    "document_type": "code_civil",
+                    "jurisdiction": "federal",
+                    "article_number": article,
+                },
+            }
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_legal_rag_search_cache_and_invalidation():
+    """Cached responses are fresh copies and are dropped on invalidation."""
+    vector_service = InMemoryVectorService()
+    cache = SearchResultCache(ttl=60)
+    rag_service = LegalRAGService(vector_service, cache=cache)
+    _upsert_legal_chunk(
+        vector_service, "c1", "Article 1382: responsabilité civile.", "1382"
+    )
+
+    first = await rag_service.search("responsabilité civile", limit=5)
+    first.results.clear()  # callers may modify what they receive
+    second = await rag_service.search("  Responsabilité   civile ", limit=5)
+    assert second.total == 1 and len(second.results) == 1
+    assert second.query == "  Responsabilité   civile "
+    assert second.results[0].article_number == "1382"
+
+    _upsert_legal_chunk(
+        vector_service, "c2", "Article 1383: négligence, responsabilité.", "1383"
+    )
+    assert (await rag_service.search("responsabilité civile", limit=5)).total == 1
+    assert await cache.invalidate("public") == 1
+    assert (await rag_service.search("responsabilité civile", limit=5)).total == 2
+
+
+@pytest.mark.asyncio
+async def test_legal_rag_multilingual_search_is_batched():
+    """All query variants go through one embed call and one vector request;
+    entities are only extracted for the results actually returned."""
+    vector_service = InMemoryVectorService()
+    for i in range(8):
+        _upsert_legal_chunk(
+            vector_service, f"c{i}", f"Article {1380 + i}: contrat de travail.", None
+        )
+    rag_service = LegalRAGService(vector_service, cache=SearchResultCache(ttl=0))
+
+    batch_calls = []
+    original_batch = vector_service.search_batch
+
+    def counting_batch(query_embeddings, **kwargs):
+        batch_calls.append(len(query_embeddings))
+        return original_batch(query_embeddings, **kwargs)
+
+    vector_service.search_batch = counting_batch
+    extracted = []
+    original_extract = rag_service._entity_extractor.extract
+
+    def counting_extract(text):
+        extracted.append(text)
+        return original_extract(text)
+
+    rag_service._entity_extractor.extract = counting_extract
+
+    result = await rag_service.search(
+        "contrat de travail", limit=3, enable_reranking=False
+    )
+    assert batch_calls == [2]  # FR expanded query + NL translation
+    assert result.total == 3
+    # One extraction for the query itself, then one per returned result
+    assert len(extracted) == 1 + 3
+    assert all(r.entities for r in result.results)
+
+
+class _FakeCrossEncoder:
+    """Scores a pair by how many query words the passage contains."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[int] = []
+        self.delay = delay
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.calls.append(len(pairs))
+        time.sleep(self.delay)
+        return [
+            float(sum(w in text.lower() for w in query.lower().split()))
+            for query, text in pairs
+        ]
+
+
+def test_rerank_service_batches_and_caches_scores():
+    """Pairs are scored in batches and repeated (query, chunk) pairs are cached."""
+    model = _FakeCrossEncoder()
+    service = RerankService(model=model, batch_size=2, budget_ms=0)
+    passages = [(f"c{i}", text) for i, text in enumerate(["a", "b c", "c", "b"])]
+
+    scores = service.score("b c", passages)
+    assert scores == [0.0, 2.0, 1.0, 1.0]
+    assert model.calls == [2, 2]
+
+    assert service.score("b c", passages + [("c9", "b c d")]) == scores + [2.0]
+    assert model.calls == [2, 2, 1]  # only the new passage was scored
+
+
+def test_rerank_service_candidate_cap_and_budget():
+    """Candidates beyond the cap keep first-stage order; over budget, no rerank."""
+    model = _FakeCrossEncoder()
+    service = RerankService(model=model, max_candidates=2, budget_ms=0)
+    results = [
+        LegalSearchResult("x", 0.9, "s", "code_civil", "federal", chunk_id="c1"),
+        LegalSearchResult("civil", 0.8, "s", "code_civil", "federal", chunk_id="c2"),
+        LegalSearchResult("civil", 0.7, "s", "code_civil", "federal", chunk_id="c3"),
+    ]
+    reranked, applied = service.rerank("civil", results, 3, text_attr="chunk_text")
+    assert applied
+    assert [r.chunk_id for r in reranked] == ["c2", "c1", "c3"]
+    assert model.calls == [2]
+
+    slow = RerankService(model=_FakeCrossEncoder(delay=0.02), batch_size=1, budget_ms=5)
+    results = [
+        LegalSearchResult(t, s, "s", "code_civil", "federal", chunk_id=t)
+        for t, s in [("a", 0.9), ("b", 0.8), ("c", 0.7)]
+    ]
+    reranked, applied = slow.rerank("c", results, 3, text_attr="chunk_text")
+    assert not applied
+    assert [r.chunk_id for r in reranked] == ["a", "b", "c"]
+    assert reranked[0].score == 0.9
+
+
+@pytest.mark.asyncio
+async def test_legal_rag_search_reports_rerank_time():
+    """Rerank time is reported separately from total search time."""
+    vector_service = InMemoryVectorService()
+    for i in range(4):
+        _upsert_legal_chunk(
+            vector_service, f"c{i}", f"Article {1382 + i} responsabilité.", None
+        )
+    rag_service = LegalRAGService(vector_service, cache=SearchResultCache(ttl=0))
+    rag_service._reranker = CrossEncoderReranker(
+        RerankService(model=_FakeCrossEncoder(), budget_ms=0)
+    )
+    result = await rag_service.search("responsabilité", limit=2)
+    assert result.total == 2
+    assert 0 < result.rerank_time_ms <= result.search_time_ms
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # PART 5 — ML Pipeline Tests
 # ══════════════════════════════════════════════════════════════════════════════
@@ -707,5 +895,653 @@ async def test_no_source_no_claim_enforcement():
     assert result.answer
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# PART 9 — Brain Bulk Loading Tests
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+
+class _ScriptedSession:
+    """Returns one scripted result per execute() and counts the queries."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Rows(self.results.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_load_case_datasets_groups_rows_by_case():
+    import uuid
+    from types import SimpleNamespace
+
+    from apps.api.services.brain.case_data_loader import load_case_datasets
+
+    case_a, case_b, case_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    contact = SimpleNamespace(
+        id=uuid.uuid4(),
+        full_name="Jean Dupont",
+        email=None,
+        phone_e164=None,
+        type="natural",
+    )
+
+    def event(case_id, day):
+        return SimpleNamespace(
+            id=uuid.uuid4(),
+            case_id=case_id,
+            event_date=date(2026, 3, day),
+            event_time=None,
+            category="deadline",
+            title=f"Délai {day}",
+            description="",
+            actors=[],
+            source_type="manual",
+            confidence_score=1.0,
+            is_validated=True,
+            is_key_event=False,
+        )
+
+    entry = SimpleNamespace(
+        id=uuid.uuid4(),
+        case_id=case_b,
+        date=date(2026, 3, 1),
+        duration_minutes=60,
+        billable=True,
+        status="draft",
+        source="manual",
+        hourly_rate_cents=25000,
+        description="Consultation",
+    )
+    session = _ScriptedSession(
+        [(case_a, contact, "client"), (case_b, contact, "adverse")],
+        [event(case_a, 2), event(case_b, 3), event(case_a, 9)],
+        [],
+        [entry],
+    )
+
+    datasets = await load_case_datasets(session, [case_a, case_b, case_c], uuid.uuid4())
+
+    assert len(session.statements) == 4
+    assert all("ANY" in str(s) for s in session.statements)
+    assert [c["role"] for c in datasets[case_a].contacts] == ["client"]
+    assert [e["title"] for e in datasets[case_a].timeline] == ["Délai 2", "Délai 9"]
+    assert datasets[case_b].time_entries[0]["duration_minutes"] == 60
+    assert datasets[case_c].contacts == datasets[case_c].timeline == []
+
+
+@pytest.mark.asyncio
+async def test_brain_summary_loads_datasets_in_bulk(monkeypatch):
+    import uuid
+    from unittest.mock import AsyncMock
+
+    from apps.api.services.brain import orchestrator as orchestrator_module
+    from apps.api.services.brain.case_data_loader import CaseDataset
+    from apps.api.services.brain.orchestrator import BrainOrchestrator
+
+    case_ids = [uuid.uuid4() for _ in range(50)]
+    cases = [
+        {"id": cid, "reference": f"2026/{i:03d}", "status": "open"}
+        for i, cid in enumerate(case_ids)
+    ]
+    loader = AsyncMock(return_value={cid: CaseDataset() for cid in case_ids})
+    monkeypatch.setattr(orchestrator_module, "load_case_datasets", loader)
+    per_case = AsyncMock(side_effect=AssertionError("per-case query"))
+    orch = BrainOrchestrator()
+    for name in (
+        "_fetch_contacts",
+        "_fetch_timeline",
+        "_fetch_documents",
+        "_fetch_time_entries",
+    ):
+        monkeypatch.setattr(orch, name, per_case)
+    monkeypatch.setattr(orch, "_fetch_active_cases", AsyncMock(return_value=cases))
+    monkeypatch.setattr(orch, "_count_pending_actions", AsyncMock(return_value=0))
+    monkeypatch.setattr(orch, "_fetch_recent_insights", AsyncMock(return_value=[]))
+
+    summary = await orch.get_brain_summary(object(), uuid.uuid4())
+
+    loader.assert_awaited_once()
+    assert loader.await_args.args[1] == case_ids
+    assert summary.total_active_cases == 50
+    assert sum(summary.risk_distribution.values()) == 50
+
+
+@pytest.mark.asyncio
+async def test_analyze_case_fetches_concurrently_into_snapshot(monkeypatch):
+    import asyncio
+    import uuid
+    from contextlib import asynccontextmanager
+
+    from apps.api.services.brain.orchestrator import BrainOrchestrator
+
+    case_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    in_flight = peak = 0
+    sessions = []
+
+    @asynccontextmanager
+    async def session_factory(tid):
+        assert tid == tenant_id
+        sessions.append(tid)
+        yield object()
+
+    def fetcher(rows):
+        async def fetch(session, cid, tid):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return rows
+
+        return fetch
+
+    orch = BrainOrchestrator(session_factory=session_factory, fetch_concurrency=3)
+    case = {"id": case_id, "reference": "2026/042", "matter_type": "civil"}
+    monkeypatch.setattr(orch, "_fetch_case", fetcher(case))
+    for name in (
+        "_fetch_contacts",
+        "_fetch_documents",
+        "_fetch_timeline",
+        "_fetch_time_entries",
+        "_fetch_calendar_events",
+        "_fetch_emails",
+        "_fetch_calls",
+    ):
+        monkeypatch.setattr(orch, name, fetcher([]))
+
+    snapshot = await orch._load_snapshot(object(), case_id, tenant_id, {})
+    assert peak == 4  # the case on the caller's session + 3 pooled fetches
+    assert len(sessions) == 7
+    assert snapshot.case["unbilled_minutes"] == 0
+    with pytest.raises(TypeError):
+        snapshot.case["status"] = "closed"
+
+    analysis = await orch.analyze_case(object(), case_id, tenant_id)
+    assert analysis.case_reference == "2026/042"
+    for stage in ("case", "calls", "fetch", "risk", "deadlines", "communication"):
+        assert analysis.stage_timings_ms[stage] >= 0
+
+
+@pytest.mark.asyncio
+async def test_snapshot_fetches_share_process_wide_pool_slots(monkeypatch):
+    import asyncio
+    import uuid
+    import weakref
+    from contextlib import asynccontextmanager
+    from unittest.mock import AsyncMock
+
+    from apps.api.services.brain import orchestrator as orchestrator_module
+    from apps.api.services.brain.orchestrator import BrainOrchestrator
+
+    monkeypatch.setattr(orchestrator_module, "BRAIN_FETCH_POOL_SLOTS", 3)
+    monkeypatch.setattr(orchestrator_module, "_pool_slots", weakref.WeakKeyDictionary())
+    open_sessions = peak = 0
+
+    @asynccontextmanager
+    async def session_factory(tid):
+        nonlocal open_sessions, peak
+        open_sessions += 1
+        peak = max(peak, open_sessions)
+        try:
+            yield object()
+        finally:
+            open_sessions -= 1
+
+    async def fetch(session, cid, tid):
+        await asyncio.sleep(0.01)
+        return []
+
+    orch = BrainOrchestrator(session_factory=session_factory, fetch_concurrency=4)
+    monkeypatch.setattr(orch, "_fetch_case", AsyncMock(return_value={"id": 1}))
+    for name in (
+        "_fetch_contacts",
+        "_fetch_documents",
+        "_fetch_timeline",
+        "_fetch_time_entries",
+        "_fetch_calendar_events",
+        "_fetch_emails",
+        "_fetch_calls",
+    ):
+        monkeypatch.setattr(orch, name, fetch)
+
+    # Five concurrent requests, 4 fetches each allowed: 3 pooled sessions total
+    await asyncio.gather(
+        *(
+            orch._load_snapshot(object(), uuid.uuid4(), uuid.uuid4(), {})
+            for _ in range(5)
+        )
+    )
+    assert peak == 3
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PART 10 — Case Intelligence Snapshot Tests
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def test_snapshot_invalidation_covers_changed_and_linked_rows():
+    import uuid
+
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm.attributes import set_committed_value
+
+    from apps.api.services.brain.case_snapshots import invalidation_statement
+    from packages.db.models.brain_insight import BrainInsight
+    from packages.db.models.evidence_link import EvidenceLink
+    from packages.db.models.time_entry import TimeEntry
+    from packages.db.models.timeline_event import TimelineEvent
+
+    case_a, case_b, case_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    interaction_id = uuid.uuid4()
+    moved = TimeEntry()
+    set_committed_value(moved, "case_id", case_a)
+    moved.case_id = case_b  # moved to another case: both are affected
+
+    statement = invalidation_statement(
+        [
+            moved,
+            TimelineEvent(case_id=case_c),
+            EvidenceLink(interaction_event_id=interaction_id),
+            BrainInsight(case_id=uuid.uuid4()),
+        ]
+    )
+    compiled = statement.compile(dialect=postgresql.dialect())
+    params = [str(v) for v in compiled.params.values()]
+    assert "interaction_events" in str(compiled)
+    assert "version + " in str(compiled)
+    for expected in (case_a, case_b, case_c, interaction_id):
+        assert str(expected) in str(params)
+
+    assert invalidation_statement([BrainInsight(case_id=case_a)]) is None
+
+
+@pytest.mark.asyncio
+async def test_load_case_intelligence_serves_snapshots(monkeypatch):
+    import uuid
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    from apps.api.services.brain import case_snapshots
+
+    now = datetime.now(timezone.utc)
+    tenant_id = uuid.uuid4()
+    fresh, dirty, expired, missing = (
+        SimpleNamespace(id=uuid.uuid4(), tenant_id=tenant_id) for _ in range(4)
+    )
+
+    def snapshot(case, generated_at, is_dirty=False):
+        return SimpleNamespace(
+            case_id=case.id,
+            dirty=is_dirty,
+            version=2,
+            generated_at=generated_at,
+            risk={
+                "overall_score": 60,
+                "level": "high",
+                "factors": [],
+                "recommendations": [],
+            },
+            completeness={
+                "score": 50,
+                "present": [],
+                "missing": [],
+                "matter_type": "civil",
+            },
+            health={
+                "overall_score": 70,
+                "status": "attention_needed",
+                "components": {},
+                "trend": "stable",
+            },
+        )
+
+    snapshots = [
+        snapshot(fresh, now),
+        snapshot(dirty, now, is_dirty=True),
+        snapshot(expired, now - timedelta(days=2)),
+    ]
+    session = _ScriptedSession(snapshots)
+    computed = SimpleNamespace(stale=False)
+    refresh = AsyncMock(return_value=computed)
+    monkeypatch.setattr(case_snapshots, "refresh_case_snapshot", refresh)
+
+    intelligence = await case_snapshots.load_case_intelligence(
+        session, [fresh, dirty, expired, missing], tenant_id
+    )
+
+    assert len(session.statements) == 1
+    refresh.assert_awaited_once_with(session, missing, 0)
+    assert intelligence[missing.id] is computed
+    assert not intelligence[fresh.id].stale
+    assert intelligence[dirty.id].stale and intelligence[expired.id].stale
+    assert intelligence[fresh.id].risk.level == "high"
+    assert intelligence[dirty.id].health.stale
+    assert intelligence[fresh.id].health.generated_at == now
+
+    # The worker refreshes stale snapshots instead of serving them
+    refresh.reset_mock()
+    session = _ScriptedSession(snapshots)
+    intelligence = await case_snapshots.load_case_intelligence(
+        session, [fresh, dirty, expired], tenant_id, refresh_stale=True
+    )
+    assert [call.args[1] for call in refresh.await_args_list] == [dirty, expired]
+    assert all(call.args[2] == 2 for call in refresh.await_args_list)
+    assert not intelligence[fresh.id].stale
+
+
+@pytest.mark.asyncio
+async def test_refresh_due_snapshots_commits_each_case(monkeypatch):
+    import contextlib
+    import uuid
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    from apps.api.services.brain import case_snapshots
+
+    tenant_id = uuid.uuid4()
+    cases = [SimpleNamespace(id=uuid.uuid4(), tenant_id=tenant_id) for _ in range(3)]
+    due = [(tenant_id, case.id, 1) for case in cases]
+    transactions = []
+
+    @contextlib.asynccontextmanager
+    async def superadmin_session():
+        yield _ScriptedSession(due)
+
+    @contextlib.asynccontextmanager
+    async def tenant_session(tid):
+        session = SimpleNamespace(
+            scalar=AsyncMock(return_value=cases[len(transactions)])
+        )
+        transactions.append(session)
+        yield session
+
+    async def refresh(session, case, version):
+        if case is cases[1]:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(case_snapshots, "get_superadmin_session", superadmin_session)
+    monkeypatch.setattr(case_snapshots, "get_tenant_session", tenant_session)
+    monkeypatch.setattr(case_snapshots, "refresh_case_snapshot", refresh)
+
+    # One transaction per case; a failing case does not roll back the others
+    assert await case_snapshots.refresh_due_snapshots(limit=3) == 2
+    assert len(transactions) == 3
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PART 11 — Precomputed Tenant Summary Tests
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def test_summary_invalidation_queues_tenants_of_relevant_rows():
+    import uuid
+
+    from sqlalchemy.dialects import postgresql
+
+    from apps.api.services.brain.tenant_summary import (
+        invalidation_statement,
+        summary_tenants,
+    )
+    from packages.db.models.ai_audit_log import AIAuditLog
+    from packages.db.models.brain_insight import BrainInsight
+    from packages.db.models.time_entry import TimeEntry
+
+    tenant_a, tenant_b = uuid.uuid4(), uuid.uuid4()
+    tenant_ids = summary_tenants(
+        [
+            BrainInsight(tenant_id=tenant_a),
+            TimeEntry(tenant_id=tenant_b),
+            TimeEntry(tenant_id=tenant_b),
+            AIAuditLog(tenant_id=uuid.uuid4()),
+        ]
+    )
+    assert tenant_ids == {tenant_a, tenant_b}
+    assert summary_tenants([AIAuditLog(tenant_id=tenant_a)]) == set()
+
+    # Insert-only: writers never update (and lock) the snapshot row
+    statement = str(
+        invalidation_statement(tenant_ids).compile(dialect=postgresql.dialect())
+    )
+    assert statement.startswith("INSERT INTO brain_summary_invalidations")
+    assert "brain_summary_snapshots" not in statement
+
+
+def test_summary_invalidation_queued_once_per_transaction():
+    import uuid
+    from unittest.mock import MagicMock
+
+    from apps.api.services.brain import tenant_summary
+    from packages.db.models.time_entry import TimeEntry
+
+    tenant_id = uuid.uuid4()
+    session = MagicMock(info={}, dirty=[], deleted=[])
+    for _ in range(3):  # three flushes of one transaction
+        session.new = [TimeEntry(tenant_id=tenant_id)]
+        tenant_summary._invalidate_after_flush(session, None)
+    assert session.connection().execute.call_count == 1
+
+    tenant_summary._forget_queued(session, None)
+    tenant_summary._invalidate_after_flush(session, None)
+    assert session.connection().execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_summary_is_served_until_the_worker_refreshes(monkeypatch):
+    import uuid
+    from datetime import datetime, timezone
+    from unittest.mock import AsyncMock
+
+    from apps.api.services.brain import tenant_summary
+
+    stored = tenant_summary.StoredSummary(
+        None, {}, datetime.now(timezone.utc), stale=True
+    )
+    fresh = tenant_summary.StoredSummary(None, {}, datetime.now(timezone.utc))
+    get_stored = AsyncMock(return_value=stored)
+    monkeypatch.setattr(tenant_summary, "get_stored_summary", get_stored)
+    refresh = AsyncMock(return_value=fresh)
+    monkeypatch.setattr(tenant_summary, "refresh_tenant_summary", refresh)
+
+    result = await tenant_summary.read_tenant_summary(object(), uuid.uuid4())
+    assert result == (stored, False)
+    assert result[0].stale
+    refresh.assert_not_awaited()
+
+    # Only a tenant without a stored summary is computed on request
+    get_stored.return_value = None
+    result = await tenant_summary.read_tenant_summary(object(), uuid.uuid4())
+    assert result == (fresh, True)
+    assert refresh.await_args.kwargs == {"refresh_stale": False}
+
+
+@pytest.mark.asyncio
+async def test_brain_summary_endpoint_reads_stored_summary(monkeypatch):
+    import uuid
+    from datetime import datetime, timezone
+    from unittest.mock import AsyncMock
+
+    from fastapi import BackgroundTasks, HTTPException
+
+    from apps.api.routers import brain as brain_router
+    from apps.api.schemas.brain import BrainSummaryResponse
+    from apps.api.services.brain import tenant_summary
+
+    tenant_id = uuid.uuid4()
+    summary = BrainSummaryResponse(
+        total_active_cases=3,
+        risk_distribution={"low": 3},
+        critical_deadlines=[],
+        pending_actions=[],
+        recent_insights=[],
+        cases_needing_attention=[],
+        stats={},
+    )
+    stored = tenant_summary.StoredSummary(summary, {}, datetime.now(timezone.utc))
+    monkeypatch.setattr(
+        tenant_summary, "get_stored_summary", AsyncMock(return_value=stored)
+    )
+    refresh = AsyncMock(return_value=stored)
+    monkeypatch.setattr(tenant_summary, "refresh_tenant_summary", refresh)
+    compute = AsyncMock(side_effect=AssertionError("computed on request"))
+    monkeypatch.setattr(tenant_summary, "compute_brain_summary", compute)
+
+    user = {"tenant_id": tenant_id, "role": "junior"}
+    tasks = BackgroundTasks()
+    result = await brain_router.get_brain_summary(
+        tasks, days_ahead=14, refresh=False, session=object(), current_user=user
+    )
+    assert result.total_active_cases == 3
+    refresh.assert_not_awaited()
+    assert not tasks.tasks
+
+    with pytest.raises(HTTPException) as exc:
+        await brain_router.get_brain_summary(
+            tasks, days_ahead=14, refresh=True, session=object(), current_user=user
+        )
+    assert exc.value.status_code == 403
+
+    admin = {**user, "role": "admin"}
+    await brain_router.get_brain_summary(
+        tasks, days_ahead=14, refresh=True, session=object(), current_user=admin
+    )
+    assert refresh.await_args.kwargs == {"refresh_stale": True}
+    assert len(tasks.tasks) == 1  # update published after the commit
+
+
+@pytest.mark.asyncio
+async def test_summary_update_is_pushed_to_sse_subscribers(monkeypatch):
+    import json
+    import uuid
+    from datetime import datetime, timezone
+
+    from apps.api.services.brain import tenant_summary
+    from apps.api.services.sse_service import sse_manager
+
+    monkeypatch.setattr(tenant_summary, "BRAIN_SUMMARY_REDIS_URL", None)
+    tenant_id = uuid.uuid4()
+    stream = sse_manager.subscribe(tenant_id)
+    assert "connected" in await stream.__anext__()
+
+    generated_at = datetime.now(timezone.utc)
+    await tenant_summary.publish_summary_updated(tenant_id, generated_at)
+    message = await stream.__anext__()
+    await stream.aclose()
+
+    event_line, data_line = message.strip().split("\n")
+    assert event_line == "event: brain_summary_updated"
+    assert json.loads(data_line[len("data: ") :])["generated_at"] == (
+        generated_at.isoformat()
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PART 12 — Batch Case Scoring Tests
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _portfolio(count):
+    import random
+    from datetime import datetime, timedelta
+
+    from apps.api.services.brain.case_data_loader import CaseSnapshot
+
+    rng = random.Random(25)
+    today = date.today()
+
+    def some_date(span=400):
+        day = today + timedelta(days=rng.randint(-span, 60))
+        return rng.choice(
+            [day, day.isoformat(), datetime(day.year, day.month, day.day), "?", None]
+        )
+
+    snapshots = []
+    for _ in range(count):
+        timeline = tuple(
+            {
+                "event_date": some_date(),
+                "category": rng.choice(["email", "call", "meeting", "deadline", ""]),
+                "title": rng.choice(["Délai conclusions", "Audience", "RDV client"]),
+                "is_validated": rng.random() < 0.3,
+            }
+            for _ in range(rng.randint(0, 10))
+        )
+        time_entries = tuple(
+            {
+                "date": some_date(),
+                "status": rng.choice(["draft", "submitted", "approved", "invoiced"]),
+            }
+            for _ in range(rng.randint(0, 6))
+        )
+        case = {
+            "title": rng.choice(["", "Dupont c. Martin"]),
+            "matter_type": rng.choice(["civil", "commercial", "family", None]),
+            "jurisdiction": rng.choice([None, "Bruxelles"]),
+            "status": rng.choice(["open", "in_progress", "pending", "closed"]),
+            "court_reference": rng.choice([None, "2026/AR/123"]),
+            "opened_at": some_date(2000),
+            "total_time_minutes": rng.choice([0, 60, 300, 1200]),
+            "unbilled_minutes": rng.choice([0, 45, 250, 1000]),
+            "last_invoice_date": rng.choice([None, some_date(200)]),
+        }
+        snapshots.append(
+            CaseSnapshot(
+                case=case,
+                contacts=tuple(
+                    {"role": rng.choice(["client", "adverse", "witness"])}
+                    for _ in range(rng.randint(0, 3))
+                ),
+                documents=tuple(
+                    {"name": rng.choice(["Contrat de bail", "Citation", "Facture"])}
+                    for _ in range(rng.randint(0, 3))
+                ),
+                timeline=timeline,
+                time_entries=time_entries,
+            )
+        )
+    return snapshots
+
+
+def test_batch_scoring_matches_per_case_scoring():
+    from apps.api.services.brain.case_analyzer import CaseAnalyzer, CaseColumns
+
+    analyzer = CaseAnalyzer()
+    snapshots = _portfolio(300)
+    columns = CaseColumns.from_cases(snapshots)
+
+    assert len(columns) == 300
+    assert analyzer.assess_risk_batch(columns) == [
+        analyzer.assess_risk(s.case, s.contacts, s.timeline, s.documents)
+        for s in snapshots
+    ]
+    assert analyzer.calculate_case_health_batch(columns) == [
+        analyzer.calculate_case_health(s.case, s.contacts, s.timeline, s.time_entries)
+        for s in snapshots
+    ]
+
+
+def test_batch_scoring_empty_portfolio():
+    from apps.api.services.brain.case_analyzer import CaseAnalyzer, CaseColumns
+
+    columns = CaseColumns.from_cases([])
+
+    assert CaseAnalyzer().assess_risk_batch(columns) == []
+    assert CaseAnalyzer().calculate_case_health_batch(columns) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-x"])
@@ -5,23 +5,47 @@ Covers:
 - DataAnonymizer: anonymization, deanonymization, roundtrip, message anonymization
 - Provider routing rules: tier enforcement, NON-EU provider restrictions
 - LLMGateway: mocked end-to-end flows including fallback and anonymization blocking
+- HTTPClientRegistry: shared per-origin connection pools
+- Latency-aware routing: circuit breaker, percentiles, hedged requests
+- Response cache: exact and near-duplicate hits, tenant isolation, audit
 
 Uses:
 - pytest with asyncio_mode = auto
 - unittest.mock (AsyncMock, patch, MagicMock)
 """
 
+import asyncio
+import time
 import uuid
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
+from apps.api.services.http_client import (
+    HTTPClientRegistry,
+    _TimeoutClient,
+    get_http_client,
+)
 from apps.api.services.llm.data_classifier import (
     ClassificationContext,
     DataClassifier,
+    DetectedEntity,
     DataSensitivity,
+    RequestScans,
+    scan_text,
+)
+from apps.api.services.llm import data_classifier
+from apps.api.services.llm.anonymizer import DataAnonymizer, StreamDeanonymizer
+from apps.api.services.llm.audit_logger import CACHE_PROVIDER, AIAuditLogger
+from apps.api.services.llm.audit_writer import AuditWriter
+from apps.api.services.llm.provider_health import BreakerState, ProviderHealth
+from apps.api.services.llm.response_cache import (
+    LLM_CACHE_SEMANTIC_PURPOSES,
+    CachedResponse,
+    CacheLookup,
+    ResponseCache,
 )
-from apps.api.services.llm.anonymizer import DataAnonymizer
 from apps.api.services.llm.gateway import (
     LLMGateway,
     LLMResponse,
@@ -55,6 +79,7 @@ def _mock_audit_logger() -> AsyncMock:
     logger.log_request = AsyncMock(return_value=uuid.uuid4())
     logger.log_response = AsyncMock()
     logger.log_error = AsyncMock()
+    logger.log_cancelled = AsyncMock()
     return logger
 
 
@@ -330,6 +355,69 @@ class TestDataAnonymizer:
         niss_entries = [k for k in result.mapping if k.startswith("[NISS")]
         assert len(niss_entries) == 1
 
+    def test_anonymize_longest_value_wins(self, anonymizer):
+        """Every occurrence is replaced; nested values keep the longest match."""
+        text = "Me Jean Dupont plaide. Plus tard, Jean Dupont signe."
+        result = anonymizer.anonymize(text)
+
+        assert "Jean Dupont" not in result.anonymized_text
+        assert result.anonymized_text.count("[PERSONNE_") == 2
+        assert anonymizer.deanonymize(result.anonymized_text, result.mapping) == text
+
+    def test_anonymize_address_overlapping_iban(self, anonymizer):
+        """An address ending inside an IBAN must not leave part of the IBAN."""
+        text = "Virement depuis avenue BE12 3456 7890 1234 reçu."
+        result = anonymizer.anonymize(text)
+
+        assert "3456" not in result.anonymized_text
+        assert "7890 1234" not in result.anonymized_text
+        assert result.anonymized_text.startswith("Virement depuis [IBAN_")
+        assert anonymizer.verify_anonymization(
+            result.anonymized_text, result.entities, result.replaced_spans
+        )
+        assert anonymizer.deanonymize(result.anonymized_text, result.mapping) == text
+
+    def test_verify_anonymization_checks_spans(self, anonymizer):
+        """A value replaced only in part is a leak, even if never whole."""
+        entities = [DetectedEntity("iban", "BE12 3456 7890 1234", 23, 42)]
+        partial = "Virement depuis [ADRESSE_1] 7890 1234 reçu."
+        assert anonymizer.verify_anonymization(partial, entities)
+        assert not anonymizer.verify_anonymization(partial, entities, [(16, 32)])
+        assert anonymizer.verify_anonymization(partial, entities, [(16, 42)])
+
+    def test_deanonymize_keeps_unknown_placeholders(self, anonymizer):
+        mapping = {"[NISS_1]": "78.06.15-123.45"}
+        text = "[NISS_1] et [NISS_10] [voir note]"
+        assert (
+            anonymizer.deanonymize(text, mapping)
+            == "78.06.15-123.45 et [NISS_10] [voir note]"
+        )
+
+    def test_stream_deanonymizer_split_placeholders(self):
+        """Placeholders split across chunks are restored; nothing leaks."""
+        mapping = {"[PERSONNE_1]": "Jean Dupont", "[NISS_1]": "78.06.15-123.45"}
+        text = "Client [PERSONNE_1], NISS [NISS_1] [sic]."
+        expected = "Client Jean Dupont, NISS 78.06.15-123.45 [sic]."
+        for size in range(1, len(text) + 1):
+            restorer = StreamDeanonymizer(mapping)
+            chunks = [
+                restorer.feed(text[i : i + size]) for i in range(0, len(text), size)
+            ]
+            chunks.append(restorer.flush())
+            assert "".join(chunks) == expected
+            assert not any("PERSONNE" in c or "NISS_" in c for c in chunks)
+
+    def test_stream_deanonymizer_holds_back_only_placeholder_prefixes(self):
+        restorer = StreamDeanonymizer({"[PERSONNE_1]": "Jean Dupont"})
+
+        # Brackets that cannot start a known placeholder pass through
+        assert restorer.feed("Voir [1] et [sic") == "Voir [1] et [sic"
+        assert restorer.feed("] puis [PERS") == "] puis "
+        assert restorer.feed("ONNE_") == ""
+        assert restorer.feed("1] signe [PERSONNE_2") == "Jean Dupont signe [PERSONNE_2"
+        assert restorer.feed(" fin [") == " fin "
+        assert restorer.flush() == "["
+
     def test_deanonymize_alias(self, anonymizer):
         """deanonymize_text must be an alias for deanonymize."""
         mapping = {"[NISS_1]": "78.06.15-123.45"}
@@ -524,6 +612,36 @@ class TestLLMGatewayIntegration:
         # The response should be deanonymized (original BCE number restored)
         assert "0123.456.789" in response.content
 
+    @pytest.mark.asyncio
+    async def test_stream_deanonymizes_incrementally(self, gateway, audit_logger):
+        """Anonymized streams yield restored chunks, never placeholders."""
+        messages = [
+            {"role": "user", "content": "L'entreprise 0123.456.789 est enregistrée"}
+        ]
+
+        async def fake_stream(**kwargs):
+            for chunk in ["L'entreprise [BC", "E_1] est ", "active."]:
+                yield chunk
+
+        gateway.providers["deepseek"].stream = fake_stream
+
+        chunks = [
+            chunk
+            async for chunk in gateway.stream(
+                messages=messages,
+                purpose="test_stream",
+                tenant_id=TENANT_ID,
+                user_id=USER_ID,
+                audit_logger=audit_logger,
+                preferred_provider="deepseek",
+                data_sensitivity=DataSensitivity.SEMI_SENSITIVE,
+            )
+        ]
+
+        assert chunks == ["L'entreprise ", "0123.456.789 est ", "active."]
+        logged = audit_logger.log_response.call_args.kwargs["response_content"]
+        assert logged == "L'entreprise 0123.456.789 est active."
+
     @pytest.mark.asyncio
     async def test_fallback_when_primary_fails(self, gateway, audit_logger):
         """When the first provider fails, gateway must try the next in the chain."""
@@ -793,3 +911,941 @@ class TestLLMGatewayIntegration:
                 assert provider.complete.call_count == 0, (
                     f"Provider {name} should NOT have been called after anonymization failure"
                 )
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 5. Shared HTTP client pools
+# ════════════════════════════════════════════════════════════════════════
+
+
+class TestHTTPClientRegistry:
+    """Providers and sync services share one keep-alive client per origin."""
+
+    @pytest.mark.asyncio
+    async def test_one_client_per_origin(self):
+        registry = HTTPClientRegistry()
+        client = registry.get("https://api.mistral.ai/v1")
+        assert registry.get("https://API.mistral.ai/v1/chat/completions") is client
+        assert registry.get("https://api.openai.com/v1") is not client
+        assert set(registry.stats()) == {
+            "https://api.mistral.ai",
+            "https://api.openai.com",
+        }
+
+        await registry.aclose()
+        assert client.is_closed
+        assert registry.get("https://api.mistral.ai/v1") is not client
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_relative_url_rejected(self):
+        with pytest.raises(ValueError):
+            HTTPClientRegistry().get("/v1/models")
+
+    @pytest.mark.asyncio
+    async def test_providers_share_pooled_client(self):
+        gateway = LLMGateway()
+        provider = gateway.providers["mistral"]
+        client = await provider._get_client()
+        assert client is await provider._get_client()
+        assert client is get_http_client(PROVIDER_CONFIGS["mistral"].base_url)
+
+    @pytest.mark.asyncio
+    async def test_scoped_timeout_is_a_default(self):
+        inner = AsyncMock()
+        client = _TimeoutClient(inner, 30.0)
+        await client.get("https://graph.microsoft.com/v1.0/me")
+        await client.post("https://graph.microsoft.com/v1.0/me", timeout=5.0)
+        assert inner.get.call_args.kwargs["timeout"] == 30.0
+        assert inner.post.call_args.kwargs["timeout"] == 5.0
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 6. Latency-aware routing and hedging
+# ════════════════════════════════════════════════════════════════════════
+
+
+def _available_gateway(*names: str, **kwargs) -> LLMGateway:
+    gateway = LLMGateway(**kwargs)
+    for name, provider in gateway.providers.items():
+        if name in names:
+            provider._status = ProviderStatus.HEALTHY
+            provider.api_key = f"test-{name}-key"
+        else:
+            provider._status = ProviderStatus.DISABLED
+            provider.api_key = ""
+    return gateway
+
+
+def _result(content: str, model: str = "m") -> dict:
+    return {
+        "content": content,
+        "usage": {"prompt_tokens": 5, "completion_tokens": 5},
+        "model": model,
+    }
+
+
+class TestProviderHealth:
+    """Moving percentiles and circuit breaker states."""
+
+    def test_percentiles(self):
+        health = ProviderHealth("mistral", window=10)
+        assert health.p50 is None
+        for latency in range(1, 21):  # only the last 10 are kept
+            health.record_success(latency * 100)
+        assert health.p50 == 1500
+        assert health.p95 == 2000
+
+    def test_breaker_opens_and_half_opens(self):
+        health = ProviderHealth("mistral", failure_threshold=2, cooldown=0.05)
+        health.record_failure()
+        assert health.state == BreakerState.CLOSED
+        health.record_failure()
+        assert health.state == BreakerState.OPEN
+        assert not health.allows_request()
+
+        time.sleep(0.06)
+        assert health.state == BreakerState.HALF_OPEN
+        health.begin_attempt()
+        assert not health.allows_request()  # one probe at a time
+        health.record_failure()
+        assert health.state == BreakerState.OPEN
+
+        time.sleep(0.06)
+        health.begin_attempt()
+        health.record_success(120)
+        assert health.state == BreakerState.CLOSED
+
+
+class TestLatencyAwareRouting:
+    """Circuit breaker demotion and hedged requests in LLMGateway.complete."""
+
+    def test_open_breaker_demoted_to_last_resort(self):
+        gateway = _available_gateway("mistral", "gemini", "anthropic")
+        for _ in range(3):
+            gateway.health["mistral"].record_failure()
+        allowed = gateway.classifier.get_allowed_providers(DataSensitivity.SENSITIVE)
+        assert gateway._select_provider(allowed) == ["gemini", "anthropic", "mistral"]
+        assert gateway._select_provider(allowed, "mistral")[-1] == "mistral"
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_reported_degraded(self):
+        gateway = _available_gateway("anthropic")
+        for _ in range(3):
+            gateway.health["anthropic"].record_failure()
+        status = (await gateway.get_provider_status())["anthropic"]
+        assert status["status"] == "degraded"
+        assert status["breaker"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_first_success_wins(self):
+        gateway = _available_gateway(
+            "mistral", "gemini", hedging=True, hedge_delay_ms=20
+        )
+
+        async def slow(**kwargs):
+            await asyncio.sleep(5)
+            return _result("trop tard")
+
+        gateway.providers["mistral"].complete = slow
+        gateway.providers["gemini"].complete = AsyncMock(
+            return_value=_result("réponse rapide")
+        )
+        audit_logger = _mock_audit_logger()
+
+        response = await gateway.complete(
+            messages=[{"role": "user", "content": "Question de droit"}],
+            purpose="test_hedge",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=audit_logger,
+            data_sensitivity=DataSensitivity.SENSITIVE,
+        )
+
+        assert response.provider == "gemini"
+        assert response.content == "réponse rapide"
+        # Both attempts are audited; the loser is recorded as cancelled
+        assert audit_logger.log_request.call_count == 2
+        assert audit_logger.log_request.call_args.kwargs["metadata"]["hedged"]
+        audit_logger.log_response.assert_called_once()
+        # Losing a race is not an error: kept out of error counts
+        audit_logger.log_error.assert_not_called()
+        audit_logger.log_cancelled.assert_called_once()
+        assert gateway.health["mistral"].state == BreakerState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_blocked_hedge_keeps_primary(self):
+        gateway = _available_gateway(
+            "mistral", "deepseek", hedging=True, hedge_delay_ms=20
+        )
+
+        async def slow(**kwargs):
+            await asyncio.sleep(0.1)
+            return _result("réponse lente")
+
+        gateway.providers["mistral"].complete = slow
+        gateway.providers["deepseek"].complete = AsyncMock()
+        gateway.anonymizer.anonymize_messages = MagicMock(
+            side_effect=RuntimeError("anonymizer down")
+        )
+        audit_logger = _mock_audit_logger()
+
+        response = await gateway.complete(
+            messages=[{"role": "user", "content": "L'entreprise 0123.456.789"}],
+            purpose="test_hedge_blocked",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=audit_logger,
+            data_sensitivity=DataSensitivity.SEMI_SENSITIVE,
+        )
+
+        assert response.provider == "mistral"
+        assert response.content == "réponse lente"
+        gateway.providers["deepseek"].complete.assert_not_called()
+        assert "BLOCKED" in audit_logger.log_error.call_args.args[1]
+
+    @pytest.mark.asyncio
+    async def test_hedge_to_non_eu_provider_is_anonymized(self):
+        gateway = _available_gateway(
+            "mistral", "deepseek", hedging=True, hedge_delay_ms=20
+        )
+
+        async def slow(**kwargs):
+            await asyncio.sleep(5)
+            return _result("trop tard")
+
+        gateway.providers["mistral"].complete = slow
+        gateway.providers["deepseek"].complete = AsyncMock(
+            return_value=_result("L'entreprise [BCE_1] est active.")
+        )
+
+        response = await gateway.complete(
+            messages=[{"role": "user", "content": "L'entreprise 0123.456.789"}],
+            purpose="test_hedge_anonymized",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=_mock_audit_logger(),
+            data_sensitivity=DataSensitivity.SEMI_SENSITIVE,
+        )
+
+        assert response.provider == "deepseek"
+        assert response.was_anonymized is True
+        assert "0123.456.789" in response.content
+        sent = gateway.providers["deepseek"].complete.call_args.kwargs["messages"]
+        assert "0123.456.789" not in sent[0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_failures_fall_through_and_open_breaker(self):
+        gateway = _available_gateway("mistral", "gemini")
+        gateway.providers["mistral"].complete = AsyncMock(
+            side_effect=RuntimeError("boom")
+        )
+        gateway.providers["gemini"].complete = AsyncMock(return_value=_result("ok"))
+
+        for _ in range(3):
+            response = await gateway.complete(
+                messages=[{"role": "user", "content": "Question"}],
+                purpose="test_breaker",
+                tenant_id=TENANT_ID,
+                user_id=USER_ID,
+                audit_logger=_mock_audit_logger(),
+                data_sensitivity=DataSensitivity.SENSITIVE,
+                use_cache=False,
+            )
+            assert response.provider == "gemini"
+
+        assert gateway.health["mistral"].state == BreakerState.OPEN
+        assert gateway.providers["mistral"].complete.call_count == 3
+        # Breaker open: gemini is now tried first
+        await gateway.complete(
+            messages=[{"role": "user", "content": "Question"}],
+            purpose="test_breaker",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=_mock_audit_logger(),
+            data_sensitivity=DataSensitivity.SENSITIVE,
+            use_cache=False,
+        )
+        assert gateway.providers["mistral"].complete.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_claims_probe_and_disconnect_releases_it(self):
+        gateway = _available_gateway("mistral")
+        health = ProviderHealth("mistral", failure_threshold=1, cooldown=0.01)
+        gateway.health["mistral"] = health
+        health.record_failure()
+        await asyncio.sleep(0.02)
+        assert health.state == BreakerState.HALF_OPEN
+
+        async def fake_stream(**kwargs):
+            yield "Première partie"
+            await asyncio.sleep(5)
+            yield "jamais lue"
+
+        gateway.providers["mistral"].stream = fake_stream
+        chunks = gateway.stream(
+            messages=[{"role": "user", "content": "Question"}],
+            purpose="test_stream_probe",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=_mock_audit_logger(),
+            data_sensitivity=DataSensitivity.SENSITIVE,
+        )
+        assert await chunks.__anext__() == "Première partie"
+        # The open stream holds the single half-open probe
+        assert not health.allows_request()
+
+        await chunks.aclose()  # client disconnected
+        # Not a provider failure: the probe is free for the next request
+        assert health.state == BreakerState.HALF_OPEN
+        assert health.allows_request()
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 7. Response cache
+# ════════════════════════════════════════════════════════════════════════
+
+
+class TestResponseCache:
+    """Cached completions skip the provider but are still audited."""
+
+    async def _ask(self, gateway, content, tenant_id=TENANT_ID, **kwargs):
+        audit_logger = _mock_audit_logger()
+        response = await gateway.complete(
+            messages=[{"role": "user", "content": content}],
+            tenant_id=tenant_id,
+            user_id=USER_ID,
+            audit_logger=audit_logger,
+            data_sensitivity=DataSensitivity.SENSITIVE,
+            **{"purpose": "legal_research", **kwargs},
+        )
+        return response, audit_logger
+
+    @pytest.mark.asyncio
+    async def test_exact_hit_is_audited_as_cached(self):
+        gateway = _available_gateway("mistral", response_cache=ResponseCache())
+        gateway.providers["mistral"].complete = AsyncMock(
+            return_value=_result("Article 1382 du Code civil.")
+        )
+
+        first, _ = await self._ask(gateway, "Quel article  pour la faute ?")
+        second, audit_logger = await self._ask(gateway, "Quel article pour la faute ?")
+
+        assert gateway.providers["mistral"].complete.call_count == 1
+        assert not first.cached
+        assert second.cached
+        assert second.content == first.content
+        assert second.cost_estimate_eur == 0.0
+        request = audit_logger.log_request.call_args.kwargs
+        assert request["provider"] == CACHE_PROVIDER
+        metadata = request["metadata"]
+        assert metadata["cached"] is True
+        assert metadata["cache_match"] == "exact"
+        assert metadata["source_provider"] == "mistral"
+        assert metadata["source_audit_id"] == first.audit_id
+        audit_logger.log_response.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_hit_keeps_anonymization_flags(self):
+        gateway = _available_gateway("mistral", response_cache=ResponseCache())
+        audit_logger = _mock_audit_logger()
+        lookup = CacheLookup(
+            key="k",
+            partition="p",
+            text="Question",
+            hit=CachedResponse(
+                content="Réponse",
+                provider="anthropic",
+                model="claude",
+                sensitivity="semi",
+                was_anonymized=True,
+                token_count_input=10,
+                token_count_output=5,
+                audit_id=None,
+            ),
+            match="exact",
+        )
+        response = await gateway._serve_cached(
+            lookup,
+            "Question",
+            "legal_research",
+            TENANT_ID,
+            USER_ID,
+            audit_logger,
+            DataSensitivity.SEMI_SENSITIVE,
+            False,
+        )
+        request = audit_logger.log_request.call_args.kwargs
+        assert request["provider"] == CACHE_PROVIDER
+        assert request["was_anonymized"] is True
+        assert request["anonymization_method"] == "regex_replacement"
+        assert response.was_anonymized
+
+    def test_extraction_is_exact_match_only_by_default(self):
+        assert "extraction" not in LLM_CACHE_SEMANTIC_PURPOSES
+
+    @pytest.mark.asyncio
+    async def test_key_includes_tenant_and_parameters(self):
+        gateway = _available_gateway("mistral", response_cache=ResponseCache())
+        gateway.providers["mistral"].complete = AsyncMock(return_value=_result("ok"))
+
+        await self._ask(gateway, "Question")
+        other, _ = await self._ask(gateway, "Question", tenant_id=uuid.uuid4())
+        warmer, _ = await self._ask(gateway, "Question", temperature=0.9)
+        fresh, _ = await self._ask(gateway, "Question", use_cache=False)
+
+        assert not (other.cached or warmer.cached or fresh.cached)
+        assert gateway.providers["mistral"].complete.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_for_deterministic_purpose(self):
+        def embed(texts):
+            # Same vector whatever the wording: everything is a near-duplicate
+            return [[1.0, 0.0, 0.0] for _ in texts]
+
+        cache = ResponseCache(
+            semantic_purposes=frozenset({"classification"}), embed=embed
+        )
+        gateway = _available_gateway("mistral", response_cache=cache)
+        gateway.providers["mistral"].complete = AsyncMock(return_value=_result("civil"))
+
+        await self._ask(gateway, "Matière du dossier ?", purpose="classification")
+        near, audit_logger = await self._ask(
+            gateway, "Quelle matière pour ce dossier ?", purpose="classification"
+        )
+        assert near.cached
+        metadata = audit_logger.log_request.call_args.kwargs["metadata"]
+        assert metadata["cache_match"] == "semantic"
+
+        # Non-deterministic purposes only get exact hits
+        await self._ask(gateway, "Matière du dossier ?")
+        other, _ = await self._ask(gateway, "Quelle matière pour ce dossier ?")
+        assert not other.cached
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_size_bound(self):
+        gateway = _available_gateway(
+            "mistral", response_cache=ResponseCache(ttl=0.05, max_entries=1)
+        )
+        gateway.providers["mistral"].complete = AsyncMock(return_value=_result("ok"))
+
+        await self._ask(gateway, "A")
+        await self._ask(gateway, "B")  # evicts A
+        assert not (await self._ask(gateway, "A"))[0].cached
+        assert (await self._ask(gateway, "A"))[0].cached
+        await asyncio.sleep(0.06)
+        assert not (await self._ask(gateway, "A"))[0].cached
+        assert gateway.response_cache.invalidate(TENANT_ID) == 1
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 8. Single-pass PII scanner
+# ════════════════════════════════════════════════════════════════════════
+
+
+class TestPIIScanner:
+    """Classifier, anonymizer and verification share one scan per request."""
+
+    TEXT = (
+        "Dossier n° 2024/17 : Me Jean Dupont, NISS 85.03.12-123.45, "
+        "rue de la Loi 16, 1000 Bruxelles, compte BE68 5390 0754 7034. "
+        "Certificat médical pour l'enfant ; voir l'art. 1382 Code civil."
+    )
+
+    def test_one_scan_per_text(self, classifier, anonymizer, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            data_classifier,
+            "scan_text",
+            lambda text: calls.append(text) or scan_text(text),
+        )
+        scans = RequestScans()
+        classifier.classify(self.TEXT, scans=scans)
+        result = anonymizer.anonymize(self.TEXT, scans)
+        entities = classifier.classify(self.TEXT, scans=scans).detected_entities
+        anonymizer.verify_anonymization(result.anonymized_text, entities)
+        assert calls == [self.TEXT]
+
+    @pytest.mark.asyncio
+    async def test_scans_are_scoped_to_the_request(self):
+        """System and user messages are scanned apart from the joined text."""
+        gateway = _available_gateway("deepseek")
+        gateway.providers["deepseek"].complete = AsyncMock(
+            return_value=_result("Réponse")
+        )
+        seen = []
+        classify = gateway.classifier.classify
+
+        def spy(text, context=None, scans=None):
+            seen.append(scans)
+            return classify(text, context, scans)
+
+        gateway.classifier.classify = spy
+        await gateway.complete(
+            messages=[
+                {"role": "system", "content": "Tu es un assistant juridique."},
+                {"role": "user", "content": "L'entreprise 0123.456.789"},
+            ],
+            purpose="test_scans",
+            tenant_id=TENANT_ID,
+            user_id=USER_ID,
+            audit_logger=_mock_audit_logger(),
+            data_sensitivity=DataSensitivity.SEMI_SENSITIVE,
+        )
+        # One memo for the request: the joined text, then each message
+        assert seen and all(scans is seen[0] for scans in seen)
+        assert len(seen[0]) == 3
+        # Nothing is kept at module level once the request is done
+        assert not hasattr(scan_text, "cache_info")
+
+    def test_families_detected_in_one_pass(self, classifier):
+        result = classifier.classify(self.TEXT)
+        types = {e.entity_type for e in result.detected_entities}
+        assert {
+            "internal_ref",
+            "person_name",
+            "niss",
+            "iban",
+            "address",
+            "health_keyword",
+            "minor_keyword",
+        } <= types
+        assert any("legal code" in r.lower() for r in result.reasons)
+        assert result.sensitivity == DataSensitivity.CRITICAL
+
+    def test_overlapping_identifiers_all_reported(self):
+        """Structured patterns may overlap; none may be dropped."""
+        scan = scan_text("IBAN BE68 5390 0754 7034")
+        assert [e.value for e in scan.get("iban")] == ["BE68 5390 0754 7034"]
+        assert "5390" in [e.value for e in scan.get("postal_code")]
+
+    def test_anonymizer_pairs_each_address(self, anonymizer):
+        text = "Rue Haute 5, 1000 Bruxelles et avenue Louise 12, 1050 Ixelles."
+        result = anonymizer.anonymize(text)
+        addresses = [v for k, v in result.mapping.items() if k.startswith("[ADRESSE")]
+        assert addresses == ["Rue Haute 5, 1000", "avenue Louise 12, 1050"]
+
+    def test_detected_entities_not_shared(self, anonymizer):
+        """Sorting one call's entity list must not affect the shared scan."""
+        scans = RequestScans()
+        first = anonymizer._detect_entities(self.TEXT, scans)
+        first.clear()
+        assert anonymizer._detect_entities(self.TEXT, scans)
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 9. Batched AI audit writer
+# ════════════════════════════════════════════════════════════════════════
+
+
+class _FakeAuditDB:
+    """Records the statements of each tenant transaction; can be taken down
+    or made to reject the rows in ``rejected``."""
+
+    def __init__(self):
+        self.transactions: list[tuple[uuid.UUID, list]] = []
+        self.down = False
+        self.rejected: set[uuid.UUID] = set()
+
+    def session(self, tenant_id):
+        db = self
+
+        class _Session:
+            def __init__(self):
+                self.statements = []
+
+            async def execute(self, statement, params=None):
+                if any(row["id"] in db.rejected for row in params or ()):
+                    raise IntegrityError(str(statement), params, Exception("FK"))
+                self.statements.append((statement, params))
+
+            async def __aenter__(self):
+                if db.down:
+                    raise ConnectionError("database unavailable")
+                return self
+
+            async def __aexit__(self, exc_type, *exc):
+                if exc_type is None:
+                    db.transactions.append((tenant_id, self.statements))
+
+        return _Session()
+
+    def inserted(self) -> list[dict]:
+        return [
+            row
+            for _, statements in self.transactions
+            for _, params in statements
+            if params
+            for row in params
+        ]
+
+
+class TestAuditWriter:
+    """Audit entries are queued, merged and bulk-written off the request path."""
+
+    @staticmethod
+    def _logger(db, tmp_path, **kwargs):
+        writer = AuditWriter(
+            spill_path=str(tmp_path / "spill.jsonl"),
+            session_factory=db.session,
+            **kwargs,
+        )
+        return AIAuditLogger(session=AsyncMock(), writer=writer), writer
+
+    @staticmethod
+    async def _log(audit_logger, tenant_id=TENANT_ID):
+        return await audit_logger.log_request(
+            tenant_id=tenant_id,
+            user_id=USER_ID,
+            provider="mistral",
+            model="mistral-large-latest",
+            data_sensitivity="sensitive",
+            was_anonymized=False,
+            anonymization_method=None,
+            prompt_content="prompt",
+            purpose="test",
+        )
+
+    @pytest.mark.asyncio
+    async def test_attempt_becomes_one_insert(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        ok = await self._log(audit_logger)
+        await audit_logger.log_response(ok, "réponse", 10, 20, 150)
+        failed = await self._log(audit_logger)
+        await audit_logger.log_error(failed, "HTTP 503")
+        assert db.transactions == []  # nothing written in the request path
+
+        await writer.flush()
+        [(tenant_id, statements)] = db.transactions
+        assert tenant_id == TENANT_ID
+        assert len(statements) == 1
+        rows = {row["id"]: row for row in db.inserted()}
+        assert rows[ok]["latency_ms"] == 150
+        assert rows[ok]["response_hash"] == AIAuditLogger.hash_content("réponse")
+        assert rows[failed]["error"] == "HTTP 503"
+        audit_logger.session.flush.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_late_response_updates_written_row(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        request_id = await self._log(audit_logger)
+        await writer.flush()
+        await audit_logger.log_response(request_id, "réponse", latency_ms=90)
+        await writer.flush()
+
+        statement, params = db.transactions[-1][1][0]
+        assert params is None
+        assert "UPDATE ai_audit_logs" in str(statement)
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_background_flush(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(
+            db, tmp_path, batch_size=3, flush_interval=60
+        )
+        for _ in range(3):
+            await self._log(audit_logger)
+        await asyncio.sleep(0.01)
+
+        assert len(db.inserted()) == 3
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_spill_and_replay_when_database_down(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        db.down = True
+        first = await self._log(audit_logger)
+        await writer.flush()
+        assert (tmp_path / "spill.jsonl").exists()
+        # A response for a spilled row is spilled behind it
+        await audit_logger.log_response(first, "réponse", latency_ms=42)
+        await writer.flush()
+
+        db.down = False
+        second = await self._log(audit_logger)
+        await writer.close()
+
+        assert not (tmp_path / "spill.jsonl").exists()
+        rows = db.inserted()
+        assert [row["id"] for row in rows] == [first, second]
+        assert rows[0]["latency_ms"] == 42
+        assert rows[0]["created_at"] < rows[1]["created_at"]
+
+    @pytest.mark.asyncio
+    async def test_replay_skips_files_another_process_is_replaying(self, tmp_path):
+        fcntl = pytest.importorskip("fcntl")
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        db.down = True
+        busy, orphan, ours = [await self._log(audit_logger) for _ in range(3)]
+        await writer.flush()
+        busy_line, orphan_line, ours_line = (
+            (tmp_path / "spill.jsonl").read_text().splitlines()
+        )
+        # Being replayed by another worker / left by a crashed one / ours
+        claimed = tmp_path / "spill.jsonl.replay-other"
+        claimed.write_text(busy_line + "\n")
+        (tmp_path / "spill.jsonl.replay").write_text(orphan_line + "\n")
+        (tmp_path / "spill.jsonl").write_text(ours_line + "\n")
+
+        db.down = False
+        with open(claimed) as held:
+            fcntl.flock(held, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            await writer.flush()
+        assert {row["id"] for row in db.inserted()} == {orphan, ours}
+        assert claimed.exists()
+        assert not (tmp_path / "spill.jsonl.replay").exists()
+        assert not (tmp_path / "spill.jsonl").exists()
+
+        await writer.flush()
+        assert db.inserted()[-1]["id"] == busy
+        assert not claimed.exists()
+
+    @pytest.mark.asyncio
+    async def test_torn_spill_line_is_quarantined(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        db.down = True
+        spilled = await self._log(audit_logger)
+        await writer.flush()
+        with open(tmp_path / "spill.jsonl", "a") as f:
+            f.write('{"op": "insert", "fiel')  # crash mid-append
+
+        db.down = False
+        queued = await self._log(audit_logger)
+        await writer.flush()
+        assert {row["id"] for row in db.inserted()} == {spilled, queued}
+        assert (tmp_path / "spill.jsonl.corrupt").read_text().startswith('{"op"')
+        assert not (tmp_path / "spill.jsonl").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_spill_keeps_entries_queued(self, tmp_path, monkeypatch):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path)
+
+        def disk_full(path, lines):
+            raise OSError(28, "No space left on device")
+
+        db.down = True
+        request_id = await self._log(audit_logger)
+        monkeypatch.setattr(writer, "_append_lines", disk_full)
+        with pytest.raises(OSError):
+            await writer.flush()
+        assert writer.pending == 1
+
+        monkeypatch.undo()
+        db.down = False
+        await writer.flush()
+        assert [row["id"] for row in db.inserted()] == [request_id]
+
+    @pytest.mark.asyncio
+    async def test_rejected_row_is_dead_lettered_without_blocking(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path, max_attempts=2)
+
+        bad = await self._log(audit_logger)
+        good = await self._log(audit_logger)
+        db.rejected.add(bad)
+        await writer.flush()
+        # The other row of the tenant's batch is written alone
+        assert [row["id"] for row in db.inserted()] == [good]
+        assert str(bad) in (tmp_path / "spill.jsonl").read_text()
+
+        later = await self._log(audit_logger)
+        await writer.flush()
+        assert [row["id"] for row in db.inserted()] == [good, later]
+        assert not (tmp_path / "spill.jsonl").exists()
+        assert str(bad) in (tmp_path / "spill.jsonl.dead").read_text()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_entries(self, tmp_path):
+        db = _FakeAuditDB()
+        audit_logger, writer = self._logger(db, tmp_path, flush_interval=60)
+        await self._log(audit_logger, tenant_id=uuid.uuid4())
+        await self._log(audit_logger)
+
+        await writer.close()
+        assert len(db.transactions) == 2
+        assert writer.pending == 0
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 10. Daily usage rollups
+# ════════════════════════════════════════════════════════════════════════
+
+
+class _ScriptedResult:
+    def __init__(self, value):
+        self.value = value
+
+    def one(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class _ScriptedSession:
+    """Returns the scripted results in order and records the statements."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        return _ScriptedResult(self.results.pop(0) if self.results else None)
+
+
+class TestUsageRollups:
+    """Statistics combine rollups with a live aggregate of recent days."""
+
+    @pytest.mark.asyncio
+    async def test_days_to_roll_up(self):
+        from datetime import date, datetime
+
+        from apps.api.services.llm.usage_rollup import days_to_roll_up
+
+        today = date(2026, 3, 10)
+        # First run: from the oldest audit row up to yesterday
+        session = _ScriptedSession((None, None), datetime(2026, 3, 7, 15, 0))
+        assert await days_to_roll_up(session, today) == [
+            date(2026, 3, 7),
+            date(2026, 3, 8),
+            date(2026, 3, 9),
+        ]
+
+        # Later runs: the last rolled-up day again, plus late validations
+        session = _ScriptedSession(
+            (date(2026, 3, 8), datetime(2026, 3, 9, 1, 0)),
+            [(date(2026, 2, 20),)],
+        )
+        assert await days_to_roll_up(session, today) == [
+            date(2026, 2, 20),
+            date(2026, 3, 8),
+            date(2026, 3, 9),
+        ]
+        # Days of rows validated or written (replayed late) since the last run
+        changed_q = str(session.statements[1][0])
+        assert "human_validated_at" in changed_q and "inserted_at" in changed_q
+
+    def test_beat_tasks_are_registered(self):
+        from apps.workers.main import app
+
+        app.loader.import_default_modules()
+        for entry in app.conf.beat_schedule.values():
+            assert entry["task"] in app.tasks
+
+    @pytest.mark.asyncio
+    async def test_rollup_runs_one_upsert_per_day(self):
+        from datetime import date, datetime
+
+        from apps.api.services.llm.usage_rollup import rollup_ai_usage
+
+        session = _ScriptedSession(
+            (date(2026, 3, 8), datetime(2026, 3, 9, 1, 0)), [], None, None
+        )
+        assert await rollup_ai_usage(session, date(2026, 3, 10)) == 2
+        upserts = session.statements[2:]
+        assert [params["start"] for _, params in upserts] == [
+            datetime(2026, 3, 8),
+            datetime(2026, 3, 9),
+        ]
+        assert "ON CONFLICT" in str(upserts[0][0])
+
+    @pytest.mark.asyncio
+    async def test_usage_buckets_merge_rollups_and_live_rows(self):
+        from datetime import date, datetime
+        from decimal import Decimal
+        from types import SimpleNamespace
+
+        from apps.api.services.llm.usage_rollup import usage_buckets
+
+        def row(provider, count, cost, latency_sum, latency_count):
+            return SimpleNamespace(
+                provider=provider,
+                data_sensitivity="sensitive",
+                count=count,
+                anonymized=0,
+                errors=1,
+                validated=count,
+                tokens_in=10 * count,
+                tokens_out=5 * count,
+                cost=cost,
+                latency_sum=latency_sum,
+                latency_count=latency_count,
+            )
+
+        session = _ScriptedSession(
+            date(2026, 3, 9),
+            [row("mistral", 100, Decimal("1.5"), 20000, 100)],
+            [row("mistral", 2, None, 400, 2), row("gemini", 1, None, 0, 0)],
+        )
+        buckets = await usage_buckets(session, TENANT_ID, since=datetime(2026, 2, 8))
+
+        rollup_q, live_q = (str(s) for s, _ in session.statements[1:])
+        assert "ai_usage_rollups" in rollup_q
+        assert "ai_audit_logs" in live_q
+        assert session.statements[2][0].compile().params["created_at_1"] == datetime(
+            2026, 3, 10
+        )
+        by_provider = {b["provider"]: b for b in buckets}
+        assert by_provider["mistral"]["count"] == 102
+        assert by_provider["mistral"]["cost"] == Decimal("1.5")
+        assert by_provider["mistral"]["latency_sum"] == 20400
+        assert by_provider["gemini"]["cost"] is None
+
+    @pytest.mark.asyncio
+    async def test_usage_stats_from_buckets(self):
+        from decimal import Decimal
+
+        bucket = {
+            "provider": "mistral",
+            "data_sensitivity": "sensitive",
+            "count": 4,
+            "anonymized": 1,
+            "errors": 0,
+            "validated": 1,
+            "tokens_in": 40,
+            "tokens_out": 20,
+            "cost": Decimal("0.25"),
+            "latency_sum": 1002,
+            "latency_count": 3,
+        }
+        audit_logger = AIAuditLogger(session=AsyncMock(), writer=None)
+        with patch(
+            "apps.api.services.llm.audit_logger.usage_buckets",
+            AsyncMock(
+                return_value=[
+                    bucket,
+                    {**bucket, "data_sensitivity": "public", "cost": None},
+                ]
+            ),
+        ):
+            stats = await audit_logger.get_usage_stats(TENANT_ID, days=30)
+
+        assert stats["total_requests"] == 8
+        assert stats["total_cost_eur"] == 0.25
+        assert stats["human_validation_rate"] == 25.0
+        assert stats["by_sensitivity"] == {"sensitive": 4, "public": 4}
+        assert stats["by_provider"] == [
+            {
+                "provider": "mistral",
+                "count": 8,
+                "cost_eur": 0.25,
+                "tokens_in": 80,
+                "tokens_out": 40,
+                "avg_latency_ms": 334,
+            }
+        ]
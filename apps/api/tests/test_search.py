@@ -1,16 +1,47 @@
 """Tests for LXB-030-032: Chunking, Vector search, Hybrid search."""
 
+import asyncio
+import fcntl
+import os
+import re
+import threading
 import uuid
 
+import numpy as np
+import pytest
 
+from apps.api.services import chunking_service
 from apps.api.services.chunking_service import (
     chunk_text,
     count_tokens,
+    extract_text_from_pdf,
     generate_embeddings,
+    iter_document_chunks,
+    take_batch,
     _split_text_into_chunks,
 )
-from apps.api.services.vector_service import InMemoryVectorService
-from apps.api.services.search_service import SearchResult, SearchService, _keyword_score
+from apps.api.services.context_packer import (
+    LLM_CONTEXT_WINDOW,
+    RAG_CONTEXT_MAX_TOKENS,
+    context_budget,
+    format_context,
+    model_context_window,
+    pack_context,
+)
+from apps.api.services.compute_executor import ComputeExecutor, ExecutorBusyError
+from apps.api.services.embedding_service import EmbeddingCache, EmbeddingEngine
+from apps.api.services import ivf_vector_service
+from apps.api.services.ivf_vector_service import IVFVectorService
+from apps.api.services.vector_service import InMemoryVectorService, VectorSearchResult
+from apps.api.services.keyword_index import KeywordIndex
+from apps.api.services.llm_gateway import ContextChunk
+from apps.api.services.rag_pipeline import RAGPipeline
+from apps.api.services.search_service import (
+    SearchResult,
+    SearchService,
+    _keyword_score,
+    reciprocal_rank_fusion,
+)
 
 
 # ── Chunking tests ──
@@ -78,6 +109,548 @@ class TestChunking:
         assert e[0] != e[1]
 
 
+# ── Streaming extraction tests ──
+
+
+class _WordEncoder:
+    """Word tokenizer standing in for tiktoken (no download needed).
+
+    Tokens keep their leading whitespace, so decoding is lossless.
+    """
+
+    def encode(self, text):
+        return re.findall(r"\s*\S+|\s+", text)
+
+    encode_ordinary = encode
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+    def decode_bytes(self, tokens):
+        return "".join(tokens).encode("utf-8")
+
+    def decode_single_token_bytes(self, token):
+        return token.encode("utf-8")
+
+
+def _make_pdf(page_texts: list[str]) -> bytes:
+    """Minimal PDF with one line of Helvetica text per page."""
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>"
+        )
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += (
+        f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+class TestStreamingExtraction:
+    @pytest.fixture(autouse=True)
+    def _word_encoder(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "_encoder", _WordEncoder())
+
+    def test_parallel_pdf_pages_in_order(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "PDF_PARALLEL_MIN_PAGES", 4)
+        monkeypatch.setattr(chunking_service, "PDF_PAGES_PER_TASK", 3)
+        monkeypatch.setattr(chunking_service, "PDF_EXTRACT_WORKERS", 2)
+        pdf = _make_pdf([f"Page {i} conclusions" for i in range(1, 21)])
+
+        pages = extract_text_from_pdf(pdf)
+        assert [n for _, n in pages] == list(range(1, 21))
+        assert pages[6][0] == "Page 7 conclusions"
+
+    def test_page_pool_does_not_fork_and_shuts_down(self):
+        pool = chunking_service._get_page_pool()
+        assert pool._mp_context.get_start_method() == "forkserver"
+        chunking_service.shutdown_page_pool()
+        assert chunking_service._page_pool is None
+
+    def test_sequential_matches_parallel(self, monkeypatch):
+        pdf = _make_pdf([f"Page {i}" for i in range(1, 11)])
+        sequential = extract_text_from_pdf(pdf)
+        monkeypatch.setattr(chunking_service, "PDF_PARALLEL_MIN_PAGES", 2)
+        monkeypatch.setattr(chunking_service, "PDF_PAGES_PER_TASK", 4)
+        monkeypatch.setattr(chunking_service, "PDF_EXTRACT_WORKERS", 2)
+        assert extract_text_from_pdf(pdf) == sequential
+
+    def test_pdf_chunks_have_global_index(self):
+        pdf = _make_pdf(["First page", "Second page", "Third page"])
+        chunks = list(iter_document_chunks(pdf, "application/pdf", document_id="doc-1"))
+        assert [c.chunk_index for c in chunks] == [0, 1, 2]
+        assert [c.page_number for c in chunks] == [1, 2, 3]
+        assert all(c.document_id == "doc-1" for c in chunks)
+
+    def test_take_batch(self):
+        chunks = chunk_text(
+            " ".join(f"w{i}" for i in range(50)), max_tokens=10, overlap_tokens=2
+        )
+        stream = iter(chunks)
+        batches = []
+        while batch := take_batch(stream, batch_size=2):
+            batches.append(batch)
+        assert sum(len(b) for b in batches) == len(chunks)
+        assert all(len(b) <= 2 for b in batches)
+
+    @pytest.mark.asyncio
+    async def test_ingest_streams_batches(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "EMBEDDING_BATCH_SIZE", 2)
+        pipeline = RAGPipeline(use_stub=True)
+        calls = []
+        upsert = pipeline.vector_service.upsert_chunks
+
+        def counting_upsert(chunk_ids, embeddings, payloads):
+            calls.append(len(chunk_ids))
+            upsert(chunk_ids=chunk_ids, embeddings=embeddings, payloads=payloads)
+
+        pipeline.vector_service.upsert_chunks = counting_upsert
+        pdf = _make_pdf([f"Page {i}" for i in range(1, 6)])
+        result = await pipeline.ingest_document(
+            "doc-1", pdf, "application/pdf", tenant_id="t1"
+        )
+        assert result.success
+        assert result.chunks_created == 5
+        assert calls == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_ingest_failure_rolls_back(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "EMBEDDING_BATCH_SIZE", 1)
+        pipeline = RAGPipeline(use_stub=True)
+        calls = []
+
+        def flaky_embeddings(texts):
+            calls.append(texts)
+            if len(calls) > 1:
+                raise RuntimeError("embedding backend down")
+            return generate_embeddings(texts)
+
+        monkeypatch.setattr(
+            "apps.api.services.rag_pipeline.generate_embeddings", flaky_embeddings
+        )
+        pdf = _make_pdf(["Some text", "More text"])
+        result = await pipeline.ingest_document(
+            "doc-1", pdf, "application/pdf", tenant_id="t1"
+        )
+        assert not result.success
+        assert "backend down" in result.error
+        assert pipeline.keyword_index.document_count("t1") == 0
+        assert (
+            pipeline.vector_service.search(
+                query_embedding=generate_embeddings(["Some text"])[0], tenant_id="t1"
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_cancelled_ingest_rolls_back(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "EMBEDDING_BATCH_SIZE", 1)
+        pipeline = RAGPipeline(use_stub=True)
+        calls = []
+        started, release = threading.Event(), threading.Event()
+
+        def slow_embeddings(texts):
+            calls.append(texts)
+            if len(calls) > 1:
+                started.set()
+                release.wait(5)
+            return generate_embeddings(texts)
+
+        monkeypatch.setattr(
+            "apps.api.services.rag_pipeline.generate_embeddings", slow_embeddings
+        )
+        pdf = _make_pdf(["Some text", "More text"])
+        task = asyncio.create_task(
+            pipeline.ingest_document("doc-1", pdf, "application/pdf", tenant_id="t1")
+        )
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        assert pipeline.keyword_index.document_count("t1") == 0
+
+    @pytest.mark.asyncio
+    async def test_ingest_text_failure_rolls_back(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "_encoder", _WordEncoder())
+        pipeline = RAGPipeline(use_stub=True)
+
+        def broken_add(chunk_ids, payloads):
+            raise RuntimeError("keyword index down")
+
+        pipeline.keyword_index.add = broken_add
+        result = await pipeline.ingest_text(
+            "doc-1", "Le contrat de bail.", tenant_id="t1"
+        )
+        assert result.error == "keyword index down"
+        # The vector upsert that did succeed is removed
+        assert (
+            pipeline.vector_service.search(
+                query_embedding=generate_embeddings(["Le contrat de bail."])[0],
+                tenant_id="t1",
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_reingest_keeps_earlier_chunks(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "EMBEDDING_BATCH_SIZE", 1)
+        pipeline = RAGPipeline(use_stub=True)
+        pdf = _make_pdf(["Some text", "More text"])
+        assert (
+            await pipeline.ingest_document("doc-1", pdf, "application/pdf", "k", "t1")
+        ).success
+
+        calls = []
+
+        def flaky_embeddings(texts):
+            calls.append(texts)
+            if len(calls) > 1:
+                raise RuntimeError("embedding backend down")
+            return generate_embeddings(texts)
+
+        monkeypatch.setattr(
+            "apps.api.services.rag_pipeline.generate_embeddings", flaky_embeddings
+        )
+        result = await pipeline.ingest_document(
+            "doc-1", pdf, "application/pdf", "k", "t1"
+        )
+        assert not result.success
+        # Only the failed attempt's chunk is rolled back
+        assert pipeline.keyword_index.document_count("t1") == 2
+        hits = pipeline.vector_service.search(
+            query_embedding=generate_embeddings(["Some text"])[0], tenant_id="t1"
+        )
+        assert len(hits) == 2
+
+
+class TestComputeExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop_with_timings(self):
+        executor = ComputeExecutor(max_workers=2)
+        timings = {}
+        name = await executor.run(
+            "probe", lambda: threading.current_thread().name, timings=timings
+        )
+        assert name.startswith("rag-compute")
+        assert timings["probe"] >= 0
+        assert executor.pending() == 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self):
+        executor = ComputeExecutor(max_workers=1)
+        release = threading.Event()
+        task = asyncio.create_task(executor.run("block", release.wait, 5))
+        # The event loop keeps serving while the stage blocks a worker
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        release.set()
+        assert await task is True
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_back_pressure(self):
+        executor = ComputeExecutor(max_workers=1, max_pending=1, admit_timeout=0.05)
+        release = threading.Event()
+        task = asyncio.create_task(executor.run("block", release.wait, 5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExecutorBusyError):
+            await executor.run("search", lambda: None)
+        release.set()
+        await task
+        assert await executor.run("search", lambda: "ok") == "ok"
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tenant_ingest_cap(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "_encoder", _WordEncoder())
+        executor = ComputeExecutor(max_ingests_per_tenant=1)
+        pipeline = RAGPipeline(use_stub=True, executor=executor)
+        async with executor.tenant_ingest("t1"):
+            rejected = await pipeline.ingest_text("doc-1", "Texte", tenant_id="t1")
+            other = await pipeline.ingest_text("doc-2", "Texte", tenant_id="t2")
+        assert not rejected.success
+        assert "in progress" in rejected.error
+        assert other.success
+        assert set(other.stage_timings_ms) == {"chunk", "embed", "upsert"}
+        assert (await pipeline.ingest_text("doc-1", "Texte", tenant_id="t1")).success
+        executor.shutdown()
+
+
+class TestTokenWindows:
+    @pytest.fixture(autouse=True)
+    def _word_encoder(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "_encoder", _WordEncoder())
+
+    def test_windows_respect_max_tokens(self):
+        text = " ".join(f"mot{i}" for i in range(1000))
+        chunks = chunk_text(text, max_tokens=100, overlap_tokens=20)
+        assert all(0 < c.token_count <= 100 for c in chunks)
+        assert chunks[0].content.startswith("mot0 ")
+        assert chunks[-1].content.endswith("mot999")
+        # Consecutive windows overlap by 20 words
+        assert chunks[0].content.split()[-20:] == chunks[1].content.split()[:20]
+
+    def test_each_token_is_decoded_once(self, monkeypatch):
+        decoded = []
+
+        class CountingEncoder(_WordEncoder):
+            def decode_bytes(self, tokens):
+                raise AssertionError("spans are read from the byte offsets")
+
+            def decode_single_token_bytes(self, token):
+                decoded.append(token)
+                return super().decode_single_token_bytes(token)
+
+        monkeypatch.setattr(chunking_service, "_encoder", CountingEncoder())
+        text = " ".join(f"mot{i}." for i in range(500))
+        chunks = _split_text_into_chunks(text, max_tokens=50, overlap_tokens=10)
+        assert len(chunks) > 10
+        assert len(decoded) == 500
+
+    def test_snaps_to_sentence_end(self):
+        sentence = "Le tribunal statue sur la demande du requérant. "
+        chunks = _split_text_into_chunks(sentence * 40, max_tokens=50, overlap_tokens=5)
+        assert len(chunks) > 1
+        assert all(c.endswith("requérant.") for c in chunks[:-1])
+
+    def test_prefers_paragraph_break(self):
+        text = (
+            "Attendu que le contrat a été résilié. " * 2
+            + "Vu les pièces du dossier.\n\n"
+            + "Par ces motifs, le tribunal condamne la partie défenderesse. " * 3
+        )
+        chunks = _split_text_into_chunks(text, max_tokens=30, overlap_tokens=0)
+        assert chunks[0].endswith("Vu les pièces du dossier.")
+
+    def test_abbreviation_is_not_a_sentence_end(self):
+        text = "x " * 30 + "conformément à l'art. 1382 du Code civil " + "y " * 30
+        chunks = _split_text_into_chunks(text, max_tokens=40, overlap_tokens=0)
+        assert not chunks[0].endswith("art.")
+
+    def test_overlap_larger_than_window_terminates(self):
+        text = " ".join(f"w{i}" for i in range(200))
+        chunks = _split_text_into_chunks(text, max_tokens=10, overlap_tokens=64)
+        assert chunks[-1].endswith("w199")
+        assert len(chunks) < 200
+
+    def test_multibyte_text_is_sliced_cleanly(self):
+        text = "Équité procès délai réglé. " * 100
+        chunks = _split_text_into_chunks(text, max_tokens=32, overlap_tokens=8)
+        assert all("\ufffd" not in c for c in chunks)
+        assert all(c.startswith("Équité") for c in chunks[1:])
+
+
+# ── Context packing tests ──
+
+
+def _context(chunks, **kwargs):
+    return [
+        ContextChunk(content=c.content, document_id=c.document_id, **kwargs)
+        for c in chunks
+    ]
+
+
+class TestContextPacker:
+    @pytest.fixture(autouse=True)
+    def _word_encoder(self, monkeypatch):
+        monkeypatch.setattr(chunking_service, "_encoder", _WordEncoder())
+
+    def _doc_chunks(self, words=300):
+        text = " ".join(f"mot{i}" for i in range(words))
+        return chunk_text(text, document_id="doc-1", max_tokens=100, overlap_tokens=20)
+
+    def test_overlapping_windows_are_merged_once(self):
+        chunks = self._doc_chunks()
+        context = [
+            ContextChunk(
+                content=c.content,
+                document_id=c.document_id,
+                chunk_index=c.chunk_index,
+                score=1.0 - i / 10,
+            )
+            for i, c in enumerate(chunks)
+        ]
+        packed = pack_context(context, budget=10_000)
+        assert len(packed.chunks) == 1
+        words = packed.chunks[0].content.split()
+        assert words == [f"mot{i}" for i in range(300)]
+        assert packed.tokens_saved > 20 * (len(chunks) - 1)
+        assert packed.context_tokens == count_tokens(format_context(packed.chunks))
+
+    def test_merges_by_text_without_chunk_index(self):
+        a, b = self._doc_chunks()[:2]
+        packed = pack_context(_context([b, a]), budget=10_000)
+        assert len(packed.chunks) == 1
+        assert packed.chunks[0].content.startswith("mot0 ")
+
+    def test_duplicates_and_other_documents(self):
+        a, b = self._doc_chunks()[:2]
+        other = ContextChunk(content=a.content, document_id="doc-2")
+        packed = pack_context(_context([a, a]) + [other], budget=10_000)
+        assert [c.document_id for c in packed.chunks] == ["doc-1", "doc-2"]
+        assert packed.chunks[0].content == a.content
+
+    def test_budget_is_filled_by_score(self):
+        context = [
+            ContextChunk(content=" ".join(["bas"] * 50), document_id="a", score=0.2),
+            ContextChunk(content=" ".join(["haut"] * 50), document_id="b", score=0.9),
+            ContextChunk(content=" ".join(["moyen"] * 30), document_id="c", score=0.5),
+        ]
+        packed = pack_context(context, budget=100)
+        assert [c.document_id for c in packed.chunks] == ["b", "c"]
+        assert packed.dropped == 1
+        assert packed.context_tokens <= 100
+
+    def test_oversized_single_chunk_is_cut_to_budget(self):
+        transcript = ContextChunk(
+            content=" ".join(f"mot{i}" for i in range(500)), document_id="t-1"
+        )
+        packed = pack_context([transcript], budget=100)
+        assert len(packed.chunks) == 1
+        assert packed.chunks[0].content.startswith("mot0 mot1")
+        assert 0 < packed.context_tokens <= 100
+        assert packed.dropped == 0
+        # Cut text is not a packing saving
+        assert packed.tokens_saved == 0
+
+    def test_dropped_chunks_are_not_counted_as_saved(self):
+        context = [
+            ContextChunk(content=" ".join(["haut"] * 50), document_id="b", score=0.9),
+            ContextChunk(content=" ".join(["bas"] * 80), document_id="a", score=0.2),
+        ]
+        packed = pack_context(context, budget=100)
+        assert packed.dropped == 1
+        assert packed.tokens_saved == 0
+
+    def test_budget_leaves_room_for_prompt_and_completion(self):
+        assert context_budget("gpt-4", "system", "question ?", 2000) == min(
+            RAG_CONTEXT_MAX_TOKENS, 8192 - 2000 - 1 - 2 - 32
+        )
+        assert context_budget("gpt-4", "", "", 9000) == 0
+
+    def test_model_context_window_longest_prefix(self):
+        assert model_context_window("gpt-4o-mini") == 128_000
+        assert model_context_window("gpt-4-0613") == 8_192
+        assert model_context_window("unknown-model") == LLM_CONTEXT_WINDOW
+
+
+# ── Embedding engine tests ──
+
+
+class _FakeModel:
+    """Records every encode call; embeds a text as [len(text), 1.0]."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls.append(len(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+class TestEmbeddingEngine:
+    def test_results_returned_per_caller(self):
+        engine = EmbeddingEngine(model=_FakeModel(), max_wait_ms=0)
+        assert engine.encode(["a", "bbb"]) == [[1.0, 1.0], [3.0, 1.0]]
+        assert engine.encode([]) == []
+
+    def test_concurrent_requests_share_one_encode_call(self):
+        model = _FakeModel()
+        engine = EmbeddingEngine(model=model, max_batch_size=64, max_wait_ms=200)
+        results: dict[int, list[list[float]]] = {}
+        barrier = threading.Barrier(8)
+
+        def worker(i: int) -> None:
+            barrier.wait()
+            results[i] = engine.encode(["x" * (i + 1)])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(model.calls) == 8
+        assert len(model.calls) < 8
+        for i in range(8):
+            assert results[i] == [[float(i + 1), 1.0]]
+
+    def test_batch_size_limit(self):
+        model = _FakeModel()
+        engine = EmbeddingEngine(model=model, max_batch_size=2, max_wait_ms=50)
+        engine.encode(["a", "b", "c"])
+        assert model.calls == [3]
+
+    def test_model_error_propagates(self):
+        class _Broken:
+            def encode(self, texts, show_progress_bar=False):
+                raise RuntimeError("boom")
+
+        engine = EmbeddingEngine(model=_Broken(), max_wait_ms=0)
+        with pytest.raises(RuntimeError, match="boom"):
+            engine.encode(["a"])
+
+
+class TestEmbeddingCache:
+    def test_unchanged_text_not_reencoded(self):
+        model = _FakeModel()
+        engine = EmbeddingEngine(model=model, max_wait_ms=0, cache=EmbeddingCache())
+        first = engine.encode(["alpha", "beta"])
+        second = engine.encode(["beta", "alpha", "gamma"])
+        assert model.calls == [2, 1]
+        assert second[:2] == [first[1], first[0]]
+        stats = engine.cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 3
+
+    def test_duplicate_texts_encoded_once(self):
+        model = _FakeModel()
+        engine = EmbeddingEngine(model=model, max_wait_ms=0, cache=EmbeddingCache())
+        result = engine.encode(["same", "same", "same"])
+        assert model.calls == [1]
+        assert result[0] == result[1] == result[2]
+
+    def test_key_includes_model(self):
+        assert EmbeddingCache.make_key("m1", "text") != EmbeddingCache.make_key(
+            "m2", "text"
+        )
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        cache.get_many(["a"])  # a becomes most recently used
+        cache.put_many({"c": [3.0]})
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_disk_backend_survives_restart(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        EmbeddingCache(max_entries=10, path=path).put_many({"k": [0.5, -1.0]})
+        reopened = EmbeddingCache(max_entries=10, path=path)
+        assert reopened.get_many(["k"]) == {"k": [0.5, -1.0]}
+        assert reopened.stats()["hits"] == 1
+
+
 # ── Vector service tests ──
 
 
@@ -195,6 +768,320 @@ class TestVectorService:
         results = self.svc.search(query_emb, self.tenant_id, top_k=5)
         assert len(results) == 5
 
+    def test_filters(self):
+        embeddings = generate_embeddings(["a", "b"])
+        self.svc.upsert_chunks(
+            chunk_ids=["c1", "c2"],
+            embeddings=embeddings,
+            payloads=[
+                {"content": "a", "tenant_id": self.tenant_id, "lang": "fr"},
+                {"content": "b", "tenant_id": self.tenant_id, "lang": "nl"},
+            ],
+        )
+        results = self.svc.search(embeddings[0], self.tenant_id, filters={"lang": "nl"})
+        assert [r.chunk_id for r in results] == ["c2"]
+
+    def test_upsert_overwrites_existing_chunk(self):
+        embeddings = generate_embeddings(["old", "new"])
+        payload = {"content": "old", "tenant_id": self.tenant_id, "case_id": "x"}
+        self.svc.upsert_chunks(["c1"], [embeddings[0]], [payload])
+        moved = {"content": "new", "tenant_id": self.tenant_id, "case_id": "y"}
+        self.svc.upsert_chunks(["c1"], [embeddings[1]], [moved])
+
+        assert len(self.svc._store) == 1
+        assert self.svc.search(embeddings[1], self.tenant_id, case_id="x") == []
+        results = self.svc.search(embeddings[1], self.tenant_id, case_id="y")
+        assert results[0].content == "new"
+        assert abs(results[0].score - 1.0) < 1e-5
+
+    def test_deleted_rows_are_reused(self):
+        embeddings = generate_embeddings(["one", "two"])
+        self.svc.upsert_chunks(
+            ["c1"],
+            [embeddings[0]],
+            [{"tenant_id": self.tenant_id, "document_id": "d1"}],
+        )
+        self.svc.delete_by_document("d1")
+        self.svc.upsert_chunks(
+            ["c2"],
+            [embeddings[1]],
+            [{"tenant_id": self.tenant_id, "document_id": "d2"}],
+        )
+        assert len(self.svc._row_ids) == 1
+        results = self.svc.search(embeddings[0], self.tenant_id)
+        assert [r.chunk_id for r in results] == ["c2"]
+
+    def test_ranking_matches_brute_force_cosine(self):
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(300, 16)).tolist()
+        self.svc.upsert_chunks(
+            chunk_ids=[f"c{i}" for i in range(300)],
+            embeddings=vectors,
+            payloads=[{"tenant_id": self.tenant_id} for _ in range(300)],
+        )
+        query = rng.normal(size=16)
+
+        matrix = np.array(vectors)
+        cosine = (
+            matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+        )
+        expected = [f"c{i}" for i in np.argsort(-cosine)[:10]]
+
+        results = self.svc.search(query.tolist(), self.tenant_id, top_k=10)
+        assert [r.chunk_id for r in results] == expected
+        assert abs(results[0].score - cosine.max()) < 1e-5
+
+    def test_search_batch_matches_single_searches(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(200, 16)).tolist()
+        self.svc.upsert_chunks(
+            chunk_ids=[f"c{i}" for i in range(200)],
+            embeddings=vectors,
+            payloads=[{"tenant_id": self.tenant_id} for _ in range(200)],
+        )
+        queries = rng.normal(size=(3, 16)).tolist()
+        batched = self.svc.search_batch(queries, self.tenant_id, top_k=5)
+        assert len(batched) == 3
+        for query, results in zip(queries, batched):
+            single = self.svc.search(query, self.tenant_id, top_k=5)
+            assert [r.chunk_id for r in results] == [r.chunk_id for r in single]
+        assert self.svc.search_batch(queries, "unknown-tenant") == [[], [], []]
+
+
+class TestIVFVectorService:
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        self.path = str(tmp_path / "index")
+        self.svc = IVFVectorService(path=self.path)
+        self.tenant_id = str(uuid.uuid4())
+        self.other_tenant = str(uuid.uuid4())
+
+    def _payload(self, content: str, **extra) -> dict:
+        return {"content": content, "tenant_id": self.tenant_id, **extra}
+
+    def test_upsert_search_and_tenant_isolation(self):
+        embeddings = generate_embeddings(["contrat de travail", "bail"])
+        self.svc.upsert_chunks(
+            ["c1", "c2"],
+            embeddings,
+            [
+                self._payload("Contrat", document_id="d1"),
+                {"content": "Bail", "tenant_id": self.other_tenant},
+            ],
+        )
+        results = self.svc.search(embeddings[0], self.tenant_id, top_k=5)
+        assert [r.chunk_id for r in results] == ["c1"]
+        assert results[0].content == "Contrat"
+        assert results[0].document_id == "d1"
+        assert self.svc.search(embeddings[0], "unknown-tenant") == []
+
+    def test_case_filter_and_payload_filters(self):
+        embeddings = generate_embeddings(["a", "b", "c"])
+        self.svc.upsert_chunks(
+            ["c1", "c2", "c3"],
+            embeddings,
+            [
+                self._payload("a", case_id="k1", lang="fr"),
+                self._payload("b", case_id="k1", lang="nl"),
+                self._payload("c", case_id="k2", lang="nl"),
+            ],
+        )
+        in_case = self.svc.search(embeddings[0], self.tenant_id, case_id="k1")
+        assert {r.chunk_id for r in in_case} == {"c1", "c2"}
+        dutch = self.svc.search(
+            embeddings[0], self.tenant_id, case_id="k1", filters={"lang": "nl"}
+        )
+        assert [r.chunk_id for r in dutch] == ["c2"]
+
+    def test_search_batch(self):
+        embeddings = generate_embeddings(["contrat", "bail"])
+        self.svc.upsert_chunks(
+            ["c1", "c2"], embeddings, [self._payload("contrat"), self._payload("bail")]
+        )
+        batched = self.svc.search_batch(embeddings, self.tenant_id, top_k=1)
+        assert [[r.chunk_id for r in rs] for rs in batched] == [["c1"], ["c2"]]
+
+    def test_delete_by_document_tombstones_rows(self):
+        embeddings = generate_embeddings(["x", "y"])
+        self.svc.upsert_chunks(
+            ["c1", "c2"],
+            embeddings,
+            [
+                self._payload("x", document_id="d1"),
+                self._payload("y", document_id="d2"),
+            ],
+        )
+        self.svc.delete_by_document("d1")
+        results = self.svc.search(embeddings[0], self.tenant_id, top_k=5)
+        assert [r.chunk_id for r in results] == ["c2"]
+
+    def test_delete_chunks(self):
+        embeddings = generate_embeddings(["x", "y"])
+        self.svc.upsert_chunks(
+            ["c1", "c2"],
+            embeddings,
+            [
+                self._payload("x", document_id="d1"),
+                self._payload("y", document_id="d1"),
+            ],
+        )
+        self.svc.delete_chunks(["c1", "missing"])
+        results = self.svc.search(embeddings[0], self.tenant_id, top_k=5)
+        assert [r.chunk_id for r in results] == ["c2"]
+
+    def test_reupsert_replaces_previous_vector(self):
+        embeddings = generate_embeddings(["old", "new"])
+        self.svc.upsert_chunks(["c1"], [embeddings[0]], [self._payload("old")])
+        self.svc.upsert_chunks(["c1"], [embeddings[1]], [self._payload("new")])
+        results = self.svc.search(embeddings[1], self.tenant_id, top_k=5)
+        assert [r.content for r in results] == ["new"]
+
+    def test_index_persists_across_reopen(self):
+        embeddings = generate_embeddings(["persist me", "deleted"])
+        self.svc.upsert_chunks(
+            ["c1", "c2"],
+            embeddings,
+            [
+                self._payload("persist me", document_id="d1"),
+                self._payload("deleted", document_id="d2"),
+            ],
+        )
+        self.svc.delete_by_document("d2")
+        self.svc.close()
+
+        reopened = IVFVectorService(path=self.path)
+        results = reopened.search(embeddings[0], self.tenant_id, top_k=5)
+        assert [r.chunk_id for r in results] == ["c1"]
+
+    def test_two_writers_share_the_index(self):
+        # Two workers with their own service instances on one directory
+        other = IVFVectorService(path=self.path)
+        embeddings = generate_embeddings(["contrat", "bail", "divorce", "faillite"])
+        self.svc.upsert_chunks(
+            ["c1"], [embeddings[0]], [self._payload("contrat", case_id="k1")]
+        )
+        other.upsert_chunks(
+            ["c2"], [embeddings[1]], [self._payload("bail", case_id="k2")]
+        )
+        self.svc.upsert_chunks(
+            ["c3"], [embeddings[2]], [self._payload("divorce", case_id="k3")]
+        )
+        other.upsert_chunks(
+            ["c4"], [embeddings[3]], [self._payload("faillite", case_id="k2")]
+        )
+
+        for svc in (self.svc, other):
+            for i, chunk_id in enumerate(["c1", "c2", "c3", "c4"]):
+                results = svc.search(embeddings[i], self.tenant_id, top_k=1)
+                assert [r.chunk_id for r in results] == [chunk_id]
+            in_case = svc.search(embeddings[1], self.tenant_id, case_id="k2")
+            assert {r.chunk_id for r in in_case} == {"c2", "c4"}
+            assert [
+                r.chunk_id
+                for r in svc.search(embeddings[2], self.tenant_id, case_id="k3")
+            ] == ["c3"]
+
+        other.delete_chunks(["c1"])
+        results = self.svc.search(embeddings[0], self.tenant_id, top_k=5)
+        assert "c1" not in {r.chunk_id for r in results}
+        other.close()
+
+    def test_trained_index_recall(self, monkeypatch):
+        monkeypatch.setattr(ivf_vector_service, "IVF_MIN_TRAIN_SIZE", 500)
+        rng = np.random.default_rng(7)
+        centers = rng.normal(size=(20, 32))
+        vectors = centers[rng.integers(0, 20, 2000)] + 0.1 * rng.normal(size=(2000, 32))
+        self.svc.upsert_chunks(
+            [f"c{i}" for i in range(1000)],
+            vectors[:1000].tolist(),
+            [self._payload(f"v{i}") for i in range(1000)],
+        )
+        # Incremental inserts after training go to their nearest list
+        self.svc.upsert_chunks(
+            [f"c{i}" for i in range(1000, 2000)],
+            vectors[1000:].tolist(),
+            [self._payload(f"v{i}") for i in range(1000, 2000)],
+        )
+        part = self.svc._partitions[self.tenant_id]
+        assert part.centroids is not None
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        recalled = 0
+        for q in range(0, 2000, 100):
+            expected = {f"c{i}" for i in np.argsort(-(unit @ unit[q]))[:10]}
+            results = self.svc.search(vectors[q].tolist(), self.tenant_id, top_k=10)
+            recalled += len(expected & {r.chunk_id for r in results})
+        assert recalled / 200 >= 0.9
+
+    def test_training_runs_outside_the_partition_locks(self, monkeypatch):
+        monkeypatch.setattr(ivf_vector_service, "IVF_MIN_TRAIN_SIZE", 500)
+        train_centroids = ivf_vector_service.train_centroids
+        held = []
+
+        def spy(sample, nlist):
+            part = self.svc._partitions[self.tenant_id]
+            with open(os.path.join(part.directory, ".lock"), "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                except BlockingIOError:
+                    held.append("flock")
+
+            # Another thread can write while k-means runs
+            def try_lock():
+                if self.svc._lock.acquire(blocking=False):
+                    self.svc._lock.release()
+                else:
+                    held.append("service lock")
+
+            writer = threading.Thread(target=try_lock)
+            writer.start()
+            writer.join()
+            return train_centroids(sample, nlist)
+
+        monkeypatch.setattr(ivf_vector_service, "train_centroids", spy)
+        vectors = np.random.default_rng(3).normal(size=(600, 16))
+        self.svc.upsert_chunks(
+            [f"c{i}" for i in range(600)],
+            vectors.tolist(),
+            [self._payload(f"v{i}") for i in range(600)],
+        )
+        assert self.svc._partitions[self.tenant_id].trained_size == 600
+        assert held == []
+
+    def test_trained_index_filtered_search_fills_top_k(self, monkeypatch):
+        monkeypatch.setattr(ivf_vector_service, "IVF_MIN_TRAIN_SIZE", 500)
+        rng = np.random.default_rng(11)
+        vectors = rng.normal(size=(1500, 32))
+        # Rows of case k1 and lang=nl are scattered over every list
+        self.svc.upsert_chunks(
+            [f"c{i}" for i in range(1500)],
+            vectors.tolist(),
+            [
+                self._payload(
+                    f"v{i}",
+                    case_id="k1" if i % 100 == 0 else "k2",
+                    lang="nl" if i % 75 == 0 else "fr",
+                )
+                for i in range(1500)
+            ],
+        )
+        assert self.svc._partitions[self.tenant_id].centroids is not None
+
+        in_case = self.svc.search(
+            vectors[1].tolist(), self.tenant_id, top_k=10, case_id="k1"
+        )
+        assert len(in_case) == 10
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        case_rows = np.arange(0, 1500, 100)
+        expected = case_rows[np.argsort(-(unit[case_rows] @ unit[1]))[:10]]
+        assert [r.chunk_id for r in in_case] == [f"c{i}" for i in expected]
+
+        dutch = self.svc.search(
+            vectors[1].tolist(), self.tenant_id, top_k=10, filters={"lang": "nl"}
+        )
+        assert len(dutch) == 10
+
 
 # ── Hybrid search tests ──
 
@@ -260,3 +1147,153 @@ class TestHybridSearch:
         if len(response.results) >= 2:
             scores = [r.score for r in response.results]
             assert scores == sorted(scores, reverse=True)
+
+
+# ── BM25 keyword index tests ──
+
+
+class TestKeywordIndex:
+    def setup_method(self):
+        self.index = KeywordIndex()
+        self.tenant_id = str(uuid.uuid4())
+        texts = [
+            "Article 1382 du Code civil: responsabilité pour faute.",
+            "Le contrat de bail commercial est signé.",
+            "Le contrat de travail prévoit un préavis.",
+        ]
+        self.index.add(
+            [f"c{i}" for i in range(3)],
+            [
+                {
+                    "content": t,
+                    "tenant_id": self.tenant_id,
+                    "document_id": f"doc-{i}",
+                    "case_id": "case-1" if i < 2 else "case-2",
+                }
+                for i, t in enumerate(texts)
+            ],
+        )
+
+    def test_exact_article_number(self):
+        results = self.index.search("article 1382", self.tenant_id)
+        assert results[0].chunk_id == "c0"
+        assert results[0].score > 0
+
+    def test_rare_terms_weigh_more(self):
+        # "contrat" appears twice, "bail" once: the bail chunk ranks first
+        results = self.index.search("contrat bail", self.tenant_id)
+        assert [r.chunk_id for r in results][:2] == ["c1", "c2"]
+
+    def test_tenant_isolation_and_case_filter(self):
+        assert self.index.search("contrat", "other-tenant") == []
+        results = self.index.search("contrat", self.tenant_id, case_id="case-2")
+        assert [r.chunk_id for r in results] == ["c2"]
+
+    def test_delete_by_document(self):
+        self.index.delete_by_document("doc-1")
+        assert self.index.document_count(self.tenant_id) == 2
+        assert [r.chunk_id for r in self.index.search("bail", self.tenant_id)] == []
+
+    def test_rebuild_from_vector_store(self):
+        vector_svc = InMemoryVectorService()
+        texts = ["Article 1382 du Code civil.", "Le contrat de bail."]
+        vector_svc.upsert_chunks(
+            ["v0", "v1"],
+            generate_embeddings(texts),
+            [{"content": t, "tenant_id": self.tenant_id} for t in texts],
+        )
+        assert self.index.rebuild(vector_svc) == 2
+        assert self.index.document_count(self.tenant_id) == 2
+        assert [r.chunk_id for r in self.index.search("1382", self.tenant_id)] == ["v0"]
+
+    def test_shared_across_processes(self, tmp_path):
+        # Two workers open the same index file
+        path = str(tmp_path / "keywords.db")
+        writer, reader = KeywordIndex(path), KeywordIndex(path)
+        writer.add(
+            ["c0"],
+            [{"content": "Article 1382", "tenant_id": self.tenant_id, "lang": "fr"}],
+        )
+        results = reader.search("1382", self.tenant_id, filters={"lang": "fr"})
+        assert [r.chunk_id for r in results] == ["c0"]
+        reader.delete_chunks(["c0"])
+        assert writer.search("1382", self.tenant_id) == []
+
+    def test_rebuild_if_empty_keeps_existing_index(self):
+        vector_svc = InMemoryVectorService()
+        vector_svc.upsert_chunks(
+            ["v0"],
+            generate_embeddings(["Le contrat de bail."]),
+            [{"content": "Le contrat de bail.", "tenant_id": self.tenant_id}],
+        )
+        assert self.index.rebuild(vector_svc, if_empty=True) == 0
+        assert self.index.document_count(self.tenant_id) == 3
+        assert KeywordIndex().rebuild(vector_svc, if_empty=True) == 1
+
+    def test_rebuild_drops_chunks_missing_from_vector_store(self):
+        # A restarted in-memory vector store is empty: so must the index be
+        assert self.index.rebuild(InMemoryVectorService()) == 0
+        assert self.index.document_count(self.tenant_id) == 0
+        assert self.index.search("contrat", self.tenant_id) == []
+
+    def test_reciprocal_rank_fusion(self):
+        a = VectorSearchResult(chunk_id="a", score=0.9, content="a")
+        b = VectorSearchResult(chunk_id="b", score=0.8, content="b")
+        c = VectorSearchResult(chunk_id="c", score=5.0, content="c")
+        fused = reciprocal_rank_fusion([([a, b], 1.0), ([b, c], 1.0)])
+        assert [hit.chunk_id for hit, _, _ in fused][0] == "b"
+        assert {hit.chunk_id: n for hit, _, n in fused} == {"a": 1, "b": 2, "c": 1}
+
+
+class TestFusedHybridSearch:
+    def setup_method(self):
+        self.vector_svc = InMemoryVectorService()
+        self.keyword_index = KeywordIndex()
+        self.search_svc = SearchService(self.vector_svc, self.keyword_index)
+        self.tenant_id = str(uuid.uuid4())
+
+    def _index_docs(self, texts: list[str]):
+        chunk_ids = [f"c{i}" for i in range(len(texts))]
+        payloads = [
+            {
+                "content": t,
+                "tenant_id": self.tenant_id,
+                "document_id": f"doc-{i}",
+            }
+            for i, t in enumerate(texts)
+        ]
+        self.vector_svc.upsert_chunks(chunk_ids, generate_embeddings(texts), payloads)
+        self.keyword_index.add(chunk_ids, payloads)
+
+    def test_keyword_candidates_are_counted_and_fused(self):
+        self._index_docs(
+            [
+                "Le contrat de bail commercial est signé.",
+                "Le droit pénal belge prévoit des sanctions.",
+                "Jugement du tribunal de Bruxelles, partie Dupont.",
+            ]
+        )
+        response = self.search_svc.search("Dupont", self.tenant_id, top_k=3)
+        assert response.keyword_count == 1
+        assert response.results[0].document_id == "doc-2"
+        assert response.results[0].source_type == "hybrid"
+        scores = [r.score for r in response.results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_empty_keyword_index_skips_fusion(self):
+        texts = ["Le contrat de bail commercial est signé."]
+        self.vector_svc.upsert_chunks(
+            ["c0"],
+            generate_embeddings(texts),
+            [{"content": texts[0], "tenant_id": self.tenant_id, "document_id": "d"}],
+        )
+        response = self.search_svc.search("contrat bail", self.tenant_id)
+        assert response.keyword_count == 0
+        # Vector hits keep their hybrid score instead of a bare RRF rank
+        assert response.results[0].score > 0.1
+
+    def test_keyword_search(self):
+        self._index_docs(["Article 1382 Code civil", "Article 544 Code civil"])
+        results = self.search_svc.keyword_search("1382", self.tenant_id)
+        assert [r.document_id for r in results] == ["doc-0"]
+        assert results[0].source_type == "keyword"
@@ -1,12 +1,20 @@
 """LexiBel Celery Workers"""
 
 from celery import Celery
+from celery.signals import worker_init
 import os
 
 app = Celery(
     "lexibel",
     broker=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
     backend=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    # Task modules, imported by workers and beat (autodiscovery would look
+    # for apps.workers.tasks.tasks only)
+    include=[
+        "apps.workers.tasks.sync_tasks",
+        "apps.workers.tasks.usage_tasks",
+        "apps.workers.tasks.brain_tasks",
+    ],
 )
 
 app.conf.update(
@@ -30,7 +38,27 @@ app.conf.update(
             "task": "refresh_expiring_tokens",
             "schedule": 2700,
         },
+        "rollup-ai-usage-hourly": {
+            "task": "rollup_ai_usage",
+            "schedule": 3600,
+        },
+        "refresh-case-snapshots-every-minute": {
+            "task": "refresh_case_snapshots",
+            "schedule": 60,
+        },
+        "precompute-brain-summaries-every-minute": {
+            "task": "precompute_brain_summaries",
+            "schedule": 60,
+        },
     },
 )
 
-app.autodiscover_tasks(["apps.workers.tasks"])
+
+@worker_init.connect
+def _register_brain_hooks(**kwargs):
+    """Writes made by the workers invalidate Brain snapshots and summaries too."""
+    from apps.api.services.brain.case_snapshots import register_snapshot_hooks
+    from apps.api.services.brain.tenant_summary import register_summary_hooks
+
+    register_snapshot_hooks()
+    register_summary_hooks()
@@ -0,0 +1,52 @@
+"""Celery tasks maintaining the Brain case snapshots and tenant summaries.
+
+refresh_case_snapshots recomputes the snapshots marked dirty by writes to
+the rows they depend on, the expired ones and the missing ones of active
+cases, so Brain dashboard reads do not recompute scores.
+
+precompute_brain_summaries recomputes the per-tenant Brain summary and
+dashboard intelligence payloads with queued invalidations, the expired and
+the missing ones, and pushes brain_summary_updated to the tenant's SSE
+subscribers.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="refresh_case_snapshots", queue="default")
+def refresh_case_snapshots():
+    """Recompute a batch of dirty, expired or missing case snapshots.
+
+    Called by Celery Beat every minute; a backlog larger than
+    BRAIN_SNAPSHOT_REFRESH_BATCH is drained over the next runs.
+    """
+    import asyncio
+
+    from apps.api.services.brain.case_snapshots import refresh_due_snapshots
+
+    async def _run():
+        refreshed = await refresh_due_snapshots()
+        logger.info(f"Refreshed {refreshed} case intelligence snapshot(s)")
+
+    asyncio.run(_run())
+
+
+@shared_task(name="precompute_brain_summaries", queue="default")
+def precompute_brain_summaries():
+    """Recompute the stale (invalidated or expired) and missing tenant summaries.
+
+    Called by Celery Beat every minute.
+    """
+    import asyncio
+
+    from apps.api.services.brain.tenant_summary import precompute_due_summaries
+
+    async def _run():
+        refreshed = await precompute_due_summaries()
+        logger.info(f"Precomputed {refreshed} tenant Brain summary(ies)")
+
+    asyncio.run(_run())
@@ -0,0 +1,31 @@
+"""Celery tasks maintaining the daily AI usage rollups.
+
+rollup_ai_usage aggregates ai_audit_logs into ai_usage_rollups so the LLM
+dashboard, cost and DPIA statistics do not scan the full audit table.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="rollup_ai_usage", queue="default")
+def rollup_ai_usage():
+    """Refresh the AI usage rollups of every stale day.
+
+    Called by Celery Beat every hour. Today is never rolled up: readers
+    aggregate it from the live table.
+    """
+    import asyncio
+
+    from apps.api.services.llm import usage_rollup
+    from packages.db.session import get_superadmin_session
+
+    async def _run():
+        async with get_superadmin_session() as session:
+            days = await usage_rollup.rollup_ai_usage(session)
+        logger.info(f"Refreshed AI usage rollups for {days} day(s)")
+
+    asyncio.run(_run())
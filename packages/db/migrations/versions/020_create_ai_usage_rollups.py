@@ -0,0 +1,87 @@
+"""LXB-020: Create ai_usage_rollups table (daily AI usage aggregates).
+
+One row per tenant × day × provider × sensitivity, maintained by the
+rollup_ai_usage worker task so LLM usage, cost and DPIA statistics no
+longer scan the whole ai_audit_logs table.
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_usage_rollups",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "tenant_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="RESTRICT"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column("day", sa.Date, nullable=False),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("data_sensitivity", sa.String(20), nullable=False),
+        sa.Column("request_count", sa.Integer, nullable=False),
+        sa.Column("anonymized_count", sa.Integer, nullable=False),
+        sa.Column("error_count", sa.Integer, nullable=False),
+        sa.Column("human_validated_count", sa.Integer, nullable=False),
+        sa.Column("tokens_in", sa.BigInteger, nullable=False),
+        sa.Column("tokens_out", sa.BigInteger, nullable=False),
+        sa.Column("cost_eur", sa.Numeric(14, 6), nullable=True),
+        sa.Column("latency_ms_sum", sa.BigInteger, nullable=False),
+        sa.Column("latency_count", sa.Integer, nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime,
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.UniqueConstraint(
+            "tenant_id",
+            "day",
+            "provider",
+            "data_sensitivity",
+            name="uq_ai_usage_rollup_bucket",
+        ),
+    )
+
+    # RLS
+    op.execute("ALTER TABLE ai_usage_rollups ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation ON ai_usage_rollups
+        USING (tenant_id = current_setting('app.current_tenant_id', TRUE)::uuid)
+        """
+    )
+
+    # Late validations are found by their validation time
+    op.create_index(
+        "idx_ai_audit_logs_human_validated_at",
+        "ai_audit_logs",
+        ["human_validated_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_ai_audit_logs_human_validated_at", "ai_audit_logs")
+    op.drop_table("ai_usage_rollups")
@@ -0,0 +1,90 @@
+"""LXB-021: Create case_intelligence_snapshots table (persisted Brain scores).
+
+One row per case with its risk, completeness and health, marked dirty when
+a row the scores depend on changes and recomputed by the
+refresh_case_snapshots worker task, so the Brain dashboard reads scores
+instead of recomputing them per case.
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "case_intelligence_snapshots",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "tenant_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="RESTRICT"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column(
+            "case_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("cases.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("risk_score", sa.Integer, nullable=False),
+        sa.Column("risk_level", sa.String(20), nullable=False),
+        sa.Column("completeness_score", sa.Integer, nullable=False),
+        sa.Column("health_score", sa.Integer, nullable=False),
+        sa.Column("risk", JSONB, nullable=False),
+        sa.Column("completeness", JSONB, nullable=False),
+        sa.Column("health", JSONB, nullable=False),
+        sa.Column(
+            "dirty",
+            sa.Boolean,
+            nullable=False,
+            server_default=sa.text("false"),
+        ),
+        sa.Column(
+            "version",
+            sa.Integer,
+            nullable=False,
+            server_default=sa.text("0"),
+        ),
+        sa.Column("generated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("dirtied_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # RLS
+    op.execute("ALTER TABLE case_intelligence_snapshots ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation ON case_intelligence_snapshots
+        USING (tenant_id = current_setting('app.current_tenant_id', TRUE)::uuid)
+        """
+    )
+
+    # The refresh task scans dirty and expired snapshots
+    op.create_index(
+        "idx_case_intelligence_snapshots_refresh",
+        "case_intelligence_snapshots",
+        ["dirty", "generated_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("case_intelligence_snapshots")
@@ -0,0 +1,71 @@
+"""LXB-022: Create brain_summary_snapshots table (precomputed tenant summaries).
+
+One row per tenant with the /brain/summary and /dashboard/intelligence
+payloads, marked dirty when a row they depend on changes and recomputed by
+the precompute_brain_summaries worker task, so the endpoints read stored
+aggregates instead of computing them per request.
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "brain_summary_snapshots",
+        sa.Column(
+            "id",
+            UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "tenant_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="RESTRICT"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("summary", JSONB, nullable=False),
+        sa.Column("dashboard", JSONB, nullable=False),
+        sa.Column(
+            "dirty",
+            sa.Boolean,
+            nullable=False,
+            server_default=sa.text("false"),
+        ),
+        sa.Column(
+            "version",
+            sa.Integer,
+            nullable=False,
+            server_default=sa.text("0"),
+        ),
+        sa.Column("generated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("dirtied_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # RLS
+    op.execute("ALTER TABLE brain_summary_snapshots ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation ON brain_summary_snapshots
+        USING (tenant_id = current_setting('app.current_tenant_id', TRUE)::uuid)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("brain_summary_snapshots")
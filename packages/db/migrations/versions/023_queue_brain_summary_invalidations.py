@@ -0,0 +1,72 @@
+"""LXB-023: Queue Brain summary invalidations instead of updating the snapshot.
+
+Writers used to UPDATE their tenant's brain_summary_snapshots row on every
+flush, holding its lock until commit: every write transaction of a tenant
+serialized on that row. They now append to brain_summary_invalidations; a
+summary is stale while its tenant has queued rows, so the dirty, version
+and dirtied_at columns go.
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "brain_summary_invalidations",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("tenant_id", UUID(as_uuid=True), nullable=False, index=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index(
+        "idx_brain_summary_invalidations_tenant_id_id",
+        "brain_summary_invalidations",
+        ["tenant_id", "id"],
+    )
+
+    # RLS
+    op.execute("ALTER TABLE brain_summary_invalidations ENABLE ROW LEVEL SECURITY")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation ON brain_summary_invalidations
+        USING (tenant_id = current_setting('app.current_tenant_id', TRUE)::uuid)
+        """
+    )
+
+    op.drop_column("brain_summary_snapshots", "dirty")
+    op.drop_column("brain_summary_snapshots", "version")
+    op.drop_column("brain_summary_snapshots", "dirtied_at")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "brain_summary_snapshots",
+        sa.Column("dirtied_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "brain_summary_snapshots",
+        sa.Column("version", sa.Integer, nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "brain_summary_snapshots",
+        sa.Column("dirty", sa.Boolean, nullable=False, server_default=sa.text("false")),
+    )
+    op.drop_table("brain_summary_invalidations")
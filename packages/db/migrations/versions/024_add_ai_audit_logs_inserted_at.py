@@ -0,0 +1,39 @@
+"""LXB-024: Add ai_audit_logs.inserted_at (write time of audit rows).
+
+created_at is set when an entry is queued; the audit writer inserts it
+later, and entries spilled during a database outage are replayed much
+later with their original created_at. The usage rollups re-aggregate the
+days of rows written since their previous run, found by inserted_at.
+
+Existing rows keep a NULL inserted_at (they are rolled up already).
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "024"
+down_revision: Union[str, None] = "023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ai_audit_logs", sa.Column("inserted_at", sa.DateTime, nullable=True))
+    op.alter_column("ai_audit_logs", "inserted_at", server_default=sa.text("now()"))
+    op.create_index(
+        "ix_ai_audit_logs_inserted_at",
+        "ai_audit_logs",
+        ["inserted_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_audit_logs_inserted_at", "ai_audit_logs")
+    op.drop_column("ai_audit_logs", "inserted_at")
@@ -32,12 +32,16 @@ from packages.db.models.prophet_simulation import ProphetSimulation
 from packages.db.models.sentinel_conflict import SentinelConflict
 from packages.db.models.sentinel_entity import SentinelEntity
 from packages.db.models.ai_audit_log import AIAuditLog
+from packages.db.models.ai_usage_rollup import AIUsageRollup
 from packages.db.models.cloud_document import CloudDocument
 from packages.db.models.cloud_sync_job import CloudSyncJob
 from packages.db.models.document_case_link import DocumentCaseLink
 from packages.db.models.timeline_document import TimelineDocument
 from packages.db.models.timeline_event import TimelineEvent
 from packages.db.models.tenant_setting import TenantSetting
+from packages.db.models.case_intelligence_snapshot import CaseIntelligenceSnapshot
+from packages.db.models.brain_summary_snapshot import BrainSummarySnapshot
+from packages.db.models.brain_summary_invalidation import BrainSummaryInvalidation
 
 __all__ = [
     "Base",
@@ -72,10 +76,14 @@ __all__ = [
     "SentinelConflict",
     "SentinelEntity",
     "AIAuditLog",
+    "AIUsageRollup",
     "CloudDocument",
     "CloudSyncJob",
     "DocumentCaseLink",
     "TimelineDocument",
     "TimelineEvent",
     "TenantSetting",
+    "CaseIntelligenceSnapshot",
+    "BrainSummarySnapshot",
+    "BrainSummaryInvalidation",
 ]
@@ -131,6 +131,13 @@ class AIAuditLog(TenantMixin, Base):
         nullable=False,
         server_default=text("now()"),
     )
+    inserted_at: Mapped[datetime | None] = mapped_column(
+        nullable=True,
+        index=True,
+        server_default=text("now()"),
+        comment="When the row was written (created_at is set when queued; "
+        "rows replayed from the spill file are written late)",
+    )
 
     def __repr__(self) -> str:
         return f"<AIAuditLog {self.id} {self.provider}/{self.model} [{self.data_sensitivity}]>"
@@ -0,0 +1,87 @@
+"""AI usage rollup model — daily aggregates of ai_audit_logs.
+
+One row per tenant × day × provider × sensitivity, maintained by the
+rollup_ai_usage worker task. Usage, cost and DPIA statistics read these
+rows and only aggregate the live ai_audit_logs table for days that are
+not rolled up yet (today).
+
+Protected by RLS via tenant_id.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from packages.db.base import Base, TenantMixin
+
+
+class AIUsageRollup(TenantMixin, Base):
+    __tablename__ = "ai_usage_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "day",
+            "provider",
+            "data_sensitivity",
+            name="uq_ai_usage_rollup_bucket",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    day: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="UTC day of ai_audit_logs.created_at",
+    )
+    provider: Mapped[str] = mapped_column(String(50), nullable=False)
+    data_sensitivity: Mapped[str] = mapped_column(String(20), nullable=False)
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    anonymized_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    human_validated_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    tokens_in: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    tokens_out: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cost_eur: Mapped[Decimal | None] = mapped_column(
+        Numeric(14, 6),
+        nullable=True,
+        comment="NULL when no request of the bucket has a cost estimate",
+    )
+    latency_ms_sum: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latency_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Requests with a latency (the average ignores the others)",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<AIUsageRollup {self.day} {self.provider} "
+            f"[{self.data_sensitivity}] {self.request_count}>"
+        )
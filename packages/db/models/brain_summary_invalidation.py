@@ -0,0 +1,41 @@
+"""Brain summary invalidation model — insert-only queue of summary changes.
+
+Writes to the rows a tenant Brain summary depends on append one row here
+(per tenant and transaction) instead of updating the tenant's
+brain_summary_snapshots row, so concurrent writers of a tenant never wait
+on a shared row. A summary is stale while its tenant has queued rows; a
+refresh deletes the rows it has seen in the transaction that stores the
+recomputed payloads.
+
+No foreign key to tenants: inserts take no lock on the tenant row.
+Protected by RLS via tenant_id.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from packages.db.base import Base, TenantMixin
+
+
+class BrainSummaryInvalidation(TenantMixin, Base):
+    __tablename__ = "brain_summary_invalidations"
+    __table_args__ = (
+        Index("idx_brain_summary_invalidations_tenant_id_id", "tenant_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="BIGSERIAL — insert-only queue",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<BrainSummaryInvalidation tenant={self.tenant_id} id={self.id}>"
@@ -0,0 +1,51 @@
+"""Brain summary snapshot model — precomputed dashboard payloads per tenant.
+
+One row per tenant with the /brain/summary and /dashboard/intelligence
+payloads. Writes to the rows they depend on queue a
+brain_summary_invalidations row; the precompute_brain_summaries worker task
+recomputes the summaries with queued invalidations and the expired ones.
+
+Protected by RLS via tenant_id.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from packages.db.base import Base, TenantMixin
+
+
+class BrainSummarySnapshot(TenantMixin, Base):
+    __tablename__ = "brain_summary_snapshots"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="RESTRICT"),
+        nullable=False,
+        unique=True,
+    )
+    summary: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="BrainSummaryResponse (14-day deadline horizon)",
+    )
+    dashboard: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="GET /dashboard/intelligence payload",
+    )
+    generated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<BrainSummarySnapshot tenant={self.tenant_id} at={self.generated_at}>"
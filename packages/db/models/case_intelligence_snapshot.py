@@ -0,0 +1,90 @@
+"""Case intelligence snapshot model — persisted Brain scores per case.
+
+One row per case with the risk, completeness and health computed by the
+Brain, so dashboard reads do not recompute them from raw rows. Writes to
+the rows the scores depend on mark the snapshot dirty (and bump version);
+the refresh_case_snapshots worker task recomputes dirty and expired ones.
+
+Protected by RLS via tenant_id.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from packages.db.base import Base, TenantMixin
+
+
+class CaseIntelligenceSnapshot(TenantMixin, Base):
+    __tablename__ = "case_intelligence_snapshots"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    case_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("cases.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    risk_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    risk_level: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="low | medium | high | critical",
+    )
+    completeness_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    health_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    risk: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="RiskAssessmentResponse",
+    )
+    completeness: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="CompletenessResponse",
+    )
+    health: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="CaseHealthResponse (without freshness fields)",
+    )
+    dirty: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        server_default=text("false"),
+        comment="A row the scores depend on changed since generated_at",
+    )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Bumped on every invalidation (detects changes during a refresh)",
+    )
+    generated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    dirtied_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        state = "dirty" if self.dirty else "clean"
+        return (
+            f"<CaseIntelligenceSnapshot case={self.case_id} "
+            f"risk={self.risk_level} {state}>"
+        )